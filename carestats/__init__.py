@@ -0,0 +1,2 @@
+# -*- coding: utf-8 -*-
+"""careStatsAPI 공통 모듈 (시트 로딩, 데이터셋 정규화, 공백 지수, HTTP API)"""
@@ -0,0 +1,7 @@
+# -*- coding: utf-8 -*-
+"""python -m carestats"""
+import sys
+
+from carestats.cli import main
+
+sys.exit(main())
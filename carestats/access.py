@@ -0,0 +1,253 @@
+# -*- coding: utf-8 -*-
+"""시설 접근성: 수요 지점마다 가장 가까운 시설 k개와 반경 r km 안의 정원 합
+
+공백 지수의 공급(capacity)은 지역 안 정원 합이라 경계 바로 너머 시설이 이웃 지역에 주는
+몫을 놓친다. 여기서는 수요 지점(시군구 대표점, 읍면동 중심, 인구 격자 등)에서 시설까지의
+대원 거리(haversine, km)로
+
+- nearest_km / mean{k}_km: 가장 가까운 시설까지 / k개까지 평균 거리
+- facilities_within / capacity_within: 반경 r km 안의 시설 수 / 정원 합
+
+을 구한다. capacity_within을 gap.ACCESS_COL(access_capacity)로 붙이면 compute_gap_index가
+supply_index의 세 번째 성분으로 쓴다.
+
+    index = NeighborIndex(fac_lat, fac_lon)
+    count, total = index.within(lat, lon, 10.0, weights=capacity)
+    dist, idx = index.nearest(lat, lon, k=3)
+
+색인은 위경도 격자 버킷이다. 칸 크기는 가로/세로 모두 cell_km 이상이 되도록 (가장 높은 위도
+기준으로) 잡으므로, 반경 d km 안의 시설은 항상 ceil(d / cell_km)칸 이웃 안에 있다. 후보는
+칸 범위를 CSR로 펼쳐 (지점, 시설) 쌍 배열로 한 번에 거리 계산하고, 최근접 k는 이웃 범위를
+두 배씩 넓히며 k번째 거리가 범위 안에서 확정된 지점부터 끝낸다.
+
+    python -m carestats access --facilities welfare_facilities_points.csv --boundaries PATH --radius 10 --k 3
+"""
+import argparse
+import math
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+from carestats import config
+from carestats.trace import traced
+
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEG = EARTH_RADIUS_KM * math.pi / 180
+CHUNK_PAIRS = 1 << 22     # 한 번에 만드는 (지점, 시설) 쌍 수 상한
+
+
+def haversine_km(lat1, lon1, lat2, lon2):
+    """두 지점(배열 가능, 브로드캐스트) 사이 대원 거리 km"""
+    lat1, lon1, lat2, lon2 = (np.radians(np.asarray(a, dtype=float)) for a in (lat1, lon1, lat2, lon2))
+    h = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(h, 0.0, 1.0)))
+
+
+def _expand(count):
+    """CSR 펼치기: count (n,) → (그룹 번호, 그룹 안 순번)"""
+    group = np.repeat(np.arange(len(count)), count)
+    return group, np.arange(count.sum()) - np.repeat(np.cumsum(count) - count, count)
+
+
+def _chunks(pairs, limit=CHUNK_PAIRS):
+    """지점별 쌍 수 → 쌍이 limit 정도씩 되도록 나눈 지점 번호 묶음"""
+    total = np.cumsum(pairs)
+    splits = np.searchsorted(total, np.arange(limit, total[-1] if len(total) else 0, limit))
+    return [part for part in np.split(np.arange(len(pairs)), splits) if len(part)]
+
+
+class NeighborIndex:
+    """시설 좌표 격자 버킷 (좌표가 없는 시설은 빠지고 결과의 시설 번호는 입력 순서 그대로)"""
+
+    def __init__(self, lat, lon, cell_km=5.0):
+        lat = np.asarray(lat, dtype=float)
+        lon = np.asarray(lon, dtype=float)
+        valid = np.flatnonzero(np.isfinite(lat) & np.isfinite(lon))
+        self.size = len(lat)
+        self.cell_km = float(cell_km)
+        self.lat = lat[valid]
+        self.lon = lon[valid]
+        if len(valid):
+            self.lat0, self.lon0 = self.lat.min(), self.lon.min()
+            widest = min(89.0, np.abs(self.lat).max() + 1.0)    # 가장 높은 위도(+1° 여유)에서도 가로 ≥ cell_km
+        else:
+            self.lat0 = self.lon0 = widest = 0.0
+        self.dlat = self.cell_km / KM_PER_DEG
+        self.dlon = self.cell_km / (KM_PER_DEG * math.cos(math.radians(widest)))
+        row, col = self._cell(self.lat, self.lon)
+        self.nrows = int(row.max()) + 1 if len(valid) else 1
+        self.ncols = int(col.max()) + 1 if len(valid) else 1
+        cell = row * self.ncols + col
+        order = np.argsort(cell, kind='stable')
+        self.members = valid[order]            # 칸 순서로 늘어선 시설 번호 (원래 순서)
+        self.member_lat = self.lat[order]
+        self.member_lon = self.lon[order]
+        counts = np.bincount(cell, minlength=self.nrows * self.ncols)
+        self.cell_start = np.concatenate([[0], np.cumsum(counts)])
+        # 칸 범위의 시설 수를 O(1)로 세는 2차원 누적합 (쌍 배열 크기 예측용)
+        table = np.zeros((self.nrows + 1, self.ncols + 1), dtype=np.int64)
+        table[1:, 1:] = counts.reshape(self.nrows, self.ncols).cumsum(axis=0).cumsum(axis=1)
+        self._table = table
+
+    def _cell(self, lat, lon):
+        row = np.floor((np.asarray(lat, dtype=float) - self.lat0) / self.dlat)
+        col = np.floor((np.asarray(lon, dtype=float) - self.lon0) / self.dlon)
+        return (np.clip(np.nan_to_num(row, nan=-1e9), -1e9, 1e9).astype(np.int64),
+                np.clip(np.nan_to_num(col, nan=-1e9), -1e9, 1e9).astype(np.int64))
+
+    def _block(self, row, col, reach):
+        """지점별로 ±reach칸 범위를 격자 안으로 자른 (r0, r1, c0, c1) (비면 r0 > r1)"""
+        return (np.maximum(row - reach, 0), np.minimum(row + reach, self.nrows - 1),
+                np.maximum(col - reach, 0), np.minimum(col + reach, self.ncols - 1))
+
+    def _block_count(self, r0, r1, c0, c1):
+        empty = (r0 > r1) | (c0 > c1)
+        r0, r1, c0, c1 = (np.where(empty, 0, a) for a in (r0, r1, c0, c1))
+        t = self._table
+        n = t[r1 + 1, c1 + 1] - t[r0, c1 + 1] - t[r1 + 1, c0] + t[r0, c0]
+        return np.where(empty, 0, n)
+
+    def _pairs(self, lat, lon, row, col, reach):
+        """지점 × 범위 안 시설 → (지점 번호, 칸 순서 시설 위치, 거리 km) 쌍"""
+        r0, r1, c0, c1 = self._block(row, col, reach)
+        empty = (r0 > r1) | (c0 > c1)
+        height = np.where(empty, 0, r1 - r0 + 1)
+        width = np.where(empty, 0, c1 - c0 + 1)
+        # 지점마다 범위의 행 조각(같은 행의 연속 칸은 CSR에서 한 구간)
+        point, k = _expand(height)
+        first = (r0[point] + k) * self.ncols + c0[point]
+        lo = self.cell_start[first]
+        hi = self.cell_start[first + width[point]]
+        seg, j = _expand(hi - lo)
+        who = point[seg]
+        pos = lo[seg] + j
+        return who, pos, haversine_km(lat[who], lon[who], self.member_lat[pos], self.member_lon[pos])
+
+    @traced('access.within', 'cpu')
+    def within(self, lat, lon, radius_km, weights=None):
+        """지점마다 반경 radius_km 안 시설 수와 weights 합 → (count (n,), total (n,))"""
+        lat = np.asarray(lat, dtype=float)
+        lon = np.asarray(lon, dtype=float)
+        weights = np.ones(self.size) if weights is None else np.asarray(weights, dtype=float)
+        member_w = weights[self.members]
+        count = np.zeros(len(lat), dtype=np.int64)
+        total = np.zeros(len(lat))
+        row, col = self._cell(lat, lon)
+        reach = int(math.ceil(radius_km / self.cell_km))
+        for part in _chunks(self._block_count(*self._block(row, col, reach))):
+            who, pos, dist = self._pairs(lat[part], lon[part], row[part], col[part], reach)
+            hit = dist <= radius_km
+            count[part] = np.bincount(who[hit], minlength=len(part))
+            total[part] = np.bincount(who[hit], weights=member_w[pos[hit]], minlength=len(part))
+        return count, total
+
+    @traced('access.nearest', 'cpu')
+    def nearest(self, lat, lon, k=1):
+        """지점마다 가까운 시설 k개 → (거리 km (n, k), 시설 번호 (n, k)) (시설이 k개보다 적으면 inf / -1)"""
+        lat = np.asarray(lat, dtype=float)
+        lon = np.asarray(lon, dtype=float)
+        dist = np.full((len(lat), k), np.inf)
+        idx = np.full((len(lat), k), -1, dtype=np.intp)
+        row, col = self._cell(lat, lon)
+        pending = np.flatnonzero(np.isfinite(lat) & np.isfinite(lon)) if len(self.members) else np.array([], int)
+        want = min(k, len(self.members))
+        reach = 1
+        while len(pending):
+            # 범위가 격자 전체를 덮으면 모든 시설을 본 것 → 확정
+            r0, r1, c0, c1 = self._block(row[pending], col[pending], reach)
+            whole = (r0 == 0) & (c0 == 0) & (r1 == self.nrows - 1) & (c1 == self.ncols - 1)
+            for part in _chunks(self._block_count(r0, r1, c0, c1)):
+                q = pending[part]
+                who, pos, d = self._pairs(lat[q], lon[q], row[q], col[q], reach)
+                order = np.lexsort((d, who))
+                who, pos, d = who[order], pos[order], d[order]
+                rank = np.arange(len(who)) - np.searchsorted(who, who)
+                top = rank < k
+                dist[q[who[top]], rank[top]] = d[top]
+                idx[q[who[top]], rank[top]] = self.members[pos[top]]
+            found = np.isfinite(dist[pending, want - 1]) if want else np.ones(len(pending), bool)
+            # ±reach칸 안에는 reach × cell_km 이내의 시설이 모두 들어 있음
+            settled = whole | (found & (dist[pending, max(want, 1) - 1] <= reach * self.cell_km))
+            pending = pending[~settled]
+            reach *= 2
+        return dist, idx
+
+
+def accessibility(lat, lon, fac_lat, fac_lon, capacity, k=3, radius_km=10.0, cell_km=None):
+    """수요 지점 × 시설 → nearest_km / mean{k}_km / facilities_within / capacity_within DataFrame"""
+    index = NeighborIndex(fac_lat, fac_lon, cell_km or max(radius_km / 2, 1.0))
+    dist, _ = index.nearest(lat, lon, k)
+    count, total = index.within(lat, lon, radius_km, weights=np.nan_to_num(np.asarray(capacity, dtype=float)))
+    with np.errstate(invalid='ignore'):
+        mean_k = np.where(np.isfinite(dist).all(axis=1), dist.mean(axis=1), np.nan)
+    return pd.DataFrame({
+        'nearest_km': np.where(np.isfinite(dist[:, 0]), dist[:, 0], np.nan),
+        f"mean{k}_km": mean_k,
+        'facilities_within': count,
+        'capacity_within': total,
+    })
+
+
+def access_by_region(regions, centroids, points, k=3, radius_km=10.0, value='정원'):
+    """지역 대표점 기준 접근성 → regions 컬럼 + 접근성 컬럼 + gap.ACCESS_COL
+
+    regions: 지역 키 DataFrame, centroids: (lat (n,), lon (n,)), points: lat/lon/value 컬럼이 있는 시설 표
+    """
+    from carestats.gap import ACCESS_COL
+    lat, lon = centroids
+    capacity = pd.to_numeric(points[value], errors='coerce').fillna(0).to_numpy()
+    table = accessibility(lat, lon, pd.to_numeric(points['lat'], errors='coerce'),
+                          pd.to_numeric(points['lon'], errors='coerce'), capacity, k, radius_km)
+    out = pd.concat([regions.reset_index(drop=True), table], axis=1)
+    out[ACCESS_COL] = out['capacity_within']
+    return out
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='carestats access',
+                                     description="시설 접근성 (가까운 시설 k개, 반경 안 정원 합)")
+    parser.add_argument('--facilities', required=True, help="lat/lon/정원 컬럼이 있는 시설 CSV")
+    parser.add_argument('--demand', help="lat/lon 컬럼이 있는 수요 지점 CSV (읍면동 중심 등, 없으면 시군구 대표점)")
+    parser.add_argument('--boundaries', default=config.BOUNDARY_PATH, help="시군구 경계 GeoJSON (대표점용)")
+    parser.add_argument('--k', type=int, default=3)
+    parser.add_argument('--radius', type=float, default=10.0, help="반경 km")
+    parser.add_argument('--data-dir', help="스냅샷 디렉터리: 주면 접근성을 공급 성분으로 넣은 시군구 공백 지수 출력")
+    parser.add_argument('--top', type=int, default=10)
+    parser.add_argument('--out', help="결과 CSV 저장 경로")
+    args = parser.parse_args(argv)
+
+    points = pd.read_csv(args.facilities, encoding='utf-8-sig')
+    start = time.perf_counter()
+    if args.demand:
+        demand = pd.read_csv(args.demand, encoding='utf-8-sig')
+        result = pd.concat([demand, accessibility(demand['lat'], demand['lon'], points['lat'], points['lon'],
+                                                  points['정원'], args.k, args.radius)], axis=1)
+    else:
+        if not os.path.exists(args.boundaries):
+            raise SystemExit(f"❌ 경계 파일이 없습니다: {args.boundaries} (--demand 또는 CARESTATS_BOUNDARY_PATH)")
+        from carestats.spatial import RegionIndex
+        index = RegionIndex.from_geojson(args.boundaries)
+        result = access_by_region(index.regions, index.centroids(), points, args.k, args.radius)
+    elapsed = time.perf_counter() - start
+    print(f"✅ 수요 지점 {len(result):,}개 × 시설 {len(points):,}개 ({elapsed * 1e3:.0f}ms)")
+
+    if args.data_dir and not args.demand:
+        from carestats import datasets
+        from carestats.gap import ACCESS_COL, gap_table
+        access = result[['통계시도명', '통계시군구명', ACCESS_COL]]
+        df = gap_table(datasets.load_snapshot(args.data_dir), 'sigungu', access=access)
+        print(f"=== 접근성 포함 복지 공백 상위 {args.top}개 (반경 {args.radius:g}km 정원) ===")
+        cols = ['통계시도명', '통계시군구명', 'capacity', ACCESS_COL, 'supply_index', 'demand_index', 'gap_diff']
+        print(df.nlargest(args.top, 'gap_diff')[cols].to_string(index=False))
+    else:
+        print(result.head(args.top).to_string(index=False))
+    if args.out:
+        result.to_csv(args.out, index=False, encoding='utf-8-sig')
+        print(f"💾 저장: {args.out}")
+    return 0
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,150 @@
+# -*- coding: utf-8 -*-
+"""주소 정규화: 소재지 표기 변형 → 건물 하나에 하나인 표준 키 + 비슷한 키 찾기 (n-gram 색인)
+
+워크시트 1의 소재지는 같은 건물이 여러 글자로 적혀 있다.
+
+    서울 강남구 테헤란로 123, 4층 (역삼동)
+    서울특별시 강남구 테헤란로123 한남빌딩 402호
+    서울특별시 강남구 테헤란로 123
+
+parse_address는 이를 (시도, 시군구, 도로명/동리, 건물번호)로 나누고 canonical_key는
+'서울특별시 강남구 테헤란로 123' 하나로 만든다. 층/호/건물명/참고항목(괄호)은 버리고
+시도 약칭은 공식 명칭으로, '로 12번길'처럼 띄어 쓴 길 이름은 붙인다. 지번 주소는
+(시도, 시군구, 읍면, 동리, 번지)로 같은 방식의 키를 만든다.
+
+AddressIndex는 이미 좌표가 있는 키를 (시군구 끝 이름, 건물번호) 묶음 안에서 도로명 글자
+2-gram으로 색인해, 오타/표기 차이('중앙로12번길' ↔ '중앙로12길')로 키가 조금 다른 주소도
+같은 건물로 찾는다. 건물번호가 다르면 절대 같은 건물로 보지 않는다.
+"""
+import re
+
+from carestats.regions import SIDO_ALIASES, SIDO_NAMES, normalize_sido
+
+MIN_SIMILARITY = 0.75   # 도로명/동리 2-gram Dice 계수 (중앙로 ↔ 중앙대로 0.67은 다른 길로 봄)
+
+_NOISE = re.compile(r'[\[\]「」|※★·●◎▶▷◆◇□■○"\']')
+_BRACKETS = re.compile(r'\([^)]*\)|\[[^\]]*\]')
+_SIGUNGU = re.compile(r'^[가-힣][가-힣0-9]*(시|군|구)$')
+_TOWN = re.compile(r'^[가-힣0-9]+(읍|면)$')
+_ROAD = re.compile(r'^([가-힣A-Za-z0-9]+(?:로|길))\s*(?:지하\s*)?(\d+)(?:\s*-\s*(\d+))?(?:번지|번)?(?=\s|$)')
+_LOT = re.compile(r'^([가-힣0-9]+(?:동|리|가))\s*(산\s*)?(\d+)(?:\s*-\s*(\d+))?(?:번지|번)?(?=\s|$)')
+
+
+def _sido(token):
+    name = normalize_sido(token)
+    if name in SIDO_NAMES:
+        return name
+    if token.endswith('시') and token[:-1] in SIDO_ALIASES:   # '서울시', '부산시'
+        return SIDO_ALIASES[token[:-1]]
+    return ''
+
+
+def parse_address(address):
+    """소재지 → {'kind': 'road'|'lot', 'sido', 'sigungu', 'town', 'street', 'number'} / 도로명·지번을 못 찾으면 None"""
+    if address is None or address != address:   # None / NaN
+        return None
+    text = _BRACKETS.sub(' ', str(address))
+    text = _NOISE.sub(' ', text).split(',')[0]
+    text = re.sub(r'(로|길)\s+(\d+(?:번)?길)', r'\1\2', text)   # '중앙로 12번길' → '중앙로12번길'
+    tokens = text.split()
+    if not tokens:
+        return None
+
+    sido = _sido(tokens[0])
+    pos = 1 if sido else 0
+    sigungu = []
+    while pos < len(tokens) and len(sigungu) < 2 and _SIGUNGU.match(tokens[pos]) and not _ROAD.match(tokens[pos]):
+        sigungu.append(tokens[pos])
+        pos += 1
+    town = ''
+    if pos < len(tokens) and _TOWN.match(tokens[pos]):
+        town = tokens[pos]
+        pos += 1
+    rest = ' '.join(tokens[pos:])
+
+    m = _ROAD.match(rest)
+    if m:
+        kind, street, number = 'road', m.group(1), m.group(2) + (f"-{m.group(3)}" if m.group(3) else '')
+    else:
+        m = _LOT.match(rest)
+        if not m:
+            return None
+        kind, street = 'lot', m.group(1)
+        number = ('산' if m.group(2) else '') + m.group(3) + (f"-{m.group(4)}" if m.group(4) else '')
+    number = re.sub(r'(?<![\d])0+(?=\d)', '', number)   # '012' → '12'
+    return {'kind': kind, 'sido': sido, 'sigungu': ' '.join(sigungu),
+            'town': town if kind == 'lot' else '', 'street': street, 'number': number}
+
+
+def canonical_key(address):
+    """소재지 → '시도 시군구 도로명 건물번호' (지번이면 '시도 시군구 읍면 동리 번지') / 주소가 아니면 ''"""
+    parts = parse_address(address)
+    if parts is None:
+        return ''
+    return ' '.join(p for p in (parts['sido'], parts['sigungu'], parts['town'], parts['street'], parts['number']) if p)
+
+
+def _bigrams(text):
+    padded = f"^{text}$"
+    return {padded[i:i + 2] for i in range(len(padded) - 1)}
+
+
+def _block(parts):
+    """비교 묶음: 종류, 시군구 끝 이름('성남시 분당구' ↔ '분당구'), 건물번호"""
+    return parts['kind'], parts['sigungu'].split(' ')[-1] if parts['sigungu'] else '', parts['number']
+
+
+class AddressIndex:
+    """표준 키 → 값(좌표 등) + 도로명 2-gram 역색인 (묶음 안에서만 후보를 셈)"""
+
+    def __init__(self, min_similarity=MIN_SIMILARITY):
+        self.min_similarity = min_similarity
+        self._values = {}
+        self._parts = {}
+        self._postings = {}   # (묶음, 2-gram) → [키]
+
+    def __len__(self):
+        return len(self._values)
+
+    def __contains__(self, key):
+        return key in self._values
+
+    def add(self, key, value):
+        """표준 키 등록 (parse_address로 다시 나눌 수 없는 키는 정확히 같을 때만 찾음)"""
+        new = key not in self._values
+        self._values[key] = value
+        parts = parse_address(key)
+        if not new or parts is None:
+            return
+        self._parts[key] = parts
+        block = _block(parts)
+        for gram in _bigrams(parts['street']):
+            self._postings.setdefault((block, gram), []).append(key)
+
+    def get(self, key, default=None):
+        return self._values.get(key, default)
+
+    def nearest(self, key):
+        """가장 비슷한 등록 키 (같은 키 포함) / 기준 미달이면 None"""
+        if key in self._values:
+            return key
+        parts = parse_address(key)
+        if parts is None:
+            return None
+        block = _block(parts)
+        grams = _bigrams(parts['street'])
+        shared = {}
+        for gram in grams:
+            for other in self._postings.get((block, gram), ()):
+                shared[other] = shared.get(other, 0) + 1
+        best, best_score = None, self.min_similarity
+        for other, count in shared.items():
+            theirs = self._parts[other]
+            if parts['sido'] and theirs['sido'] and parts['sido'] != theirs['sido']:
+                continue
+            if parts['town'] != theirs['town'] and parts['town'] and theirs['town']:
+                continue
+            score = 2 * count / (len(grams) + len(_bigrams(theirs['street'])))
+            if score >= best_score:
+                best, best_score = other, score
+        return best
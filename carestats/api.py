@@ -0,0 +1,428 @@
+# -*- coding: utf-8 -*-
+"""careStatsAPI HTTP 서버 (aiohttp)
+
+시작할 때 정규화 데이터셋을 메모리에 올려 차원별 정수 코드 배열로 인덱싱하고,
+각 요청은 코드 배열 마스킹 + np.bincount 집계만 수행한다.
+공백 지수 순위는 시작 시점에 지역 단위별로 미리 정렬해 둔다.
+/stats, /gap 응답은 (데이터셋 버전, 정규화 쿼리) 키로 캐시되며 ETag/If-None-Match를 지원한다.
+
+실행:
+    python -m carestats.api --data-dir <스냅샷 디렉터리>  # save_snapshot() 결과
+    python -m carestats.api                              # 구글 스프레드시트
+"""
+import argparse
+import asyncio
+import contextlib
+import hashlib
+import json
+import time
+from functools import partial
+
+import numpy as np
+import pandas as pd
+from aiohttp import web
+from multidict import MultiDict
+
+from carestats import datasets
+from carestats.cache import ResultCache, etag_matches, normalize_query
+from carestats.gap import INDEX_COLS, RAW_COLS, gap_table, gap_tables_by_sido, region_keys
+from carestats.regions import SIDO
+
+# 쿼리 파라미터 → 데이터셋 컬럼
+PARAM_COLUMNS = {
+    'sido': '통계시도명',
+    'sigungu': '통계시군구명',
+    'month': '통계연월',
+    'support_type': '지원구분',
+    'family_type': '가족유형',
+    'income_band': '중위소득비율구분',
+}
+COLUMN_PARAMS = {v: k for k, v in PARAM_COLUMNS.items()}
+
+# 데이터셋별 (차원 컬럼, 값 컬럼)
+DATASET_SPEC = {
+    'payments': (['통계연월', '통계시도명', '통계시군구명', '지원구분'], ['지급건수']),
+    'capacity': (['통계시도명', '통계시군구명'], ['정원']),
+    'recipients': (datasets.RECIPIENT_DIMS, datasets.RECIPIENT_VALUES),
+    'households': (['통계시도명'], ['가구수']),
+}
+GAP_ORDERS = ('gap_diff', 'gap_ratio')
+
+
+class QueryError(ValueError):
+    """잘못된 쿼리 파라미터 (HTTP 400)"""
+
+
+class FactTable:
+    """차원 컬럼은 정렬된 범주 코드(int32) 배열, 값 컬럼은 int64 배열로 보관"""
+
+    def __init__(self, df, dims, values):
+        self.dims = [d for d in dims if d in df.columns]
+        self.value_cols = [v for v in values if v in df.columns]
+        self.rows = len(df)
+        self.levels = {}
+        self.codes = {}
+        self.lookup = {}
+        for dim in self.dims:
+            codes, uniques = pd.factorize(df[dim].astype(str), sort=True)
+            self.codes[dim] = codes.astype(np.int32)
+            self.levels[dim] = np.asarray(uniques, dtype=object)
+            self.lookup[dim] = {v: i for i, v in enumerate(self.levels[dim])}
+        self.values = {v: df[v].to_numpy(dtype=np.int64) for v in self.value_cols}
+
+    def mask(self, filters=None, ranges=None):
+        """filters: {dim: [값,...]}, ranges: {dim: (lo, hi)} (양끝 포함) → bool 마스크 또는 None"""
+        mask = None
+        for dim, wanted in (filters or {}).items():
+            lookup = self.lookup[dim]
+            codes = [lookup[v] for v in wanted if v in lookup]
+            m = np.isin(self.codes[dim], codes)
+            mask = m if mask is None else mask & m
+        for dim, (lo, hi) in (ranges or {}).items():
+            levels = self.levels[dim]
+            lo_code = 0 if lo is None else np.searchsorted(levels, lo, side='left')
+            hi_code = len(levels) if hi is None else np.searchsorted(levels, hi, side='right')
+            codes = self.codes[dim]
+            m = (codes >= lo_code) & (codes < hi_code)
+            mask = m if mask is None else mask & m
+        return mask
+
+    def aggregate(self, value, group_by=None, filters=None, ranges=None):
+        """조건에 맞는 행의 value 합계 → (총합, [(그룹값, 합계), ...])"""
+        mask = self.mask(filters, ranges)
+        values = self.values[value]
+        if mask is not None:
+            values = values[mask]
+        total = int(values.sum())
+        if group_by is None:
+            return total, []
+        codes = self.codes[group_by]
+        if mask is not None:
+            codes = codes[mask]
+        n = len(self.levels[group_by])
+        sums = np.bincount(codes, weights=values, minlength=n)
+        present = np.flatnonzero(np.bincount(codes, minlength=n))
+        levels = self.levels[group_by]
+        return total, [(levels[i], int(sums[i])) for i in present]
+
+
+class StatsStore:
+    """메모리 인덱스 묶음: 데이터셋별 FactTable + 미리 정렬한 공백 지수 순위"""
+
+    def __init__(self, frames):
+        self.tables = {
+            name: FactTable(frames[name], *DATASET_SPEC[name]) for name in datasets.DATASETS
+        }
+        self.version = dataset_version(frames)
+        self.gap = {}
+        self._build_gap(frames)
+
+    def _build_gap(self, frames):
+        scopes = {('sido', None): gap_table(frames, 'sido'), ('sigungu', None): gap_table(frames, 'sigungu')}
+        by_sido = gap_tables_by_sido(frames)    # 시도별 시군구 정규화를 한 번의 배치 호출로
+        for sido in self.tables['payments'].levels['통계시도명']:
+            if sido in by_sido:
+                scopes[('sigungu', sido)] = by_sido[sido]
+        for (level, sido), df in scopes.items():
+            cols = region_keys(level) + RAW_COLS + INDEX_COLS
+            for order in GAP_ORDERS:
+                ranked = df.sort_values(order, ascending=False, kind='stable')[cols]
+                records = ranked.to_dict(orient='records')
+                for rank, rec in enumerate(records, start=1):
+                    rec['rank'] = rank
+                    for c in RAW_COLS:
+                        rec[c] = int(rec[c])
+                self.gap[(level, sido, order)] = records
+
+    def stats(self, name, value=None, group_by=None, filters=None, ranges=None):
+        if name not in self.tables:
+            raise QueryError(f"알 수 없는 데이터셋: {name}")
+        table = self.tables[name]
+        value = value or table.value_cols[0]
+        if value not in table.values:
+            raise QueryError(f"{name}에 '{value}' 값 컬럼이 없습니다.")
+        for dim in list(filters or {}) + list(ranges or {}) + ([group_by] if group_by else []):
+            if dim not in table.lookup:
+                raise QueryError(f"{name}에 '{COLUMN_PARAMS.get(dim, dim)}' 차원이 없습니다.")
+        total, groups = table.aggregate(value, group_by, filters, ranges)
+        return {
+            'dataset': name,
+            'value': value,
+            'group_by': COLUMN_PARAMS.get(group_by, group_by),
+            'total': total,
+            'rows': [{'key': k, 'value': v} for k, v in groups],
+        }
+
+    def gap_ranking(self, level='sido', sido=None, order='gap_diff', top=10):
+        if order not in GAP_ORDERS:
+            raise QueryError(f"order는 {GAP_ORDERS} 중 하나여야 합니다.")
+        if level == 'sido':
+            sido = None
+        elif sido:
+            sido = resolve_sido(sido)
+        key = (level, sido, order)
+        if key not in self.gap:
+            raise QueryError(f"공백 지수를 계산할 수 없는 범위: level={level}, sido={sido}")
+        records = self.gap[key]
+        return {
+            'level': level,
+            'sido': sido,
+            'order': order,
+            'rows': records[:top] if top else records,
+        }
+
+    def describe(self):
+        return {
+            name: {
+                'rows': t.rows,
+                'dimensions': [COLUMN_PARAMS.get(d, d) for d in t.dims],
+                'values': t.value_cols,
+            }
+            for name, t in self.tables.items()
+        }
+
+
+def dataset_version(frames):
+    """데이터셋 내용 해시 (스냅샷이 바뀌면 값이 바뀜)"""
+    h = hashlib.sha1()
+    for name in datasets.DATASETS:
+        h.update(name.encode('utf-8'))
+        h.update(pd.util.hash_pandas_object(frames[name], index=False).to_numpy().tobytes())
+    return h.hexdigest()[:16]
+
+
+# --- 요청 파싱 ---
+def _split(value):
+    return [v.strip() for v in value.split(',') if v.strip()]
+
+
+def resolve_sido(name):
+    """시도 약칭/옛 명칭('서울', '강원도') → 데이터셋의 공식 시도명 (모르는 이름은 QueryError)"""
+    code = SIDO.code(name)
+    if code < 0:
+        raise QueryError(f"알 수 없는 시도: {name}")
+    return SIDO.name(code)
+
+
+def parse_stats_query(query):
+    """쿼리 문자열 → (value, group_by, filters, ranges)"""
+    filters, ranges = {}, {}
+    value = group_by = None
+    month_from = month_to = None
+    for key, raw in query.items():
+        if key == 'value':
+            value = raw
+        elif key == 'group_by':
+            if raw not in PARAM_COLUMNS:
+                raise QueryError(f"group_by는 {sorted(PARAM_COLUMNS)} 중 하나여야 합니다.")
+            group_by = PARAM_COLUMNS[raw]
+        elif key == 'month_from':
+            month_from = raw
+        elif key == 'month_to':
+            month_to = raw
+        elif key == 'sido':
+            filters.setdefault(PARAM_COLUMNS[key], []).extend(resolve_sido(v) for v in _split(raw))
+        elif key in PARAM_COLUMNS:
+            filters.setdefault(PARAM_COLUMNS[key], []).extend(_split(raw))
+        else:
+            raise QueryError(f"알 수 없는 파라미터: {key}")
+    if month_from or month_to:
+        ranges['통계연월'] = (month_from, month_to)
+    return value, group_by, filters, ranges
+
+
+def cache_query(query):
+    """캐시 키용 쿼리: sido 약칭/옛 명칭을 공식 시도명으로 바꿈 (모르는 이름은 그대로 → 핸들러가 400)"""
+    out = MultiDict()
+    for key, raw in query.items():
+        if key == 'sido':
+            raw = ','.join(SIDO.name(SIDO.code(v)) if SIDO.code(v) >= 0 else v for v in _split(raw))
+        out.add(key, raw)
+    return out
+
+
+def _int_param(query, key, default, minimum=0):
+    try:
+        value = int(query.get(key, default))
+    except ValueError:
+        raise QueryError(f"{key}는 정수여야 합니다.")
+    if value < minimum:
+        raise QueryError(f"{key}는 {minimum} 이상이어야 합니다.")
+    return value
+
+
+class StatsService:
+    """현재 StatsStore와 결과 캐시를 묶어 보관, 스냅샷이 바뀌면 store 교체 + 캐시 무효화"""
+
+    def __init__(self, store, cache=None, loader=None):
+        self.store = store
+        self.cache = cache if cache is not None else ResultCache()
+        self.loader = loader
+
+    def swap(self, store):
+        if store.version == self.store.version:
+            return False
+        self.store = store
+        self.cache.clear()
+        return True
+
+    async def reload(self):
+        """loader로 스냅샷을 다시 읽어 버전이 바뀌었으면 교체 (로딩은 스레드에서 수행)"""
+        if self.loader is None:
+            return False
+        loop = asyncio.get_running_loop()
+        store = await loop.run_in_executor(None, self.loader)
+        return self.swap(store)
+
+
+# --- 핸들러 ---
+SERVICE = web.AppKey('service', StatsService)
+CACHED_ROUTES = ('/stats/', '/gap')
+json_response = partial(web.json_response, dumps=partial(json.dumps, ensure_ascii=False))
+
+
+@web.middleware
+async def error_middleware(request, handler):
+    try:
+        return await handler(request)
+    except QueryError as e:
+        return json_response({'error': str(e)}, status=400)
+
+
+@web.middleware
+async def timing_middleware(request, handler):
+    """핸들러 처리 시간을 Server-Timing 헤더(ms)로 노출"""
+    start = time.perf_counter()
+    resp = await handler(request)
+    resp.headers['Server-Timing'] = f"handler;dur={(time.perf_counter() - start) * 1000:.3f}"
+    return resp
+
+
+@web.middleware
+async def cache_middleware(request, handler):
+    """GET /stats, /gap 응답을 (버전, 정규화 쿼리) 키로 캐시하고 If-None-Match면 304 반환
+
+    ?sido=서울 과 ?sido=서울특별시 는 같은 응답이므로 같은 키 (cache_query)
+    """
+    if request.method != 'GET' or not request.path.startswith(CACHED_ROUTES):
+        return await handler(request)
+    service = request.app[SERVICE]
+    version = service.store.version
+    key = (version,) + normalize_query(request.path, cache_query(request.query), PARAM_COLUMNS)
+    entry = service.cache.get(key)
+    if entry is None:
+        resp = await handler(request)
+        if resp.status != 200 or service.store.version != version:
+            return resp
+        etag = service.cache.put(key, resp.body, resp.content_type)
+        resp.headers['ETag'] = etag
+        resp.headers['X-Cache'] = 'MISS'
+    else:
+        etag, body, content_type = entry
+        resp = web.Response(body=body, content_type=content_type, charset='utf-8')
+        resp.headers['ETag'] = etag
+        resp.headers['X-Cache'] = 'HIT'
+    if etag_matches(request.headers.get('If-None-Match'), etag):
+        return web.Response(status=304, headers={'ETag': etag, 'X-Cache': resp.headers['X-Cache']})
+    return resp
+
+
+async def handle_health(request):
+    service = request.app[SERVICE]
+    return json_response({
+        'status': 'ok',
+        'version': service.store.version,
+        'cache': service.cache.stats(),
+    })
+
+
+async def handle_datasets(request):
+    store = request.app[SERVICE].store
+    return json_response({'version': store.version, 'datasets': store.describe()})
+
+
+async def handle_stats(request):
+    store = request.app[SERVICE].store
+    value, group_by, filters, ranges = parse_stats_query(request.query)
+    result = store.stats(request.match_info['dataset'], value, group_by, filters, ranges)
+    result['version'] = store.version
+    return json_response(result)
+
+
+async def handle_gap(request):
+    store = request.app[SERVICE].store
+    query = request.query
+    result = store.gap_ranking(
+        level=query.get('level', 'sido'),
+        sido=query.get('sido'),
+        order=query.get('order', 'gap_diff'),
+        top=_int_param(query, 'top', 10),
+    )
+    result['version'] = store.version
+    return json_response(result)
+
+
+async def handle_reload(request):
+    service = request.app[SERVICE]
+    changed = await service.reload()
+    return json_response({'changed': changed, 'version': service.store.version})
+
+
+async def _reload_loop(service, interval):
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            if await service.reload():
+                print(f"🔄 스냅샷 변경 감지, 캐시 초기화 (version={service.store.version})")
+        except Exception as e:
+            print(f"❌ 스냅샷 재로딩 실패: {e}")
+
+
+def create_app(store, cache=None, loader=None, reload_interval=None):
+    service = StatsService(store, cache, loader)
+    app = web.Application(middlewares=[timing_middleware, error_middleware, cache_middleware])
+    app[SERVICE] = service
+    app.router.add_get('/health', handle_health)
+    app.router.add_get('/datasets', handle_datasets)
+    app.router.add_get('/stats/{dataset}', handle_stats)
+    app.router.add_get('/gap', handle_gap)
+    app.router.add_post('/reload', handle_reload)
+
+    if loader is not None and reload_interval:
+        async def reload_ctx(app):
+            task = asyncio.create_task(_reload_loop(service, reload_interval))
+            yield
+            task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+        app.cleanup_ctx.append(reload_ctx)
+    return app
+
+
+def load_store(data_dir=None):
+    frames = datasets.load_snapshot(data_dir) if data_dir else datasets.load_from_sheets()
+    return StatsStore(frames)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="careStatsAPI HTTP 서버")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--data-dir', help="로컬 스냅샷 디렉터리 (없으면 구글 스프레드시트에서 로드)")
+    parser.add_argument('--cache-mb', type=float, default=32, help="결과 캐시 메모리 상한 (MB)")
+    parser.add_argument('--reload-interval', type=float, default=0,
+                        help="스냅샷 변경 확인 주기 (초, 0이면 POST /reload로만 갱신)")
+    args = parser.parse_args(argv)
+
+    loader = partial(load_store, args.data_dir)
+    store = loader()
+    print(f"✅ 데이터 로드 완료 (version={store.version})")
+    for name, info in store.describe().items():
+        print(f"  {name}: {info['rows']}행")
+    cache = ResultCache(max_bytes=int(args.cache_mb * 1024 * 1024))
+    app = create_app(store, cache, loader, args.reload_interval)
+    web.run_app(app, host=args.host, port=args.port)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,157 @@
+# -*- coding: utf-8 -*-
+"""asyncio 기반 Sheets v4 클라이언트
+
+하나의 aiohttp 세션(커넥션 풀)으로 서로 독립인 워크시트를 동시에 받아온다.
+동시 요청 수는 concurrency로 제한하고, 각 요청은 carestats.quota의 토큰 버킷/재시도 계층을 거친다.
+
+    frames = fetch_frames({
+        'capacity': (1, None),          # 워크시트 1 전체, 첫 행이 헤더
+        'members': (7, 'A3:D'),         # 워크시트 7의 A3:D, A3 행이 헤더
+        'seoul': (2, ['통계시군구명', '지급건수'], {'통계시도명': '서울특별시'}),  # 필요한 열만
+    })
+"""
+import asyncio
+from urllib.parse import quote
+
+import aiohttp
+import pandas as pd
+
+from carestats import config
+from carestats.projection import column_ranges, columns_to_frame, needed_columns, quote_title
+from carestats.parsing import parse_values
+from carestats.quota import call_with_retry_async
+from carestats.trace import span, traced
+
+
+@traced('parse', 'cpu')
+def values_to_frame(values, header_row=0, schema=None):
+    """values (list of lists) → DataFrame (header_row 행을 컬럼명으로, schema가 없으면 모두 문자열)"""
+    return parse_values(values, schema, header_row, drop_errors=False)
+
+
+class AsyncSheetsClient:
+    """스프레드시트 하나에 대한 비동기 클라이언트 (async with 로 사용)"""
+
+    def __init__(self, spreadsheet_id=None, credentials=None, concurrency=4,
+                 base_url=None, value_render_option='FORMATTED_VALUE'):
+        self.spreadsheet_id = spreadsheet_id or config.SPREADSHEET_ID
+        self.credentials = credentials
+        self.base_url = (base_url or config.SHEETS_API_URL).rstrip('/')
+        self.value_render_option = value_render_option
+        self.concurrency = concurrency
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._session = None
+        self._titles = None
+        self._headers = {}
+        self._token_lock = asyncio.Lock()
+
+    async def __aenter__(self):
+        connector = aiohttp.TCPConnector(limit=self.concurrency, ttl_dns_cache=300)
+        self._session = aiohttp.ClientSession(connector=connector)
+        return self
+
+    async def __aexit__(self, *exc):
+        await self._session.close()
+
+    async def _auth_headers(self):
+        """액세스 토큰이 없거나 만료되었으면 (스레드에서) 갱신 (익명 인증이면 헤더 없음)"""
+        if self.credentials is None:
+            return {}
+        async with self._token_lock:
+            if not self.credentials.valid:
+                from google.auth.transport.requests import Request
+                loop = asyncio.get_running_loop()
+                await loop.run_in_executor(None, self.credentials.refresh, Request())
+        if not self.credentials.token:
+            return {}
+        return {'Authorization': f"Bearer {self.credentials.token}"}
+
+    async def _get_once(self, url, params):
+        headers = await self._auth_headers()
+        async with self._session.get(url, params=params, headers=headers) as resp:
+            resp.raise_for_status()
+            return await resp.json()
+
+    async def _get(self, path, params=None):
+        url = f"{self.base_url}/spreadsheets/{self.spreadsheet_id}{path}"
+        async with self._semaphore:
+            return await call_with_retry_async(self._get_once, url, params)
+
+    async def sheet_titles(self):
+        """워크시트 번호 순서대로 제목 목록 (한 번만 조회)"""
+        if self._titles is None:
+            meta = await self._get('', {'fields': 'sheets.properties(index,title)'})
+            props = sorted((s['properties'] for s in meta['sheets']), key=lambda p: p.get('index', 0))
+            self._titles = [p['title'] for p in props]
+        return self._titles
+
+    async def _a1(self, index, a1_range=None):
+        quoted = quote_title((await self.sheet_titles())[index])
+        return f"{quoted}!{a1_range}" if a1_range else quoted
+
+    async def values(self, index, a1_range=None):
+        """워크시트(index)의 A1 범위 값 → list of lists (범위 없으면 시트 전체)"""
+        a1 = await self._a1(index, a1_range)
+        data = await self._get(
+            f"/values/{quote(a1, safe='')}",
+            {'valueRenderOption': self.value_render_option},
+        )
+        return data.get('values', [])
+
+    async def frame(self, index, a1_range=None, header_row=0):
+        return values_to_frame(await self.values(index, a1_range), header_row)
+
+    async def columns(self, index, columns, where=None, header_row=1):
+        """워크시트(index)의 지정 컬럼만 → DataFrame (헤더는 시트별로 한 번만 조회)"""
+        header = self._headers.get((index, header_row))
+        if header is None:
+            header = (await self.values(index, f"{header_row}:{header_row}") or [[]])[0]
+            self._headers[(index, header_row)] = header
+        title = (await self.sheet_titles())[index]
+        ranges = column_ranges(title, header, needed_columns(columns, where), header_row)
+        data = await self._get('/values:batchGet', [
+            ('majorDimension', 'COLUMNS'),
+            ('valueRenderOption', self.value_render_option),
+        ] + [('ranges', r) for r in ranges])
+        values = [(vr.get('values') or [[]])[0] for vr in data.get('valueRanges', [])]
+        return columns_to_frame(values, columns, where)
+
+    def _request(self, spec):
+        index, target = spec[0], spec[1]
+        if isinstance(target, (list, tuple)):
+            return self.columns(index, target, *spec[2:])
+        return self.values(index, target)
+
+    async def gather_values(self, specs):
+        """모든 요청을 동시에 보냄
+
+        specs: {이름: (index, a1_range)}            → values (list of lists)
+               {이름: (index, [컬럼, ...], where)}   → 지정 컬럼만 담은 DataFrame
+        """
+        await self.sheet_titles()
+        names = list(specs)
+        results = await asyncio.gather(*(self._request(specs[n]) for n in names))
+        return dict(zip(names, results))
+
+
+async def _fetch(specs, concurrency, credentials):
+    async with AsyncSheetsClient(credentials=credentials, concurrency=concurrency) as client:
+        return await client.gather_values(specs)
+
+
+def fetch_values(specs, concurrency=4, credentials=None):
+    """동기 코드용: {이름: (index, a1_range)} → {이름: values}"""
+    if credentials is None:
+        from carestats.sheets import get_credentials
+        credentials = get_credentials()
+    with span('sheets.download', 'io', requests=len(specs)):
+        return asyncio.run(_fetch(specs, concurrency, credentials))
+
+
+def fetch_frames(specs, concurrency=4, credentials=None):
+    """동기 코드용: {이름: (index, a1_range)} → {이름: DataFrame} (범위 첫 행이 헤더)"""
+    values = fetch_values(specs, concurrency, credentials)
+    return {
+        name: v if isinstance(v, pd.DataFrame) else values_to_frame(v)
+        for name, v in values.items()
+    }
@@ -0,0 +1,505 @@
+# -*- coding: utf-8 -*-
+"""로더/집계/렌더러 벤치마크 (로컬 fixtures 기반, 1×/10×/100×/1000× 규모)
+
+    python -m carestats bench                      # 전체 실행 후 현재 커밋 이름으로 결과 저장
+    python -m carestats bench --filter gap --scales 1,10
+    python -m carestats bench --compare HEAD~3     # 저장된 다른 커밋 결과와 비교 (느려진 항목 ⚠️)
+    python -m carestats bench --history            # 커밋별 중앙값 (git log 순서)
+
+규모 N은 fixtures/sample을 N번 이어 붙인 데이터다. 복사본마다 시군구명(또는 시설명)에
+'#k' 접미사를 붙여 집계 그룹 수도 함께 늘어난다. 렌더러는 마커/차트 수가 커지므로 100×까지만 잰다.
+folium/plotly/matplotlib이 없으면 해당 벤치마크는 건너뛴다.
+
+결과: STATE_DIR/bench/<머신>/<커밋>.json (작업 트리에 변경이 있으면 <커밋>-dirty.json)
+"""
+import argparse
+import json
+import os
+import platform
+import runpy
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import zlib
+
+import pandas as pd
+
+from carestats import config
+
+DEFAULT_DATA_DIR = os.path.join(config.ROOT_DIR, 'fixtures', 'sample')
+DEFAULT_SCALES = (1, 10, 100, 1000)
+SLOWER = 1.2   # 비교 시 이 비율 이상 느려지면 경고
+
+BENCHMARKS = {}
+
+
+class Skip(Exception):
+    """선택 의존성이 없는 등 실행할 수 없는 벤치마크"""
+
+
+def benchmark(name, max_scale=None):
+    """setup(fixture, scale) → 측정할 인자 없는 함수 를 등록"""
+    def register(setup):
+        BENCHMARKS[name] = (setup, max_scale)
+        return setup
+    return register
+
+
+# --- 데이터 준비 ---
+class Fixture:
+    """fixtures 디렉터리의 원본 CSV(문자열)와 정규화 데이터셋 (한 번만 읽음)"""
+
+    def __init__(self, data_dir=DEFAULT_DATA_DIR):
+        self.data_dir = data_dir
+        self._raw = {}
+        self._frames = None
+
+    def raw(self, name):
+        if name not in self._raw:
+            path = os.path.join(self.data_dir, f"{name}.csv")
+            self._raw[name] = pd.read_csv(path, dtype=str, keep_default_na=False, encoding='utf-8-sig')
+        return self._raw[name]
+
+    def frames(self):
+        if self._frames is None:
+            from carestats.datasets import load_snapshot
+            self._frames = load_snapshot(self.data_dir)
+        return self._frames
+
+
+def scale_frame(df, scale, suffix_col=None):
+    """df를 scale번 이어 붙임 (suffix_col 값에는 복사본 번호 '#k'를 붙여 그룹 수도 늘림)"""
+    if scale == 1:
+        return df.copy()
+    copies = []
+    for k in range(scale):
+        part = df.copy()
+        if suffix_col and k:
+            part[suffix_col] = part[suffix_col] + f"#{k}"
+        copies.append(part)
+    return pd.concat(copies, ignore_index=True)
+
+
+def worksheet_values(df):
+    """DataFrame → ws.get_values()와 같은 2차원 문자열 목록 (1행 헤더)"""
+    return [list(df.columns)] + df.astype(str).values.tolist()
+
+
+def _script(rel_path):
+    """스크립트 함수 가져오기 (matplotlib 등 import 실패는 Skip)"""
+    try:
+        return runpy.run_path(os.path.join(config.ROOT_DIR, rel_path))
+    except ImportError as e:
+        raise Skip(str(e))
+
+
+def _require(module):
+    try:
+        __import__(module)
+    except ImportError as e:
+        raise Skip(str(e))
+
+
+def _coords(names):
+    """지오코딩 없이 이름별로 고정된 가짜 좌표"""
+    coords = {}
+    for n in names:
+        h = zlib.crc32(n.encode('utf-8'))
+        coords[n] = (34.0 + (h % 400) / 100, 126.0 + (h // 400 % 300) / 100)
+    return coords
+
+
+# --- 로더 ---
+@benchmark('parse.worksheet')
+def bench_parse_worksheet(fx, scale):
+    from carestats.parsing import parse_values
+    values = worksheet_values(scale_frame(fx.raw('recipients'), scale, '통계시군구명'))
+    schema = {'통계시도명': 'str', '통계시군구명': 'str', '가족유형': 'str', '중위소득비율구분': 'str',
+              '수급자수': 'int', '수급가구수': 'int'}
+    return lambda: parse_values(values, schema)
+
+
+@benchmark('parse.columns')
+def bench_parse_columns(fx, scale):
+    from carestats.projection import columns_to_frame
+    df = scale_frame(fx.raw('payments'), scale, '통계시군구명')
+    columns = ['통계시도명', '통계시군구명', '지급건수']
+    column_values = [df[c].tolist() for c in columns]
+    return lambda: columns_to_frame(column_values, columns[1:], where={'통계시도명': '서울특별시'})
+
+
+@benchmark('data_fix.reshape')
+def bench_data_fix(fx, scale):
+    ns = runpy.run_path(os.path.join(config.ROOT_DIR, 'data_fix.py'))
+    payments = scale_frame(fx.raw('payments'), scale, '통계시군구명')
+    # 월별로 나눠 가로로 이어 붙인 원본 CSV 모양 재현 (블록 사이 빈 열 포함)
+    months = sorted(payments['통계연월'].unique(), reverse=True)[:5]
+    blocks = []
+    for i, month in enumerate(months):
+        suffix = "" if i == 0 else f".{i}"
+        block = payments[payments['통계연월'] == month][ns['COLUMNS']].reset_index(drop=True)
+        block.columns = [f"{c}{suffix}" for c in ns['COLUMNS']]
+        block[f"Unnamed: {i}"] = ""
+        blocks.append(block)
+    wide = pd.concat(blocks, axis=1)
+    return lambda: ns['reshape'](wide, months[1:])
+
+
+# --- 집계 ---
+@benchmark('aggregate.city_income')
+def bench_city_income(fx, scale):
+    ns = _script('woohyun/중위소득비율.py')
+    df = scale_frame(fx.raw('recipients'), scale, '통계시군구명')[['통계시도명', '중위소득비율구분', '수급자수']]
+    return lambda: ns['calculate_city_income_sums'](df)
+
+
+@benchmark('aggregate.city_family')
+def bench_city_family(fx, scale):
+    ns = _script('woohyun/가족유형.py')
+    df = scale_frame(fx.raw('recipients'), scale, '통계시군구명')[['통계시도명', '가족유형', '수급자수']]
+    return lambda: ns['calculate_city_family_sums'](df)
+
+
+@benchmark('aggregate.gap_index')
+def bench_gap_index(fx, scale):
+    from carestats.gap import gap_table
+    frames = {
+        name: scale_frame(df, scale, '통계시군구명' if '통계시군구명' in df.columns else None)
+        for name, df in fx.frames().items()
+    }
+    return lambda: gap_table(frames, level='sigungu')
+
+
+@benchmark('aggregate.gap_index_by_sido')
+def bench_gap_index_by_sido(fx, scale):
+    from carestats.gap import gap_tables_by_sido
+    frames = {
+        name: scale_frame(df, scale, '통계시군구명' if '통계시군구명' in df.columns else None)
+        for name, df in fx.frames().items()
+    }
+    return lambda: gap_tables_by_sido(frames)
+
+
+@benchmark('aggregate.gap_sensitivity', max_scale=10)
+def bench_gap_sensitivity(fx, scale):
+    from carestats.gap import gap_table
+    from carestats.sensitivity import weight_sensitivity
+    frames = {
+        name: scale_frame(df, scale, '통계시군구명' if '통계시군구명' in df.columns else None)
+        for name, df in fx.frames().items()
+    }
+    df = gap_table(frames, level='sigungu')
+    return lambda: weight_sensitivity(df, n_samples=10000)
+
+
+@benchmark('aggregate.gap_bootstrap', max_scale=10)
+def bench_gap_bootstrap(fx, scale):
+    from carestats.bootstrap import gap_intervals
+    frames = {
+        name: scale_frame(df, scale, '통계시군구명' if '통계시군구명' in df.columns else None)
+        for name, df in fx.frames().items()
+    }
+    return lambda: gap_intervals(frames, level='sigungu', n_boot=1000)
+
+
+@benchmark('aggregate.spatial_join', max_scale=100)
+def bench_spatial_join(fx, scale):
+    import numpy as np
+    from carestats.spatial import RegionIndex
+    from carestats.synthetic import KOREA_BOUNDS, boundary_collection, region_names
+    # 시군구 255개, 변 약 20만 개 (실제 경계 수준의 꼭짓점 수), 점 1만 × 규모
+    index = RegionIndex.from_geojson(boundary_collection(region_names(17, 15), detail=200))
+    rng = np.random.default_rng(0)
+    west, south, east, north = KOREA_BOUNDS
+    lon = rng.uniform(west, east, 10000 * scale)
+    lat = rng.uniform(south, north, 10000 * scale)
+    return lambda: index.locate(lon, lat)
+
+
+@benchmark('aggregate.simplify', max_scale=10)
+def bench_simplify(fx, scale):
+    from carestats.shapes import simplify_rings, tolerance
+    from carestats.spatial import read_rings
+    from carestats.synthetic import boundary_collection, region_names
+    # 시군구 255개, 꼭짓점 약 20만 × 규모, 줌 10 허용 오차 (공유 호 단위 Douglas-Peucker)
+    _, rings = read_rings(boundary_collection(region_names(17, 15), detail=200 * scale))
+    return lambda: simplify_rings(rings, tolerance(10))
+
+
+@benchmark('aggregate.access', max_scale=100)
+def bench_access(fx, scale):
+    import numpy as np
+    from carestats.access import accessibility
+    from carestats.synthetic import KOREA_BOUNDS
+    # 읍면동 약 3,500곳 × 시설 1,000 × 규모 (가까운 5개 + 반경 10km 정원)
+    rng = np.random.default_rng(0)
+    west, south, east, north = KOREA_BOUNDS
+    demand = rng.uniform((south, west), (north, east), (3500, 2))
+    facilities = rng.uniform((south, west), (north, east), (1000 * scale, 2))
+    capacity = rng.integers(10, 60, len(facilities))
+    return lambda: accessibility(demand[:, 0], demand[:, 1], facilities[:, 0], facilities[:, 1], capacity,
+                                 k=5, radius_km=10.0)
+
+
+@benchmark('aggregate.clean_address')
+def bench_clean_address(fx, scale):
+    from carestats.geocode import clean_address
+    addresses = scale_frame(fx.raw('capacity'), scale)['소재지'].tolist()
+    return lambda: [clean_address(a) for a in addresses]
+
+
+@benchmark('aggregate.address_key')
+def bench_address_key(fx, scale):
+    from carestats.geocode import address_query
+    addresses = scale_frame(fx.raw('capacity'), scale)['소재지'].tolist()
+    return lambda: [address_query(a) for a in addresses]
+
+
+# --- 렌더러 ---
+def _sigungu_totals(fx, scale, name, value):
+    df = scale_frame(fx.frames()[name], scale, '통계시군구명')
+    return df.groupby('통계시군구명', as_index=False)[value].sum()
+
+
+@benchmark('render.folium_bubble', max_scale=100)
+def bench_folium(fx, scale):
+    _require('folium')
+    from carestats.maps import bubble_map
+    summary = _sigungu_totals(fx, scale, 'capacity', '정원')
+    coords = _coords(summary['통계시군구명'])
+    out = os.path.join(tempfile.mkdtemp(prefix='carestats-bench-'), 'map.html')
+    return lambda: bubble_map(
+        summary, coords, out, name_col='통계시군구명', value_col='정원', factor=0.5,
+        unit='명', label='정원', legend_title='시군구별 정원',
+    )
+
+
+@benchmark('render.plotly_bubble', max_scale=100)
+def bench_plotly(fx, scale):
+    _require('plotly')
+    from carestats.maps import plotly_bubble_map
+    summary = _sigungu_totals(fx, scale, 'recipients', '수급가구수')
+    coords = _coords(summary['통계시군구명'])
+    out = os.path.join(tempfile.mkdtemp(prefix='carestats-bench-'), 'map.html')
+    return lambda: plotly_bubble_map(
+        summary, coords, out, name_col='통계시군구명', value_col='수급가구수',
+        title='시군구별 수급가구수', unit='가구',
+    )
+
+
+@benchmark('render.matplotlib_pie', max_scale=100)
+def bench_matplotlib(fx, scale):
+    ns = _script('woohyun/가족유형.py')
+    import matplotlib
+    matplotlib.use('Agg')
+    pivot = ns['calculate_city_family_sums'](fx.raw('recipients'))
+    counts = pivot.sum()
+    out_dir = tempfile.mkdtemp(prefix='carestats-bench-')
+    # 규모 = 그리는 차트 수 (refresh의 시도별 차트와 같은 방식)
+    return lambda: [ns['plot_family_pie'](f"도시{k}", counts, os.path.join(out_dir, f"{k}.png"))
+                    for k in range(scale)]
+
+
+# --- 측정 ---
+def measure(fn, repeat=5, min_time=0.2):
+    """timeit.autorange처럼 한 번 측정이 min_time 이상이 되도록 반복 횟수를 정한 뒤 repeat번 측정"""
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time or number >= 1000:
+            break
+        number *= 10
+    times = [elapsed / number]
+    for _ in range(repeat - 1):
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        times.append((time.perf_counter() - start) / number)
+    return {
+        'median': statistics.median(times),
+        'min': min(times),
+        'number': number,
+        'repeat': len(times),
+    }
+
+
+def run(names, scales, repeat=5, data_dir=DEFAULT_DATA_DIR, verbose=True):
+    """벤치마크 실행 → {'이름@규모': 측정 결과 또는 {'skipped': 사유}}"""
+    fx = Fixture(data_dir)
+    results = {}
+    for name in names:
+        setup, max_scale = BENCHMARKS[name]
+        for scale in scales:
+            if max_scale and scale > max_scale:
+                continue
+            key = f"{name}@{scale}"
+            try:
+                fn = setup(fx, scale)
+                result = measure(fn, repeat)
+            except Skip as e:
+                results[key] = {'skipped': str(e)}
+                if verbose:
+                    print(f"⏭️ {key}: {e}")
+                break
+            results[key] = result
+            if verbose:
+                print(f"✅ {key:<36} {format_seconds(result['median'])}"
+                      f"  (min {format_seconds(result['min'])}, {result['number']}회×{result['repeat']})")
+    return results
+
+
+def format_seconds(s):
+    if s >= 1:
+        return f"{s:8.2f}s "
+    if s >= 1e-3:
+        return f"{s * 1e3:8.2f}ms"
+    return f"{s * 1e6:8.1f}µs"
+
+
+# --- 결과 저장 ---
+def _git(*args):
+    try:
+        out = subprocess.run(['git', *args], cwd=config.ROOT_DIR, capture_output=True, text=True, check=True)
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return out.stdout.strip()
+
+
+def commit_info():
+    commit = _git('rev-parse', 'HEAD') or 'unknown'
+    dirty = bool(_git('status', '--porcelain', '--untracked-files=no'))
+    return commit, dirty
+
+
+def machine_name():
+    return f"{platform.node() or 'local'}-py{sys.version_info.major}{sys.version_info.minor}"
+
+
+def results_dir(base=None):
+    return os.path.join(base or os.path.join(config.STATE_DIR, 'bench'), machine_name())
+
+
+def result_path(directory, commit, dirty=False):
+    return os.path.join(directory, f"{commit[:12]}{'-dirty' if dirty else ''}.json")
+
+
+def save_results(results, directory):
+    import numpy as np
+
+    commit, dirty = commit_info()
+    path = result_path(directory, commit, dirty)
+    os.makedirs(directory, exist_ok=True)
+    # 같은 커밋에서 일부만 다시 잰 경우 나머지 결과는 유지
+    merged = {}
+    if os.path.exists(path):
+        with open(path, encoding='utf-8') as f:
+            merged = json.load(f).get('results', {})
+    merged.update(results)
+    payload = {
+        'commit': commit,
+        'dirty': dirty,
+        'date': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'machine': machine_name(),
+        'versions': {'python': platform.python_version(), 'pandas': pd.__version__, 'numpy': np.__version__},
+        'results': merged,
+    }
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(payload, f, ensure_ascii=False, indent=2)
+    return path
+
+
+def load_results(directory, ref):
+    """커밋 참조(HEAD~1, 브랜치, 해시) → 저장된 결과 (없으면 None)"""
+    commit = _git('rev-parse', ref) or ref
+    for dirty in (False, True):
+        path = result_path(directory, commit, dirty)
+        if os.path.exists(path):
+            with open(path, encoding='utf-8') as f:
+                return json.load(f)
+    return None
+
+
+def compare(base, current, threshold=SLOWER):
+    """같은 벤치마크@규모의 중앙값 비율 출력, 느려진 항목 수 반환"""
+    print(f"\n=== 비교: {base['commit'][:12]} → 현재 ===")
+    slower = 0
+    for key, cur in current.items():
+        old = base['results'].get(key)
+        if 'median' not in cur or not old or 'median' not in old:
+            continue
+        ratio = cur['median'] / old['median'] if old['median'] else float('inf')
+        mark = '⚠️' if ratio >= threshold else ('🚀' if ratio <= 1 / threshold else '  ')
+        slower += ratio >= threshold
+        print(f"{mark} {key:<36} {format_seconds(old['median'])} → {format_seconds(cur['median'])}  ×{ratio:.2f}")
+    return slower
+
+
+def history(directory, names, limit=30):
+    """git log 순서로 저장된 커밋별 중앙값 출력 (어느 커밋에서 느려졌는지 확인용)"""
+    commits = (_git('log', f'-n{limit}', '--format=%H %s') or '').splitlines()
+    rows = []
+    for line in commits:
+        commit, _, subject = line.partition(' ')
+        data = load_results(directory, commit)
+        if data:
+            rows.append((commit, subject, data['results']))
+    if not rows:
+        print(f"⚠️ 저장된 결과가 없습니다: {directory}")
+        return
+    keys = [k for k in dict.fromkeys(k for _, _, r in rows for k in r) if k.split('@')[0] in names]
+    for key in keys:
+        print(f"\n{key}")
+        for commit, subject, results in rows:
+            if 'median' in results.get(key, {}):
+                print(f"  {commit[:10]} {format_seconds(results[key]['median'])}  {subject[:60]}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='carestats bench', description="로더/집계/렌더러 벤치마크")
+    parser.add_argument('--filter', default='', help="이름에 이 문자열이 들어간 벤치마크만 (쉼표로 여러 개)")
+    parser.add_argument('--scales', default=','.join(map(str, DEFAULT_SCALES)), help="데이터 규모 (예: 1,10,100)")
+    parser.add_argument('--repeat', type=int, default=5, help="측정 반복 횟수")
+    parser.add_argument('--data-dir', default=DEFAULT_DATA_DIR, help="fixture 디렉터리")
+    parser.add_argument('--results-dir', default=None, help="결과 저장 위치 (기본: STATE_DIR/bench)")
+    parser.add_argument('--compare', metavar='REF', help="저장된 커밋 결과와 비교")
+    parser.add_argument('--history', action='store_true', help="커밋별 저장 결과만 출력 (실행하지 않음)")
+    parser.add_argument('--no-save', action='store_true', help="결과를 저장하지 않음")
+    parser.add_argument('--list', action='store_true', help="벤치마크 목록 출력")
+    args = parser.parse_args(argv)
+
+    patterns = [p for p in args.filter.split(',') if p]
+    names = [n for n in BENCHMARKS if not patterns or any(p in n for p in patterns)]
+    directory = results_dir(args.results_dir)
+    if args.list:
+        for name in BENCHMARKS:
+            max_scale = BENCHMARKS[name][1]
+            print(f"  {name}" + (f" (최대 {max_scale}×)" if max_scale else ""))
+        return 0
+    if args.history:
+        history(directory, names)
+        return 0
+    if not names:
+        parser.error(f"'{args.filter}'에 해당하는 벤치마크가 없습니다.")
+
+    base = None
+    if args.compare:
+        base = load_results(directory, args.compare)
+        if base is None:
+            parser.error(f"{args.compare}의 저장된 결과가 없습니다: {directory}")
+
+    scales = [int(s) for s in args.scales.split(',') if s]
+    results = run(names, scales, args.repeat, args.data_dir)
+    if not args.no_save:
+        print(f"💾 {save_results(results, directory)}")
+    if base is not None and compare(base, results):
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,195 @@
+# -*- coding: utf-8 -*-
+"""공백 지표(gap_diff, gap_ratio) 부트스트랩 신뢰구간
+
+점 추정만으로는 순위가 얼마나 믿을 만한지 알 수 없고, gap_ratio는 supply_index + 1e-6으로
+나누기 때문에 공급이 0에 가까운 지역에서 값이 폭발한다. 여기서는 원자료를 다시 뽑아
+(재표본) 지표의 분포를 만들고 백분위 구간을 순위표 옆에 붙인다.
+
+- capacity: 시설 단위 재표본 (전체 시설 목록에서 복원 추출 → 지역별 정원 합)
+- support_count: 월 단위 재표본 (통계연월을 복원 추출 → 지역별 지급건수 합)
+- household_count / member_count: 재표본 단위가 없어 고정
+
+재표본 B개를 (B, 지역, 4) 배열로 쌓아 carestats.numeric.minmax_scale 한 번으로 정규화하고
+gap_diff/gap_ratio/순위를 배치로 계산한다. 재표본은 chunk_size개씩 나눠 묶음마다
+SeedSequence(seed).spawn()으로 난수를 정하므로 workers(프로세스 수)와 관계없이 결과가 같다.
+
+    python -m carestats bootstrap --data-dir fixtures/sample --level sigungu --samples 1000 --workers 4
+"""
+import argparse
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from carestats.gap import RAW_COLS, compute_gap_index, region_keys, region_totals
+from carestats.numeric import minmax_scale
+from carestats.regions import SIDO
+from carestats.trace import traced
+
+INTERVAL_COLS = ['gap_diff_lo', 'gap_diff_hi', 'gap_ratio_lo', 'gap_ratio_hi', 'rank_lo', 'rank_hi', 'zero_supply']
+
+
+def _replicate_chunk(base, facilities, monthly, n, seed_seq):
+    """재표본 n개 → (gap_diff (n, R), gap_ratio (n, R), supply_index (n, R))"""
+    rng = np.random.default_rng(seed_seq)
+    n_regions = base.shape[0]
+    raw = np.broadcast_to(base, (n,) + base.shape).copy()
+    if facilities is not None:
+        codes, values = facilities
+        pick = rng.integers(0, len(codes), (n, len(codes)))
+        flat = (np.arange(n)[:, None] * n_regions + codes[pick]).ravel()
+        raw[:, :, 0] = np.bincount(flat, weights=values[pick].ravel(),
+                                   minlength=n * n_regions).reshape(n, n_regions)
+    if monthly is not None:
+        pick = rng.integers(0, monthly.shape[0], (n, monthly.shape[0]))
+        raw[:, :, 1] = monthly[pick].sum(axis=1)
+    norm = minmax_scale(raw)
+    supply = norm[..., :2].mean(axis=-1)
+    demand = norm[..., 2:].mean(axis=-1)
+    return demand - supply, demand / (supply + 1e-6), supply
+
+
+def bootstrap_gap(base, facilities=None, monthly=None, n_boot=1000, seed=0, workers=1, chunk_size=250):
+    """재표본 공백 지표 배열
+
+    base: (R, 4) RAW_COLS 합계 (점 추정과 같은 값)
+    facilities: (지역 코드 (F,), 정원 (F,)) — 주면 capacity를 시설 재표본으로
+    monthly: (M, R) 월별 지급건수 — 주면 support_count를 월 재표본으로
+    → (gap_diff (B, R), gap_ratio (B, R), supply_index (B, R))
+    """
+    base = np.asarray(base, dtype=float)
+    if facilities is not None:
+        facilities = (np.asarray(facilities[0], dtype=np.intp), np.asarray(facilities[1], dtype=float))
+    if monthly is not None:
+        monthly = np.asarray(monthly, dtype=float)
+    sizes = [min(chunk_size, n_boot - i) for i in range(0, n_boot, chunk_size)]
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    args = [(base, facilities, monthly, n, s) for n, s in zip(sizes, seeds)]
+    if workers > 1 and len(args) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            parts = list(pool.map(_replicate_chunk, *zip(*args)))
+    else:
+        parts = [_replicate_chunk(*a) for a in args]
+    return tuple(np.concatenate([p[i] for p in parts]) for i in range(3))
+
+
+def interval_table(gap_diff, gap_ratio, supply, alpha=0.05):
+    """재표본 배열 → 지역별 백분위 구간 DataFrame (INTERVAL_COLS, rank는 gap_diff 기준 1위부터)"""
+    q = [100 * alpha / 2, 100 * (1 - alpha / 2)]
+    ranks = np.empty(gap_diff.shape, dtype=np.int32)
+    np.put_along_axis(ranks, np.argsort(-gap_diff, axis=1, kind='stable'),
+                      np.arange(gap_diff.shape[1], dtype=np.int32)[None, :], axis=1)
+    diff_lo, diff_hi = np.percentile(gap_diff, q, axis=0)
+    ratio_lo, ratio_hi = np.percentile(gap_ratio, q, axis=0)
+    rank_lo, rank_hi = np.percentile(ranks + 1, q, axis=0, method='nearest')
+    return pd.DataFrame({
+        'gap_diff_lo': diff_lo, 'gap_diff_hi': diff_hi,
+        'gap_ratio_lo': ratio_lo, 'gap_ratio_hi': ratio_hi,
+        'rank_lo': rank_lo.astype(int), 'rank_hi': rank_hi.astype(int),
+        'zero_supply': (supply <= 1e-9).mean(axis=0),
+    })
+
+
+def resample_inputs(regions, facility_keys=None, capacity=None, payment_keys=None, months=None, counts=None):
+    """지역 목록에 맞춘 (facilities, monthly) 입력 만들기 (목록에 없는 지역의 행은 버림)
+
+    regions: 지역 키 Index (또는 MultiIndex), *_keys: 행별 지역 키 (같은 종류의 Index)
+    """
+    facilities = monthly = None
+    if facility_keys is not None:
+        codes = regions.get_indexer(facility_keys)
+        keep = codes >= 0
+        facilities = (codes[keep], np.asarray(capacity, dtype=float)[keep])
+    if payment_keys is not None:
+        codes = regions.get_indexer(payment_keys)
+        keep = codes >= 0
+        month_codes, month_names = pd.factorize(np.asarray(months)[keep])
+        monthly = np.zeros((len(month_names), len(regions)))
+        np.add.at(monthly, (month_codes, codes[keep]), np.asarray(counts, dtype=float)[keep])
+    return facilities, monthly
+
+
+@traced('bootstrap', 'cpu')
+def gap_intervals(frames, level='sido', sido=None, n_boot=1000, seed=0, workers=1, alpha=0.05):
+    """정규화 데이터셋 → gap_table 결과 + 부트스트랩 구간 (INTERVAL_COLS)
+
+    sido는 데이터셋의 공식 시도명 ('서울특별시'), 해당 지역이 없으면 ValueError.
+    """
+    totals = region_totals(frames, level, sido)
+    if totals.empty:
+        raise ValueError(f"지역이 없습니다: level={level}, sido={sido}")
+    df = compute_gap_index(totals)
+    keys = region_keys(level)
+    regions = pd.MultiIndex.from_frame(df[keys])
+
+    capacity = frames['capacity']
+    payments = frames['payments']
+    if sido is not None:
+        capacity = capacity[capacity['통계시도명'] == sido]
+        payments = payments[payments['통계시도명'] == sido]
+    facilities, monthly = resample_inputs(
+        regions,
+        pd.MultiIndex.from_frame(capacity[keys]), capacity['정원'],
+        pd.MultiIndex.from_frame(payments[keys]), payments['통계연월'], payments['지급건수'],
+    )
+    reps = bootstrap_gap(df[RAW_COLS].to_numpy(dtype=float), facilities, monthly, n_boot, seed, workers)
+    return pd.concat([df, interval_table(*reps, alpha=alpha)], axis=1)
+
+
+def format_ranking(df, keys, top=10, order='gap_diff'):
+    """순위표 문자열: 점 추정 [구간]"""
+    ranked = df.sort_values(order, ascending=False, kind='stable').head(top)
+    lines = []
+    for rank, (_, row) in enumerate(ranked.iterrows(), start=1):
+        name = ' '.join(str(row[k]) for k in keys)
+        lines.append(
+            f"  {rank:>3}. {name:<20} gap_diff {row['gap_diff']:+.3f} [{row['gap_diff_lo']:+.3f}, {row['gap_diff_hi']:+.3f}]"
+            f"  순위 [{row['rank_lo']}, {row['rank_hi']}]"
+            f"  gap_ratio {row['gap_ratio']:.2f} [{row['gap_ratio_lo']:.2f}, {row['gap_ratio_hi']:.2f}]"
+            + (f"  ⚠️ 공급 0 ({row['zero_supply']:.0%})" if row['zero_supply'] > 0 else '')
+        )
+    return '\n'.join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='carestats bootstrap',
+                                     description="공백 지표 부트스트랩 신뢰구간 (시설/월 재표본)")
+    parser.add_argument('--data-dir', help="로컬 스냅샷 디렉터리 (없으면 구글 스프레드시트에서 로드)")
+    parser.add_argument('--level', choices=('sido', 'sigungu'), default='sigungu')
+    parser.add_argument('--sido', help="이 시도의 시군구만 (--level sigungu)")
+    parser.add_argument('--samples', type=int, default=1000, help="재표본 수")
+    parser.add_argument('--alpha', type=float, default=0.05, help="구간 밖 확률 (0.05 → 95%% 구간)")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--workers', type=int, default=1, help="프로세스 수 (결과는 같음)")
+    parser.add_argument('--top', type=int, default=10)
+    parser.add_argument('--order', choices=('gap_diff', 'gap_ratio'), default='gap_diff')
+    parser.add_argument('--csv', help="전체 결과를 CSV로 저장")
+    args = parser.parse_args(argv)
+
+    sido = None
+    if args.sido and args.level == 'sigungu':
+        # '서울' → '서울특별시' (데이터셋의 공식 시도명, carestats.api.resolve_sido와 같은 해석)
+        if SIDO.code(args.sido) < 0:
+            raise SystemExit(f"❌ 알 수 없는 시도: {args.sido}")
+        sido = SIDO.name(SIDO.code(args.sido))
+
+    from carestats import datasets
+    frames = datasets.load_snapshot(args.data_dir) if args.data_dir else datasets.load_from_sheets()
+    start = time.perf_counter()
+    try:
+        df = gap_intervals(frames, args.level, sido, args.samples, args.seed, args.workers, args.alpha)
+    except ValueError as e:
+        raise SystemExit(f"❌ {e}")
+    elapsed = time.perf_counter() - start
+
+    print(f"=== 복지 공백 상위 {args.top}개 ({1 - args.alpha:.0%} 부트스트랩 구간, 재표본 {args.samples:,}개, "
+          f"지역 {len(df)}개, {elapsed:.2f}s) ===")
+    print(format_ranking(df, region_keys(args.level), args.top, args.order))
+    if args.csv:
+        df.to_csv(args.csv, index=False, encoding='utf-8-sig')
+        print(f"💾 저장: {args.csv}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+"""API 결과 캐시: 정규화된 쿼리 + 데이터셋 버전 → 직렬화된 응답 본문 (메모리 상한 LRU)"""
+import hashlib
+from collections import OrderedDict
+
+
+def normalize_query(path, query, multi_value_keys=()):
+    """파라미터 순서, 콤마 목록 순서/중복 차이를 없앤 캐시 키용 튜플"""
+    items = []
+    for key in sorted(set(query.keys())):
+        values = query.getall(key) if hasattr(query, 'getall') else [query[key]]
+        if key in multi_value_keys:
+            parts = {p.strip() for v in values for p in v.split(',') if p.strip()}
+            items.append((key, ','.join(sorted(parts))))
+        else:
+            items.append((key, values[-1]))
+    return (path, tuple(items))
+
+
+def make_etag(body):
+    return '"' + hashlib.sha1(body).hexdigest()[:20] + '"'
+
+
+def etag_matches(if_none_match, etag):
+    """If-None-Match 헤더 (여러 값, 약한 비교 W/ 포함)와 ETag 비교"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == '*':
+        return True
+    tags = [t.strip() for t in if_none_match.split(',')]
+    return etag in tags or f"W/{etag}" in tags
+
+
+class ResultCache:
+    """LRU 캐시, 저장된 본문 바이트 합계가 max_bytes를 넘으면 오래된 항목부터 제거"""
+
+    def __init__(self, max_bytes=32 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        """key → (etag, body, content_type) 또는 None"""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry
+
+    def put(self, key, body, content_type='application/json'):
+        etag = make_etag(body)
+        if len(body) > self.max_bytes:
+            return etag
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self.size -= len(old[1])
+        self._entries[key] = (etag, body, content_type)
+        self.size += len(body)
+        while self.size > self.max_bytes:
+            _, (_, evicted, _) = self._entries.popitem(last=False)
+            self.size -= len(evicted)
+            self.evictions += 1
+        return etag
+
+    def clear(self):
+        self._entries.clear()
+        self.size = 0
+
+    def stats(self):
+        return {
+            'entries': len(self._entries),
+            'bytes': self.size,
+            'max_bytes': self.max_bytes,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+        }
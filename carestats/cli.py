@@ -0,0 +1,276 @@
+# -*- coding: utf-8 -*-
+"""carestats 통합 CLI
+
+    python -m carestats analyze [--seoul]
+    python -m carestats map capacity|payments|members [--seoul [--choropleth]]
+    python -m carestats charts [family-type|income ...]
+    python -m carestats fix-data
+    python -m carestats refresh [--only STAGE ... --site DIR]
+    python -m carestats serve --data-dir fixtures/sample
+    python -m carestats bench [--scales 1,10 --compare HEAD~1]
+    python -m carestats synth --out /tmp/synth [--sigungu 60 --skew 1.2]
+    python -m carestats sheets-emulator --data-dir /tmp/synth [--latency 0.2 --quota 60]
+    python -m carestats sensitivity --data-dir fixtures/sample [--samples 10000 --top 10]
+    python -m carestats bootstrap --data-dir fixtures/sample [--samples 1000 --workers 4]
+    python -m carestats spatial-join --points welfare_facilities_points.csv [--boundaries PATH]
+    python -m carestats access --facilities welfare_facilities_points.csv [--radius 10 --k 3 --data-dir DIR]
+    python -m carestats dashboard --site /tmp/site [--data-dir DIR --facilities welfare_facilities_points.csv]
+    python -m carestats --import-time fix-data     # 모듈 import 시간 보고
+    python -m carestats --trace map capacity       # 단계별 시간 요약 (--trace-json PATH: Chrome trace)
+    python -m carestats --profile-memory fix-data  # 단계별 tracemalloc/RSS, DataFrame.copy() 위치
+
+이 모듈은 표준 라이브러리만 import한다. pandas/gspread/folium/seaborn 등은
+선택한 하위 명령이 실행하는 스크립트(또는 모듈)가 필요할 때 로드한다.
+"""
+import argparse
+import os
+import runpy
+import subprocess
+import sys
+import time
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 하위 명령 → 기존 스크립트 (전국, 서울)
+ANALYSES = ('woohyun/analysis.py', 'sangho/seoul_analysis.py')
+MAPS = {
+    'capacity': ('woohyun/복지시설.py', 'sangho/서울복지시설.py'),
+    'payments': ('woohyun/지급건수.py', 'sangho/서울지급건수.py'),
+    'members': ('woohyun/한부모가정명수.py', 'sangho/서울한부모가정명수.py'),
+}
+CHARTS = {
+    'family-type': 'woohyun/가족유형.py',
+    'income': 'woohyun/중위소득비율.py',
+}
+FIX_DATA = 'data_fix.py'
+
+
+def run_script(rel_path, args=()):
+    """스크립트를 python <script> [args] 와 같은 방식으로 실행 (상대 경로는 저장소 루트 기준)"""
+    path = os.path.join(ROOT_DIR, rel_path)
+    os.chdir(ROOT_DIR)
+    sys.argv = [path, *args]
+    runpy.run_path(path, run_name='__main__')
+
+
+def _selected(names, table, kind):
+    unknown = [n for n in names if n not in table]
+    if unknown:
+        raise SystemExit(f"❌ 알 수 없는 {kind}: {', '.join(unknown)} (가능: {', '.join(table)})")
+    return names or list(table)
+
+
+def cmd_analyze(args):
+    run_script(ANALYSES[args.seoul])
+
+
+def cmd_map(args):
+    if args.choropleth and not args.seoul:
+        # 전국 스크립트에는 단계구분도가 없음 (전국 시군구 격차 단계구분도는 refresh 단계로만 생성)
+        raise SystemExit("❌ --choropleth는 서울 구 지도에만 있습니다: --seoul --choropleth로 실행하세요 "
+                         "(전국 시군구: refresh --only map:woohyun/gap_choropleth_sigungu.html)")
+    for name in _selected(args.names, MAPS, '지도'):
+        print(f"🗺️ {name}")
+        run_script(MAPS[name][args.seoul], ['--choropleth'] if args.choropleth else [])
+
+
+def cmd_charts(args):
+    for name in _selected(args.names, CHARTS, '차트'):
+        print(f"📊 {name}")
+        run_script(CHARTS[name])
+
+
+def cmd_fix_data(args):
+    run_script(FIX_DATA)
+
+
+def cmd_refresh(args):
+    from carestats import refresh
+    return refresh.main(args.extra)
+
+
+def cmd_serve(args):
+    from carestats import api
+    api.main(args.extra)
+
+
+def cmd_bench(args):
+    from carestats import bench
+    return bench.main(args.extra)
+
+
+def cmd_synth(args):
+    from carestats import synthetic
+    return synthetic.main(args.extra)
+
+
+def cmd_sensitivity(args):
+    from carestats import sensitivity
+    return sensitivity.main(args.extra)
+
+
+def cmd_bootstrap(args):
+    from carestats import bootstrap
+    return bootstrap.main(args.extra)
+
+
+def cmd_spatial_join(args):
+    from carestats import spatial
+    return spatial.main(args.extra)
+
+
+def cmd_access(args):
+    from carestats import access
+    return access.main(args.extra)
+
+
+def cmd_dashboard(args):
+    from carestats import dashboard
+    return dashboard.main(args.extra)
+
+
+def cmd_sheets_emulator(args):
+    from carestats import sheets_emulator
+    return sheets_emulator.main(args.extra)
+
+
+# --- import 시간 보고 ---
+def parse_importtime(lines):
+    """-X importtime 출력 → [(모듈명, 깊이, self µs, cumulative µs)]"""
+    rows = []
+    for line in lines:
+        if not line.startswith('import time:') or 'imported package' in line:
+            continue
+        try:
+            head, cum, name = line[len('import time:'):].split('|')
+            self_us, cum_us = int(head), int(cum)
+        except ValueError:
+            continue
+        depth = (len(name) - len(name.lstrip(' '))) // 2
+        rows.append((name.strip(), depth, self_us, cum_us))
+    return rows
+
+
+def import_report(rows, top=15):
+    """최상위 import를 패키지별로 묶어 누적 시간 순으로 출력"""
+    by_package = {}
+    for name, depth, _, cum_us in rows:
+        if depth == 0:
+            pkg = name.split('.')[0]
+            by_package[pkg] = by_package.get(pkg, 0) + cum_us
+    total = sum(by_package.values())
+    print(f"\n=== import 시간: 총 {total / 1e3:.1f}ms, 모듈 {len(rows)}개 ===")
+    for pkg, us in sorted(by_package.items(), key=lambda kv: -kv[1])[:top]:
+        print(f"  {pkg:<28} {us / 1e3:8.1f}ms  {us / total:6.1%}" if total else f"  {pkg}")
+
+
+def run_with_import_time(argv):
+    """같은 명령을 python -X importtime 하위 프로세스로 다시 실행하고 보고서 출력"""
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join(filter(None, [ROOT_DIR, env.get('PYTHONPATH')]))
+    start = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-m', 'carestats'] + argv,
+        stderr=subprocess.PIPE, text=True, env=env,
+    )
+    elapsed = time.perf_counter() - start
+    lines = proc.stderr.splitlines()
+    for line in lines:
+        if not line.startswith('import time:'):
+            print(line, file=sys.stderr)
+    import_report(parse_importtime(lines))
+    print(f"  (전체 실행 {elapsed * 1e3:.0f}ms)")
+    return proc.returncode
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog='carestats', description="한부모가족 복지 통계 도구")
+    parser.add_argument('--import-time', action='store_true',
+                        help="명령 실행 후 모듈 import 시간 보고 (python -X importtime)")
+    parser.add_argument('--trace', action='store_true',
+                        help="인증/다운로드/파싱/지오코딩/렌더링 단계별 시간 요약 출력")
+    parser.add_argument('--trace-json', metavar='PATH',
+                        help="--trace + Chrome trace-event JSON 저장 (chrome://tracing, Perfetto)")
+    parser.add_argument('--profile-memory', action='store_true',
+                        help="단계별 메모리 사용량(tracemalloc, RSS)과 할당 위치, 불필요한 DataFrame.copy() 보고")
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    p = sub.add_parser('analyze', help="복지 공백 분석 (정규화, 상관관계, PCA)")
+    p.add_argument('--seoul', action='store_true', help="서울 구 단위 분석")
+    p.set_defaults(func=cmd_analyze)
+
+    p = sub.add_parser('map', help="버블맵 HTML 생성")
+    p.add_argument('names', nargs='*', metavar='NAME',
+                   help=f"{', '.join(MAPS)} (생략하면 전부)")
+    p.add_argument('--seoul', action='store_true', help="서울 구 단위 지도")
+    p.add_argument('--choropleth', action='store_true',
+                   help="서울 구 경계를 칠한 단계구분도 (--seoul과 함께, 지오코딩 없음, 경계 파일 필요)")
+    p.set_defaults(func=cmd_map)
+
+    p = sub.add_parser('charts', help="시도별 가족유형/중위소득 차트 PNG 생성")
+    p.add_argument('names', nargs='*', metavar='NAME',
+                   help=f"{', '.join(CHARTS)} (생략하면 전부)")
+    p.set_defaults(func=cmd_charts)
+
+    p = sub.add_parser('fix-data', help="월별 블록 CSV → output.csv")
+    p.set_defaults(func=cmd_fix_data)
+
+    # 나머지 인자를 그대로 넘기는 명령 (-h도 넘김)
+    p = sub.add_parser('refresh', add_help=False,
+                       help="지도/차트 전체 갱신 (DAG, 단계 캐시, 병렬; 인자는 carestats.refresh로 전달)")
+    p.set_defaults(func=cmd_refresh, passthrough=True)
+
+    p = sub.add_parser('serve', add_help=False, help="통계 API 서버 (인자는 carestats.api로 전달)")
+    p.set_defaults(func=cmd_serve, passthrough=True)
+
+    p = sub.add_parser('bench', add_help=False, help="벤치마크 (결과는 커밋별 저장; 인자는 carestats.bench로 전달)")
+    p.set_defaults(func=cmd_bench, passthrough=True)
+
+    p = sub.add_parser('synth', add_help=False, help="규모 테스트용 가짜 데이터 생성 (인자는 carestats.synthetic으로 전달)")
+    p.set_defaults(func=cmd_synth, passthrough=True)
+
+    p = sub.add_parser('sensitivity', add_help=False,
+                       help="공백 지수 가중치 민감도 (인자는 carestats.sensitivity로 전달)")
+    p.set_defaults(func=cmd_sensitivity, passthrough=True)
+
+    p = sub.add_parser('bootstrap', add_help=False,
+                       help="공백 지표 부트스트랩 신뢰구간 (인자는 carestats.bootstrap으로 전달)")
+    p.set_defaults(func=cmd_bootstrap, passthrough=True)
+
+    p = sub.add_parser('spatial-join', add_help=False,
+                       help="시설 좌표 → 시군구 경계 공간 결합 (인자는 carestats.spatial로 전달)")
+    p.set_defaults(func=cmd_spatial_join, passthrough=True)
+
+    p = sub.add_parser('access', add_help=False,
+                       help="시설 접근성: 가까운 시설 k개, 반경 안 정원 (인자는 carestats.access로 전달)")
+    p.set_defaults(func=cmd_access, passthrough=True)
+
+    p = sub.add_parser('dashboard', add_help=False,
+                       help="지표 레이어 + 시도→시군구 대시보드 (인자는 carestats.dashboard로 전달)")
+    p.set_defaults(func=cmd_dashboard, passthrough=True)
+
+    p = sub.add_parser('sheets-emulator', add_help=False,
+                       help="로컬 Sheets/Drive 대역 서버 (인자는 carestats.sheets_emulator로 전달)")
+    p.set_defaults(func=cmd_sheets_emulator, passthrough=True)
+    return parser
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    parser = build_parser()
+    args, extra = parser.parse_known_args(argv)
+    if extra and not getattr(args, 'passthrough', False):
+        parser.error(f"알 수 없는 인자: {' '.join(extra)}")
+    args.extra = extra
+    if args.trace or args.trace_json:
+        # 하위 프로세스(--import-time 등)도 같은 설정으로 측정
+        os.environ['CARESTATS_TRACE'] = os.path.abspath(args.trace_json) if args.trace_json else '1'
+        from carestats import trace
+        trace.enable(os.environ['CARESTATS_TRACE'] if args.trace_json else None)
+    if args.profile_memory:
+        os.environ['CARESTATS_PROFILE_MEMORY'] = '1'
+        from carestats import memory
+        memory.enable()
+    if args.import_time:
+        return run_with_import_time([a for a in argv if a != '--import-time'])
+    return args.func(args)
@@ -0,0 +1,44 @@
+# -*- coding: utf-8 -*-
+"""공통 설정: 스프레드시트 ID, 서비스 계정 키 경로, 워크시트 번호"""
+import os
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 구글 스프레드시트 정보 (환경변수로 덮어쓰기 가능)
+SPREADSHEET_ID = os.getenv(
+    "CARESTATS_SPREADSHEET_ID", "1_m5GzATyDfHQ6GH_AIDt96dG-fUkLt-I4a93XlSkA58"
+)
+KEY_PATH = os.getenv(
+    "GOOGLE_SERVICE_ACCOUNT_KEY",
+    os.path.join(ROOT_DIR, "key", "datascience-457408-eb15d8611be3.json"),
+)
+# 로컬 Sheets/Drive 대역 서버 (python -m carestats sheets-emulator)
+# host:port를 주면 모든 Sheets/Drive 요청을 그쪽으로 보내고 서비스 계정 인증은 건너뜀
+SHEETS_EMULATOR_HOST = os.getenv("CARESTATS_SHEETS_EMULATOR_HOST", "")
+_EMULATOR_URL = f"http://{SHEETS_EMULATOR_HOST}" if SHEETS_EMULATOR_HOST else ""
+SHEETS_API_URL = os.getenv(
+    "CARESTATS_SHEETS_API_URL", f"{_EMULATOR_URL or 'https://sheets.googleapis.com'}/v4"
+)
+DRIVE_API_URL = os.getenv(
+    "CARESTATS_DRIVE_API_URL", f"{_EMULATOR_URL or 'https://www.googleapis.com'}/drive/v3"
+)
+# 시군구 경계 파일 (GeoJSON, 경위도) → carestats.spatial 공간 결합
+BOUNDARY_PATH = os.getenv(
+    "CARESTATS_BOUNDARY_PATH", os.path.join(ROOT_DIR, "data", "boundaries", "sigungu.geojson")
+)
+# 실행 기록 (변경 감지용 지문) 저장 위치
+STATE_DIR = os.getenv("CARESTATS_STATE_DIR", os.path.join(ROOT_DIR, ".carestats"))
+# 지도 사이트 번들에 넣을 Leaflet 파일 위치 (없으면 처음 한 번 CDN에서 받아 둠), 배경 타일 (빈 값이면 타일 없이)
+ASSET_DIR = os.getenv("CARESTATS_ASSET_DIR", os.path.join(STATE_DIR, "assets"))
+TILE_URL = os.getenv("CARESTATS_TILE_URL", "https://{s}.tile.openstreetmap.org/{z}/{x}/{y}.png")
+SCOPES = [
+    "https://www.googleapis.com/auth/spreadsheets.readonly",
+    "https://www.googleapis.com/auth/drive.readonly",
+]
+
+# 워크시트 번호
+SHEET_FACILITIES = 1   # 복지시설 (시도, 구, 정원, 소재지)
+SHEET_PAYMENTS = 2     # 지원구분별 지급건수
+SHEET_RECIPIENTS = 3   # 가족유형/중위소득비율별 수급자수
+SHEET_HOUSEHOLDS = 4   # 시도별 한부모 가구 수 (A3:B23)
+SHEET_MEMBERS = 7      # 시도별 수급자수 (A3:D)
@@ -0,0 +1,160 @@
+# -*- coding: utf-8 -*-
+"""대시보드: 한 페이지에서 지표 레이어를 켜고 끄며 시도 → 시군구로 내려가 보기
+
+지도 HTML 아홉 개를 따로 여는 대신 페이지 하나(carestats.site 번들 공유)만 열고,
+레이어 데이터는 켤 때 처음 한 번만 받는다. 첫 화면은 배경 지도와 레이어 목록뿐이다.
+
+    data/dashboard-geo.<해시>.js          전국 시군구 경계 (전국 줌 하나, 시도별로 같은 색이라 시도 지도로 보임)
+    data/dashboard-geo-<시도 번호>.<해시>.js  그 시도 시군구 경계 (시도 범위 줌 + 확대 줌)
+    data/dashboard-<지표>.<해시>.js        시도 합계/시군구 값과 색 구간 (값뿐이라 작음)
+    data/dashboard-facilities.<해시>.js    시설 위치 (있을 때만)
+
+지표는 carestats.gap.region_totals의 시군구 합계(정원, 지급건수, 수급자수, 수급가구수)다.
+색 구간은 전국 보기에서는 시도 합계의 분위수, 시도 보기에서는 그 시도 시군구 값의 분위수.
+
+    python -m carestats dashboard --data-dir fixtures/sample --site /tmp/site [--facilities points.csv]
+"""
+import argparse
+import json
+import os
+
+import pandas as pd
+
+from carestats import config, shapes
+from carestats.gap import region_totals
+from carestats.maps import DETAIL_ZOOMS, PALETTE, marker_layer, quantile_bins
+from carestats.regions import normalize_sido
+from carestats.site import view_options, write_data, write_page
+from carestats.trace import traced
+
+METRICS = [
+    # (키, 제목, 단위, region_totals 열)
+    ('capacity', '복지시설 정원', '명', 'capacity'),
+    ('payments', '지급건수', '건', 'support_count'),
+    ('recipients', '수급자수', '명', 'member_count'),
+    ('households', '수급가구수', '가구', 'household_count'),
+]
+PAGE = 'dashboard.html'
+
+
+def geometry(boundaries):
+    """경계 파일 → (전국 경계 dict, [시도별 경계 dict])"""
+    coarse = shapes.simplified(boundaries, shapes.ZOOM_LEVELS[0])
+    regions = coarse['regions']
+    sidos = list(dict.fromkeys(r[1] for r in regions))
+    sido_of = [sidos.index(r[1]) for r in regions]
+
+    def bounds(members):
+        boxes = [coarse['boxes'][i] for i in members]
+        return [min(b[0] for b in boxes), min(b[1] for b in boxes), max(b[2] for b in boxes), max(b[3] for b in boxes)]
+
+    members = [[i for i, s in enumerate(sido_of) if s == k] for k in range(len(sidos))]
+    everything = bounds(range(len(regions)))
+    nation_zoom = shapes.zoom_for_bounds(everything)
+    nation = {
+        'sidos': sidos,
+        'regions': [[r[2], s] for r, s in zip(regions, sido_of)],
+        'rings': shapes.simplified(boundaries, nation_zoom)['rings'],
+        'bounds': everything,
+        'boxes': [bounds(m) for m in members],
+    }
+    per_sido = []
+    for m in members:
+        zoom = shapes.zoom_for_bounds(bounds(m))
+        levels = []
+        for z in sorted({zoom, min(zoom + DETAIL_ZOOMS, shapes.ZOOM_LEVELS[-1])}):
+            rings = shapes.simplified(boundaries, z)['rings']
+            levels.append({'from': z if levels else 0, 'rings': [rings[i] for i in m]})
+        per_sido.append({'regions': m, 'levels': levels})
+    return nation, per_sido
+
+
+def metric_layer(totals, nation, column, key, title, unit):
+    """시군구 합계(region_totals) → 대시보드 지표 데이터 (경계에 없는 시군구는 버림)"""
+    lookup = {(nation['sidos'][s], name): i for i, (name, s) in enumerate(nation['regions'])}
+    values = [None] * len(nation['regions'])
+    for sido, name, value in zip(totals['통계시도명'].map(normalize_sido), totals['통계시군구명'], totals[column]):
+        i = lookup.get((sido, str(name).strip()))
+        if i is not None:
+            values[i] = (values[i] or 0) + (value.item() if hasattr(value, 'item') else value)
+
+    n_sidos = len(nation['sidos'])
+    sido_values = [None] * n_sidos
+    for v, (_, s) in zip(values, nation['regions']):
+        if v is not None:
+            sido_values[s] = (sido_values[s] or 0) + v
+    present = [s for s in range(n_sidos) if sido_values[s] is not None]
+    sido_edges, sido_cls = quantile_bins([sido_values[s] for s in present], len(PALETTE))
+    sido_classes = [-1] * n_sidos
+    for s, c in zip(present, sido_cls.tolist()):
+        sido_classes[s] = c
+
+    classes = [-1] * len(values)
+    edges = [[] for _ in range(n_sidos)]
+    for s in range(n_sidos):
+        members = [i for i, (_, k) in enumerate(nation['regions']) if k == s and values[i] is not None]
+        edges[s], cls = quantile_bins([values[i] for i in members], len(PALETTE))
+        for i, c in zip(members, cls.tolist()):
+            classes[i] = c
+    return {
+        'key': key, 'title': title, 'unit': unit,
+        'sido': {'values': sido_values, 'classes': sido_classes, 'edges': sido_edges},
+        'sigungu': {'values': values, 'classes': classes, 'edges': edges},
+    }
+
+
+def facility_layer(points):
+    """시설 좌표표 (시설명, 정원, lat, lon) → marker 레이어"""
+    points = points.dropna(subset=['lat', 'lon'])
+    labels = [f"{name} (정원 {int(cap)}명)" if pd.notna(cap) else str(name)
+              for name, cap in zip(points['시설명'], points['정원'])]
+    return marker_layer(zip(points['lat'], points['lon'], labels))
+
+
+@traced('dashboard', 'render')
+def build_dashboard(site_dir, frames, boundaries=None, facilities=None, title='한부모가족 복지 대시보드'):
+    """정규화 데이터셋 (+ 시설 좌표표) → site_dir/dashboard.html과 레이어 데이터 파일 → 페이지 경로"""
+    boundaries = boundaries or config.BOUNDARY_PATH
+    nation, per_sido = geometry(boundaries)
+    totals = region_totals(frames, 'sigungu')
+    manifest = {
+        'title': title,
+        'palette': PALETTE,
+        'geo': write_data(site_dir, 'dashboard-geo', nation),
+        'sidoGeo': [write_data(site_dir, f"dashboard-geo-{k}", g) for k, g in enumerate(per_sido)],
+        'metrics': [{'key': key, 'title': name, 'unit': unit,
+                     'src': write_data(site_dir, f"dashboard-{key}",
+                                       metric_layer(totals, nation, column, key, name, unit))}
+                    for key, name, unit, column in METRICS],
+        'facilities': write_data(site_dir, 'dashboard-facilities', facility_layer(facilities))
+        if facilities is not None else None,
+    }
+    script = (f"carestats.dashboard({json.dumps(manifest, ensure_ascii=False)}, 'map', "
+              f"{json.dumps(view_options(), ensure_ascii=False)});").replace('</', '<\\/')
+    return write_page(site_dir, PAGE, title, lambda href: script)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='carestats dashboard',
+                                     description="지표 레이어 + 시도→시군구 드릴다운 대시보드 (사이트 디렉터리에 저장)")
+    parser.add_argument('--data-dir', help="로컬 스냅샷 디렉터리 (없으면 구글 스프레드시트에서 로드)")
+    parser.add_argument('--site', required=True, help="사이트 디렉터리 (carestats.site 번들과 공유)")
+    parser.add_argument('--boundaries', default=config.BOUNDARY_PATH, help="시군구 경계 GeoJSON")
+    parser.add_argument('--facilities', help="시설 좌표 CSV (시설명, 정원, lat, lon) → 시설 레이어")
+    args = parser.parse_args(argv)
+
+    if not os.path.exists(args.boundaries):
+        raise SystemExit(f"❌ 경계 파일이 없습니다: {args.boundaries}")
+    from carestats import datasets
+    frames = datasets.load_snapshot(args.data_dir) if args.data_dir else datasets.load_from_sheets()
+    facilities = None
+    if args.facilities:
+        facilities = pd.read_csv(args.facilities, encoding='utf-8-sig')
+        facilities['정원'] = pd.to_numeric(facilities['정원'], errors='coerce')
+    page = build_dashboard(args.site, frames, args.boundaries, facilities)
+    print(f"✅ 대시보드 저장: {page}")
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,130 @@
+# -*- coding: utf-8 -*-
+"""정규화된 데이터셋 (지급건수, 시설 정원, 수급자, 한부모 가구) 로딩/저장
+
+모든 데이터셋은 지역 컬럼을 '통계시도명'(공식 시도명) / '통계시군구명'으로 통일하고,
+'시도코드'(행정구역코드 앞 두 자리, int, 모르는 시도는 -1)를 함께 둔다 (carestats.regions.SIDO).
+"""
+import os
+
+import pandas as pd
+
+from carestats import config
+from carestats.parsing import parse_numeric
+from carestats.regions import SIDO, normalize_sido
+
+DATASETS = ('payments', 'capacity', 'recipients', 'households')
+
+PAYMENT_COLS = ['통계연월', '통계시도명', '통계시군구명', '지원구분', '지급건수']
+RECIPIENT_DIMS = ['통계시도명', '통계시군구명', '가족유형', '중위소득비율구분']
+RECIPIENT_VALUES = ['수급자수', '수급가구수']
+
+
+def _to_int(s):
+    """'1,234' / '' / '#REF!' 섞인 컬럼 → int"""
+    return pd.Series(parse_numeric(s.to_numpy(dtype=object)), index=s.index)
+
+
+def _strip(s):
+    return s.fillna('').astype(str).str.strip()
+
+
+def _with_codes(df):
+    """통계시도명 바로 뒤에 시도코드 열 추가"""
+    df = df.drop(columns='시도코드', errors='ignore')
+    df.insert(df.columns.get_loc('통계시도명') + 1, '시도코드', SIDO.codes(df['통계시도명']))
+    return df
+
+
+def normalize_payments(df):
+    """워크시트 2 / output.csv → 월별 지급건수 ('통합' 행 제외)"""
+    df = df[PAYMENT_COLS].copy()
+    for col in PAYMENT_COLS[:-1]:
+        df[col] = _strip(df[col])
+    # 202501.0 처럼 실수로 저장된 연월 정리
+    df['통계연월'] = df['통계연월'].str.replace(r'\.0$', '', regex=True)
+    df = df[
+        (df['통계시도명'] != '')
+        & ~df['통계시도명'].str.contains('#REF!', regex=False)
+        & (df['통계연월'] != '')
+        & (df['통계연월'] != '통합')
+    ]
+    df['통계시도명'] = df['통계시도명'].map(normalize_sido)
+    df['지급건수'] = _to_int(df['지급건수'])
+    return _with_codes(df.reset_index(drop=True))
+
+
+def normalize_capacity(df):
+    """워크시트 1 (시설 단위) → 통계시도명/통계시군구명/정원"""
+    keep = [c for c in ['시설명', '소재지'] if c in df.columns]
+    out = pd.DataFrame({
+        '통계시도명': _strip(df['시도']).map(normalize_sido),
+        '통계시군구명': _strip(df['구']) if '구' in df.columns else '',
+        '정원': _to_int(df['정원']),
+    })
+    for col in keep:
+        out[col] = _strip(df[col])
+    return _with_codes(out[out['통계시도명'] != ''].reset_index(drop=True))
+
+
+def normalize_recipients(df):
+    """워크시트 3 → 시군구 × 가족유형 × 중위소득비율구분별 수급자수/수급가구수"""
+    dims = [c for c in RECIPIENT_DIMS if c in df.columns]
+    values = [c for c in RECIPIENT_VALUES if c in df.columns]
+    out = df[dims + values].copy()
+    for col in dims:
+        out[col] = _strip(out[col])
+    for col in values:
+        out[col] = _to_int(out[col])
+    out = out[out['통계시도명'] != '']
+    out['통계시도명'] = out['통계시도명'].map(normalize_sido)
+    return _with_codes(out.reset_index(drop=True))
+
+
+def normalize_households(raw):
+    """워크시트 4의 A3:B23 값 → 통계시도명/가구수"""
+    rows = [r for r in raw[4:] if r and str(r[0]).strip()]
+    df = pd.DataFrame([r[:2] for r in rows], columns=['통계시도명', '가구수'])
+    df['통계시도명'] = _strip(df['통계시도명']).map(normalize_sido)
+    df['가구수'] = _to_int(df['가구수'])
+    return _with_codes(df)
+
+
+def load_from_sheets():
+    """구글 스프레드시트에서 네 데이터셋을 모두 읽어 정규화"""
+    from carestats import sheets
+
+    spreadsheet = sheets.open_spreadsheet()
+    return {
+        'payments': normalize_payments(
+            sheets.load_worksheet(config.SHEET_PAYMENTS, spreadsheet)),
+        'capacity': normalize_capacity(
+            sheets.load_worksheet(config.SHEET_FACILITIES, spreadsheet)),
+        'recipients': normalize_recipients(
+            sheets.load_worksheet(config.SHEET_RECIPIENTS, spreadsheet)),
+        'households': normalize_households(
+            sheets.load_range(config.SHEET_HOUSEHOLDS, 'A3:B23', spreadsheet)),
+    }
+
+
+def load_snapshot(data_dir):
+    """save_snapshot()으로 저장한 디렉터리({name}.csv) → {name: DataFrame}"""
+    frames = {}
+    for name in DATASETS:
+        path = os.path.join(data_dir, f"{name}.csv")
+        frames[name] = pd.read_csv(path, dtype=str, keep_default_na=False, encoding='utf-8-sig')
+    return {
+        'payments': normalize_payments(frames['payments']),
+        'capacity': normalize_capacity(
+            frames['capacity'].rename(columns={'통계시도명': '시도', '통계시군구명': '구'})),
+        'recipients': normalize_recipients(frames['recipients']),
+        'households': _with_codes(frames['households'].assign(
+            통계시도명=lambda d: d['통계시도명'].map(normalize_sido),
+            가구수=lambda d: _to_int(d['가구수']),
+        )),
+    }
+
+
+def save_snapshot(frames, data_dir):
+    os.makedirs(data_dir, exist_ok=True)
+    for name in DATASETS:
+        frames[name].to_csv(os.path.join(data_dir, f"{name}.csv"), index=False, encoding='utf-8-sig')
@@ -0,0 +1,191 @@
+# -*- coding: utf-8 -*-
+"""변경 감지: 원본이 그대로면 로딩/지오코딩/렌더링을 통째로 건너뜀
+
+작업(job)마다 마지막 성공 실행 때의 원본 지문을 STATE_DIR/runs.json에 남겨 두고,
+다음 실행 전에 지금 지문과 비교한다.
+- 스프레드시트: Drive 메타데이터(version, modifiedTime) 한 번 조회
+- 로컬 파일(CSV, 스크립트 자신): 크기/mtime이 같으면 저장된 해시 재사용, 다르면 sha256 다시 계산
+- 스크립트가 쓰는 carestats 모듈/정적 파일(code=): 로더/렌더러가 바뀌어도 다시 만들도록 같은 방식으로 비교
+- 결과 파일이 없으면 항상 다시 실행
+
+    check = RunCheck('woohyun/복지시설', files=[__file__], outputs=[out], code=SHEET_CODE)
+    if not check.changed():
+        print("⏭️ 원본 변경 없음, 건너뜀")
+        return
+    ...
+    check.record()    # 성공했을 때만
+
+CARESTATS_FORCE=1 이면 지문과 상관없이 실행한다 (빈 값/0이면 꺼짐).
+"""
+import hashlib
+import json
+import os
+import tempfile
+
+from carestats import config
+
+STATE_FILE = "runs.json"
+PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# 시트 로드/파싱/지역 코드 (folium 버블맵처럼 carestats 렌더러를 쓰지 않는 스크립트의 code)
+SHEET_CODE = ('carestats.sheets', 'carestats.parsing', 'carestats.regions')
+
+# carestats.maps로 그리는 지도(단계구분도)의 code: 렌더러/번들 런타임이 바뀌어도 다시 만듦
+RENDER_CODE = SHEET_CODE + (
+    'carestats.maps', 'carestats.shapes', 'carestats.spatial', 'carestats.site',
+    'static/map.js', 'static/map.css',
+)
+
+
+def state_path():
+    return os.path.join(config.STATE_DIR, STATE_FILE)
+
+
+def load_state(path=None):
+    try:
+        with open(path or state_path(), encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_state(state, path=None):
+    """임시 파일에 쓰고 교체 (쓰다 만 상태 파일이 남지 않도록)"""
+    path = path or state_path()
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+    with os.fdopen(fd, 'w', encoding='utf-8') as f:
+        json.dump(state, f, ensure_ascii=False, indent=1, sort_keys=True)
+    os.replace(tmp, path)
+
+
+def file_hash(path, chunk_size=1 << 20):
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def code_paths(modules):
+    """모듈 이름('carestats.maps') / 패키지 기준 경로('static/map.js') / 절대 경로 → 파일 경로 목록"""
+    import importlib.util
+    paths = []
+    for name in modules:
+        if os.path.isabs(name):
+            paths.append(name)
+        elif '/' in name or os.path.splitext(name)[1] in ('.py', '.js', '.css'):
+            paths.append(os.path.join(PACKAGE_DIR, name))
+        else:
+            spec = importlib.util.find_spec(name)
+            if spec is None or not spec.origin:
+                raise ImportError(f"모듈을 찾을 수 없습니다: {name}")
+            paths.append(spec.origin)
+    return paths
+
+
+def file_fingerprint(path, previous=None):
+    """로컬 파일 → {size, mtime_ns, sha256} (크기/mtime이 이전과 같으면 해시를 다시 계산하지 않음)"""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    fp = {'size': st.st_size, 'mtime_ns': st.st_mtime_ns}
+    if previous and previous.get('size') == fp['size'] and previous.get('mtime_ns') == fp['mtime_ns']:
+        fp['sha256'] = previous['sha256']
+    else:
+        fp['sha256'] = file_hash(path)
+    return fp
+
+
+def drive_revision(spreadsheet_id, credentials=None):
+    """스프레드시트의 Drive 메타데이터 → {version, modifiedTime} (API 호출 1회)"""
+    from google.auth.transport.requests import AuthorizedSession
+    from carestats.quota import call_with_retry
+
+    if credentials is None:
+        from carestats.sheets import get_credentials
+        credentials = get_credentials()
+    session = AuthorizedSession(credentials)
+
+    def get():
+        resp = session.get(
+            f"{config.DRIVE_API_URL.rstrip('/')}/files/{spreadsheet_id}",
+            params={'fields': 'version,modifiedTime', 'supportsAllDrives': 'true'},
+            timeout=30,
+        )
+        resp.raise_for_status()
+        return resp.json()
+
+    meta = call_with_retry(get, api='drive')
+    return {'version': meta.get('version'), 'modifiedTime': meta.get('modifiedTime')}
+
+
+class RunCheck:
+    """작업 하나의 원본 지문 비교/기록
+
+    code: 함께 비교할 carestats 모듈/정적 파일 (code_paths 형식, SHEET_CODE / RENDER_CODE 등, 기본은 없음)
+    """
+
+    def __init__(self, job, files=(), outputs=(), spreadsheet_id=config.SPREADSHEET_ID,
+                 credentials=None, path=None, code=()):
+        self.job = job
+        self.files = list(dict.fromkeys(os.path.abspath(p) for p in [*files, *code_paths(code)]))
+        self.outputs = [os.path.abspath(p) for p in outputs]
+        self.spreadsheet_id = spreadsheet_id
+        self.credentials = credentials
+        self.path = path
+        self.reasons = []
+        self._current = None
+
+    def _previous(self):
+        return load_state(self.path).get(self.job, {})
+
+    def current(self):
+        """지금 원본 지문 (한 번만 계산)"""
+        if self._current is None:
+            previous = self._previous().get('files', {})
+            current = {'files': {p: file_fingerprint(p, previous.get(p)) for p in self.files}}
+            if self.spreadsheet_id:
+                current['sheet'] = drive_revision(self.spreadsheet_id, self.credentials)
+            self._current = current
+        return self._current
+
+    def changed(self):
+        """마지막 성공 실행 이후 원본이 바뀌었거나 결과 파일이 없으면 True"""
+        self.reasons = []
+        try:
+            current = self.current()   # 실행 전에 지문을 떠 둠 (실행 중 원본이 바뀌면 다음에 다시 실행)
+        except Exception as e:
+            # 메타데이터를 못 받으면 보수적으로 다시 실행
+            self.reasons.append(f"원본 확인 실패: {e}")
+            return True
+        if os.getenv('CARESTATS_FORCE', '') not in ('', '0'):
+            self.reasons.append('CARESTATS_FORCE')
+        previous = self._previous()
+        if not previous:
+            self.reasons.append('이전 실행 기록 없음')
+            return True
+        self.reasons += [f"결과 없음: {p}" for p in self.outputs if not os.path.exists(p)]
+        if current.get('sheet') != previous.get('sheet'):
+            self.reasons.append('스프레드시트 변경')
+        old_files = previous.get('files', {})
+        for p, fp in current['files'].items():
+            old = old_files.get(p)
+            if fp is None or old is None or fp['sha256'] != old.get('sha256'):
+                self.reasons.append(f"파일 변경: {os.path.basename(p)}")
+        if not self.reasons and current != previous:
+            # 내용은 같고 mtime만 바뀜: 다음 확인 때 다시 해시하지 않도록 갱신
+            self.record()
+        return bool(self.reasons)
+
+    def record(self):
+        """성공한 실행의 원본 지문 저장"""
+        try:
+            current = self.current()
+        except Exception as e:
+            print(f"⚠️ 실행 기록을 남기지 못했습니다 ({self.job}): {e}")
+            return
+        state = load_state(self.path)
+        state[self.job] = current
+        save_state(state, self.path)
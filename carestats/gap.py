@@ -0,0 +1,101 @@
+# -*- coding: utf-8 -*-
+"""공급·수요 지수 및 복지 공백(gap) 계산 (sangho/seoul_analysis.py와 같은 정의)
+
+- supply_index = mean(capacity_norm, support_count_norm[, access_capacity_norm])
+- demand_index = mean(household_count_norm, member_count_norm)
+- gap_diff = demand_index - supply_index
+- gap_ratio = demand_index / (supply_index + 1e-6)
+
+정규화는 carestats.numeric.minmax_scale (by를 주면 묶음마다 따로, 한 번의 배치 호출로).
+access_capacity(반경 안 시설 정원, carestats.access) 컬럼이 있으면 공급 성분으로 함께 평균한다.
+
+수요 성분은 시군구 단위까지 있는 수급자 데이터셋(워크시트 3)의 수급가구수/수급자수다.
+woohyun/analysis.py(시도 단위)는 수요를 다른 시트에서 읽는다.
+
+    household_count  워크시트 4 A3:B23의 시도별 가구수
+    member_count     워크시트 7에서 특성 '계/소계' 행의 시도별 값
+
+그래서 /gap 순위(carestats.api)와 analysis.py의 시도 순위는 값도 순서도 다를 수 있다.
+워크시트 4/7은 시도 단위뿐이라 시군구 순위에 쓸 수 없어 여기서는 워크시트 3으로 통일한다.
+"""
+import pandas as pd
+
+from carestats.numeric import minmax_scale, pad_groups
+
+RAW_COLS = ['capacity', 'support_count', 'household_count', 'member_count']
+NORM_COLS = [f"{c}_norm" for c in RAW_COLS]
+INDEX_COLS = ['supply_index', 'demand_index', 'gap_diff', 'gap_ratio']
+ACCESS_COL = 'access_capacity'   # 선택 공급 성분 (carestats.access.access_by_region)
+
+
+def region_keys(level):
+    if level == 'sido':
+        return ['통계시도명']
+    if level == 'sigungu':
+        return ['통계시도명', '통계시군구명']
+    raise ValueError(f"알 수 없는 level: {level}")
+
+
+def region_totals(frames, level='sido', sido=None):
+    """정규화 데이터셋 → 지역별 capacity/support_count/household_count/member_count
+
+    household_count / member_count는 수급자 데이터셋(워크시트 3)의 수급가구수/수급자수 합계
+    (woohyun/analysis.py의 워크시트 4 가구수 / 워크시트 7 인원과 다름, 모듈 설명 참고).
+    """
+    keys = region_keys(level)
+
+    def total(name, value, out_col):
+        df = frames[name]
+        if sido is not None:
+            df = df[df['통계시도명'] == sido]
+        if value not in df.columns:
+            return pd.Series(dtype='int64', name=out_col)
+        return df.groupby(keys)[value].sum().rename(out_col)
+
+    df = pd.concat([
+        total('capacity', '정원', 'capacity'),
+        total('payments', '지급건수', 'support_count'),
+        total('recipients', '수급가구수', 'household_count'),
+        total('recipients', '수급자수', 'member_count'),
+    ], axis=1).fillna(0).astype('int64')
+    return df.reset_index()
+
+
+def compute_gap_index(df, by=None):
+    """RAW_COLS → 정규화(min-max) 후 공급·수요 지수와 공백 지표 추가
+
+    by: 이 컬럼 값마다 따로 정규화 (예: '통계시도명' → 시도 안에서 시군구끼리 비교)
+    """
+    df = df.copy()
+    raw_cols = RAW_COLS + ([ACCESS_COL] if ACCESS_COL in df.columns else [])
+    values = df[raw_cols].to_numpy(dtype=float)
+    if by is None:
+        norm = minmax_scale(values)
+    else:
+        codes, _ = pd.factorize(df[by])
+        padded, mask, index = pad_groups(values, codes)
+        norm = minmax_scale(padded, mask)[index]
+    df[[f"{c}_norm" for c in raw_cols]] = norm
+    supply = norm[:, [0, 1] + list(range(4, len(raw_cols)))].mean(axis=1)
+    demand = norm[:, 2:4].mean(axis=1)
+    df['supply_index'] = supply
+    df['demand_index'] = demand
+    df['gap_diff'] = demand - supply
+    df['gap_ratio'] = demand / (supply + 1e-6)
+    return df
+
+
+def gap_table(frames, level='sido', sido=None, access=None):
+    """access: region_keys(level) + ACCESS_COL DataFrame을 주면 공급 성분으로 추가 (없는 지역은 0)"""
+    df = region_totals(frames, level, sido)
+    if access is not None:
+        keys = region_keys(level)
+        df = df.merge(access.groupby(keys, as_index=False)[ACCESS_COL].sum(), on=keys, how='left')
+        df[ACCESS_COL] = df[ACCESS_COL].fillna(0)
+    return compute_gap_index(df)
+
+
+def gap_tables_by_sido(frames):
+    """시도별 시군구 공백 지표 {시도: DataFrame} (gap_table(frames, 'sigungu', 시도)와 같은 값, 정규화는 한 번에)"""
+    df = compute_gap_index(region_totals(frames, 'sigungu'), by='통계시도명')
+    return {sido: part.reset_index(drop=True) for sido, part in df.groupby('통계시도명', sort=False)}
@@ -0,0 +1,174 @@
+# -*- coding: utf-8 -*-
+"""지오코딩 (Nominatim): 질의 문자열별 결과를 디스크에 캐시하고 프로세스 전체에서 1초에 1건으로 제한
+
+    geocoder = get_geocoder()
+    coords = geocoder.many(['서울', '부산'], "{}, South Korea")   # {이름: (lat, lon)}
+    points = geocoder.addresses([address_query(a) for a in df['소재지']])   # 시설 주소: 건물 단위로 재사용
+    geocoder.save()
+
+찾지 못한 주소도 (None, None)으로 캐시하고, 네트워크 오류만 다음 실행에서 다시 시도한다.
+시설 주소는 carestats.address의 표준 키(시도 시군구 도로명 건물번호)로 질의하고, 캐시에 없는 키도
+같은 건물로 보이는 키(AddressIndex)의 좌표가 있으면 질의 없이 그 좌표를 쓴다.
+"""
+import os
+import re
+import threading
+import time
+
+from carestats import config
+from carestats.address import AddressIndex, canonical_key
+from carestats.freshness import load_state, save_state
+from carestats.trace import span
+
+MIN_INTERVAL = 1.0   # Nominatim 사용 정책: 초당 1건
+
+
+def cache_path():
+    return os.path.join(config.STATE_DIR, 'geocode.json')
+
+
+def clean_address(address):
+    """시설 소재지 → 지오코딩용 주소 (호실/건물명/괄호 등 제거, 주소가 아니면 '')"""
+    if address is None or address != address:   # None / NaN
+        return ""
+
+    # 문자열로 캐스팅 후 기본 정리
+    address = str(address).strip()
+
+    # 완전히 주소가 아닌 경우 삭제
+    if any(keyword in address for keyword in ["비공개", "작성자", "미혼모자", "안내"]):
+        return ""
+
+    # 괄호/인용 부호/이상한 문자 제거
+    address = re.sub(r'[\(\)\[\]「」|※★·●◎▶▷◆◇□■○]', '', address)
+
+    # 콤마 뒤 지우기
+    address = re.sub(r',.*$', '', address)
+
+    # "A동 B호", "202호", "한남하우스" 등 건물/호실 제거 (가능한 한 뒤쪽만 제거)
+    address = re.sub(r'\s+\d{1,3}동\b', '', address)
+    address = re.sub(r'\s+\d{1,3}호\b', '', address)
+    address = re.sub(r'\s+\d{1,3}(호|층|호실)\b', '', address)
+    address = re.sub(r'\s+\d{1,3}(호|층)?\s+[가-힣]{2,}\b', '', address)  # 예: "501 한남하우스"
+
+    # "숫자-숫자"가 나오면 그 뒤는 제거
+    address = re.sub(r'(\d+-\d+).*', r'\1', address)
+    # 공백 정리
+    address = re.sub(r'\s+', ' ', address).strip()
+
+    return address
+
+
+def address_query(address):
+    """시설 소재지 → 지오코딩 질의 (표준 주소 키, 도로명/지번을 못 찾으면 clean_address 결과)"""
+    cleaned = clean_address(address)
+    if not cleaned:
+        return ""
+    return canonical_key(address) or cleaned
+
+
+class Geocoder:
+    """질의 → (lat, lon) 캐시 + 속도 제한 (스레드 안전)"""
+
+    def __init__(self, user_agent='carestats', min_interval=MIN_INTERVAL, path=None, timeout=10):
+        self.user_agent = user_agent
+        self.min_interval = min_interval
+        self.path = path or cache_path()
+        self.timeout = timeout
+        self._cache = {q: tuple(v) for q, v in load_state(self.path).items()}
+        self._lock = threading.Lock()
+        self._last = 0.0
+        self._client = None
+        self._index = None
+        self.lookups = 0
+        self.reused = 0
+        self.dirty = False
+
+    def _geocode(self, query):
+        if self._client is None:
+            from geopy.geocoders import Nominatim
+            self._client = Nominatim(user_agent=self.user_agent, timeout=self.timeout)
+        wait = self._last + self.min_interval - time.monotonic()
+        if wait > 0:
+            with span('geocode.sleep', 'sleep'):
+                time.sleep(wait)
+        try:
+            with span('geocode.request', 'io'):
+                loc = self._client.geocode(query)
+        finally:
+            self._last = time.monotonic()
+            self.lookups += 1
+        return (loc.latitude, loc.longitude) if loc else (None, None)
+
+    def lookup(self, query):
+        """질의 하나 → (lat, lon) / 못 찾으면 (None, None)"""
+        if not query:
+            return (None, None)
+        with self._lock:
+            if query in self._cache:
+                return self._cache[query]
+            try:
+                coords = self._geocode(query)
+            except Exception as e:
+                print(f"❌ 지오코딩 오류 - {query} → {e}")
+                return (None, None)
+            self._cache[query] = coords
+            self.dirty = True
+            return coords
+
+    def many(self, names, template="{}"):
+        """이름 목록 → {이름: (lat, lon)} (같은 이름은 한 번만 질의)"""
+        return {name: self.lookup(template.format(name)) for name in dict.fromkeys(names)}
+
+    def _address_index(self):
+        # 좌표를 찾은 캐시 항목만 색인 (못 찾은 주소를 비슷한 주소에 옮기지 않음)
+        if self._index is None:
+            self._index = AddressIndex()
+            for query, coords in self._cache.items():
+                if coords[0] is not None:
+                    self._index.add(query, coords)
+        return self._index
+
+    def address(self, query):
+        """표준 주소 키 → (lat, lon): 캐시 → 같은 건물로 보이는 캐시 키 → 네트워크 순"""
+        if not query:
+            return (None, None)
+        with self._lock:
+            if query in self._cache:
+                return self._cache[query]
+            index = self._address_index()
+            near = index.nearest(query)
+            if near is not None:
+                coords = index.get(near)
+                self._cache[query] = coords   # 다음 실행에서는 바로 찾도록 별칭으로 저장
+                self.dirty = True
+                self.reused += 1
+                return coords
+        coords = self.lookup(query)
+        if coords[0] is not None:
+            with self._lock:
+                self._address_index().add(query, coords)
+        return coords
+
+    def addresses(self, queries):
+        """표준 주소 키 목록 → {키: (lat, lon)} (같은 키는 한 번만)"""
+        return {query: self.address(query) for query in dict.fromkeys(queries)}
+
+    def save(self):
+        with self._lock:
+            if self.dirty:
+                save_state({q: list(v) for q, v in self._cache.items()}, self.path)
+                self.dirty = False
+
+
+_GEOCODER = None
+_GEOCODER_LOCK = threading.Lock()
+
+
+def get_geocoder():
+    """프로세스 공용 Geocoder"""
+    global _GEOCODER
+    with _GEOCODER_LOCK:
+        if _GEOCODER is None:
+            _GEOCODER = Geocoder()
+        return _GEOCODER
@@ -0,0 +1,308 @@
+# -*- coding: utf-8 -*-
+"""careStatsAPI 부하 테스트
+
+로컬 스냅샷(기본: fixtures/sample)으로 API 서버를 별도 프로세스로 띄우고,
+대시보드와 비슷한 쿼리 묶음(시도→시군구 드릴다운, 월 범위 집계, 공백 순위)을
+동시 요청으로 재생한다. 구간별 처리량/p95와 서버 RSS 변화, 최종 p50/p95/p99를 출력한다.
+
+fixtures/sample의 지급건수는 output.csv에서 가져왔고, 시설/수급자/가구 데이터는
+지급건수 규모에 맞춰 만든 가짜 값이다.
+
+실행:
+    python -m carestats.loadtest --duration 30 --concurrency 32
+    python -m carestats.loadtest --url http://127.0.0.1:8080   # 이미 떠 있는 서버
+    python -m carestats.loadtest --data-dir /tmp/synth        # carestats.synthetic으로 만든 큰 데이터
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import time
+from urllib.parse import urlencode
+
+import numpy as np
+import aiohttp
+
+from carestats.config import ROOT_DIR
+
+DEFAULT_DATA_DIR = os.path.join(ROOT_DIR, 'fixtures', 'sample')
+
+# 시나리오별 가중치
+MIX = {
+    'drilldown': 0.45,
+    'month_range': 0.25,
+    'gap': 0.20,
+    'recipients': 0.10,
+}
+
+
+def rss_bytes(pid):
+    """프로세스 RSS (psutil이 없으면 /proc 사용, 둘 다 안 되면 None)"""
+    try:
+        import psutil
+        return psutil.Process(pid).memory_info().rss
+    except ImportError:
+        pass
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        return None
+    return None
+
+
+def percentiles(latencies):
+    if not latencies:
+        return {'p50': None, 'p95': None, 'p99': None}
+    p50, p95, p99 = np.percentile(np.asarray(latencies) * 1000, [50, 95, 99])
+    return {'p50': p50, 'p95': p95, 'p99': p99}
+
+
+class QueryMix:
+    """서버에서 지역/월 목록을 받아 시나리오별 요청 URL 경로를 생성"""
+
+    def __init__(self, regions, months, seed=0):
+        self.regions = regions        # {시도: [시군구, ...]}
+        self.sidos = sorted(regions)
+        self.months = sorted(months)
+        self.rng = random.Random(seed)
+        self.names = list(MIX)
+        self.weights = [MIX[n] for n in self.names]
+
+    @classmethod
+    async def discover(cls, session, base_url, seed=0):
+        async def keys(path, **params):
+            async with session.get(f"{base_url}{path}?{urlencode(params)}") as resp:
+                resp.raise_for_status()
+                return [r['key'] for r in (await resp.json())['rows']]
+
+        months = await keys('/stats/payments', group_by='month')
+        regions = {}
+        for sido in await keys('/stats/payments', group_by='sido'):
+            regions[sido] = await keys('/stats/payments', group_by='sigungu', sido=sido)
+        return cls(regions, months, seed)
+
+    def next(self):
+        """(시나리오 이름, 경로) 하나를 뽑는다"""
+        name = self.rng.choices(self.names, self.weights)[0]
+        return name, getattr(self, f"_{name}")()
+
+    def _drilldown(self):
+        sido = self.rng.choice(self.sidos)
+        step = self.rng.randrange(3)
+        if step == 0:
+            params = {'group_by': 'sido'}
+        elif step == 1:
+            params = {'sido': sido, 'group_by': 'sigungu'}
+        else:
+            params = {'sido': sido, 'sigungu': self.rng.choice(self.regions[sido]),
+                      'group_by': 'support_type'}
+        return f"/stats/payments?{urlencode(params)}"
+
+    def _month_range(self):
+        i, j = sorted(self.rng.sample(range(len(self.months)), 2)) if len(self.months) > 1 else (0, 0)
+        params = {'month_from': self.months[i], 'month_to': self.months[j], 'group_by': 'month'}
+        if self.rng.random() < 0.5:
+            params['sido'] = self.rng.choice(self.sidos)
+        return f"/stats/payments?{urlencode(params)}"
+
+    def _gap(self):
+        if self.rng.random() < 0.3:
+            params = {'level': 'sido', 'top': 10}
+        else:
+            params = {'level': 'sigungu', 'sido': self.rng.choice(self.sidos), 'top': 10}
+        if self.rng.random() < 0.3:
+            params['order'] = 'gap_ratio'
+        return f"/gap?{urlencode(params)}"
+
+    def _recipients(self):
+        params = {'sido': self.rng.choice(self.sidos),
+                  'group_by': self.rng.choice(['family_type', 'income_band'])}
+        return f"/stats/recipients?{urlencode(params)}"
+
+
+class Recorder:
+    def __init__(self):
+        self.latencies = []
+        self.by_scenario = {}
+        self.statuses = {}
+        self.cache_hits = 0
+        self.window = []
+
+    def add(self, name, latency, status, cache):
+        self.latencies.append(latency)
+        self.window.append(latency)
+        self.by_scenario.setdefault(name, []).append(latency)
+        self.statuses[status] = self.statuses.get(status, 0) + 1
+        if cache == 'HIT':
+            self.cache_hits += 1
+
+    def take_window(self):
+        window, self.window = self.window, []
+        return window
+
+
+async def worker(session, base_url, mix, recorder, deadline, revalidate):
+    etags = {}
+    while time.perf_counter() < deadline:
+        name, path = mix.next()
+        headers = {}
+        if revalidate and path in etags:
+            headers['If-None-Match'] = etags[path]
+        start = time.perf_counter()
+        async with session.get(base_url + path, headers=headers) as resp:
+            await resp.read()
+            latency = time.perf_counter() - start
+            if 'ETag' in resp.headers:
+                etags[path] = resp.headers['ETag']
+            recorder.add(name, latency, resp.status, resp.headers.get('X-Cache'))
+
+
+async def monitor(recorder, pid, interval, deadline, timeline):
+    start = time.perf_counter()
+    while time.perf_counter() < deadline:
+        await asyncio.sleep(interval)
+        window = recorder.take_window()
+        rss = rss_bytes(pid) if pid else None
+        row = {
+            'elapsed': time.perf_counter() - start,
+            'requests': len(recorder.latencies),
+            'rps': len(window) / interval,
+            'p95_ms': percentiles(window)['p95'],
+            'rss_mb': rss / 2**20 if rss else None,
+        }
+        timeline.append(row)
+        p95 = f"{row['p95_ms']:.2f}ms" if row['p95_ms'] is not None else '-'
+        mem = f"{row['rss_mb']:.1f}MB" if row['rss_mb'] is not None else '-'
+        print(f"  [{row['elapsed']:6.1f}s] {row['requests']:>8}건  {row['rps']:8.0f} req/s  p95 {p95}  RSS {mem}")
+
+
+async def run(base_url, duration, concurrency, interval, revalidate, seed, pid=None):
+    connector = aiohttp.TCPConnector(limit=concurrency)
+    async with aiohttp.ClientSession(connector=connector) as session:
+        mix = await QueryMix.discover(session, base_url, seed)
+        recorder = Recorder()
+        timeline = []
+        rss_start = rss_bytes(pid) if pid else None
+        deadline = time.perf_counter() + duration
+        started = time.perf_counter()
+        await asyncio.gather(
+            monitor(recorder, pid, interval, deadline, timeline),
+            *(worker(session, base_url, QueryMix(mix.regions, mix.months, seed + i),
+                     recorder, deadline, revalidate)
+              for i in range(concurrency)),
+        )
+        elapsed = time.perf_counter() - started
+        rss_end = rss_bytes(pid) if pid else None
+
+    total = len(recorder.latencies)
+    return {
+        'requests': total,
+        'elapsed': elapsed,
+        'throughput': total / elapsed if elapsed else 0.0,
+        'latency_ms': percentiles(recorder.latencies),
+        'scenarios': {n: dict(count=len(v), **percentiles(v)) for n, v in recorder.by_scenario.items()},
+        'statuses': recorder.statuses,
+        'cache_hit_rate': recorder.cache_hits / total if total else 0.0,
+        'rss_mb': {
+            'start': rss_start / 2**20 if rss_start else None,
+            'end': rss_end / 2**20 if rss_end else None,
+        },
+        'timeline': timeline,
+    }
+
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def start_server(data_dir, port, cache_mb):
+    """별도 프로세스로 API 서버 실행 후 /health가 응답할 때까지 대기"""
+    cmd = [sys.executable, '-m', 'carestats.api', '--data-dir', data_dir,
+           '--port', str(port), '--cache-mb', str(cache_mb)]
+    proc = subprocess.Popen(cmd, cwd=ROOT_DIR, stdout=subprocess.DEVNULL)
+
+    async def wait_ready():
+        async with aiohttp.ClientSession() as session:
+            for _ in range(200):
+                if proc.poll() is not None:
+                    raise RuntimeError("API 서버가 시작 중 종료되었습니다.")
+                try:
+                    async with session.get(f"http://127.0.0.1:{port}/health") as resp:
+                        if resp.status == 200:
+                            return
+                except aiohttp.ClientConnectionError:
+                    pass
+                await asyncio.sleep(0.1)
+        raise RuntimeError("API 서버가 응답하지 않습니다.")
+
+    try:
+        asyncio.run(wait_ready())
+    except Exception:
+        proc.kill()
+        raise
+    return proc
+
+
+def print_report(report):
+    lat = report['latency_ms']
+    print("\n=== 부하 테스트 결과 ===")
+    print(f"요청 수: {report['requests']}건 / {report['elapsed']:.1f}초")
+    print(f"처리량: {report['throughput']:.0f} req/s")
+    print(f"지연시간: p50 {lat['p50']:.2f}ms  p95 {lat['p95']:.2f}ms  p99 {lat['p99']:.2f}ms")
+    print(f"캐시 적중률: {report['cache_hit_rate'] * 100:.1f}%")
+    print(f"응답 코드: {report['statuses']}")
+    rss = report['rss_mb']
+    if rss['start'] is not None and rss['end'] is not None:
+        print(f"서버 RSS: {rss['start']:.1f}MB → {rss['end']:.1f}MB ({rss['end'] - rss['start']:+.1f}MB)")
+    print("\n시나리오별:")
+    for name, s in sorted(report['scenarios'].items()):
+        print(f"  {name:12s} {s['count']:>8}건  p50 {s['p50']:.2f}ms  p95 {s['p95']:.2f}ms  p99 {s['p99']:.2f}ms")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="careStatsAPI 부하 테스트")
+    parser.add_argument('--url', help="대상 서버 주소 (없으면 --data-dir로 서버를 직접 띄움)")
+    parser.add_argument('--data-dir', default=DEFAULT_DATA_DIR)
+    parser.add_argument('--duration', type=float, default=20)
+    parser.add_argument('--concurrency', type=int, default=16)
+    parser.add_argument('--interval', type=float, default=2, help="중간 보고 주기 (초)")
+    parser.add_argument('--cache-mb', type=float, default=32)
+    parser.add_argument('--revalidate', action='store_true', help="같은 쿼리 재요청 시 If-None-Match 전송")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help="결과 JSON 저장 경로")
+    args = parser.parse_args(argv)
+
+    proc = None
+    base_url = args.url
+    if base_url is None:
+        port = _free_port()
+        proc = start_server(args.data_dir, port, args.cache_mb)
+        base_url = f"http://127.0.0.1:{port}"
+        print(f"✅ 테스트 서버 실행: {base_url} (pid={proc.pid}, data={args.data_dir})")
+    try:
+        report = asyncio.run(run(base_url.rstrip('/'), args.duration, args.concurrency,
+                                 args.interval, args.revalidate, args.seed,
+                                 pid=proc.pid if proc else None))
+    finally:
+        if proc is not None:
+            proc.terminate()
+            proc.wait()
+
+    print_report(report)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"✅ 결과 저장: {args.output}")
+
+
+if __name__ == '__main__':
+    main()
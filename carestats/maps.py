@@ -0,0 +1,335 @@
+# -*- coding: utf-8 -*-
+"""지도 렌더러 (스크립트별로 복사되어 있던 folium/plotly 버블맵 코드를 인자로 묶음)
+
+버블맵 함수는 (데이터, 지오코딩 결과 coords={이름: (lat, lon)}, 저장 경로)를 받고 저장한 경로를 돌려준다.
+folium/plotly는 함수 안에서 import한다.
+choropleth_map은 지오코딩 대신 경계 파일(config.BOUNDARY_PATH)의 다각형을 칠한다 (carestats.shapes).
+*_layer 함수는 같은 인자로 JSON 레이어 데이터만 만든다 (carestats.site 사이트 모드, static/map.js가 그림).
+"""
+import math
+
+from carestats.trace import span, traced
+
+
+def _legend_box(title, lines, bottom, left, width, max_height):
+    html = f"""
+     <div style="
+       position: fixed;
+       bottom: {bottom}px;
+       left: {left}px;
+       width: {width}px;
+       max-height: {max_height}px;
+       overflow: auto;
+       border:2px solid grey;
+       background-color: white;
+       padding: 10px;
+       font-size:14px;
+       z-index:9999;
+     ">
+       <b>{title}</b><br>
+    """
+    for line in lines:
+        html += f"&nbsp;{line}<br>"
+    return html + "</div>"
+
+
+def _fit(m, coords, names):
+    bounds = [coords[n] for n in names if coords.get(n, (None, None))[0] is not None]
+    if bounds:
+        m.fit_bounds(bounds)
+
+
+@traced('make_map', 'render')
+def bubble_map(summary, coords, out, *, name_col, value_col, factor, unit, label, legend_title,
+               color='darkgreen', fill_color='lightgreen', legend_at=(50, 50), legend_width=240,
+               legend_max_height=400, skip_zero=False):
+    """지역별 합계 → 원 크기 sqrt(값)*factor 버블맵 + 텍스트 범례 (복지시설/지급건수 지도)"""
+    import folium
+
+    m = folium.Map(location=[36, 128], zoom_start=6, width='100%', height='100%')
+    for name, val in zip(summary[name_col], summary[value_col]):
+        lat, lon = coords.get(name, (None, None))
+        if lat is None or (skip_zero and val == 0):
+            continue
+        folium.CircleMarker(
+            location=(lat, lon),
+            radius=math.sqrt(val) * factor,
+            color=color,
+            fill=True,
+            fill_color=fill_color,
+            fill_opacity=0.6,
+            popup=folium.Popup(f"<b>{name}</b><br>{label}: {val}{unit}", max_width=200)
+        ).add_to(m)
+
+    lines = [f"{name}: {val}{unit}" for name, val in zip(summary[name_col], summary[value_col])]
+    bottom, left = legend_at
+    m.get_root().html.add_child(folium.Element(
+        _legend_box(legend_title, lines, bottom, left, legend_width, legend_max_height)
+    ))
+    _fit(m, coords, summary[name_col])
+    with span('m.save', 'render'):
+        m.save(out)
+    return out
+
+
+@traced('make_map', 'render')
+def count_bubble_map(df, coords, out, *, name_col, value_col, factor, legend_title, unit='명',
+                     color='crimson', legend_max_height=300):
+    """지역별 인원 → 버블맵 + 버블 크기 범례(최소/중앙/최대) + 전체 수치 범례 (한부모 수급자 지도)"""
+    import folium
+
+    m = folium.Map(location=[36, 128], zoom_start=6, width='100%', height='100%')
+    for name, val in zip(df[name_col], df[value_col]):
+        lat, lon = coords.get(name, (None, None))
+        if lat is None:
+            continue
+        folium.CircleMarker(
+            location=(lat, lon),
+            radius=math.sqrt(val) * factor,
+            color=color,
+            fill=True, fill_color=color, fill_opacity=0.6,
+            popup=f"{name}: {val:,}{unit}"
+        ).add_to(m)
+
+    counts = df[value_col]
+    example_counts = sorted({int(counts.min()), int(counts.median()), int(counts.max())}) if len(counts) else []
+    bubble_legend = ('<div style="position:fixed;bottom:20px;left:20px;background:white;padding:8px;'
+                     'border:1px solid gray;font-size:12px;z-index:9999;">')
+    bubble_legend += '<b>버블 크기 범례</b><br>'
+    for cnt in example_counts:
+        diam = math.sqrt(cnt) * factor * 2
+        bubble_legend += (
+            f'<span style="display:inline-block;'
+            f'width:{diam}px;height:{diam}px;'
+            f'background:{color};border-radius:50%;opacity:0.6;vertical-align:middle;"></span> '
+            f'{cnt:,}{unit}<br>'
+        )
+    bubble_legend += '</div>'
+
+    text_legend = (f'<div style="position:fixed;bottom:20px;right:20px;max-height:{legend_max_height}px;overflow:auto;'
+                   'background:white;padding:8px;border:1px solid gray;font-size:12px;z-index:9999;">')
+    text_legend += f'<b>{legend_title}</b><br>'
+    for name, val in zip(df[name_col], df[value_col]):
+        text_legend += f"{name}: {val:,}{unit}<br>"
+    text_legend += '</div>'
+
+    m.get_root().html.add_child(folium.Element(bubble_legend + text_legend))
+    _fit(m, coords, df[name_col])
+    with span('m.save', 'render'):
+        m.save(out)
+    return out
+
+
+@traced('make_map', 'render')
+def plotly_bubble_map(df, coords, out, *, name_col, value_col, title, unit='가구'):
+    """plotly Scattergeo 버블맵 (서울 중심, 최대값 기준 크기 정규화)"""
+    import plotly.graph_objects as go
+
+    lat = [coords.get(n, (None, None))[0] for n in df[name_col]]
+    lon = [coords.get(n, (None, None))[1] for n in df[name_col]]
+    max_cnt = df[value_col].max()
+    size = df[value_col] / max_cnt * 40 + 5 if max_cnt else df[value_col] * 0 + 5
+
+    fig = go.Figure(
+        go.Scattergeo(
+            lon=lon,
+            lat=lat,
+            text=df[name_col] + '<br>' + df[value_col].astype(str) + f' {unit}',
+            marker=dict(
+                size=size,
+                color='skyblue',
+                line_color='darkblue',
+                line_width=1,
+                sizemode='diameter',
+                opacity=0.7
+            ),
+            name=value_col
+        )
+    )
+    fig.update_layout(
+        title_text=title,
+        showlegend=True,
+        legend=dict(
+            title="범례",
+            x=0.9, y=0.95,
+            bgcolor='rgba(255,255,255,0.7)',
+            bordercolor='gray', borderwidth=1
+        ),
+        geo=dict(
+            scope='asia',
+            projection_type='mercator',
+            showland=True,
+            landcolor="rgb(243,243,243)",
+            showcountries=False,
+            center=dict(lat=37.55, lon=126.98),
+            lataxis_range=[37.4, 37.8],
+            lonaxis_range=[126.7, 127.3]
+        ),
+        height=700,
+    )
+    with span('fig.write_html', 'render'):
+        fig.write_html(out, include_plotlyjs='cdn')
+    return out
+
+
+@traced('make_map', 'render')
+def marker_map(points, out, center=(37.5665, 126.9780), zoom_start=11):
+    """[(lat, lon, 팝업 문구)] → 시설 위치 마커 지도"""
+    import folium
+
+    m = folium.Map(location=list(center), zoom_start=zoom_start)
+    for lat, lon, label in points:
+        if lat is None or lon is None:
+            continue
+        folium.Marker(
+            location=[lat, lon],
+            popup=label,
+            icon=folium.Icon(color='blue', icon='info-sign')
+        ).add_to(m)
+    with span('m.save', 'render'):
+        m.save(out)
+    return out
+
+
+# --- 사이트 모드 레이어 (carestats.site / static/map.js가 그림, folium/plotly 불필요) ---
+def _num(v):
+    return v.item() if hasattr(v, 'item') else v
+
+
+def _points(names, values, coords, radius, skip_zero=False):
+    out = []
+    for name, val in zip(names, values):
+        lat, lon = coords.get(name, (None, None))
+        if lat is None or (skip_zero and val == 0):
+            continue
+        out.append([lat, lon, _num(val), str(name), round(radius(val), 2)])
+    return out
+
+
+def bubble_layer(summary, coords, *, name_col, value_col, factor, unit, label, legend_title,
+                 color='darkgreen', fill_color='lightgreen', skip_zero=False, **layout):
+    """bubble_map과 같은 인자 → bubble 레이어 (legend_at 등 folium 배치 옵션은 무시)"""
+    return {
+        'type': 'bubble', 'title': legend_title, 'label': label, 'unit': unit,
+        'color': color, 'fill': fill_color,
+        'points': _points(summary[name_col], summary[value_col], coords,
+                          lambda v: math.sqrt(v) * factor, skip_zero),
+    }
+
+
+def count_layer(df, coords, *, name_col, value_col, factor, legend_title, unit='명', color='crimson', **layout):
+    """count_bubble_map과 같은 인자 → bubble 레이어 + 크기 범례(최소/중앙/최대)"""
+    counts = df[value_col]
+    examples = sorted({int(counts.min()), int(counts.median()), int(counts.max())}) if len(counts) else []
+    return {
+        'type': 'bubble', 'title': legend_title, 'label': value_col, 'unit': unit,
+        'color': color, 'fill': color,
+        'sizes': [[cnt, round(math.sqrt(cnt) * factor, 2)] for cnt in examples],
+        'points': _points(df[name_col], counts, coords, lambda v: math.sqrt(v) * factor),
+    }
+
+
+def plotly_layer(df, coords, *, name_col, value_col, title, unit='가구'):
+    """plotly_bubble_map과 같은 인자 → bubble 레이어 (최대값 기준 지름 5~45px)"""
+    max_cnt = df[value_col].max()
+    return {
+        'type': 'bubble', 'title': title, 'label': value_col, 'unit': unit,
+        'color': 'darkblue', 'fill': 'skyblue',
+        'points': _points(df[name_col], df[value_col], coords,
+                          lambda v: (v / max_cnt * 40 + 5) / 2 if max_cnt else 2.5),
+    }
+
+
+def marker_layer(points, title='복지시설 위치'):
+    """[(lat, lon, 팝업 문구)] → marker 레이어 (시설 수가 많아도 캔버스 원 표시)"""
+    return {
+        'type': 'marker', 'title': title, 'color': 'blue',
+        'points': [[lat, lon, str(label)] for lat, lon, label in points if lat is not None and lon is not None],
+    }
+
+
+PALETTE = ['#ffffb2', '#fecc5c', '#fd8d3c', '#f03b20', '#bd0026']   # YlOrRd 5단계
+DETAIL_ZOOMS = 3   # 기본 줌 + 이만큼 확대하면 상세 경계로 교체
+
+
+def quantile_bins(values, n_bins=5):
+    """값 → (구간 경계, 값별 구간 번호) (분위수 경계, 같은 경계는 합침)"""
+    import numpy as np
+
+    values = np.asarray(values, dtype=float)
+    if not len(values):
+        return [], np.zeros(0, dtype=int)
+    edges = np.unique(np.quantile(values, np.linspace(0, 1, n_bins + 1)))
+    if len(edges) == 1:
+        edges = np.array([edges[0], edges[0]])
+    return edges.tolist(), np.searchsorted(edges[1:-1], values, side='right')
+
+
+def choropleth_layer(summary, *, name_col, value_col, title, unit='', sido=None, sido_col=None,
+                     boundaries=None, palette=PALETTE):
+    """지역별 값 → 경계 다각형을 분위수 색으로 칠하는 choropleth 레이어
+
+    지역은 경계 파일의 (통계시도명, 통계시군구명)으로 맞춘다: 시도는 sido_col 열 또는 고정값 sido,
+    시군구는 name_col 열. sido를 주면 그 시도의 경계만 넣는다.
+    경계는 carestats.shapes로 기본 줌(범위에 맞춘 줌)과 상세 줌 두 단계를 캐시에서 읽어
+    encoded polyline 그대로 넣고, 브라우저에서 확대하면 상세 경계로 바꾼다.
+    """
+    import pandas as pd
+
+    from carestats import config, shapes
+    from carestats.regions import normalize_sido
+
+    if sido is None and sido_col is None:
+        raise ValueError("sido(고정 시도명) 또는 sido_col(시도 열) 중 하나가 필요합니다")
+    boundaries = boundaries or config.BOUNDARY_PATH
+    coarse = shapes.simplified(boundaries, shapes.ZOOM_LEVELS[0])
+    regions = [tuple(r) for r in coarse['regions']]
+    keep = [i for i, r in enumerate(regions) if sido is None or r[1] == normalize_sido(sido)]
+    if not keep:
+        raise ValueError(f"경계 파일에 지역이 없습니다: sido={sido}")
+
+    if sido_col:
+        sidos = summary[sido_col].map(normalize_sido)
+    else:
+        sidos = pd.Series(normalize_sido(sido), index=summary.index)
+    names = summary[name_col].astype(str).str.strip()
+    totals = summary.assign(_sido=sidos.to_numpy(), _name=names.to_numpy()) \
+        .groupby(['_sido', '_name'])[value_col].sum()
+    lookup = {(r[1], r[2]): i for i, r in enumerate(regions)}
+    unmatched = [f"{s} {n}" for s, n in totals.index if (s, n) not in lookup]
+    if unmatched:
+        print(f"⚠️ 경계 파일에 없는 지역 {len(unmatched)}개 (지도에서 빠짐): {', '.join(unmatched[:10])}"
+              + (' …' if len(unmatched) > 10 else ''))
+
+    values = {lookup[k]: float(v) for k, v in totals.items() if k in lookup}
+    matched = [i for i in keep if i in values]
+    edges, classes = quantile_bins([values[i] for i in matched], len(palette))
+    colors = palette[:max(len(edges) - 1, 0)]
+    cls = dict(zip(matched, classes.tolist()))
+
+    # 선택한 지역 범위에 맞춘 줌 → 그 줌과 DETAIL_ZOOMS 확대 줌의 경계
+    boxes = [coarse['boxes'][i] for i in keep]
+    bounds = [min(b[0] for b in boxes), min(b[1] for b in boxes), max(b[2] for b in boxes), max(b[3] for b in boxes)]
+    zoom = shapes.zoom_for_bounds(bounds)
+    levels = []
+    for z in sorted({zoom, min(zoom + DETAIL_ZOOMS, shapes.ZOOM_LEVELS[-1])}):
+        geo = shapes.simplified(boundaries, z)
+        levels.append({'from': z if levels else 0, 'rings': [geo['rings'][i] for i in keep]})
+
+    return {
+        'type': 'choropleth', 'title': title, 'unit': unit, 'bounds': bounds, 'levels': levels,
+        'colors': colors, 'edges': edges,
+        'regions': [[regions[i][2] if sido else f"{regions[i][1]} {regions[i][2]}",
+                     values.get(i), cls.get(i, -1)] for i in keep],
+    }
+
+
+@traced('make_map', 'render')
+def choropleth_map(summary, out, *, title, **spec):
+    """choropleth_layer → 파일 하나로 여는 단계구분도 HTML (Leaflet, 캔버스 렌더링)"""
+    from carestats.site import standalone_html
+    layer = choropleth_layer(summary, title=title, **spec)
+    with span('html.write', 'render'):
+        with open(out, 'w', encoding='utf-8') as f:
+            f.write(standalone_html(layer, title))
+    return out
@@ -0,0 +1,309 @@
+# -*- coding: utf-8 -*-
+"""단계별 메모리 프로파일 (--profile-memory)
+
+    python -m carestats --profile-memory fix-data
+    python -m carestats --profile-memory refresh --only charts:family
+    CARESTATS_PROFILE_MEMORY=1 python woohyun/analysis.py
+
+carestats.trace의 span 중 'stage' / 'pipeline' 분류(load_*, make_map, merge, 파이프라인 단계 등)
+경계마다 다음을 기록하고 종료 시 최대 사용량 순으로 출력한다.
+- tracemalloc: 단계 시작 대비 최대 증가량(안쪽 단계 포함)과 끝났을 때 남은 증가량
+- RSS: 단계 시작→끝, 프로세스 최대 RSS
+- 단계 동안 늘어난 할당 위치 상위 N개 (시작/끝 스냅샷 비교)
+- DataFrame.copy() 호출 위치별 횟수/크기. 다음 경우는 불필요한 복사로 보고 ⚠️로 표시한다.
+  · 함수 인자를 같은 이름으로 복사 (df = df.copy(), 예: calculate_city_family_sums)
+    pandas Copy-on-Write(3.0부터 기본)에서는 이후 수정이 호출 측 원본에 영향을 주지 않는다.
+  · 복사 대상이 다른 곳에서 참조되지 않는 임시 객체 (예: f(df[cols].dropna()) 안의 복사)
+
+tracemalloc은 프로세스 전체 할당을 세므로 병렬로 실행되는 단계끼리는 값이 섞인다.
+refresh는 이 모드에서 단계를 하나씩 실행한다. 측정 자체로 실행이 몇 배 느려진다.
+"""
+import atexit
+import linecache
+import os
+import re
+import sys
+import sysconfig
+import threading
+import tracemalloc
+
+from carestats import trace
+
+STAGE_CATS = ('stage', 'pipeline')
+_IGNORE = (tracemalloc.__file__, __file__, '<frozen importlib._bootstrap>',
+           '<frozen importlib._bootstrap_external>', '<unknown>')
+_TRACED_CODE = trace.traced()(len).__code__   # traced() 래퍼 함수의 코드 객체
+# 할당 위치는 이 경로 밖(저장소 코드)의 가장 안쪽 프레임으로 묶는다
+_LIBRARY_DIRS = tuple({sysconfig.get_paths()[k] for k in ('stdlib', 'purelib', 'platlib')})
+
+
+def rss_bytes():
+    """현재 RSS (리눅스 /proc, 없으면 None)"""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def peak_rss_bytes():
+    """프로세스 시작 이후 최대 RSS (resource 모듈이 없으면 None)"""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+def format_bytes(n):
+    if n is None:
+        return '-'
+    sign = '-' if n < 0 else ''
+    n = abs(n)
+    for unit in ('B', 'KB', 'MB', 'GB'):
+        if n < 1024 or unit == 'GB':
+            return f"{sign}{n:.0f}{unit}" if unit == 'B' else f"{sign}{n:.1f}{unit}"
+        n /= 1024
+
+
+def _site(filename, lineno):
+    try:
+        filename = os.path.relpath(filename)
+    except ValueError:
+        pass
+    return f"{filename}:{lineno}"
+
+
+def _user_frame(traceback):
+    """tracemalloc Traceback에서 라이브러리 밖의 가장 안쪽 프레임 (없으면 가장 안쪽)"""
+    frames = list(traceback)   # 오래된 프레임 → 최근 프레임
+    for frame in reversed(frames):
+        if not frame.filename.startswith(_LIBRARY_DIRS) and not frame.filename.startswith('<'):
+            return frame
+    return frames[-1]
+
+
+class StageMemory:
+    def __init__(self, name, current, rss):
+        self.name = name
+        self.start = current
+        self.peak = current
+        self.end = current
+        self.rss_start = rss
+        self.rss_end = rss
+        self.before = None
+        self.top = []           # [(위치, 증가 바이트, 증가 블록 수)]
+
+    @property
+    def peak_delta(self):
+        return self.peak - self.start
+
+    @property
+    def retained(self):
+        return self.end - self.start
+
+
+class MemoryProfiler:
+    """trace 훅: 단계 span 경계마다 tracemalloc/RSS 측정"""
+
+    def __init__(self, top=5, frames=1, cats=STAGE_CATS):
+        self.top = top
+        self.frames = frames
+        self.cats = cats
+        self.records = []
+        self.copy_sites = {}    # 위치 → [횟수, 바이트, 임시 객체 복사 횟수, 인자 방어 복사 여부]
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._temp_refs = 0
+        self._wrapper_refs = 0
+        self._probe = None
+        self.copy_on_write = False
+
+    # --- trace 훅 ---
+    def _stack(self):
+        if not hasattr(self._local, 'stack'):
+            self._local.stack = []
+        return self._local.stack
+
+    def _snapshot(self):
+        return tracemalloc.take_snapshot().filter_traces(
+            [tracemalloc.Filter(False, pattern) for pattern in _IGNORE]
+            + [tracemalloc.Filter(False, __file__, all_frames=True)]
+        )
+
+    def enter(self, span):
+        if span.cat not in self.cats:
+            return
+        if not tracemalloc.is_tracing():
+            # 첫 단계에서 시작: 그 전의 import(pandas 등) 할당은 추적/스냅샷 비교 대상에서 빠짐
+            tracemalloc.start(self.frames)
+        stack = self._stack()
+        current, peak = tracemalloc.get_traced_memory()
+        if stack:
+            stack[-1].peak = max(stack[-1].peak, peak)
+        tracemalloc.reset_peak()
+        rec = StageMemory(span.name, current, rss_bytes())
+        rec.before = self._snapshot()
+        # 스냅샷 자체가 잡은 메모리는 빼고 시작
+        rec.start = rec.peak = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        stack.append(rec)
+        span.data = rec
+
+    def exit(self, span):
+        rec = span.data
+        if not isinstance(rec, StageMemory):
+            return
+        stack = self._stack()
+        current, peak = tracemalloc.get_traced_memory()
+        rec.peak = max(rec.peak, peak)
+        rec.end = current
+        rec.rss_end = rss_bytes()
+        after = self._snapshot()
+        rec.top = self._top_sites(after.compare_to(rec.before, 'traceback'))
+        rec.before = None
+        if stack and stack[-1] is rec:
+            stack.pop()
+        if stack:
+            stack[-1].peak = max(stack[-1].peak, rec.peak)
+        with self._lock:
+            self.records.append(rec)
+
+    def _top_sites(self, diffs):
+        """스냅샷 차이 → 저장소 코드 위치별 증가량 상위 N개"""
+        sites = {}
+        for d in diffs:
+            frame = _user_frame(d.traceback)
+            row = sites.setdefault(_site(frame.filename, frame.lineno), [0, 0])
+            row[0] += d.size_diff
+            row[1] += d.count_diff
+        ranked = sorted(sites.items(), key=lambda kv: -kv[1][0])[:self.top]
+        return [(site, size, count) for site, (size, count) in ranked if size > 0]
+
+    # --- DataFrame.copy 감시 ---
+    def watch_copies(self):
+        """pandas.DataFrame.copy를 감싸 호출 위치/크기/임시 객체 여부 기록"""
+        try:
+            import pandas as pd
+        except ImportError:
+            return
+        original = pd.DataFrame.copy
+        if getattr(original, '_carestats_watch', False):
+            return
+        profiler = self
+        pandas_dir = os.path.dirname(pd.__file__)
+        self.copy_on_write = int(pd.__version__.split('.')[0]) >= 3 or pd.options.mode.copy_on_write is True
+
+        def copy(df, deep=True):
+            refs = sys.getrefcount(df)
+            result = original(df, deep)
+            if deep:
+                caller = sys._getframe(1)
+                if not caller.f_code.co_filename.startswith(pandas_dir):
+                    profiler._record_copy(df, refs, caller)
+            return result
+
+        copy._carestats_watch = True
+        copy.__doc__ = original.__doc__
+        pd.DataFrame.copy = copy
+
+        # 임시 객체를 인자로 받아 바로 복사할 때의 참조 수 (파이썬 버전마다 다름),
+        # traced() 래퍼 한 겹마다 늘어나는 참조 수 (인자 튜플)
+        def probe(df):
+            return df.copy()
+        self._temp_refs = self._calibrate(probe, pd)
+        self._wrapper_refs = self._calibrate(trace.traced()(probe), pd) - self._temp_refs
+
+    def _calibrate(self, fn, pd):
+        self._probe = []
+        fn(pd.DataFrame({'a': [0]}))
+        refs = self._probe[0]
+        self._probe = None
+        return refs
+
+    def _record_copy(self, df, refs, frame):
+        if self._probe is not None:     # 보정용 호출
+            self._probe.append(refs)
+            return
+        site = f"{_site(frame.f_code.co_filename, frame.f_lineno)} {frame.f_code.co_name}"
+        size = int(df.memory_usage(index=True, deep=False).sum())
+        wrappers = 0
+        outer = frame.f_back
+        while outer is not None and outer.f_code is _TRACED_CODE:
+            wrappers += 1
+            outer = outer.f_back
+        temporary = refs <= self._temp_refs + wrappers * self._wrapper_refs
+        with self._lock:
+            row = self.copy_sites.get(site)
+            if row is None:
+                row = self.copy_sites[site] = [0, 0, 0, self._defensive(frame)]
+            row[0] += 1
+            row[1] += size
+            row[2] += temporary
+
+    @staticmethod
+    def _defensive(frame):
+        """호출 줄이 '인자 = 인자.copy()' 형태인지"""
+        code = frame.f_code
+        line = linecache.getline(code.co_filename, frame.f_lineno)
+        m = re.match(r'\s*(\w+)\s*=\s*(\w+)\.copy\(', line)
+        return bool(m and m.group(1) == m.group(2) and m.group(1) in code.co_varnames[:code.co_argcount])
+
+    # --- 보고 ---
+    def report(self, limit=15):
+        if not self.records and not self.copy_sites:
+            return
+        by_name = {}
+        for rec in self.records:
+            by_name.setdefault(rec.name, []).append(rec)
+        rows = sorted(by_name.items(), key=lambda kv: -max(r.peak_delta for r in kv[1]))
+
+        print(f"\n=== 단계별 메모리 (tracemalloc, 최대 RSS {format_bytes(peak_rss_bytes())}) ===")
+        print(f"  {'단계':<34} {'횟수':>4} {'최대 증가':>10} {'남은 증가':>10} {'RSS 시작→끝':>21}")
+        for name, recs in rows[:limit]:
+            worst = max(recs, key=lambda r: r.peak_delta)
+            rss = f"{format_bytes(worst.rss_start)}→{format_bytes(worst.rss_end)}"
+            print(f"  {name[:34]:<34} {len(recs):>4} {format_bytes(worst.peak_delta):>10} "
+                  f"{format_bytes(worst.retained):>10} {rss:>21}")
+            for site, size, count in worst.top:
+                code = linecache.getline(site.rsplit(':', 1)[0], int(site.rsplit(':', 1)[1])).strip()
+                print(f"      +{format_bytes(size):>9} {count:>7}블록  {site}  {code[:60]}")
+
+        copies = sorted(self.copy_sites.items(), key=lambda kv: -kv[1][1])
+        if copies:
+            print("\n=== DataFrame.copy() 호출 위치 ===")
+            for site, (count, size, temporary, defensive) in copies[:limit]:
+                notes = []
+                if defensive:
+                    notes.append("인자 방어 복사: Copy-on-Write라 불필요" if self.copy_on_write
+                                 else "인자 방어 복사: 호출 측이 원본을 다시 쓰지 않으면 불필요")
+                if temporary:
+                    notes.append(f"임시 객체 복사 {temporary}회: 복사 없이 써도 됨")
+                mark = '⚠️' if notes else '  '
+                note = f"  ({'; '.join(notes)})" if notes else ''
+                print(f"  {mark} {site:<50} {count:>5}회 {format_bytes(size):>10}{note}")
+
+
+_PROFILER = None
+
+
+def enable(top=5, frames=10):
+    """메모리 프로파일 시작 (trace도 함께 켬) → MemoryProfiler"""
+    global _PROFILER
+    if _PROFILER is None:
+        _PROFILER = MemoryProfiler(top=top, frames=frames)
+        _PROFILER.watch_copies()
+        trace.add_hook(_PROFILER)
+        trace.enable()
+        atexit.register(_PROFILER.report)
+    return _PROFILER
+
+
+def enabled():
+    return _PROFILER is not None
+
+
+# 환경 변수로 켜기 (스크립트를 직접 실행할 때, --profile-memory의 하위 프로세스)
+if os.getenv('CARESTATS_PROFILE_MEMORY', '') not in ('', '0'):
+    enable()
@@ -0,0 +1,135 @@
+# -*- coding: utf-8 -*-
+"""정규화(min-max / z-score / robust)와 PCA(절단 SVD) NumPy 커널 — scikit-learn 대체
+
+모든 함수는 (..., n, k) 배열을 받는다. 마지막 두 축이 (행=지역, 열=지표)이고 앞쪽 축은 배치다.
+지역 수가 다른 묶음(시도별 시군구 등)은 pad_groups()로 (묶음 수, 최대 행 수, k)로 채우고
+mask (..., n)로 실제 행만 표시해 한 번에 계산한다. mask 밖의 행은 결과가 0이다.
+
+    x, mask, index = pad_groups(df[RAW_COLS].to_numpy(float), codes)
+    norm = minmax_scale(x, mask)[index]            # 시도마다 따로 정규화한 값 (원래 행 순서)
+    scores, components, ratio = pca(norm_2d, 2)    # sklearn PCA(n_components=2).fit_transform과 같은 값
+
+MinMaxScaler처럼 값이 모두 같은 열은 0, PCA 부호는 scikit-learn 1.5+과 같이
+각 주성분 벡터에서 절댓값이 가장 큰 성분이 양수가 되도록 맞춘다.
+"""
+import warnings
+
+import numpy as np
+
+
+def pad_groups(x, codes, n_groups=None):
+    """행 단위 값 x (n, k)와 묶음 코드 (n,) → (채운 배열 (g, m, k), mask (g, m), index)
+
+    index는 (묶음, 칸) 튜플이라 padded[index]가 x와 같은 행 순서의 (n, k) 배열이 된다.
+    """
+    x = np.asarray(x, dtype=float)
+    codes = np.asarray(codes, dtype=np.intp)
+    n_groups = int(codes.max()) + 1 if n_groups is None and len(codes) else (n_groups or 0)
+    counts = np.bincount(codes, minlength=n_groups)
+    order = np.argsort(codes, kind='stable')
+    starts = np.concatenate([[0], np.cumsum(counts)[:-1]])
+    slot = np.empty(len(codes), dtype=np.intp)
+    slot[order] = np.arange(len(codes)) - starts[codes[order]]
+    padded = np.zeros((n_groups, counts.max(initial=0)) + x.shape[1:])
+    mask = np.zeros((n_groups, counts.max(initial=0)), dtype=bool)
+    padded[codes, slot] = x
+    mask[codes, slot] = True
+    return padded, mask, (codes, slot)
+
+
+def _masked(x, mask):
+    """mask 밖의 행을 NaN으로 (nan 집계 함수용)"""
+    x = np.asarray(x, dtype=float)
+    if mask is None:
+        return x
+    return np.where(np.asarray(mask)[..., None], x, np.nan)
+
+
+def _finish(out, mask):
+    out = np.where(np.isfinite(out), out, 0.0)
+    return out if mask is None else np.where(np.asarray(mask)[..., None], out, 0.0)
+
+
+def _nan_stat(fn, x, *args, **kwargs):
+    # 행이 하나도 없는 묶음(패딩만 있는 배치)은 경고 없이 NaN → 결과 0
+    if x.shape[-2] == 0:
+        # 행 축 길이 0은 np.nanmin 등이 ValueError → NaN 한 행으로 대신 계산 ((..., 0, k) 결과)
+        x = np.full(x.shape[:-2] + (1,) + x.shape[-1:], np.nan)
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', RuntimeWarning)
+        return fn(x, *args, axis=-2, keepdims=True, **kwargs)
+
+
+def minmax_scale(x, mask=None):
+    """열마다 (x - min) / (max - min), 값이 모두 같은 열은 0"""
+    xm = _masked(x, mask)
+    lo = _nan_stat(np.nanmin, xm)
+    span = _nan_stat(np.nanmax, xm) - lo
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return _finish((xm - lo) / np.where(span > 0, span, np.nan), mask)
+
+
+def standard_scale(x, mask=None, ddof=0):
+    """열마다 (x - 평균) / 표준편차 (StandardScaler와 같은 ddof=0), 표준편차 0인 열은 0"""
+    xm = _masked(x, mask)
+    mean = _nan_stat(np.nanmean, xm)
+    std = _nan_stat(np.nanstd, xm, ddof=ddof)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return _finish((xm - mean) / np.where(std > 0, std, np.nan), mask)
+
+
+def robust_scale(x, mask=None, quantiles=(25.0, 75.0)):
+    """열마다 (x - 중앙값) / 사분위 범위 (RobustScaler 기본값), 범위 0인 열은 0"""
+    xm = _masked(x, mask)
+    median = _nan_stat(np.nanmedian, xm)
+    lo, hi = _nan_stat(np.nanpercentile, xm, list(quantiles))
+    iqr = hi - lo
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return _finish((xm - median) / np.where(iqr > 0, iqr, np.nan), mask)
+
+
+SCALERS = {
+    'minmax': minmax_scale,
+    'zscore': standard_scale,
+    'robust': robust_scale,
+}
+
+
+def scale(x, method='minmax', mask=None):
+    if method not in SCALERS:
+        raise ValueError(f"알 수 없는 정규화 방법: {method} (가능: {', '.join(SCALERS)})")
+    return SCALERS[method](x, mask)
+
+
+def pca(x, n_components=2, mask=None):
+    """평균을 뺀 행렬의 절단 SVD 투영
+
+    → (scores (..., n, c), components (..., c, k), explained_variance_ratio (..., c))
+    scores는 sklearn PCA(n_components=c).fit_transform(x)와 같다.
+    """
+    x = np.asarray(x, dtype=float)
+    n_rows, n_cols = x.shape[-2:]
+    if not 0 < n_components <= min(n_rows, n_cols):
+        raise ValueError(f"n_components는 1 ~ {min(n_rows, n_cols)} 사이여야 합니다: {n_components}")
+    if mask is None:
+        mask = np.ones(x.shape[:-1], dtype=bool)
+    mask = np.broadcast_to(np.asarray(mask, dtype=bool), x.shape[:-1])
+    weight = mask[..., None]
+    count = mask.sum(axis=-1)[..., None, None]
+    mean = np.where(weight, x, 0.0).sum(axis=-2, keepdims=True) / np.maximum(count, 1)
+    centered = np.where(weight, x - mean, 0.0)     # 패딩 행은 0 → 특이값/주성분에 영향 없음
+
+    u, s, vt = np.linalg.svd(centered, full_matrices=False)
+    # 부호 고정: 주성분마다 절댓값 최대 성분을 양수로
+    pivot = np.take_along_axis(vt, np.abs(vt).argmax(axis=-1)[..., None], axis=-1)
+    signs = np.where(pivot < 0, -1.0, 1.0)
+    vt = vt * signs
+    u = u * np.swapaxes(signs, -1, -2)
+
+    c = n_components
+    scores = u[..., :c] * s[..., None, :c]
+    variance = s ** 2 / np.maximum(count[..., 0] - 1, 1)
+    total = variance.sum(axis=-1, keepdims=True)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        ratio = np.where(total > 0, variance[..., :c] / total, 0.0)
+    return np.where(weight, scores, 0.0), vt[..., :c, :], ratio
@@ -0,0 +1,131 @@
+# -*- coding: utf-8 -*-
+"""워크시트 values (list of lists) → 타입이 지정된 NumPy 컬럼
+
+get_all_records()처럼 행마다 dict를 만들지 않고, 필요한 열만 꺼내
+열마다 한 번의 벡터 연산으로 정리한다.
+- 숫자 열: '1,234' → 1234, 빈칸/오류 셀 → fill
+- 문자 열: 앞뒤 공백 제거
+- '#REF!' 등 오류 셀이 있는 행은 (drop_errors=True면) 버린다.
+
+    df = parse_values(vals, {'통계시도명': 'str', '지급건수': 'int'})
+"""
+import numpy as np
+import pandas as pd
+
+MAX_INT_WIDTH = 24   # 정수 벡터 변환을 시도할 최대 문자열 길이 (부호/콤마 포함)
+MAX_INT_DIGITS = 18  # 벡터 누적으로 바로 바꾸는 최대 자릿수 (10**18 < int64 최대값, 더 길면 pd.to_numeric/int)
+ERROR_CELLS = ['#REF!', '#N/A', '#VALUE!', '#DIV/0!', '#NAME?', '#NUM!', '#NULL!', '#ERROR!']
+
+
+def _text(values):
+    """셀 값 배열 → 공백 제거한 유니코드 배열 (None은 '')"""
+    if isinstance(values, np.ndarray) and values.dtype.kind == 'U':
+        return values
+    arr = np.asarray(values, dtype=object)
+    if arr.size:
+        arr[np.equal(arr, None)] = ''
+    return np.char.strip(arr.astype(str))
+
+
+def error_mask(text):
+    return np.isin(text, ERROR_CELLS)
+
+
+def parse_numeric(values, dtype='int64', fill=0):
+    """숫자 열 → dtype 배열 (천 단위 콤마 제거, 빈칸/오류/문자는 fill)
+
+    정수 모양('-1,234')이고 18자리 이하인 셀은 문자열을 코드포인트 행렬로 보고 자릿수만큼 벡터 누적해서
+    바로 변환하고, 소수/지수 표기나 더 긴 정수 등 나머지 셀만 pd.to_numeric으로 넘긴다.
+    정수 dtype에 담을 수 없는 값은 fill로 두고 개수를 알린다.
+    """
+    text = _text(values)
+    n = len(text)
+    out = np.full(n, fill, dtype=dtype)
+    width = text.dtype.itemsize // 4
+    simple = np.zeros(n, dtype=bool)
+    if n and 0 < width <= MAX_INT_WIDTH:
+        cp = text.view(np.uint32).reshape(n, width)
+        is_digit = (cp >= 48) & (cp <= 57)
+        neg = cp[:, 0] == 45
+        ok = is_digit | (cp == 44) | (cp == 0)
+        ok[:, 0] |= neg
+        digits = is_digit.sum(axis=1)
+        simple = ok.all(axis=1) & (digits > 0) & (digits <= MAX_INT_DIGITS)
+        acc = np.zeros(n, dtype=np.int64)
+        for j in range(width):
+            d = is_digit[:, j] & simple
+            acc[d] = acc[d] * 10 + (cp[d, j].astype(np.int64) - 48)
+        acc[neg] *= -1
+        out[simple] = acc[simple]
+    rest = ~simple & (text != '') & ~error_mask(text)
+    if rest.any():
+        cells = np.char.replace(text[rest], ',', '').astype(object)
+        nums = np.asarray(pd.to_numeric(cells, errors='coerce'), dtype=float)
+        if out.dtype.kind in 'iu':
+            out[rest] = _to_int(cells, nums, out.dtype, fill)
+        else:
+            out[rest] = np.where(np.isnan(nums), fill, nums)
+    return out
+
+
+def _to_int(cells, nums, dtype, fill):
+    """pd.to_numeric 결과 → 정수 (정수 모양 셀은 int()로 정확히, 범위를 넘거나 숫자가 아니면 fill)"""
+    info = np.iinfo(dtype)
+    vals = []
+    overflow = 0
+    for cell, num in zip(cells, nums):
+        try:
+            value = int(cell)
+        except ValueError:
+            value = None if np.isnan(num) else num
+        if value is not None and not info.min <= value <= info.max:
+            overflow += 1
+            value = None
+        vals.append(fill if value is None else int(value))
+    if overflow:
+        print(f"⚠️ {dtype} 범위를 넘는 숫자 셀 {overflow}개 → {fill}")
+    return np.array(vals, dtype=dtype)
+
+
+def parse_text(values):
+    return _text(values)
+
+
+def column(rows, i):
+    """행 목록에서 i번째 열만 꺼냄 (짧은 행은 '')"""
+    return [r[i] if i < len(r) else '' for r in rows]
+
+
+def parse_values(values, schema=None, header_row=0, names=None, drop_errors=True):
+    """values → DataFrame
+
+    schema: {컬럼명: 'int' | 'float' | 'str'} (없으면 모든 열을 문자로), schema에 없는 열은 버린다.
+    names: 헤더 행 대신 쓸 컬럼명 목록 (헤더 문구가 일정하지 않은 시트용)
+    """
+    if len(values) <= header_row:
+        return pd.DataFrame(columns=list(schema or names or []))
+    header = list(names) if names else [str(c).strip() for c in values[header_row]]
+    rows = values[header_row + 1:]
+    schema = schema or {name: 'str' for name in header}
+
+    out = {}
+    bad = np.zeros(len(rows), dtype=bool)
+    for name, kind in schema.items():
+        if name not in header:
+            raise KeyError(f"워크시트에 '{name}' 컬럼이 없습니다.")
+        col = _text(column(rows, header.index(name)))
+        if drop_errors:
+            bad |= error_mask(col)
+        if kind == 'int':
+            out[name] = parse_numeric(col, 'int64', 0)
+        elif kind == 'float':
+            out[name] = parse_numeric(col, 'float64', np.nan)
+        elif kind == 'str':
+            out[name] = parse_text(col)
+        else:
+            raise ValueError(f"알 수 없는 컬럼 타입: {kind}")
+
+    if drop_errors and bad.any():
+        keep = ~bad
+        out = {name: arr[keep] for name, arr in out.items()}
+    return pd.DataFrame(out, columns=list(schema))
@@ -0,0 +1,270 @@
+# -*- coding: utf-8 -*-
+"""의존성 그래프(DAG) 실행기: 단계 결과를 내용 주소(content-addressed)로 캐시하고 독립 단계는 병렬 실행
+
+    p = Pipeline()
+    p.add('sheet1', load_sheet, ['revision'], params={'index': 1})
+    p.add('capacity', capacity_by_sido, ['sheet1'])
+    p.add('capacity_map', render, ['capacity', 'coords'], params={'out': path}, writes=True)
+    p.run()
+
+단계 키 = sha256(함수 소스, code로 준 모듈/정적 파일 내용, params, 입력 결과의 digest). 결과는 digest(피클 sha256) 이름으로
+cache_dir/objects에 한 번만 저장하고, cache_dir/keys/<키>에는 digest만 남긴다.
+- 입력 내용이 같으면 (원본을 다시 받아왔더라도) 하위 단계는 캐시에서 끝난다.
+- 캐시에 맞은 단계의 결과는 하위 단계가 실제로 실행될 때만 풀어서 읽는다.
+- writes=True 단계는 결과(파일 경로 또는 경로 목록)가 디스크에 모두 있어야 캐시로 인정한다.
+- cache=False 단계(원본 버전 조회 등)는 매번 실행한다.
+- 함수 소스만으로는 함수가 부르는 모듈의 변경을 모르므로, 결과에 영향을 주는 모듈/파일은
+  code=['carestats.maps', 'static/map.js']처럼 단계에 함께 등록한다 (하나라도 바뀌면 다시 실행).
+- 같은 lock 이름을 가진 단계는 동시에 실행하지 않는다 (matplotlib pyplot 등 스레드 안전하지 않은 코드).
+"""
+import hashlib
+import inspect
+import json
+import os
+import pickle
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from carestats import config
+from carestats.freshness import code_paths, file_fingerprint
+from carestats.trace import span
+
+_FINGERPRINTS = {}   # 경로 → 마지막 file_fingerprint (크기/mtime이 같으면 다시 해시하지 않음)
+
+
+def default_cache_dir():
+    return os.path.join(config.STATE_DIR, 'pipeline')
+
+
+def _digest(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+def function_id(fn):
+    """함수 이름 + 소스 해시 (코드가 바뀌면 캐시 무효화)"""
+    try:
+        source = inspect.getsource(fn)
+    except (OSError, TypeError):
+        source = repr(getattr(fn, '__code__', fn))
+    name = f"{getattr(fn, '__module__', '')}.{getattr(fn, '__qualname__', repr(fn))}"
+    return name, _digest(source.encode('utf-8'))
+
+
+def code_digest(modules):
+    """모듈/파일 목록 → 내용 해시 (없는 파일은 None으로 들어감)"""
+    hashes = []
+    for path in code_paths(modules):
+        fp = file_fingerprint(path, _FINGERPRINTS.get(path))
+        _FINGERPRINTS[path] = fp
+        hashes.append([os.path.basename(path), fp and fp['sha256']])
+    return _digest(json.dumps(hashes).encode('utf-8'))
+
+
+class Stage:
+    def __init__(self, name, fn, inputs=(), params=None, cache=True, writes=False, lock=None, code=()):
+        self.name = name
+        self.fn = fn
+        self.inputs = tuple(inputs)
+        self.params = dict(params or {})
+        self.cache = cache
+        self.writes = writes
+        self.lock = lock
+        self.code = tuple(code)
+
+
+class StageResult:
+    def __init__(self, name, status, seconds=0.0, digest=None, error=None):
+        self.name = name
+        self.status = status      # 'run' | 'hit' | 'failed' | 'skipped'
+        self.seconds = seconds
+        self.digest = digest
+        self.error = error
+
+
+class Pipeline:
+    def __init__(self, cache_dir=None, workers=4):
+        self.cache_dir = cache_dir or default_cache_dir()
+        self.workers = workers
+        self.stages = {}
+        self.values = {}
+        self.digests = {}
+        self._locks = {}
+
+    def add(self, name, fn, inputs=(), params=None, cache=True, writes=False, lock=None, code=()):
+        if name in self.stages:
+            raise ValueError(f"이미 등록된 단계: {name}")
+        for dep in inputs:
+            if dep not in self.stages:
+                raise KeyError(f"'{name}'의 입력 단계 '{dep}'가 먼저 등록되어야 합니다.")
+        self.stages[name] = Stage(name, fn, inputs, params, cache, writes, lock, code)
+        if lock:
+            self._locks.setdefault(lock, threading.Lock())
+        return name
+
+    # --- 실행 순서 ---
+    def upstream(self, targets):
+        """targets와 그 입력 단계 전부 (등록 순서 = 위상 순서)"""
+        needed = set()
+        stack = list(targets)
+        while stack:
+            name = stack.pop()
+            if name not in self.stages:
+                raise KeyError(f"알 수 없는 단계: {name}")
+            if name not in needed:
+                needed.add(name)
+                stack.extend(self.stages[name].inputs)
+        return [n for n in self.stages if n in needed]
+
+    # --- 캐시 ---
+    def _key_path(self, key):
+        return os.path.join(self.cache_dir, 'keys', key)
+
+    def _object_path(self, digest):
+        return os.path.join(self.cache_dir, 'objects', digest[:2], f"{digest}.pkl")
+
+    def stage_key(self, stage, input_digests):
+        name, code = function_id(stage.fn)
+        deps = code_digest(stage.code) if stage.code else None
+        payload = json.dumps(
+            [name, code, deps, stage.params, input_digests],
+            sort_keys=True, ensure_ascii=False, default=repr,
+        )
+        return _digest(payload.encode('utf-8'))
+
+    def _lookup(self, key):
+        try:
+            with open(self._key_path(key), encoding='utf-8') as f:
+                digest = f.read().strip()
+        except OSError:
+            return None
+        return digest if os.path.exists(self._object_path(digest)) else None
+
+    def _store(self, key, data, digest):
+        path = self._object_path(digest)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp = f"{path}.{threading.get_ident()}.tmp"
+            with open(tmp, 'wb') as f:
+                f.write(data)
+            os.replace(tmp, path)
+        key_path = self._key_path(key)
+        os.makedirs(os.path.dirname(key_path), exist_ok=True)
+        with open(key_path, 'w', encoding='utf-8') as f:
+            f.write(digest)
+
+    def _load(self, digest):
+        with open(self._object_path(digest), 'rb') as f:
+            return pickle.load(f)
+
+    @staticmethod
+    def _files_exist(value):
+        paths = [value] if isinstance(value, str) else list(value or [])
+        return all(os.path.exists(p) for p in paths)
+
+    # --- 실행 ---
+    def _run_stage(self, stage, digests, values, values_lock):
+        def value_of(dep):
+            with values_lock:
+                if dep not in values:
+                    values[dep] = self._load(digests[dep])
+                return values[dep]
+
+        start = time.perf_counter()
+        key = None
+        if stage.cache:
+            key = self.stage_key(stage, [digests[d] for d in stage.inputs])
+            digest = self._lookup(key)
+            if digest is not None and (not stage.writes or self._files_exist(self._load(digest))):
+                return StageResult(stage.name, 'hit', time.perf_counter() - start, digest), None, False
+
+        args = [value_of(d) for d in stage.inputs]
+        lock = self._locks.get(stage.lock)
+        if lock:
+            with lock, span(stage.name, 'pipeline'):
+                value = stage.fn(*args, **stage.params)
+        else:
+            with span(stage.name, 'pipeline'):
+                value = stage.fn(*args, **stage.params)
+        with span('cache.store', 'io'):
+            data = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+            digest = _digest(data)
+            if stage.cache:
+                self._store(key, data, digest)
+        return StageResult(stage.name, 'run', time.perf_counter() - start, digest), value, True
+
+    def run(self, targets=None, verbose=True):
+        """targets(없으면 전체)와 필요한 입력 단계를 실행 → {단계명: StageResult}"""
+        order = self.upstream(targets or list(self.stages))
+        pending = {n: set(self.stages[n].inputs) for n in order}
+        digests, values, results = {}, {}, {}
+        values_lock = threading.Lock()
+        running = {}
+
+        def finish(name, result):
+            results[name] = result
+            for deps in pending.values():
+                deps.discard(name)
+            if result.status != 'failed':
+                return
+            # 실패한 단계에 (간접적으로) 의존하는 단계는 건너뜀
+            skipped = True
+            while skipped:
+                skipped = False
+                for other in list(pending):
+                    if any(results.get(d) and results[d].status in ('failed', 'skipped')
+                           for d in self.stages[other].inputs):
+                        del pending[other]
+                        results[other] = StageResult(other, 'skipped')
+                        skipped = True
+
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            while pending or running:
+                for name in [n for n, deps in pending.items() if not deps]:
+                    del pending[name]
+                    running[pool.submit(self._run_stage, self.stages[name], digests, values, values_lock)] = name
+                if not running:
+                    break
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for fut in done:
+                    name = running.pop(fut)
+                    try:
+                        result, value, fresh = fut.result()
+                    except Exception as e:
+                        result = StageResult(name, 'failed', error=e)
+                        if verbose:
+                            print(f"❌ {name}: {e}")
+                    else:
+                        digests[name] = result.digest
+                        if fresh:
+                            with values_lock:
+                                values[name] = value
+                        if verbose:
+                            mark = '✅' if result.status == 'run' else '♻️'
+                            print(f"{mark} {name} ({result.seconds:.2f}s)")
+                    finish(name, result)
+
+        self.values = values
+        self.digests = digests
+        return results
+
+    def result(self, name):
+        """run() 이후 단계 결과 값 (캐시에 맞은 단계는 여기서 읽어 옴)"""
+        if name not in self.values:
+            self.values[name] = self._load(self.digests[name])
+        return self.values[name]
+
+
+def print_summary(results):
+    counts = {}
+    for r in results.values():
+        counts[r.status] = counts.get(r.status, 0) + 1
+    total = sum(r.seconds for r in results.values())
+    print("\n=== 파이프라인 요약 ===")
+    print("  " + ", ".join(f"{k} {v}" for k, v in sorted(counts.items())) + f" (단계 시간 합 {total:.1f}s)")
+    slow = sorted((r for r in results.values() if r.status == 'run'), key=lambda r: -r.seconds)[:10]
+    for r in slow:
+        print(f"  {r.name:<32} {r.seconds:7.2f}s")
+    for r in results.values():
+        if r.status == 'failed':
+            print(f"  ❌ {r.name}: {r.error}")
@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+"""필요한 컬럼만 읽기: 헤더(1행)로 컬럼 위치를 찾고 해당 열 범위만 요청
+
+    ranges = column_ranges(title, header, ['통계시도명', '지급건수'])   # ["'시트'!C2:C", "'시트'!F2:F"]
+    (values.batchGet, majorDimension=COLUMNS)
+    df = columns_to_frame(columns, ['통계시도명', '지급건수'], where={'통계시도명': '서울특별시'})
+"""
+import pandas as pd
+
+
+def column_letter(i):
+    """0부터 시작하는 열 번호 → A1 표기 (0 → A, 26 → AA)"""
+    letters = ''
+    i += 1
+    while i:
+        i, r = divmod(i - 1, 26)
+        letters = chr(65 + r) + letters
+    return letters
+
+
+def quote_title(title):
+    return "'" + title.replace("'", "''") + "'"
+
+
+def resolve_columns(header, columns):
+    """헤더 목록에서 컬럼 위치 찾기 (없으면 KeyError)"""
+    header = [str(c).strip() for c in header]
+    positions = []
+    for col in columns:
+        if col not in header:
+            raise KeyError(f"워크시트에 '{col}' 컬럼이 없습니다.")
+        positions.append(header.index(col))
+    return positions
+
+
+def needed_columns(columns, where=None):
+    """반환할 컬럼 + 필터에만 쓰이는 컬럼 (순서 유지, 중복 제거)"""
+    return list(dict.fromkeys(list(columns) + list(where or {})))
+
+
+def column_ranges(title, header, columns, header_row=1):
+    """컬럼명 목록 → 열 단위 A1 범위 목록 (헤더 다음 행부터 끝까지)"""
+    start = header_row + 1
+    return [
+        f"{quote_title(title)}!{column_letter(i)}{start}:{column_letter(i)}"
+        for i in resolve_columns(header, columns)
+    ]
+
+
+def _matches(values, wanted):
+    if isinstance(wanted, (list, tuple, set, frozenset)):
+        wanted = {str(w) for w in wanted}
+        return [str(v).strip() in wanted for v in values]
+    wanted = str(wanted)
+    return [str(v).strip() == wanted for v in values]
+
+
+def columns_to_frame(column_values, columns, where=None):
+    """열 단위 값 목록(needed_columns 순서) → DataFrame
+
+    where={'컬럼': 값 또는 값 목록} 조건은 DataFrame을 만들기 전에 적용해
+    조건에 맞는 행만 남긴다. 필터에만 쓰인 컬럼은 결과에서 빠진다.
+    """
+    names = needed_columns(columns, where)
+    n = max((len(v) for v in column_values), default=0)
+    data = {
+        name: list(values) + [''] * (n - len(values))
+        for name, values in zip(names, column_values)
+    }
+    if where:
+        keep = [True] * n
+        for col, wanted in where.items():
+            keep = [k and m for k, m in zip(keep, _matches(data[col], wanted))]
+        rows = [i for i, k in enumerate(keep) if k]
+        data = {name: [data[name][i] for i in rows] for name in columns}
+    else:
+        data = {name: data[name] for name in columns}
+    return pd.DataFrame(data, columns=list(columns))
@@ -0,0 +1,270 @@
+# -*- coding: utf-8 -*-
+"""Sheets/Drive 호출 공통 요청 계층: 토큰 버킷 속도 제한 + 429/5xx 지수 백오프 재시도
+
+- 토큰 버킷은 API별(sheets, drive)로 하나씩, 상태를 임시 디렉터리 파일에 저장해서
+  스크립트를 연달아 실행해도 같은 프로젝트 할당량을 나눠 쓴다.
+- 재시도 대기 시간은 full jitter (0 ~ min(cap, base * 2^n)), Retry-After 헤더가 있으면 그 이상.
+- 재시도 횟수, 상태 코드, 할당량 대기/백오프 시간은 METRICS에 모이고 종료 시 요약을 출력한다.
+"""
+import asyncio
+import atexit
+import contextlib
+import json
+import os
+import random
+import tempfile
+import threading
+import time
+from collections import Counter
+
+from carestats import config
+from carestats.trace import span
+
+# 분당 요청 수 (Sheets API 읽기 기본 할당량: 사용자(서비스 계정)당 분당 60회)
+QUOTAS_PER_MINUTE = {
+    'sheets': int(os.getenv("CARESTATS_SHEETS_QUOTA_PER_MIN", "60")),
+    'drive': int(os.getenv("CARESTATS_DRIVE_QUOTA_PER_MIN", "1000")),
+}
+RETRY_STATUSES = {408, 429, 500, 502, 503, 504}
+RATE_LIMIT_REASONS = ('rateLimitExceeded', 'userRateLimitExceeded', 'quotaExceeded')
+
+
+class QuotaMetrics:
+    """재시도/속도 제한 통계"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.retries = 0
+        self.failures = 0
+        self.statuses = Counter()
+        self.throttled_seconds = 0.0
+        self.backoff_seconds = 0.0
+
+    def record_request(self):
+        with self.lock:
+            self.requests += 1
+
+    def record_throttle(self, seconds):
+        with self.lock:
+            self.throttled_seconds += seconds
+
+    def record_retry(self, status, delay):
+        with self.lock:
+            self.retries += 1
+            self.statuses[status] += 1
+            self.backoff_seconds += delay
+
+    def record_failure(self, status):
+        with self.lock:
+            self.failures += 1
+            self.statuses[status] += 1
+
+    def summary(self):
+        return {
+            'requests': self.requests,
+            'retries': self.retries,
+            'failures': self.failures,
+            'statuses': dict(self.statuses),
+            'throttled_seconds': round(self.throttled_seconds, 3),
+            'backoff_seconds': round(self.backoff_seconds, 3),
+        }
+
+    def report(self):
+        """재시도나 대기가 있었을 때만 요약 출력"""
+        if not (self.retries or self.failures or self.throttled_seconds):
+            return
+        s = self.summary()
+        print(
+            f"📊 API 요청 {s['requests']}회, 재시도 {s['retries']}회, 실패 {s['failures']}회, "
+            f"할당량 대기 {s['throttled_seconds']:.1f}초, 백오프 {s['backoff_seconds']:.1f}초 "
+            f"(상태 코드: {s['statuses']})"
+        )
+
+
+METRICS = QuotaMetrics()
+atexit.register(METRICS.report)
+
+
+@contextlib.contextmanager
+def _locked(path):
+    """상태 파일에 프로세스 간 배타 잠금 (fcntl/msvcrt가 없으면 잠금 없이 진행)"""
+    fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+    try:
+        try:
+            import fcntl
+            fcntl.flock(fd, fcntl.LOCK_EX)
+        except ImportError:
+            try:
+                import msvcrt
+                msvcrt.locking(fd, msvcrt.LK_LOCK, 1)
+            except (ImportError, OSError):
+                pass
+        yield fd
+    finally:
+        os.close(fd)
+
+
+class TokenBucket:
+    """분당 rate_per_minute 개, 최대 capacity 개까지 쌓이는 토큰 버킷
+
+    토큰이 모자라면 음수로 예약하고 그만큼 기다리므로 동시 호출자도 순서대로 분산된다.
+    state_path를 주면 (tokens, 시각)을 파일에 저장해 여러 프로세스가 공유한다.
+    """
+
+    def __init__(self, rate_per_minute, capacity=None, state_path=None):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = capacity if capacity is not None else rate_per_minute
+        self.state_path = state_path
+        self.tokens = float(self.capacity)
+        self.updated = time.time()
+        self._lock = threading.Lock()
+
+    def _refill(self, tokens, updated, now):
+        return min(self.capacity, tokens + (now - updated) * self.rate)
+
+    def _reserve_local(self, now):
+        self.tokens = self._refill(self.tokens, self.updated, now) - 1
+        self.updated = now
+        return self.tokens
+
+    def _reserve_shared(self, now):
+        with _locked(self.state_path) as fd:
+            raw = os.read(fd, 256)
+            try:
+                state = json.loads(raw)
+                tokens, updated = float(state['tokens']), float(state['updated'])
+            except (ValueError, KeyError, TypeError):
+                tokens, updated = float(self.capacity), now
+            tokens = self._refill(tokens, updated, now) - 1
+            os.lseek(fd, 0, os.SEEK_SET)
+            os.ftruncate(fd, 0)
+            os.write(fd, json.dumps({'tokens': tokens, 'updated': now}).encode())
+        return tokens
+
+    def reserve(self):
+        """토큰 하나를 예약하고 기다려야 할 시간(초)을 반환"""
+        with self._lock:
+            now = time.time()
+            if self.state_path:
+                try:
+                    tokens = self._reserve_shared(now)
+                except OSError:
+                    tokens = self._reserve_local(now)
+            else:
+                tokens = self._reserve_local(now)
+        return max(0.0, -tokens / self.rate)
+
+    def acquire(self):
+        wait = self.reserve()
+        if wait:
+            METRICS.record_throttle(wait)
+            with span('quota.wait', 'sleep'):
+                time.sleep(wait)
+
+    async def acquire_async(self):
+        wait = self.reserve()
+        if wait:
+            METRICS.record_throttle(wait)
+            await asyncio.sleep(wait)
+
+
+_BUCKETS = {}
+
+
+def _project_id():
+    try:
+        with open(config.KEY_PATH, encoding='utf-8') as f:
+            return json.load(f).get('project_id', 'default')
+    except (OSError, ValueError):
+        return 'default'
+
+
+def get_bucket(api='sheets'):
+    """API별 프로젝트 공용 토큰 버킷"""
+    if api not in _BUCKETS:
+        state = os.path.join(tempfile.gettempdir(), f"carestats-quota-{_project_id()}-{api}.json")
+        _BUCKETS[api] = TokenBucket(QUOTAS_PER_MINUTE[api], state_path=state)
+    return _BUCKETS[api]
+
+
+# --- 재시도 ---
+def backoff_delay(attempt, base=1.0, cap=64.0):
+    """full jitter 지수 백오프"""
+    return random.uniform(0, min(cap, base * 2 ** attempt))
+
+
+def error_status(exc):
+    """예외 → (HTTP 상태 코드 또는 'network', Retry-After 초) / 재시도 대상이 아니면 (None, None)"""
+    response = getattr(exc, 'response', None)
+    resp = getattr(exc, 'resp', None)
+    if response is not None and hasattr(response, 'status_code'):
+        status, headers = response.status_code, response.headers      # gspread APIError, requests
+    elif resp is not None and hasattr(resp, 'status'):
+        status, headers = int(resp.status), resp                     # googleapiclient HttpError
+    elif isinstance(getattr(exc, 'status', None), int):
+        status, headers = exc.status, getattr(exc, 'headers', None) or {}   # aiohttp ClientResponseError
+    elif isinstance(exc, (OSError, asyncio.TimeoutError)) or type(exc).__name__ in (
+            'ClientConnectionError', 'ServerDisconnectedError', 'ClientPayloadError'):
+        return 'network', None
+    else:
+        return None, None
+
+    retry_after = None
+    try:
+        retry_after = float(headers.get('Retry-After'))
+    except (TypeError, ValueError, AttributeError):
+        pass
+    if status in RETRY_STATUSES:
+        return status, retry_after
+    # Drive API는 할당량 초과를 403 usageLimits로 돌려줌
+    if status == 403 and any(r in str(exc) for r in RATE_LIMIT_REASONS):
+        return status, retry_after
+    return None, None
+
+
+def _next_delay(exc, attempt, max_attempts):
+    status, retry_after = error_status(exc)
+    if status is None or attempt + 1 >= max_attempts:
+        METRICS.record_failure(status or type(exc).__name__)
+        return None
+    delay = max(backoff_delay(attempt), retry_after or 0.0)
+    METRICS.record_retry(status, delay)
+    print(f"⚠️ API 오류({status}), {delay:.1f}초 후 재시도 ({attempt + 1}/{max_attempts - 1})")
+    return delay
+
+
+def call_with_retry(fn, *args, api='sheets', max_attempts=6, **kwargs):
+    """fn(*args, **kwargs)를 속도 제한 + 재시도와 함께 호출"""
+    bucket = get_bucket(api)
+    for attempt in range(max_attempts):
+        bucket.acquire()
+        METRICS.record_request()
+        try:
+            return fn(*args, **kwargs)
+        except Exception as e:
+            delay = _next_delay(e, attempt, max_attempts)
+            if delay is None:
+                raise
+        with span('quota.backoff', 'sleep', api=api):
+            time.sleep(delay)
+
+
+async def call_with_retry_async(fn, *args, api='sheets', max_attempts=6, **kwargs):
+    """비동기 버전: await fn(*args, **kwargs)"""
+    bucket = get_bucket(api)
+    for attempt in range(max_attempts):
+        await bucket.acquire_async()
+        METRICS.record_request()
+        try:
+            return await fn(*args, **kwargs)
+        except Exception as e:
+            delay = _next_delay(e, attempt, max_attempts)
+            if delay is None:
+                raise
+        await asyncio.sleep(delay)
+
+
+def execute(request, api='sheets', max_attempts=6):
+    """googleapiclient 요청 객체의 .execute()를 재시도 계층으로 실행"""
+    return call_with_retry(request.execute, api=api, max_attempts=max_attempts)
@@ -0,0 +1,507 @@
+# -*- coding: utf-8 -*-
+"""전체 산출물 갱신 그래프: 지도 9개 + 시도별 차트 34개 + 공백 지표 구간표 (+ 경계 파일이 있으면 시군구별 정원/접근성/단계구분도)
+
+스크립트마다 반복되던 '시트 로드 → 정리 → 집계 → 지오코딩 → 렌더링'을 하나의 DAG로 선언한다.
+- 워크시트는 (1, 2, 3, 4:A3:B23, 7:A3:D) 각각 한 번만 읽는다.
+- 지오코딩은 질의 형식별로 모든 지도의 지역명을 합쳐 한 단계에서 처리하므로 이름마다 한 번만 질의한다.
+- 원본 Drive 버전이 그대로면 로드 단계부터 캐시에서 끝나고, 집계 결과가 같으면 렌더링도 건너뛴다.
+
+    python -m carestats refresh               # 전체
+    python -m carestats refresh --only map:woohyun/capacity_bubble_map.html
+    python -m carestats refresh --site /tmp/site   # 지도를 한 사이트 디렉터리로 (carestats.site, 대시보드 포함)
+"""
+import os
+import runpy
+import threading
+
+import pandas as pd
+
+from carestats import config, regions
+from carestats.freshness import file_hash
+from carestats.parsing import parse_numeric, parse_values
+from carestats.pipeline import Pipeline, print_summary
+from carestats.regions import SIDO
+
+WOOHYUN_DIR = os.path.join(config.ROOT_DIR, 'woohyun')
+SANGHO_DIR = os.path.join(config.ROOT_DIR, 'sangho')
+FAMILY_SCRIPT = os.path.join(WOOHYUN_DIR, '가족유형.py')
+INCOME_SCRIPT = os.path.join(WOOHYUN_DIR, '중위소득비율.py')
+
+NATION = "{}, South Korea"
+SEOUL = "{}, 서울특별시, South Korea"
+
+# 단계 함수가 부르는 모듈 (단계 키에 내용 해시가 들어가 바뀌면 다시 실행, carestats.pipeline code=)
+LOAD_CODE = ['carestats.sheets']
+PARSE_CODE = ['carestats.parsing']
+FRAME_CODE = ['carestats.datasets', 'carestats.parsing', 'carestats.regions']
+GEOCODE_CODE = ['carestats.geocode', 'carestats.address', 'carestats.regions']
+GAP_CODE = ['carestats.gap', 'carestats.numeric']
+MAP_CODE = ['carestats.maps', 'carestats.site', 'static/map.js', 'static/map.css']
+SHAPE_CODE = MAP_CODE + ['carestats.shapes', 'carestats.spatial', 'carestats.regions']
+
+_SPREADSHEET = None
+_SPREADSHEET_LOCK = threading.Lock()
+_SCRIPTS = {}
+_SCRIPTS_LOCK = threading.Lock()
+
+
+# --- 원본 ---
+def _spreadsheet():
+    global _SPREADSHEET
+    with _SPREADSHEET_LOCK:
+        if _SPREADSHEET is None:
+            from carestats.sheets import open_spreadsheet
+            _SPREADSHEET = open_spreadsheet()
+        return _SPREADSHEET
+
+
+def source_revision():
+    """스프레드시트 Drive 버전 (매 실행 1회, 로드 단계의 캐시 키가 됨)"""
+    from carestats.freshness import drive_revision
+    return drive_revision(config.SPREADSHEET_ID)
+
+
+def load_sheet(revision, index):
+    from carestats.sheets import load_worksheet
+    return load_worksheet(index, _spreadsheet())
+
+
+def load_range(revision, index, a1_range):
+    from carestats.sheets import load_range as _load_range
+    return _load_range(index, a1_range, _spreadsheet())
+
+
+# --- 정리/집계 ---
+# 지역 차원 (carestats.regions): 이름 → 정수 코드로 바꿔 합산하므로 '서울'/'서울특별시' 같은 별칭이 한 지역이 됨
+REGION_DIMS = {'sido': regions.SIDO, 'seoul': regions.SEOUL}
+
+
+def sum_by(df, key, value, out_col, dim=None, sido_col=None, sido=None, fill=False, context=''):
+    """key별 value 합계 → [지역코드, key(공식 이름), out_col] (dim이 없으면 [key, out_col])
+
+    dim: REGION_DIMS 이름 ('sido' | 'seoul'), 목록에 없는 이름의 행은 버리고 ⚠️로 알림
+    sido_col/sido: 이 시도의 행만 (SIDO 코드로 비교하므로 약칭/공식 명칭 모두)
+    fill: dim의 기대 구성원 전체 (없는 지역은 0)
+    dim 없이 이름 글자로 묶는 것은 코드표가 없는 전국 시군구뿐이다.
+    """
+    if sido is not None:
+        df = df[SIDO.codes(df[sido_col]) == SIDO.code(sido)]
+    values = parse_numeric(df[value].to_numpy(dtype=object))
+    if dim is not None:
+        region_dim = REGION_DIMS[dim]
+        summary = region_dim.sum_by(df[key], values, context)
+        if fill:
+            summary = region_dim.reindex(summary)
+        return region_dim.named(summary.rename(out_col), key).reset_index()
+    keys = df[key].astype(str).str.strip()
+    values = pd.Series(values, index=df.index)
+    summary = values[keys != ''].groupby(keys[keys != '']).sum()
+    return summary.rename(out_col).rename_axis(key).reset_index()
+
+
+def members_by_sido(raw):
+    """워크시트 7 A3:D → [시도코드, 시도, 수급자수] ('계→소계' 행만, 시도 코드별 합계)"""
+    df = parse_values(
+        raw,
+        {'시도': 'str', '특성1': 'str', '특성2': 'str', '수급자수': 'int'},
+        names=['시도', '특성1', '특성2', '수급자수'],
+    )
+    df = df[(df['특성1'] == '계') & (df['특성2'] == '소계') & (df['시도'] != '계')]
+    return SIDO.named(SIDO.sum_by(df['시도'], df['수급자수'], '워크시트 7').rename('수급자수')).reset_index()
+
+
+def households_by_region(raw):
+    """워크시트 4 A3:B23 → 지역/한부모 가구 수 (3번째 행이 헤더)"""
+    df = parse_values(raw, {'지역': 'str', '한부모 가구 수': 'int'}, header_row=2,
+                      names=['지역', '한부모 가구 수'], drop_errors=False)
+    return df[df['지역'] != ''].reset_index(drop=True)
+
+
+def facility_addresses(df):
+    """워크시트 1 → 시설명/지오코딩용 주소 (표준 주소 키, carestats.address)"""
+    from carestats.geocode import address_query
+    names = df['시설명'] if '시설명' in df.columns else pd.Series('이름 없음', index=df.index)
+    out = pd.DataFrame({
+        '시설명': names.replace('', '이름 없음').to_numpy(),
+        '주소': [address_query(a) for a in df['소재지']],
+    })
+    return out[out['주소'] != ''].reset_index(drop=True)
+
+
+def _script(path):
+    """차트 스크립트의 함수들 (main은 실행하지 않음)"""
+    with _SCRIPTS_LOCK:
+        if path not in _SCRIPTS:
+            _SCRIPTS[path] = runpy.run_path(path)
+        return _SCRIPTS[path]
+
+
+def city_pivot(df, script, pivot_fn, columns, script_sha):
+    """워크시트 3 → 스크립트의 calculate_city_*_sums 결과 (script_sha는 캐시 키용)"""
+    return _script(script)[pivot_fn](df[columns].dropna())
+
+
+def gap_frames(payments, capacity, recipients):
+    """워크시트 1/2/3 → carestats.gap이 쓰는 정규화 데이터셋"""
+    from carestats import datasets
+    return {
+        'payments': datasets.normalize_payments(payments),
+        'capacity': datasets.normalize_capacity(capacity),
+        'recipients': datasets.normalize_recipients(recipients),
+    }
+
+
+def write_gap_intervals(frames, out, level, n_boot, seed):
+    """공백 지표 + 부트스트랩 구간 CSV (재표본 시드가 고정이라 같은 입력이면 같은 파일)"""
+    from carestats.bootstrap import gap_intervals
+    gap_intervals(frames, level, n_boot=n_boot, seed=seed).to_csv(out, index=False, encoding='utf-8-sig')
+    return out
+
+
+def facility_points(df, coords):
+    """워크시트 1 + 주소 좌표 → 시설별 시도/구(글자)/시설명/정원/lat/lon (좌표 없는 시설은 NaN)"""
+    from carestats.geocode import address_query
+    latlon = [coords.get(address_query(a), (None, None)) for a in df['소재지']]
+    return pd.DataFrame({
+        '시도': df['시도'].astype(str).str.strip().to_numpy(),
+        '구': (df['구'] if '구' in df.columns else pd.Series('', index=df.index)).astype(str).str.strip().to_numpy(),
+        '시설명': (df['시설명'] if '시설명' in df.columns else pd.Series('', index=df.index)).to_numpy(),
+        '정원': parse_numeric(df['정원'].to_numpy(dtype=object)),
+        'lat': pd.to_numeric(pd.Series([c[0] for c in latlon]), errors='coerce').to_numpy(),
+        'lon': pd.to_numeric(pd.Series([c[1] for c in latlon]), errors='coerce').to_numpy(),
+    })
+
+
+def write_capacity_by_district(points, out, boundaries, boundaries_sha):
+    """시설 좌표를 경계 다각형에 넣어 시군구별 정원 CSV (글자 시도/구와 다른 시설 수를 출력)"""
+    from carestats.spatial import RegionIndex, assign_regions, capacity_by_region, text_mismatches
+    index = RegionIndex.from_geojson(boundaries)
+    points = assign_regions(points, index)
+    mismatched = len(text_mismatches(points))
+    if mismatched:
+        print(f"⚠️ 글자 시도/구와 경계 결과가 다른 시설 {mismatched}개 (경계 기준으로 집계)")
+    capacity_by_region(points, index).to_csv(out, index=False, encoding='utf-8-sig')
+    return out
+
+
+def write_access_by_district(points, out, boundaries, boundaries_sha, k, radius_km):
+    """시군구 대표점에서 가까운 시설 k개 거리 / 반경 안 정원 CSV"""
+    from carestats.access import access_by_region
+    from carestats.spatial import RegionIndex
+    index = RegionIndex.from_geojson(boundaries)
+    access_by_region(index.regions, index.centroids(), points, k, radius_km) \
+        .to_csv(out, index=False, encoding='utf-8-sig')
+    return out
+
+
+# --- 지오코딩 ---
+def geocode_union(*frames, columns, template):
+    """여러 집계표의 지역명을 합쳐 한 번씩만 지오코딩 → {이름: (lat, lon)}"""
+    from carestats.geocode import get_geocoder
+    names = []
+    for df, col in zip(frames, columns):
+        names.extend(df[col])
+    geocoder = get_geocoder()
+    coords = geocoder.many(names, template)
+    geocoder.save()
+    return coords
+
+
+def geocode_addresses(df, column):
+    """시설 주소(표준 키)를 건물 단위로 지오코딩 → {키: (lat, lon)} (같은 건물로 보이는 캐시 좌표는 재사용)"""
+    from carestats.geocode import get_geocoder
+    geocoder = get_geocoder()
+    before = geocoder.reused
+    coords = geocoder.addresses(df[column])
+    geocoder.save()
+    if geocoder.reused > before:
+        print(f"♻️ 비슷한 주소의 좌표 재사용 {geocoder.reused - before}건 (표준 키 {len(coords)}개)")
+    return coords
+
+
+# --- 렌더링 ---
+# site를 주면 folium/plotly HTML 대신 사이트 디렉터리에 레이어 데이터 + 공유 번들 페이지를 쓴다 (carestats.site)
+# bundle(런타임 판)은 단계 키에만 쓰인다: 런타임이 바뀌면 새 번들 이름을 가리키도록 페이지를 다시 씀.
+# 결과에 번들 파일도 넣어, 이전 판으로 되돌려 캐시에 맞더라도 (지워진) 그 판의 번들이 없으면 다시 쓴다.
+def _with_bundle(site, page):
+    from carestats.site import write_bundle
+    return [page] + [os.path.join(site, rel) for rel in write_bundle(site).values()]
+
+
+def _site_map(site, out, layer):
+    from carestats.site import write_map
+    return _with_bundle(site, write_map(site, os.path.relpath(out, config.ROOT_DIR), layer))
+
+
+def render_bubble(summary, coords, out, site=None, bundle=None, **spec):
+    if site:
+        from carestats.maps import bubble_layer
+        return _site_map(site, out, bubble_layer(summary, coords, **spec))
+    from carestats.maps import bubble_map
+    return bubble_map(summary, coords, out, **spec)
+
+
+def render_counts(df, coords, out, site=None, bundle=None, **spec):
+    if site:
+        from carestats.maps import count_layer
+        return _site_map(site, out, count_layer(df, coords, **spec))
+    from carestats.maps import count_bubble_map
+    return count_bubble_map(df, coords, out, **spec)
+
+
+def render_plotly(df, coords, out, site=None, bundle=None, **spec):
+    if site:
+        from carestats.maps import plotly_layer
+        return _site_map(site, out, plotly_layer(df, coords, **spec))
+    from carestats.maps import plotly_bubble_map
+    return plotly_bubble_map(df, coords, out, **spec)
+
+
+def render_choropleth(summary, out, boundaries, boundaries_sha, site=None, bundle=None, **spec):
+    if site:
+        from carestats.maps import choropleth_layer
+        return _site_map(site, out, choropleth_layer(summary, boundaries=boundaries, **spec))
+    from carestats.maps import choropleth_map
+    return choropleth_map(summary, out, boundaries=boundaries, **spec)
+
+
+def render_gap_choropleth(frames, out, boundaries, boundaries_sha, site=None, bundle=None, **spec):
+    """전국 시군구 공백 지표(gap_diff) 단계구분도"""
+    from carestats.gap import gap_table
+    return render_choropleth(gap_table(frames, 'sigungu'), out, boundaries, boundaries_sha, site, bundle,
+                             name_col='통계시군구명', sido_col='통계시도명', **spec)
+
+
+def render_dashboard(frames, points, site, boundaries, boundaries_sha, bundle=None):
+    from carestats.dashboard import build_dashboard
+    return _with_bundle(site, build_dashboard(site, frames, boundaries, points))
+
+
+def render_facilities(df, coords, out, site=None, bundle=None):
+    points = [(*coords.get(addr, (None, None)), name) for name, addr in zip(df['시설명'], df['주소'])]
+    if site:
+        from carestats.maps import marker_layer
+        return _site_map(site, out, marker_layer(points))
+    from carestats.maps import marker_map
+    return marker_map(points, out)
+
+
+def render_city_charts(pivot, script, plot_fn, out_dir, suffix, script_sha):
+    """시도별 차트 PNG (합계 0인 시도 제외) → 저장한 경로 목록"""
+    ns = _script(script)
+    ns['setup_encoding_and_font']()
+    paths = []
+    for city, counts in pivot.iterrows():
+        if counts.sum() == 0:
+            continue
+        safe = city.replace(" ", "_").replace("/", "_")
+        paths.append(ns[plot_fn](city, counts, os.path.join(out_dir, f"{safe}_{suffix}.png")))
+    return paths
+
+
+# --- 그래프 ---
+BUBBLE_MAPS = [
+    # (단계 이름, 집계 단계, 좌표 단계, 저장 경로, 렌더링 옵션)
+    ('map:woohyun/capacity_bubble_map.html', 'capacity_by_sido', 'coords:nation',
+     os.path.join(WOOHYUN_DIR, 'capacity_bubble_map.html'),
+     dict(name_col='시도', value_col='총정원', factor=1.0, unit='명', label='총정원',
+          legend_title='시군구별 총정원')),
+    ('map:woohyun/bubble_map_by_region.html', 'payments_by_sido', 'coords:nation',
+     os.path.join(WOOHYUN_DIR, 'bubble_map_by_region.html'),
+     dict(name_col='통계시도명', value_col='총지급건수', factor=0.2, unit='건', label='총지급건수',
+          legend_title='시도별 총지급건수', color='darkblue', fill_color='lightblue',
+          legend_at=(20, 20), legend_width=220, legend_max_height=300)),
+    ('map:woohyun/bubble_map.html', 'payments_by_sigungu', 'coords:nation',
+     os.path.join(WOOHYUN_DIR, 'bubble_map.html'),
+     dict(name_col='통계시군구명', value_col='총지급건수', factor=0.2, unit='', label='총지급건수',
+          legend_title='시군구별 총지급건수', color='darkblue', fill_color='lightblue',
+          legend_at=(20, 20), legend_width=220, legend_max_height=300)),
+    ('map:sangho/capacity_bubble_map.html', 'seoul_capacity_by_gu', 'coords:seoul',
+     os.path.join(SANGHO_DIR, 'capacity_bubble_map.html'),
+     dict(name_col='구', value_col='총정원', factor=4.0, unit='명', label='총정원',
+          legend_title='서울특별시 구별 복지시설 총정원', legend_max_height=600, skip_zero=True)),
+    ('map:sangho/bubble_map_by_region.html', 'seoul_payments_by_gu', 'coords:seoul',
+     os.path.join(SANGHO_DIR, 'bubble_map_by_region.html'),
+     dict(name_col='통계시군구명', value_col='총지급건수', factor=0.4, unit='건', label='총지급건수',
+          legend_title='서울특별시 구별 총지급건수', color='darkblue', fill_color='lightblue',
+          legend_at=(20, 20), legend_width=220, legend_max_height=600)),
+]
+
+CHOROPLETH_MAPS = [
+    # (단계 이름, 집계 단계, 저장 경로, 렌더링 옵션) — 서울 구별 버블맵과 같은 값을 경계 다각형으로
+    ('map:sangho/capacity_choropleth.html', 'seoul_capacity_by_gu',
+     os.path.join(SANGHO_DIR, 'capacity_choropleth.html'),
+     dict(name_col='구', value_col='총정원', sido='서울특별시', unit='명',
+          title='서울특별시 구별 복지시설 총정원')),
+    ('map:sangho/payments_choropleth.html', 'seoul_payments_by_gu',
+     os.path.join(SANGHO_DIR, 'payments_choropleth.html'),
+     dict(name_col='통계시군구명', value_col='총지급건수', sido='서울특별시', unit='건',
+          title='서울특별시 구별 총지급건수')),
+    ('map:sangho/sheet3_choropleth.html', 'seoul_members_by_gu',
+     os.path.join(SANGHO_DIR, 'sheet3_choropleth.html'),
+     dict(name_col='통계시군구명', value_col='총수급자수', sido='서울특별시', unit='명',
+          title='서울특별시 구별 수급자수')),
+]
+
+
+def build(pipeline=None, site=None):
+    """site: 지도를 이 사이트 디렉터리에 쓴다 (공유 번들 + 지도별 데이터 파일, carestats.site)"""
+    p = pipeline or Pipeline()
+    view = {}
+    if site:
+        from carestats.site import bundle_digest
+        view = {'site': site, 'bundle': bundle_digest()}
+
+    # 원본: Drive 버전 1회 + 워크시트별 1회
+    p.add('revision', source_revision, cache=False)
+    for index in (1, 2, 3):
+        p.add(f'sheet{index}', load_sheet, ['revision'], params={'index': index}, code=LOAD_CODE)
+    p.add('sheet4:A3:B23', load_range, ['revision'], params={'index': 4, 'a1_range': 'A3:B23'}, code=LOAD_CODE)
+    p.add('sheet7:A3:D', load_range, ['revision'], params={'index': 7, 'a1_range': 'A3:D'}, code=LOAD_CODE)
+
+    # 집계
+    p.add('capacity_by_sido', sum_by, ['sheet1'],
+          params={'key': '시도', 'value': '정원', 'out_col': '총정원', 'dim': 'sido', 'context': '워크시트 1'},
+          code=PARSE_CODE + ['carestats.regions'])
+    p.add('payments_by_sido', sum_by, ['sheet2'],
+          params={'key': '통계시도명', 'value': '지급건수', 'out_col': '총지급건수', 'dim': 'sido',
+                  'context': '워크시트 2'},
+          code=PARSE_CODE + ['carestats.regions'])
+    p.add('payments_by_sigungu', sum_by, ['sheet2'],
+          params={'key': '통계시군구명', 'value': '지급건수', 'out_col': '총지급건수'}, code=PARSE_CODE)
+    p.add('members_by_sido', members_by_sido, ['sheet7:A3:D'], code=PARSE_CODE + ['carestats.regions'])
+    seoul = {'dim': 'seoul', 'sido': '서울특별시'}
+    p.add('seoul_capacity_by_gu', sum_by, ['sheet1'],
+          params={'key': '구', 'value': '정원', 'out_col': '총정원', **seoul, 'sido_col': '시도', 'fill': True,
+                  'context': '워크시트 1'},
+          code=PARSE_CODE + ['carestats.regions'])
+    p.add('seoul_payments_by_gu', sum_by, ['sheet2'],
+          params={'key': '통계시군구명', 'value': '지급건수', 'out_col': '총지급건수', **seoul,
+                  'sido_col': '통계시도명', 'context': '워크시트 2'},
+          code=PARSE_CODE + ['carestats.regions'])
+    p.add('seoul_members_by_gu', sum_by, ['sheet3'],
+          params={'key': '통계시군구명', 'value': '수급자수', 'out_col': '총수급자수', **seoul,
+                  'sido_col': '통계시도명', 'context': '워크시트 3'},
+          code=PARSE_CODE + ['carestats.regions'])
+    p.add('households', households_by_region, ['sheet4:A3:B23'], code=PARSE_CODE)
+    p.add('facilities', facility_addresses, ['sheet1'], code=GEOCODE_CODE)
+    p.add('gap_frames', gap_frames, ['sheet2', 'sheet1', 'sheet3'], code=FRAME_CODE)
+
+    # 지오코딩: 질의 형식별로 한 단계
+    p.add('coords:nation', geocode_union,
+          ['capacity_by_sido', 'payments_by_sido', 'payments_by_sigungu', 'members_by_sido'],
+          params={'columns': ['시도', '통계시도명', '통계시군구명', '시도'], 'template': NATION}, code=GEOCODE_CODE)
+    p.add('coords:seoul', geocode_union,
+          ['seoul_capacity_by_gu', 'seoul_payments_by_gu', 'seoul_members_by_gu'],
+          params={'columns': ['구', '통계시군구명', '통계시군구명'], 'template': SEOUL}, code=GEOCODE_CODE)
+    p.add('coords:households', geocode_union, ['households'],
+          params={'columns': ['지역'], 'template': "서울특별시 {}"}, code=GEOCODE_CODE)
+    p.add('coords:facilities', geocode_addresses, ['facilities'], params={'column': '주소'}, code=GEOCODE_CODE)
+
+    # 지도 9개
+    for name, summary, coords, out, spec in BUBBLE_MAPS:
+        p.add(name, render_bubble, [summary, coords], params={'out': out, **view, **spec}, writes=True,
+              code=MAP_CODE)
+    p.add('map:woohyun/sheet7_bubble_map.html', render_counts, ['members_by_sido', 'coords:nation'],
+          params={'out': os.path.join(WOOHYUN_DIR, 'sheet7_bubble_map.html'), **view, 'name_col': '시도',
+                  'value_col': '수급자수', 'factor': 0.3, 'legend_title': '시도별 수급자수'},
+          writes=True, code=MAP_CODE)
+    p.add('map:sangho/sheet3_bubble_map.html', render_counts, ['seoul_members_by_gu', 'coords:seoul'],
+          params={'out': os.path.join(SANGHO_DIR, 'sheet3_bubble_map.html'), **view, 'name_col': '통계시군구명',
+                  'value_col': '총수급자수', 'factor': 0.6, 'legend_title': '서울특별시 구별 수급자수',
+                  'legend_max_height': 600},
+          writes=True, code=MAP_CODE)
+    p.add('map:sangho/single_parent_bubble_map.html', render_plotly, ['households', 'coords:households'],
+          params={'out': os.path.join(SANGHO_DIR, 'single_parent_bubble_map.html'), **view, 'name_col': '지역',
+                  'value_col': '한부모 가구 수', 'title': "서울시 지역별 한부모 가구 수 버블맵"},
+          writes=True, code=MAP_CODE)
+    p.add('map:sangho/welfare_map.html', render_facilities, ['facilities', 'coords:facilities'],
+          params={'out': os.path.join(SANGHO_DIR, 'welfare_map.html'), **view}, writes=True, code=MAP_CODE)
+
+    # 공백 지표 구간표 (시군구 단위, 시설·월 재표본)
+    p.add('table:woohyun/gap_intervals_sigungu.csv', write_gap_intervals, ['gap_frames'],
+          params={'out': os.path.join(WOOHYUN_DIR, 'gap_intervals_sigungu.csv'), 'level': 'sigungu',
+                  'n_boot': 1000, 'seed': 0},
+          writes=True, code=GAP_CODE + ['carestats.bootstrap'])
+
+    # 시군구별 정원/접근성/단계구분도 (경계 다각형, 경계 파일이 있을 때만)
+    if os.path.exists(config.BOUNDARY_PATH):
+        boundaries = {'boundaries': config.BOUNDARY_PATH, 'boundaries_sha': file_hash(config.BOUNDARY_PATH)}
+        for name, summary, out, spec in CHOROPLETH_MAPS:
+            p.add(name, render_choropleth, [summary], params={'out': out, **boundaries, **view, **spec},
+                  writes=True, code=SHAPE_CODE)
+        p.add('map:woohyun/gap_choropleth_sigungu.html', render_gap_choropleth, ['gap_frames'],
+              params={'out': os.path.join(WOOHYUN_DIR, 'gap_choropleth_sigungu.html'), **boundaries, **view,
+                      'value_col': 'gap_diff', 'title': '시군구별 복지 공백 (gap_diff)'},
+              writes=True, code=SHAPE_CODE + GAP_CODE)
+        p.add('facility_points', facility_points, ['sheet1', 'coords:facilities'], code=GEOCODE_CODE + PARSE_CODE)
+        p.add('table:woohyun/capacity_by_district.csv', write_capacity_by_district, ['facility_points'],
+              params={'out': os.path.join(WOOHYUN_DIR, 'capacity_by_district.csv'), **boundaries},
+              writes=True, code=['carestats.spatial', 'carestats.regions'])
+        p.add('table:woohyun/access_by_district.csv', write_access_by_district, ['facility_points'],
+              params={'out': os.path.join(WOOHYUN_DIR, 'access_by_district.csv'),
+                      **boundaries, 'k': 3, 'radius_km': 10.0},
+              writes=True, code=['carestats.access', 'carestats.spatial', 'carestats.regions'])
+        if site:
+            p.add('map:dashboard.html', render_dashboard, ['gap_frames', 'facility_points'],
+                  params={**view, **boundaries}, writes=True,
+                  code=['carestats.dashboard'] + SHAPE_CODE + GAP_CODE)
+
+    # 시도별 차트 17 × 2 (matplotlib pyplot은 스레드 안전하지 않으므로 한 번에 하나씩)
+    for kind, script, pivot_fn, columns, plot_fn, suffix in [
+        ('family', FAMILY_SCRIPT, 'calculate_city_family_sums',
+         ['통계시도명', '가족유형', '수급자수'], 'plot_family_pie', 'family_type_pie'),
+        ('income', INCOME_SCRIPT, 'calculate_city_income_sums',
+         ['통계시도명', '중위소득비율구분', '수급자수'], 'plot_income_donut', 'income_donut'),
+    ]:
+        sha = file_hash(script)
+        p.add(f'{kind}_pivot', city_pivot, ['sheet3'],
+              params={'script': script, 'pivot_fn': pivot_fn, 'columns': columns, 'script_sha': sha})
+        p.add(f'charts:{kind}', render_city_charts, [f'{kind}_pivot'],
+              params={'script': script, 'plot_fn': plot_fn, 'out_dir': WOOHYUN_DIR,
+                      'suffix': suffix, 'script_sha': sha},
+              writes=True, lock='matplotlib')
+    return p
+
+
+def outputs(pipeline):
+    """렌더링 단계 이름 (map:*, charts:*, table:*)"""
+    return [n for n, s in pipeline.stages.items() if s.writes]
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(prog="carestats refresh", description="지도/차트 전체 갱신 (단계 캐시 + 병렬 실행)")
+    parser.add_argument('--only', nargs='+', metavar='STAGE', help="이 단계들과 그 입력만 실행")
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--cache-dir', help="단계 캐시 위치 (기본: STATE_DIR/pipeline)")
+    parser.add_argument('--list', action='store_true', help="단계 목록만 출력")
+    parser.add_argument('--site', metavar='DIR',
+                        help="지도를 이 디렉터리에 사이트로 저장 (공유 JS/CSS 번들 + 지도별 데이터, 오프라인에서 열림)")
+    args = parser.parse_args(argv)
+
+    from carestats import memory
+    if memory.enabled() and args.workers > 1:
+        print("ℹ️ 메모리 프로파일 중에는 단계별 값이 섞이지 않도록 단계를 하나씩 실행합니다.")
+        args.workers = 1
+    site = os.path.abspath(args.site) if args.site else None
+    p = build(Pipeline(args.cache_dir, args.workers), site)
+    if args.list:
+        for name, stage in p.stages.items():
+            deps = f" ← {', '.join(stage.inputs)}" if stage.inputs else ''
+            print(f"  {name}{deps}")
+        return 0
+    results = p.run(args.only or outputs(p))
+    print_summary(results)
+    if site and not args.only and all(r.status in ('run', 'hit') for r in results.values()):
+        # 모든 페이지가 현재 번들을 가리킬 때만 이전 판 정리 (--only면 나머지 페이지가 아직 이전 판을 씀)
+        from carestats.site import prune_bundles
+        removed = prune_bundles(site)
+        if removed:
+            print(f"🧹 이전 번들 {removed}개 삭제")
+    return 1 if any(r.status == 'failed' for r in results.values()) else 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,136 @@
+# -*- coding: utf-8 -*-
+"""지역 차원표: 시도명 표기 통일 (워크시트 1의 '서울' ↔ 워크시트 2~3의 '서울특별시') + 정수 행정구역코드
+
+시트마다 지역 이름 표기가 달라 이름 문자열로 outer merge하면 같은 지역이 두 행이 되거나 빠진다.
+RegionDim은 기대 구성원(코드 순서) / 별칭 → 코드를 들고 있어, 로더는 이름을 코드로 바꾸고
+집계는 코드 인덱스로 맞춘다 (없는 지역은 reindex로 채움).
+
+    SIDO.codes(df['시도'])                  # '서울', '서울특별시' → 11 (모르는 이름은 -1)
+    SIDO.named(SIDO.sum_by(df['시도'], df['정원']).rename('총정원'))   # [시도, 총정원], 공식 이름
+    SEOUL.table({'capacity': cap, 'support_count': sup})   # 25개 구 전체, 코드 인덱스
+"""
+import numpy as np
+import pandas as pd
+
+SIDO_NAMES = [
+    '서울특별시', '부산광역시', '대구광역시', '인천광역시', '광주광역시',
+    '대전광역시', '울산광역시', '세종특별자치시', '경기도', '강원특별자치도',
+    '충청북도', '충청남도', '전북특별자치도', '전라남도', '경상북도',
+    '경상남도', '제주특별자치도',
+]
+
+SIDO_ALIASES = {
+    '서울': '서울특별시', '부산': '부산광역시', '대구': '대구광역시',
+    '인천': '인천광역시', '광주': '광주광역시', '대전': '대전광역시',
+    '울산': '울산광역시', '세종': '세종특별자치시', '경기': '경기도',
+    '강원': '강원특별자치도', '강원도': '강원특별자치도',
+    '충북': '충청북도', '충남': '충청남도',
+    '전북': '전북특별자치도', '전라북도': '전북특별자치도',
+    '전남': '전라남도', '경북': '경상북도', '경남': '경상남도',
+    '제주': '제주특별자치도', '제주도': '제주특별자치도',
+}
+
+# 행정구역코드 앞 두 자리 → 공식 시도명 (경계 파일에 시도명 없이 SIG_CD만 있을 때)
+SIDO_CODES = {
+    '11': '서울특별시', '26': '부산광역시', '27': '대구광역시', '28': '인천광역시',
+    '29': '광주광역시', '30': '대전광역시', '31': '울산광역시', '36': '세종특별자치시',
+    '41': '경기도', '42': '강원특별자치도', '51': '강원특별자치도', '43': '충청북도',
+    '44': '충청남도', '45': '전북특별자치도', '52': '전북특별자치도', '46': '전라남도',
+    '47': '경상북도', '48': '경상남도', '50': '제주특별자치도',
+}
+
+# 서울특별시 자치구 (데이터에 없는 구도 0으로 채워 지도/표에 표시, 코드는 SEOUL_GU_CODES)
+SEOUL_GU = [
+    '강남구', '강동구', '강북구', '강서구', '관악구', '광진구', '구로구', '금천구',
+    '노원구', '도봉구', '동대문구', '동작구', '마포구', '서대문구', '서초구', '성동구',
+    '성북구', '송파구', '양천구', '영등포구', '용산구', '은평구', '종로구', '중구', '중랑구',
+]
+
+# 합계 행 이름 (지역이 아니므로 코드로 못 바꿔도 알리지 않음)
+TOTAL_LABELS = ('계', '합계', '총계', '소계', '전국')
+
+# 서울특별시 자치구 행정구역코드 (SIG_CD)
+SEOUL_GU_CODES = {
+    '종로구': 11110, '중구': 11140, '용산구': 11170, '성동구': 11200, '광진구': 11215,
+    '동대문구': 11230, '중랑구': 11260, '성북구': 11290, '강북구': 11305, '도봉구': 11320,
+    '노원구': 11350, '은평구': 11380, '서대문구': 11410, '마포구': 11440, '양천구': 11470,
+    '강서구': 11500, '구로구': 11530, '금천구': 11545, '영등포구': 11560, '동작구': 11590,
+    '관악구': 11620, '서초구': 11650, '강남구': 11680, '송파구': 11710, '강동구': 11740,
+}
+
+
+def normalize_sido(name):
+    """시도 약칭/옛 명칭 → 공식 시도명 (모르는 이름은 그대로 반환)"""
+    name = str(name).strip()
+    return SIDO_ALIASES.get(name, name)
+
+
+class RegionDim:
+    """지역 차원표: 정수 코드 ↔ 공식 이름, 별칭, 기대 구성원 목록 (코드 순서)"""
+
+    def __init__(self, members, aliases=None, label='지역'):
+        members = sorted(members.items(), key=lambda kv: kv[1])   # {이름: 코드}
+        self.label = label
+        self.index = pd.Index([code for _, code in members], dtype='int64', name=f"{label}코드")
+        self.names = [name for name, _ in members]
+        self._code = dict(members)
+        for alias, name in (aliases or {}).items():
+            self._code.setdefault(alias, self._code[name])
+        self._name = dict(zip(self.index, self.names))
+
+    def __len__(self):
+        return len(self.index)
+
+    def code(self, name):
+        """이름/별칭 → 코드 (모르는 이름은 -1)"""
+        return self._code.get(str(name).strip(), -1)
+
+    def codes(self, names):
+        """이름 목록 → int64 코드 배열 (같은 이름은 한 번만 찾음, 모르는 이름은 -1)"""
+        values, uniques = pd.factorize(pd.Series(names, dtype=object).fillna(''))
+        lookup = np.array([self.code(u) for u in uniques] + [-1], dtype='int64')
+        return lookup[values]   # factorize의 결측(-1)은 마지막 칸(-1)
+
+    def name(self, code):
+        return self._name.get(code, '')
+
+    def unknown(self, names):
+        """코드로 못 바꾸는 이름 (빈 값/결측/합계 행 제외, 처음 나온 순서)"""
+        names = pd.Series(names, dtype=object).dropna()
+        return [n for n in dict.fromkeys(str(x).strip() for x in names)
+                if n and n not in TOTAL_LABELS and self.code(n) < 0]
+
+    def sum_by(self, names, values, context=''):
+        """이름별 값 합계 → 코드 인덱스 Series (모르는 이름의 행은 버리고 ⚠️로 알림)"""
+        unknown = self.unknown(names)
+        if unknown:
+            where = f" ({context})" if context else ''
+            print(f"⚠️ {self.label} 목록에 없는 이름 {len(unknown)}개{where}, 집계에서 제외: {', '.join(unknown)}")
+        codes = self.codes(names)
+        values = pd.Series(np.asarray(values), index=codes)
+        return values[codes >= 0].groupby(level=0).sum().rename_axis(self.index.name)
+
+    def reindex(self, data, fill_value=0):
+        """코드 인덱스 Series/DataFrame → 기대 구성원 전체 (없는 지역은 fill_value)"""
+        return data.reindex(self.index, fill_value=fill_value)
+
+    def named(self, data, name_col=None):
+        """코드 인덱스 Series → [name_col(기본 label), 값] DataFrame (코드 인덱스, 있는 지역만)"""
+        df = data.to_frame()
+        df.insert(0, name_col or self.label, [self.name(code) for code in df.index])
+        return df
+
+    def table(self, columns, fill_value=0):
+        """{열 이름: 코드 인덱스 Series} → [label, 열...] DataFrame (코드 인덱스, 기대 구성원 전체)"""
+        df = pd.DataFrame({col: self.reindex(s, fill_value) for col, s in columns.items()}, index=self.index)
+        df.insert(0, self.label, self.names)
+        return df
+
+
+# 시도 차원 (현행 코드: 강원 51, 전북 52 / 옛 코드 42, 45는 SIDO_CODES로 이름만 찾음)
+SIDO = RegionDim(
+    {name: int(code) for code, name in SIDO_CODES.items() if code not in ('42', '45')},
+    aliases={**SIDO_ALIASES, **{f"{a}시": n for a, n in SIDO_ALIASES.items() if n.endswith('시')}},
+    label='시도',
+)
+SEOUL = RegionDim(SEOUL_GU_CODES, aliases={f"서울특별시 {gu}": gu for gu in SEOUL_GU_CODES}, label='구')
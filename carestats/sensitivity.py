@@ -0,0 +1,145 @@
+# -*- coding: utf-8 -*-
+"""공백 지수 가중치 민감도: 가중치를 바꿔도 상위 k 지역이 유지되는가
+
+supply_index / demand_index는 정규화 지표 두 개씩의 단순 평균(가중치 0.5/0.5)이다.
+여기서는 각 쌍의 가중치를 Beta(α, α) (= 2차원 Dirichlet) 분포에서 수천 개 뽑아
+
+    gap = norm @ (W * [-1, -1, 1, 1]).T          # (지역 수, 4) @ (4, 표본 수) 한 번
+
+으로 모든 표본의 gap_diff(또는 gap_ratio)를 동시에 계산하고, 표본마다 순위를 매겨
+지역별 순위 분포(평균, 5/50/95 백분위)와 상위 k에 들 확률을 보고한다.
+
+    python -m carestats sensitivity --data-dir fixtures/sample --level sigungu --samples 10000
+    python -m carestats sensitivity --data-dir fixtures/sample --sido 서울 --top 5
+
+concentration(α)이 클수록 가중치가 0.5 근처에 모이고(작은 흔들림), 1이면 쌍마다 균등 분포다.
+첫 표본은 항상 기본 가중치라 base_rank는 지금 순위와 같다.
+"""
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from carestats.gap import NORM_COLS, compute_gap_index, region_totals
+from carestats.regions import SIDO
+from carestats.trace import traced
+
+BASE_WEIGHTS = np.array([0.5, 0.5, 0.5, 0.5])   # capacity, support_count | household_count, member_count
+SIGNS = np.array([-1.0, -1.0, 1.0, 1.0])         # 공급은 빼고 수요는 더함
+ORDERS = ('gap_diff', 'gap_ratio')
+
+
+def sample_weights(n_samples, concentration=1.0, seed=0):
+    """(n_samples, 4) 가중치: 공급 쌍, 수요 쌍이 각각 합 1 (첫 행은 기본 가중치 0.5/0.5)"""
+    rng = np.random.default_rng(seed)
+    supply = rng.beta(concentration, concentration, n_samples)
+    demand = rng.beta(concentration, concentration, n_samples)
+    weights = np.column_stack([supply, 1 - supply, demand, 1 - demand])
+    weights[0] = BASE_WEIGHTS
+    return weights
+
+
+def gap_scores(norm, weights, order='gap_diff'):
+    """정규화 행렬 (지역, 4) × 가중치 (표본, 4) → 표본별 공백 지표 (표본, 지역)"""
+    if order == 'gap_diff':
+        return (weights * SIGNS) @ norm.T
+    if order == 'gap_ratio':
+        supply = weights[:, :2] @ norm[:, :2].T
+        demand = weights[:, 2:] @ norm[:, 2:].T
+        return demand / (supply + 1e-6)
+    raise ValueError(f"order는 {ORDERS} 중 하나여야 합니다: {order}")
+
+
+def rank_matrix(scores):
+    """(표본, 지역) 점수 → 표본마다 0부터 시작하는 순위 (큰 값이 0위, 동점은 지역 순서대로)"""
+    n_samples, n_regions = scores.shape
+    order = np.argsort(-scores, axis=1, kind='stable')
+    ranks = np.empty((n_samples, n_regions), dtype=np.int32)
+    np.put_along_axis(ranks, order, np.arange(n_regions, dtype=np.int32)[None, :], axis=1)
+    return ranks
+
+
+def rank_summary(ranks, top=10):
+    """(표본, 지역) 순위 → 지역별 기본 순위/평균/백분위/상위 k 확률 (순위는 1부터)"""
+    n_regions = ranks.shape[1]
+    # 순위 분포 히스토그램 (지역, 순위) → 백분위를 정렬 없이 누적합에서 읽음
+    flat = (ranks + np.arange(n_regions, dtype=np.int64) * n_regions).ravel()
+    hist = np.bincount(flat, minlength=n_regions * n_regions).reshape(n_regions, n_regions)
+    cdf = np.cumsum(hist, axis=1) / ranks.shape[0]
+
+    def percentile(q):
+        return (cdf < q).sum(axis=1) + 1
+
+    return pd.DataFrame({
+        'base_rank': ranks[0] + 1,
+        'mean_rank': ranks.mean(axis=0) + 1,
+        'p05': percentile(0.05),
+        'median': percentile(0.5),
+        'p95': percentile(0.95),
+        'best': ranks.min(axis=0) + 1,
+        'worst': ranks.max(axis=0) + 1,
+        f"top{top}_prob": cdf[:, min(top, n_regions) - 1],
+    })
+
+
+@traced('sensitivity', 'cpu')
+def weight_sensitivity(df, n_samples=10000, top=10, order='gap_diff', concentration=1.0, seed=0):
+    """compute_gap_index 결과 df → 지역별 순위 분포 DataFrame (상위 k 확률 내림차순)"""
+    norm = df[NORM_COLS].to_numpy(dtype=float)
+    weights = sample_weights(n_samples, concentration, seed)
+    ranks = rank_matrix(gap_scores(norm, weights, order))
+    summary = rank_summary(ranks, top)
+    keys = [c for c in df.columns if not pd.api.types.is_numeric_dtype(df[c])]
+    out = pd.concat([df[keys].reset_index(drop=True), summary], axis=1)
+    return out.sort_values([f"top{top}_prob", 'mean_rank'], ascending=[False, True], kind='stable') \
+        .reset_index(drop=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='carestats sensitivity',
+                                     description="공백 지수 가중치 민감도 (순위 분포, 상위 k 확률)")
+    parser.add_argument('--data-dir', help="로컬 스냅샷 디렉터리 (없으면 구글 스프레드시트에서 로드)")
+    parser.add_argument('--level', choices=('sido', 'sigungu'), default='sigungu')
+    parser.add_argument('--sido', help="이 시도의 시군구만 (--level sigungu)")
+    parser.add_argument('--samples', type=int, default=10000, help="가중치 표본 수")
+    parser.add_argument('--top', type=int, default=10, help="상위 k")
+    parser.add_argument('--order', choices=ORDERS, default='gap_diff')
+    parser.add_argument('--concentration', type=float, default=1.0,
+                        help="Beta 분포 집중도 α (클수록 0.5/0.5 근처만 흔듦)")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--rows', type=int, default=20, help="출력할 지역 수 (0이면 전부)")
+    parser.add_argument('--csv', help="결과를 CSV로 저장")
+    args = parser.parse_args(argv)
+
+    sido = None
+    if args.sido and args.level == 'sigungu':
+        # '서울' → '서울특별시' (데이터셋의 공식 시도명, carestats.api.resolve_sido와 같은 해석)
+        if SIDO.code(args.sido) < 0:
+            raise SystemExit(f"❌ 알 수 없는 시도: {args.sido}")
+        sido = SIDO.name(SIDO.code(args.sido))
+
+    from carestats import datasets
+    frames = datasets.load_snapshot(args.data_dir) if args.data_dir else datasets.load_from_sheets()
+    totals = region_totals(frames, args.level, sido)
+    if totals.empty:
+        raise SystemExit(f"❌ 지역이 없습니다: level={args.level}, sido={sido}")
+    df = compute_gap_index(totals)
+
+    start = time.perf_counter()
+    result = weight_sensitivity(df, args.samples, args.top, args.order, args.concentration, args.seed)
+    elapsed = time.perf_counter() - start
+
+    prob = f"top{args.top}_prob"
+    stable = int(((result['base_rank'] <= args.top) & (result[prob] >= 0.95)).sum())
+    print(f"=== {args.order} 가중치 민감도: 지역 {len(df)}개 × 표본 {args.samples:,}개 ({elapsed * 1e3:.0f}ms) ===")
+    print(f"  기본 상위 {args.top}개 중 {stable}개가 표본 95% 이상에서 상위 {args.top} 유지")
+    shown = result if not args.rows else result.head(args.rows)
+    print(shown.to_string(index=False, formatters={'mean_rank': '{:.1f}'.format, prob: '{:.1%}'.format}))
+    if args.csv:
+        result.to_csv(args.csv, index=False, encoding='utf-8-sig')
+        print(f"💾 저장: {args.csv}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,218 @@
+# -*- coding: utf-8 -*-
+"""경계 다각형 단순화 + 압축 인코딩 (줌 레벨별 한 번 계산해 디스크 캐시)
+
+단계구분도(choropleth)는 시군구 경계 원본(수십만 꼭짓점)을 그대로 HTML에 넣으면 파일이 크고
+그리는 데 오래 걸린다. 화면 1픽셀보다 작은 굴곡은 보이지 않으므로 줌 레벨마다 허용 오차
+(그 줌의 1픽셀 경위도 크기)로 줄인다.
+
+이웃 시군구는 경계선을 공유한다. 고리마다 따로 줄이면 공유 경계가 양쪽에서 다르게 줄어
+틈/겹침이 생기므로, TopoJSON처럼 고리를 접점(세 갈래 이상 만나는 꼭짓점)에서 호(arc)로 자르고
+호마다 한 번만 Douglas-Peucker로 줄인 뒤 다시 잇는다 (위상 보존).
+
+결과 고리는 Google encoded polyline(1e-5도 정밀도)으로 저장한다. 좌표 차분을 base64 비슷한
+문자로 적는 방식이라 JSON 숫자 배열보다 5~10배 작고 브라우저에서 몇 줄로 풀린다.
+
+    shapes = simplified(config.BOUNDARY_PATH, zoom=10)   # {'regions': [...], 'rings': [[인코딩 고리, ...], ...]}
+
+캐시: STATE_DIR/shapes/<경계 파일 sha256 앞 16자>-z<줌>.json
+"""
+import math
+import os
+
+import numpy as np
+
+from carestats import config
+from carestats.freshness import file_hash, load_state, save_state
+from carestats.trace import traced
+
+QUANTUM = 1e-7       # 꼭짓점이 같은지 비교할 때의 격자 (도)
+PRECISION = 1e5      # encoded polyline 정밀도 (1e-5도 ≈ 1m)
+ZOOM_LEVELS = tuple(range(5, 15))
+
+
+def tolerance(zoom):
+    """줌 레벨의 1픽셀(256px 타일) 크기 (도)"""
+    return 360.0 / (256 * 2 ** zoom)
+
+
+def zoom_for_bounds(bounds, pixels=800):
+    """(서, 남, 동, 북) 범위가 pixels 폭 화면에 들어가는 줌 (ZOOM_LEVELS 안으로)"""
+    west, south, east, north = bounds
+    span = max(east - west, (north - south) * 1.3, 1e-6)
+    zoom = int(math.floor(math.log2(pixels * 360.0 / (256 * span))))
+    return min(max(zoom, ZOOM_LEVELS[0]), ZOOM_LEVELS[-1])
+
+
+def encode_ring(xy):
+    """(n, 2) 경도/위도 → encoded polyline 문자열 (위도, 경도 순서, Google 형식)"""
+    ints = np.round(np.asarray(xy, dtype=float)[:, ::-1] * PRECISION).astype(np.int64)
+    deltas = np.diff(ints, axis=0, prepend=np.zeros((1, 2), dtype=np.int64)).ravel()
+    out = []
+    for value in deltas.tolist():
+        value = ~(value << 1) if value < 0 else value << 1
+        while value >= 0x20:
+            out.append(chr((0x20 | (value & 0x1f)) + 63))
+            value >>= 5
+        out.append(chr(value + 63))
+    return ''.join(out)
+
+
+def decode_ring(text):
+    """encode_ring의 역 → (n, 2) 경도/위도"""
+    values, value, shift = [], 0, 0
+    for ch in text:
+        b = ord(ch) - 63
+        value |= (b & 0x1f) << shift
+        shift += 5
+        if b < 0x20:
+            values.append(~(value >> 1) if value & 1 else value >> 1)
+            value, shift = 0, 0
+    latlon = np.cumsum(np.array(values, dtype=np.int64).reshape(-1, 2), axis=0) / PRECISION
+    return latlon[:, ::-1]
+
+
+def douglas_peucker(xy, tol):
+    """열린 선 (n, 2) → 남길 점 bool 마스크 (양 끝점은 항상 남김)"""
+    keep = np.zeros(len(xy), dtype=bool)
+    keep[[0, -1]] = True
+    stack = [(0, len(xy) - 1)]
+    while stack:
+        i, j = stack.pop()
+        if j <= i + 1:
+            continue
+        a, b = xy[i], xy[j]
+        seg = xy[i + 1:j] - a
+        d = b - a
+        norm = math.hypot(d[0], d[1])
+        if norm == 0:
+            dist = np.hypot(seg[:, 0], seg[:, 1])
+        else:
+            dist = np.abs(seg[:, 0] * d[1] - seg[:, 1] * d[0]) / norm
+        k = int(dist.argmax())
+        if dist[k] > tol:
+            m = i + 1 + k
+            keep[m] = True
+            stack.append((i, m))
+            stack.append((m, j))
+    return keep
+
+
+def _closed_keep(xy, tol):
+    """접점 없는 닫힌 고리: 시작점과 가장 먼 점을 고정하고 두 반쪽을 따로 줄임"""
+    far = int(np.hypot(*(xy - xy[0]).T).argmax())
+    if far == 0:
+        return np.ones(len(xy), dtype=bool)
+    keep = np.zeros(len(xy), dtype=bool)
+    keep[:far + 1] |= douglas_peucker(xy[:far + 1], tol)
+    keep[far:] |= douglas_peucker(xy[far:], tol)
+    return keep
+
+
+@traced('simplify', 'cpu')
+def simplify_rings(rings, tol):
+    """[(지역 번호, 닫힌 고리 (n, 2))] → 같은 순서의 줄인 닫힌 고리 목록 (공유 경계는 같은 점으로 줄어듦)
+
+    점이 4개 미만(삼각형도 못 되는)으로 줄어든 고리는 None (그 줌에서 보이지 않는 섬 등).
+    """
+    if not rings:
+        return []
+    opened = [xy[:-1] for _, xy in rings]
+    points = np.vstack(opened)
+    # 격자 좌표를 int64 하나로 묶어 1차원 unique (axis=0 unique보다 몇 배 빠름, 전 지구 범위도 넘치지 않음)
+    q = np.round(points / QUANTUM).astype(np.int64)
+    q -= q.min(axis=0)
+    _, vid = np.unique(q[:, 0] * (q[:, 1].max() + 1) + q[:, 1], return_inverse=True)
+    offsets = np.concatenate([[0], np.cumsum([len(xy) for xy in opened])])
+
+    # 꼭짓점 차수 (중복 없는 무방향 변 기준) > 2 → 접점
+    a = vid
+    b = np.concatenate([np.roll(vid[s:e], -1) for s, e in zip(offsets[:-1], offsets[1:])])
+    n = int(vid.max()) + 1
+    lo, hi = np.minimum(a, b), np.maximum(a, b)
+    pairs = np.unique(lo[lo != hi] * n + hi[lo != hi])
+    degree = np.bincount(np.concatenate([pairs // n, pairs % n]), minlength=n)
+    junction = degree > 2
+
+    done = {}
+
+    def arc(ids, xy, closed):
+        forward, backward = ids.tobytes(), ids[::-1].tobytes()
+        if closed:
+            # 닫힌 호는 가장 작은 꼭짓점에서 시작, 두 방향 중 작은 쪽이 기준
+            start = int(ids.argmin())
+            ids, xy = np.roll(ids, -start), np.roll(xy, -start, axis=0)
+            rev_ids = np.roll(ids[::-1], 1)
+            forward, backward = ids.tobytes(), rev_ids.tobytes()
+        flip = backward < forward
+        key = (closed, min(forward, backward))
+        if key not in done:
+            base = xy if not flip else (xy[::-1] if not closed else np.roll(xy[::-1], 1, axis=0))
+            done[key] = base[_closed_keep(base, tol) if closed else douglas_peucker(base, tol)]
+        kept = done[key]
+        if not flip:
+            return kept
+        return kept[::-1] if not closed else np.roll(kept[::-1], 1, axis=0)
+
+    out = []
+    for (s, e), xy in zip(zip(offsets[:-1], offsets[1:]), opened):
+        ids = vid[s:e]
+        cuts = np.flatnonzero(junction[ids])
+        if not len(cuts):
+            kept = arc(ids, xy, True)
+        else:
+            ids, xy = np.roll(ids, -cuts[0]), np.roll(xy, -cuts[0], axis=0)
+            cuts = np.append(cuts - cuts[0], len(ids))
+            ids = np.append(ids, ids[:1])
+            xy = np.vstack([xy, xy[:1]])
+            parts = [arc(ids[i:j + 1], xy[i:j + 1], False)[:-1] for i, j in zip(cuts[:-1], cuts[1:])]
+            kept = np.vstack(parts)
+        out.append(np.vstack([kept, kept[:1]]) if len(kept) >= 3 else None)
+    return out
+
+
+def cache_path(source, zoom):
+    return os.path.join(config.STATE_DIR, 'shapes', f"{file_hash(source)[:16]}-z{zoom}.json")
+
+
+def simplified(source=None, zoom=10):
+    """경계 파일 → 줌 레벨용 {'regions': [[코드, 시도, 시군구], ...], 'rings': [[인코딩 고리, ...], ...],
+    'boxes': [[서, 남, 동, 북], ...]} (boxes는 원본 고리 기준)
+
+    모든 고리가 사라진 (아주 작은) 지역은 가장 큰 원본 고리 하나를 인코딩해 둔다.
+    경로를 주면 같은 파일/줌은 캐시에서 읽는다 (dict를 주면 매번 계산).
+    """
+    from carestats.spatial import read_rings
+
+    source = source or config.BOUNDARY_PATH
+    path = cache_path(source, zoom) if isinstance(source, str) else None
+    if path:
+        cached = load_state(path)
+        if cached:
+            return cached
+    regions, rings = read_rings(source)
+    reduced = simplify_rings(rings, tolerance(zoom))
+    by_region = [[] for _ in range(len(regions))]
+    largest = {}
+    for (owner, xy), small in zip(rings, reduced):
+        if small is not None:
+            by_region[owner].append(encode_ring(small))
+        if len(xy) > len(largest.get(owner, ())):
+            largest[owner] = xy
+    for owner, encoded in enumerate(by_region):
+        if not encoded and owner in largest:
+            encoded.append(encode_ring(largest[owner]))
+    boxes = [[180.0, 90.0, -180.0, -90.0] for _ in range(len(regions))]
+    for owner, xy in rings:
+        lo, hi = xy.min(axis=0), xy.max(axis=0)
+        box = boxes[owner]
+        boxes[owner] = [min(box[0], float(lo[0])), min(box[1], float(lo[1])),
+                        max(box[2], float(hi[0])), max(box[3], float(hi[1]))]
+    result = {
+        'regions': regions.values.tolist(),
+        'rings': by_region,
+        'boxes': boxes,
+        'zoom': zoom,
+    }
+    if path:
+        save_state(result, path)
+    return result
@@ -0,0 +1,132 @@
+# -*- coding: utf-8 -*-
+"""구글 스프레드시트 인증 및 워크시트 로딩"""
+import json
+
+import gspread
+from gspread.http_client import HTTPClient
+from google.auth.credentials import AnonymousCredentials
+from google.oauth2 import service_account
+
+from carestats import config
+from carestats.parsing import parse_values
+from carestats.projection import column_ranges, columns_to_frame, needed_columns
+from carestats.quota import call_with_retry
+from carestats.trace import span, traced
+
+# (스프레드시트 ID, 워크시트 ID, 헤더 행) → 헤더 목록
+_HEADERS = {}
+
+# 할당량 버킷 이름, gspread에 박혀 있는 기본 주소 → 설정된 주소 (로컬 대역 서버 등)
+_BASE_URLS = (
+    ('sheets', 'https://sheets.googleapis.com/v4', config.SHEETS_API_URL),
+    ('drive', 'https://www.googleapis.com/drive/v3', config.DRIVE_API_URL),
+)
+
+
+def api_url(url):
+    """구글 API 기본 주소로 시작하는 URL을 config.SHEETS_API_URL / DRIVE_API_URL 기준으로 바꿈"""
+    for _, default, configured in _BASE_URLS:
+        if default != configured and url.startswith(default):
+            return configured.rstrip('/') + url[len(default):]
+    return url
+
+
+def api_bucket(url):
+    """요청 URL → 할당량 버킷 이름 ('drive' / 'sheets', 모르는 주소는 'sheets')"""
+    for api, default, configured in _BASE_URLS:
+        if url.startswith(default) or url.startswith(configured.rstrip('/') + '/'):
+            return api
+    return 'sheets'
+
+
+class QuotaHTTPClient(HTTPClient):
+    """gspread HTTP 클라이언트: 모든 요청을 토큰 버킷 + 429/5xx 재시도 계층으로 보냄
+
+        client = gspread.authorize(creds, http_client=QuotaHTTPClient)
+
+    요청 주소는 config.SHEETS_API_URL / DRIVE_API_URL을 따르고,
+    드라이브 요청(파일 목록, 수정 시각 등)은 'drive' 버킷, 나머지는 'sheets' 버킷에서 차감한다.
+    """
+
+    def request(self, method, endpoint, *args, **kwargs):
+        url = api_url(endpoint)
+        return call_with_retry(super().request, method, url, *args, api=api_bucket(url), **kwargs)
+
+
+@traced('auth', 'io')
+def get_credentials(scopes=None):
+    """서비스 계정 키 파일 → Credentials (로컬 대역 서버를 쓰면 키 없이 익명)"""
+    if config.SHEETS_EMULATOR_HOST:
+        return AnonymousCredentials()
+    with open(config.KEY_PATH, encoding='utf-8') as f:
+        info = json.load(f)
+    info['private_key'] = info['private_key'].replace('\\n', '\n')
+    return service_account.Credentials.from_service_account_info(
+        info, scopes=scopes or config.SCOPES
+    )
+
+
+@traced('auth', 'io')
+def get_client(credentials=None):
+    return gspread.authorize(credentials or get_credentials(), http_client=QuotaHTTPClient)
+
+
+def sheets_service(credentials=None):
+    """googleapiclient Sheets v4 서비스 (주소는 config.SHEETS_API_URL을 따름)"""
+    from googleapiclient.discovery import build
+
+    root = config.SHEETS_API_URL.rstrip('/')
+    root = root[:-len('/v4')] if root.endswith('/v4') else root
+    return build('sheets', 'v4', credentials=credentials or get_credentials(),
+                 client_options={'api_endpoint': root + '/'}, cache_discovery=False)
+
+
+@traced('sheets.open', 'io')
+def open_spreadsheet(client=None):
+    client = client or get_client()
+    return client.open_by_key(config.SPREADSHEET_ID)
+
+
+def load_worksheet(index, spreadsheet=None, schema=None):
+    """구글 스프레드시트 워크시트(index) → DataFrame (schema: {컬럼: 'int'|'float'|'str'})"""
+    spreadsheet = spreadsheet or open_spreadsheet()
+    ws = spreadsheet.get_worksheet(index)
+    with span('sheets.download', 'io', worksheet=index):
+        values = ws.get_values()
+    with span('parse', 'cpu', worksheet=index):
+        return parse_values(values, schema, drop_errors=False)
+
+
+def load_range(index, a1_range, spreadsheet=None):
+    """워크시트(index)의 A1 범위 → list of lists"""
+    spreadsheet = spreadsheet or open_spreadsheet()
+    with span('sheets.download', 'io', worksheet=index, range=a1_range):
+        return spreadsheet.get_worksheet(index).get(a1_range)
+
+
+def worksheet_header(ws, header_row=1):
+    """워크시트 헤더 행 (프로세스 안에서 한 번만 조회)"""
+    key = (ws.spreadsheet.id, ws.id, header_row)
+    if key not in _HEADERS:
+        _HEADERS[key] = [str(c).strip() for c in ws.row_values(header_row)]
+    return _HEADERS[key]
+
+
+def read_columns(ws, columns, where=None, header_row=1):
+    """워크시트에서 columns 열만 받아 DataFrame으로 (where 조건은 파싱하면서 적용)
+
+    get_all_records()와 달리 시트 폭이 아니라 요청한 열 수만큼만 내려받는다.
+    """
+    names = needed_columns(columns, where)
+    ranges = column_ranges(ws.title, worksheet_header(ws, header_row), names, header_row)
+    with span('sheets.download', 'io', worksheet=ws.title, columns=len(names)):
+        resp = ws.spreadsheet.values_batch_get(ranges, params={'majorDimension': 'COLUMNS'})
+    values = [(vr.get('values') or [[]])[0] for vr in resp.get('valueRanges', [])]
+    with span('parse', 'cpu', worksheet=ws.title):
+        return columns_to_frame(values, columns, where)
+
+
+def load_columns(index, columns, where=None, spreadsheet=None):
+    """워크시트(index)의 지정 컬럼만 → DataFrame"""
+    spreadsheet = spreadsheet or open_spreadsheet()
+    return read_columns(spreadsheet.get_worksheet(index), columns, where)
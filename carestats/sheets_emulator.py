@@ -0,0 +1,368 @@
+# -*- coding: utf-8 -*-
+"""로컬 Google Sheets v4 / Drive v3 대역 서버 (aiohttp, fixture 파일로 채움)
+
+이 저장소가 쓰는 API만 흉내 낸다.
+- GET /v4/spreadsheets/{id}                     스프레드시트 메타데이터 (워크시트 목록: sheetId, title, index, gridProperties)
+- GET /v4/spreadsheets/{id}/values/{range}      values.get (ws.get_values(), get_all_records(), ws.get('A3:B23'), row_values)
+- GET /v4/spreadsheets/{id}/values:batchGet     values.batchGet (majorDimension=COLUMNS 열 단위 읽기 포함)
+- GET /drive/v3/files/{id}                      Drive 메타데이터 (version, modifiedTime → RunCheck)
+- GET /_emulator/stats                          요청/제한 횟수 (대역 서버 전용)
+
+스프레드시트 ID는 확인하지 않는다 (스크립트마다 박혀 있는 ID를 그대로 받음).
+값은 모두 문자열이고 valueRenderOption은 무시한다. 범위 끝의 빈 칸/빈 행은 실제 API처럼 잘라낸다.
+
+실행:
+    python -m carestats synth --out /tmp/synth
+    python -m carestats sheets-emulator --data-dir /tmp/synth --latency 0.2 --quota 60
+    CARESTATS_SHEETS_EMULATOR_HOST=127.0.0.1:8090 python -m carestats map capacity
+
+--data-dir는 synthetic.write() 결과(worksheets/sheet{N}[_{시작}_{끝}].csv)를 그대로 쓰고,
+worksheets/가 없으면 save_snapshot() 스냅샷(fixtures/sample 등)을 워크시트 모양으로 되돌려 쓴다.
+--quota를 넘으면 429 RESOURCE_EXHAUSTED, --error-rate 비율만큼 503을 돌려줘 재시도 계층을 시험할 수 있다.
+"""
+import argparse
+import asyncio
+import collections
+import csv
+import hashlib
+import json
+import os
+import random
+import re
+import time
+from datetime import datetime, timezone
+from functools import partial
+
+from aiohttp import web
+
+from carestats.projection import column_letter, quote_title
+
+SHEET_FILE = re.compile(r'^sheet(\d+)(?:_([A-Z]*\d*)_([A-Z]*\d*))?\.csv$')
+CELL = re.compile(r'^([A-Za-z]*)(\d*)$')
+SHEET_TITLES = {
+    1: '복지시설', 2: '지원구분별 지급건수', 3: '가족유형별 수급자수',
+    4: '시도별 한부모 가구 수', 7: '시도별 수급자수',
+}
+WINDOW = 60.0   # --quota 기준 시간 (초)
+
+json_response = partial(web.json_response, dumps=partial(json.dumps, ensure_ascii=False))
+
+
+class RangeError(ValueError):
+    """해석할 수 없는 A1 범위 (HTTP 400)"""
+
+
+# --- A1 표기 ---
+def column_index(letters):
+    """A1 열 문자 → 0부터 시작하는 번호 (A → 0, AA → 26)"""
+    n = 0
+    for ch in letters.upper():
+        n = n * 26 + ord(ch) - ord('A') + 1
+    return n - 1
+
+
+def parse_cell(ref):
+    """'B23' → (행, 열) 0부터, 생략한 부분은 None ('B' → (None, 1), '3' → (2, None))"""
+    m = CELL.match(ref.strip())
+    if not m or not ref.strip():
+        raise RangeError(f"잘못된 셀 주소: {ref}")
+    letters, digits = m.groups()
+    return (int(digits) - 1 if digits else None, column_index(letters) if letters else None)
+
+
+def split_range(a1):
+    """"'제목'!A3:B23" → ('제목', 'A3:B23'), '제목' → ('제목', None), 'A3:D' → (None, 'A3:D')"""
+    if a1.startswith("'"):
+        end = a1.find("'", 1)
+        while end != -1 and a1[end + 1:end + 2] == "'":
+            end = a1.find("'", end + 2)
+        if end == -1:
+            raise RangeError(f"따옴표가 닫히지 않은 범위: {a1}")
+        title, rest = a1[1:end].replace("''", "'"), a1[end + 1:]
+        if rest and not rest.startswith('!'):
+            raise RangeError(f"잘못된 범위: {a1}")
+        return title, rest[1:] or None
+    if '!' in a1:
+        title, cells = a1.rsplit('!', 1)
+        return title, cells or None
+    return None, a1
+
+
+def parse_cells(cells, n_rows, n_cols):
+    """'A3:B23' → (행 시작, 행 끝, 열 시작, 열 끝) 끝은 포함하지 않음, 열린 끝은 시트 크기까지"""
+    if cells is None:
+        return 0, n_rows, 0, n_cols
+    first, _, last = cells.partition(':')
+    r0, c0 = parse_cell(first)
+    if not last:
+        if r0 is None or c0 is None:
+            raise RangeError(f"잘못된 범위: {cells}")
+        return r0, r0 + 1, c0, c0 + 1
+    r1, c1 = parse_cell(last)
+    return (r0 or 0, n_rows if r1 is None else r1 + 1,
+            c0 or 0, n_cols if c1 is None else c1 + 1)
+
+
+def trim(rows):
+    """끝쪽 빈 칸과 빈 행 잘라내기 (Sheets API 응답 모양)"""
+    out = []
+    for row in rows:
+        while row and row[-1] == '':
+            row = row[:-1]
+        out.append(row)
+    while out and not out[-1]:
+        out.pop()
+    return out
+
+
+# --- 워크북 ---
+class Worksheet:
+    def __init__(self, index, title, grid):
+        self.index = index
+        self.title = title
+        self.grid = grid
+        self.rows = len(grid)
+        self.cols = max((len(r) for r in grid), default=0)
+
+    def properties(self):
+        return {
+            'sheetId': self.index, 'title': self.title, 'index': self.index, 'sheetType': 'GRID',
+            'gridProperties': {'rowCount': max(self.rows, 1000), 'columnCount': max(self.cols, 26)},
+        }
+
+    def values(self, cells, major='ROWS'):
+        """A1 범위 → (정규화한 범위 문자열, 값 목록)"""
+        r0, r1, c0, c1 = parse_cells(cells, self.rows, self.cols)
+        rows = [list(row[c0:c1]) for row in self.grid[r0:min(r1, self.rows)]]
+        if major == 'COLUMNS':
+            width = max((len(r) for r in rows), default=0)
+            rows = [[r[c] if c < len(r) else '' for r in rows] for c in range(width)]
+        last_row = max(min(r1, self.rows), r0 + 1)
+        last_col = max(min(c1, self.cols), c0 + 1)
+        label = f"{quote_title(self.title)}!{column_letter(c0)}{r0 + 1}:{column_letter(last_col - 1)}{last_row}"
+        return label, trim(rows)
+
+
+class Workbook:
+    """워크시트 목록 (번호 순서) + Drive 메타데이터"""
+
+    def __init__(self, grids, title='careStats (local)'):
+        last = max(grids, default=0)
+        self.title = title
+        self.sheets = [
+            Worksheet(i, SHEET_TITLES.get(i, f"Sheet{i}"), grids.get(i, [])) for i in range(last + 1)
+        ]
+        h = hashlib.sha1()
+        for i in sorted(grids):
+            h.update(json.dumps(grids[i], ensure_ascii=False).encode('utf-8'))
+        self.digest = h.hexdigest()
+        self.version = str(int(self.digest[:8], 16))
+        self.modified = datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%S.000Z')
+
+    def worksheet(self, title=None):
+        if title is None:
+            return self.sheets[0]
+        for ws in self.sheets:
+            if ws.title == title:
+                return ws
+        raise RangeError(f"Unable to parse range: {title}")
+
+    def values(self, a1, major='ROWS'):
+        title, cells = split_range(a1)
+        if title is None and cells is not None:
+            try:
+                return self.worksheet(cells).values(None, major)    # 범위 없이 시트 제목만
+            except RangeError:
+                pass
+        return self.worksheet(title).values(cells, major)
+
+    def metadata(self, spreadsheet_id):
+        return {
+            'spreadsheetId': spreadsheet_id,
+            'properties': {'title': self.title, 'locale': 'ko_KR', 'timeZone': 'Asia/Seoul'},
+            'sheets': [{'properties': ws.properties()} for ws in self.sheets],
+        }
+
+
+def _place(rows, anchor):
+    """anchor 셀('A3')부터 놓이도록 앞쪽 빈 행/열 채우기"""
+    r0, c0 = parse_cell(anchor) if anchor else (0, 0)
+    pad = [''] * (c0 or 0)
+    return [[] for _ in range(r0 or 0)] + [pad + row for row in rows]
+
+
+def load_workbook(data_dir):
+    """data_dir/worksheets/sheet{N}[_{시작}_{끝}].csv 또는 스냅샷 CSV → Workbook"""
+    sheets_dir = os.path.join(data_dir, 'worksheets')
+    grids = {}
+    if os.path.isdir(sheets_dir):
+        for name in sorted(os.listdir(sheets_dir)):
+            m = SHEET_FILE.match(name)
+            if not m:
+                continue
+            with open(os.path.join(sheets_dir, name), newline='', encoding='utf-8-sig') as f:
+                grids[int(m.group(1))] = _place(list(csv.reader(f)), m.group(2))
+    else:
+        from carestats.synthetic import SHEET_FILES, snapshot_sheets
+        for key, rows in snapshot_sheets(data_dir).items():
+            m = SHEET_FILE.match(SHEET_FILES[key])
+            grids[int(m.group(1))] = _place(rows, m.group(2))
+    if not grids:
+        raise SystemExit(f"❌ 워크시트 파일이 없습니다: {data_dir}")
+    return Workbook(grids, title=os.path.basename(os.path.normpath(data_dir)))
+
+
+# --- 지연/할당량/오류 주입 ---
+class Faults:
+    """요청마다 지연을 넣고, 분당 할당량을 넘거나 error_rate에 걸리면 오류 응답"""
+
+    def __init__(self, latency=0.0, jitter=0.0, quota=0, error_rate=0.0, seed=None):
+        self.latency = latency
+        self.jitter = jitter
+        self.quota = quota
+        self.error_rate = error_rate
+        self.rng = random.Random(seed)
+        self.recent = collections.deque()
+        self.counts = collections.Counter()    # requests / throttled / errors
+        self.routes = collections.Counter()    # API 메서드별 요청 수
+
+    def delay(self):
+        return max(0.0, self.latency + self.rng.uniform(-self.jitter, self.jitter))
+
+    def check(self, now=None):
+        """→ None (통과) 또는 (HTTP 상태, 본문, 헤더)"""
+        now = time.monotonic() if now is None else now
+        self.counts['requests'] += 1
+        if self.quota:
+            while self.recent and now - self.recent[0] >= WINDOW:
+                self.recent.popleft()
+            if len(self.recent) >= self.quota:
+                self.counts['throttled'] += 1
+                retry_after = max(1, int(WINDOW - (now - self.recent[0])) + 1)
+                return 429, google_error(
+                    429, "Quota exceeded for quota metric 'Read requests' and limit "
+                         f"'Read requests per minute per user' ({self.quota})",
+                    'RESOURCE_EXHAUSTED', 'rateLimitExceeded'), {'Retry-After': str(retry_after)}
+            self.recent.append(now)
+        if self.error_rate and self.rng.random() < self.error_rate:
+            self.counts['errors'] += 1
+            return 503, google_error(503, 'The service is currently unavailable.', 'UNAVAILABLE',
+                                     'backendError'), {}
+        return None
+
+
+def google_error(code, message, status, reason):
+    return {'error': {'code': code, 'message': message, 'status': status,
+                      'errors': [{'message': message, 'domain': 'global', 'reason': reason}]}}
+
+
+# --- 핸들러 ---
+WORKBOOK = web.AppKey('workbook', Workbook)
+FAULTS = web.AppKey('faults', Faults)
+
+
+@web.middleware
+async def fault_middleware(request, handler):
+    if request.path.startswith('/_emulator'):
+        return await handler(request)
+    faults = request.app[FAULTS]
+    faults.routes[request.match_info.route.name or request.path] += 1
+    delay = faults.delay()
+    if delay:
+        await asyncio.sleep(delay)
+    failure = faults.check()
+    if failure is not None:
+        status, body, headers = failure
+        return json_response(body, status=status, headers=headers)
+    try:
+        return await handler(request)
+    except RangeError as e:
+        return json_response(google_error(400, str(e), 'INVALID_ARGUMENT', 'badRequest'), status=400)
+
+
+def _major(request):
+    major = request.query.get('majorDimension', 'ROWS').upper()
+    if major not in ('ROWS', 'COLUMNS'):
+        raise RangeError(f"Invalid majorDimension: {major}")
+    return major
+
+
+def _value_range(label, major, values):
+    out = {'range': label, 'majorDimension': major}
+    if values:
+        out['values'] = values
+    return out
+
+
+async def handle_metadata(request):
+    return json_response(request.app[WORKBOOK].metadata(request.match_info['id']))
+
+
+async def handle_values(request):
+    major = _major(request)
+    label, values = request.app[WORKBOOK].values(request.match_info['range'], major)
+    return json_response(_value_range(label, major, values))
+
+
+async def handle_batch_get(request):
+    major = _major(request)
+    workbook = request.app[WORKBOOK]
+    ranges = []
+    for a1 in request.query.getall('ranges', []):
+        label, values = workbook.values(a1, major)
+        ranges.append(_value_range(label, major, values))
+    return json_response({'spreadsheetId': request.match_info['id'], 'valueRanges': ranges})
+
+
+async def handle_drive_file(request):
+    workbook = request.app[WORKBOOK]
+    return json_response({
+        'kind': 'drive#file', 'id': request.match_info['id'], 'name': workbook.title,
+        'mimeType': 'application/vnd.google-apps.spreadsheet',
+        'version': workbook.version, 'modifiedTime': workbook.modified,
+    })
+
+
+async def handle_stats(request):
+    faults = request.app[FAULTS]
+    return json_response({'counts': dict(faults.counts), 'routes': dict(faults.routes), 'quota': faults.quota,
+                          'version': request.app[WORKBOOK].version})
+
+
+def create_app(workbook, faults=None):
+    app = web.Application(middlewares=[fault_middleware])
+    app[WORKBOOK] = workbook
+    app[FAULTS] = faults or Faults()
+    app.router.add_get('/v4/spreadsheets/{id}', handle_metadata, name='spreadsheets.get')
+    app.router.add_get('/v4/spreadsheets/{id}/values:batchGet', handle_batch_get, name='values.batchGet')
+    app.router.add_get('/v4/spreadsheets/{id}/values/{range:.+}', handle_values, name='values.get')
+    app.router.add_get('/drive/v3/files/{id}', handle_drive_file, name='files.get')
+    app.router.add_get('/_emulator/stats', handle_stats)
+    return app
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='carestats sheets-emulator',
+                                     description="로컬 Google Sheets/Drive 대역 서버")
+    parser.add_argument('--data-dir', required=True,
+                        help="synth 결과 디렉터리(worksheets/ 포함) 또는 스냅샷 디렉터리 (fixtures/sample)")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8090)
+    parser.add_argument('--latency', type=float, default=0.0, help="요청마다 넣을 지연 (초)")
+    parser.add_argument('--jitter', type=float, default=0.0, help="지연에 더할 ± 무작위 폭 (초)")
+    parser.add_argument('--quota', type=int, default=0,
+                        help="분당 요청 수 상한 (넘으면 429, 0이면 무제한; 실제 기본값은 60)")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="503으로 응답할 요청 비율 (0~1)")
+    parser.add_argument('--seed', type=int, help="지연/오류 주입 난수 시드")
+    args = parser.parse_args(argv)
+
+    workbook = load_workbook(args.data_dir)
+    faults = Faults(args.latency, args.jitter, args.quota, args.error_rate, args.seed)
+    titles = ', '.join(f"{ws.index}:{ws.title}({ws.rows}행)" for ws in workbook.sheets if ws.rows)
+    print(f"📄 워크시트 {titles}")
+    print(f"👉 CARESTATS_SHEETS_EMULATOR_HOST={args.host}:{args.port}")
+    web.run_app(create_app(workbook, faults), host=args.host, port=args.port, print=None)
+
+
+if __name__ == '__main__':
+    main()
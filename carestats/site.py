@@ -0,0 +1,220 @@
+# -*- coding: utf-8 -*-
+"""지도 사이트: 공유 JS/CSS 번들 한 벌 + 지도별 데이터 파일 + 몇 줄짜리 페이지
+
+folium/plotly HTML은 지도마다 같은 보일러플레이트를 통째로 싣고 보는 순간 CDN에서 Leaflet/Plotly를
+받는다 (내부망에서 느리고 오프라인이면 안 열림). 사이트 모드는 한 디렉터리에
+
+    assets/carestats.<해시>.js       leaflet.js + static/map.js (carestats 지도 런타임)
+    assets/carestats.<해시>.css      leaflet.css + static/map.css
+    data/<지도 이름>.<해시>.js        carestats.load('<지도 이름>', {레이어 JSON});
+    woohyun/capacity_bubble_map.html   번들과 데이터 파일을 부르는 페이지
+
+를 쓴다. 파일 이름에 내용 해시가 들어가므로 오래 캐시해도 되고(내용이 바뀌면 이름이 바뀜)
+모든 페이지가 같은 번들을 공유해 브라우저는 한 번만 받는다. 데이터는 JSON을 carestats.load(...)
+한 줄로 감싼 스크립트라 웹 서버 없이 file://로 열어도 읽힌다.
+
+Leaflet 파일은 config.ASSET_DIR에서 읽고, 없으면 처음 한 번 CDN에서 받아 둔다 (오프라인 환경에서는
+leaflet.js / leaflet.css를 그 디렉터리에 넣어 두면 됨). 파일 하나로 여는 페이지(standalone_html)도
+같은 파일을 페이지 안에 넣으므로, 보는 시점에 네트워크가 필요한 것은 배경 타일(config.TILE_URL,
+빈 값이면 타일 없이)뿐이다.
+
+런타임이 바뀌어 새 번들을 써도 이전 판은 바로 지우지 않는다 (--only로 일부 페이지만 다시 쓰면 나머지
+페이지는 아직 이전 판을 가리킴). 모든 페이지를 다시 쓴 뒤 prune_bundles()로 정리한다.
+
+    python -m carestats refresh --site /tmp/site
+"""
+import glob
+import hashlib
+import json
+import os
+import re
+import tempfile
+import threading
+
+from carestats import config
+
+LEAFLET_VERSION = '1.9.4'
+LEAFLET_CDN = f"https://unpkg.com/leaflet@{LEAFLET_VERSION}/dist/"
+STATIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'static')
+
+_BUNDLE_LOCK = threading.Lock()
+
+PAGE_HTML = """<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>{title}</title>
+<meta name="viewport" content="width=device-width, initial-scale=1">
+<link rel="stylesheet" href="{css}">
+<script src="{js}"></script>
+</head><body><div id="map"></div>
+<script>{script}</script>
+</body></html>
+"""
+
+STANDALONE_HTML = """<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>{title}</title>
+<meta name="viewport" content="width=device-width, initial-scale=1">
+<style>
+{css}</style>
+<script>
+{js}</script>
+</head><body><div id="map"></div>
+<script>carestats.show({spec}, 'map', {options});</script>
+</body></html>
+"""
+
+
+def _digest(data):
+    return hashlib.sha256(data).hexdigest()[:10]
+
+
+def _write_atomic(path, data):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+    with os.fdopen(fd, 'wb') as f:
+        f.write(data)
+    os.chmod(tmp, 0o644)   # mkstemp는 0600 → 웹 서버가 읽을 수 있게
+    os.replace(tmp, path)
+
+
+def _prune(directory, stem, ext, keep):
+    """stem.<해시>.ext 중 keep이 아닌 이전 판 삭제 → 지운 파일 수"""
+    pattern = re.compile(re.escape(stem) + r'\.[0-9a-f]{10}\.' + re.escape(ext) + '$')
+    removed = 0
+    for path in glob.glob(os.path.join(glob.escape(directory), f"{glob.escape(stem)}.*.{ext}")):
+        name = os.path.basename(path)
+        if name != keep and pattern.match(name):
+            os.remove(path)
+            removed += 1
+    return removed
+
+
+def vendor_file(name):
+    """ASSET_DIR의 Leaflet 파일 내용 (없으면 CDN에서 한 번 받아 저장)"""
+    path = os.path.join(config.ASSET_DIR, name)
+    if not os.path.exists(path):
+        import urllib.request
+        url = LEAFLET_CDN + name
+        try:
+            with urllib.request.urlopen(url, timeout=30) as resp:
+                data = resp.read()
+        except OSError as e:
+            raise RuntimeError(f"{name}을(를) 받지 못했습니다 ({e}). {url} 파일을 {config.ASSET_DIR}에 넣어 주세요.")
+        _write_atomic(path, data)
+    with open(path, 'rb') as f:
+        return f.read()
+
+
+def runtime():
+    """(map.js, map.css) 내용"""
+    with open(os.path.join(STATIC_DIR, 'map.js'), 'rb') as f:
+        js = f.read()
+    with open(os.path.join(STATIC_DIR, 'map.css'), 'rb') as f:
+        css = f.read()
+    return js, css
+
+
+def bundle_digest():
+    """런타임 판 (Leaflet 버전 + map.js + map.css 해시, Leaflet 파일을 받지 않고 계산)
+
+    사이트 렌더링 단계의 params에 넣어 런타임이 바뀌면 페이지를 다시 쓰게 한다 (carestats.refresh).
+    """
+    js, css = runtime()
+    return _digest(LEAFLET_VERSION.encode('utf-8') + b'\0' + js + b'\0' + css)
+
+
+def _bundle_parts():
+    js, css = runtime()
+    return {
+        'js': vendor_file('leaflet.js') + b'\n;\n' + js,
+        'css': vendor_file('leaflet.css') + b'\n' + css,
+    }
+
+
+def write_bundle(site_dir):
+    """site_dir/assets에 번들 JS/CSS (이미 같은 판이 있으면 그대로, 이전 판은 남겨 둠) → {'js': 상대 경로, 'css': 상대 경로}"""
+    assets = os.path.join(site_dir, 'assets')
+    out = {}
+    with _BUNDLE_LOCK:
+        for ext, data in _bundle_parts().items():
+            name = f"carestats.{_digest(data)}.{ext}"
+            path = os.path.join(assets, name)
+            if not os.path.exists(path):
+                _write_atomic(path, data)
+            out[ext] = f"assets/{name}"
+    return out
+
+
+def prune_bundles(site_dir):
+    """현재 판이 아닌 번들 삭제 → 지운 파일 수
+
+    모든 페이지를 현재 판으로 다시 쓴 뒤에만 부른다 (carestats.refresh: --only 없이 전체 단계가 성공했을 때).
+    """
+    current = write_bundle(site_dir)
+    assets = os.path.join(site_dir, 'assets')
+    with _BUNDLE_LOCK:
+        return sum(_prune(assets, 'carestats', ext, os.path.basename(rel)) for ext, rel in current.items())
+
+
+def map_name(rel_path):
+    """'woohyun/capacity_bubble_map.html' → 'woohyun-capacity_bubble_map'"""
+    return os.path.splitext(rel_path)[0].replace(os.sep, '-').replace('/', '-')
+
+
+def write_data(site_dir, name, spec):
+    """레이어 데이터 → site_dir/data/<name>.<해시>.js (상대 경로 반환)"""
+    payload = json.dumps(spec, ensure_ascii=False, separators=(',', ':'))
+    data = f"carestats.load({json.dumps(name)},{payload});\n".encode('utf-8')
+    directory = os.path.join(site_dir, 'data')
+    file_name = f"{name}.{_digest(data)}.js"
+    path = os.path.join(directory, file_name)
+    if not os.path.exists(path):
+        _write_atomic(path, data)
+        _prune(directory, name, 'js', file_name)
+    return f"data/{file_name}"
+
+
+def view_options():
+    return {'tiles': config.TILE_URL} if config.TILE_URL else {}
+
+
+def write_page(site_dir, rel_path, title, script):
+    """번들을 부르는 페이지 쓰기 → 페이지 경로
+
+    script(href): 페이지에서 실행할 JS 문자열을 돌려주는 함수 (href(사이트 기준 상대 경로) → 페이지 기준 경로)
+    """
+    bundle = write_bundle(site_dir)
+    page = os.path.join(site_dir, rel_path)
+    prefix = os.path.relpath(site_dir, os.path.dirname(page)).replace(os.sep, '/')
+
+    def href(rel):
+        return rel if prefix == '.' else f"{prefix}/{rel}"
+
+    html = PAGE_HTML.format(title=title, css=href(bundle['css']), js=href(bundle['js']), script=script(href))
+    _write_atomic(page, html.encode('utf-8'))
+    return page
+
+
+def write_map(site_dir, rel_path, spec, title=None):
+    """지도 하나를 사이트에 쓰기 (번들 + 데이터 파일 + 페이지) → 페이지 경로"""
+    name = map_name(rel_path)
+    data = write_data(site_dir, name, spec)
+    options = json.dumps(view_options(), ensure_ascii=False)
+    return write_page(
+        site_dir, rel_path, title or spec.get('title', name),
+        lambda href: f"carestats.fetch({json.dumps(name)}, {json.dumps(href(data))}, "
+                     f"function (spec) {{ carestats.show(spec, 'map', {options}); }});",
+    )
+
+
+def _inline(data):
+    """<script>/<style> 안에 넣을 문자열 (본문의 '</script', '</style'이 태그를 닫지 않게)"""
+    return re.sub(r'</(script|style)', r'<\\/\1', data.decode('utf-8'), flags=re.IGNORECASE)
+
+
+def standalone_html(spec, title):
+    """사이트 없이 파일 하나로 여는 페이지 (Leaflet, 런타임, 데이터 모두 페이지 안에 — 번들과 같은 내용)"""
+    parts = _bundle_parts()
+    return STANDALONE_HTML.format(
+        title=title, css=_inline(parts['css']), js=_inline(parts['js']),
+        spec=json.dumps(spec, ensure_ascii=False, separators=(',', ':')).replace('</', '<\\/'),
+        options=json.dumps(view_options(), ensure_ascii=False),
+    )
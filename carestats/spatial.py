@@ -0,0 +1,320 @@
+# -*- coding: utf-8 -*-
+"""좌표 → 시군구 공간 결합 (경계 다각형 + 격자 색인, NumPy만 사용)
+
+워크시트 1의 정원은 자유 입력 '시도'/'구' 글자로 지역에 붙는다. 글자가 비었거나 틀리면
+조용히 다른 지역으로 가거나 빠진다. 여기서는 지오코딩한 시설 좌표(lat/lon)를 로컬 경계 파일
+(GeoJSON, 경위도)의 시군구 다각형에 직접 넣는다.
+
+    index = RegionIndex.from_geojson(config.BOUNDARY_PATH)
+    codes = index.locate(lon, lat)                 # 지역 번호 (경계 밖/좌표 없음은 -1)
+    df = assign_regions(points, index)             # 통계시도명/통계시군구명을 경계 기준으로
+
+색인은 경계를 덮는 균일 격자다.
+- 칸마다 그 칸을 지나는 변 목록(CSR)과 칸 기준점이 속한 지역을 미리 구한다 (기준점은 행마다 광선 교차 한 번).
+- 점은 자기 칸 기준점의 지역에서 출발해 기준점 → 점 선분이 그 칸의 변을 몇 번 넘는지로 결정한다.
+- 변이 없는 칸(지역 안쪽)의 점은 교차 계산 없이 칸 기준점 지역을 그대로 받는다.
+
+점 하나가 보는 변은 칸 하나 분량뿐이라 10만 점 × 시군구 250개도 1초 안쪽이다.
+경계 파일 속성은 통계시도명/통계시군구명 또는 CTP_KOR_NM/SIG_KOR_NM/SIG_CD 등을 읽는다.
+
+    python -m carestats spatial-join --points welfare_facilities_points.csv [--boundaries PATH]
+"""
+import argparse
+import json
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+from carestats import config
+from carestats.regions import SIDO_CODES, normalize_sido
+from carestats.trace import traced
+
+SIDO_FIELDS = ('통계시도명', 'CTP_KOR_NM', 'SIDO_NM', 'sido', '시도')
+SIGUNGU_FIELDS = ('통계시군구명', 'SIG_KOR_NM', 'SIGUNGU_NM', 'sigungu', '시군구', '구', 'name')
+CODE_FIELDS = ('행정구역코드', 'SIG_CD', 'ADM_CD', 'adm_cd', 'code')
+EDGES_PER_CELL = 8         # 격자 크기: 칸당 평균 변 수가 이 정도가 되도록
+MAX_CELLS = 1 << 20
+CHUNK_PAIRS = 1 << 22      # 한 번에 만드는 (점, 변) 쌍 수 상한
+# 칸 안 기준점 위치 (칸 너비/높이 비율): 좌표가 딱 떨어지는 경계선 위에 놓이지 않게 무리수 비율
+ANCHOR = (0.41421356, 0.57735027)
+
+
+def _first(props, fields):
+    for field in fields:
+        value = props.get(field)
+        if value not in (None, ''):
+            return str(value).strip()
+    return ''
+
+
+def _rings(geometry):
+    if geometry is None:
+        return []
+    if geometry['type'] == 'Polygon':
+        return geometry['coordinates']
+    if geometry['type'] == 'MultiPolygon':
+        return [ring for polygon in geometry['coordinates'] for ring in polygon]
+    return []
+
+
+def read_rings(source):
+    """GeoJSON 경로/dict → (지역 DataFrame [행정구역코드, 통계시도명, 통계시군구명], [(지역 번호, 닫힌 고리 (n, 2))])
+
+    이름이 같은 피처(섬 등 여러 조각)는 한 지역으로 합친다.
+    """
+    if isinstance(source, dict):
+        collection = source
+    else:
+        with open(source, encoding='utf-8') as f:
+            collection = json.load(f)
+    keys, rings = [], []
+    for feature in collection.get('features', []):
+        props = feature.get('properties') or {}
+        code = _first(props, CODE_FIELDS)
+        sido = normalize_sido(_first(props, SIDO_FIELDS) or SIDO_CODES.get(code[:2], ''))
+        keys.append((code, sido, _first(props, SIGUNGU_FIELDS)))
+        for ring in _rings(feature.get('geometry')):
+            xy = np.asarray(ring, dtype=float)[:, :2]
+            if len(xy) < 3:
+                continue
+            if not np.array_equal(xy[0], xy[-1]):
+                xy = np.vstack([xy, xy[:1]])
+            rings.append((len(keys) - 1, xy))
+    columns = ['행정구역코드', '통계시도명', '통계시군구명']
+    codes, uniques = pd.factorize(pd.MultiIndex.from_frame(pd.DataFrame(keys, columns=columns)))
+    regions = pd.DataFrame(list(uniques), columns=columns)
+    return regions, [(int(codes[owner]), xy) for owner, xy in rings]
+
+
+def read_boundaries(source):
+    """GeoJSON 경로/dict → (지역 DataFrame, 변 (E, 4), 변의 지역 번호 (E,))
+
+    구멍(안쪽 고리)은 짝홀 규칙으로 처리된다.
+    """
+    regions, rings = read_rings(source)
+    if not rings:
+        return regions, np.empty((0, 4)), np.empty(0, dtype=np.intp)
+    edges = np.vstack([np.hstack([xy[:-1], xy[1:]]) for _, xy in rings])
+    owners = np.concatenate([np.full(len(xy) - 1, owner, dtype=np.intp) for owner, xy in rings])
+    return regions, edges, owners
+
+
+class RegionIndex:
+    """경계 다각형 격자 색인: locate(lon, lat) → 지역 번호 (regions 행)"""
+
+    def __init__(self, regions, edges, edge_region, cells=None):
+        self.regions = regions.reset_index(drop=True)
+        self.edges = np.asarray(edges, dtype=float)
+        self.edge_region = np.asarray(edge_region, dtype=np.intp)
+        x1, y1, x2, y2 = self.edges.T
+        if len(self.edges):
+            self.bounds = (min(x1.min(), x2.min()), min(y1.min(), y2.min()),
+                           max(x1.max(), x2.max()), max(y1.max(), y2.max()))
+        else:
+            self.bounds = (0.0, 0.0, 1.0, 1.0)
+        west, south, east, north = self.bounds
+        width, height = max(east - west, 1e-9), max(north - south, 1e-9)
+        cells = cells or int(np.clip(len(self.edges) // EDGES_PER_CELL, 1, MAX_CELLS))
+        self.nx = max(1, int(round(np.sqrt(cells * width / height))))
+        self.ny = max(1, int(np.ceil(cells / self.nx)))
+        self.cell_w = width / self.nx
+        self.cell_h = height / self.ny
+        self._build_cells()
+        self._label_anchors()
+
+    @classmethod
+    def from_geojson(cls, source=None, cells=None):
+        regions, edges, edge_region = read_boundaries(source or config.BOUNDARY_PATH)
+        return cls(regions, edges, edge_region, cells)
+
+    def _col(self, x):
+        return np.floor((x - self.bounds[0]) / self.cell_w).astype(np.int64)
+
+    def _row(self, y):
+        return np.floor((y - self.bounds[1]) / self.cell_h).astype(np.int64)
+
+    def _build_cells(self):
+        """변 → 그 변의 bbox가 걸치는 모든 칸 (CSR: cell_start, cell_edges)"""
+        x1, y1, x2, y2 = self.edges.T
+        c0 = np.clip(self._col(np.minimum(x1, x2)), 0, self.nx - 1)
+        c1 = np.clip(self._col(np.maximum(x1, x2)), 0, self.nx - 1)
+        r0 = np.clip(self._row(np.minimum(y1, y2)), 0, self.ny - 1)
+        r1 = np.clip(self._row(np.maximum(y1, y2)), 0, self.ny - 1)
+        width = c1 - c0 + 1
+        count = width * (r1 - r0 + 1)
+        edge = np.repeat(np.arange(len(self.edges)), count)
+        k = np.arange(count.sum()) - np.repeat(np.cumsum(count) - count, count)
+        cell = (r0[edge] + k // width[edge]) * self.nx + c0[edge] + k % width[edge]
+        order = np.argsort(cell, kind='stable')
+        self.cell_edges = edge[order]
+        self.cell_start = np.concatenate([[0], np.cumsum(np.bincount(cell, minlength=self.nx * self.ny))])
+
+    def _label_anchors(self):
+        """칸 기준점마다 속한 지역 (행마다 기준점 높이의 수평선과 변의 교점을 세는 광선 교차, 짝홀 규칙)"""
+        west, south = self.bounds[:2]
+        cx = west + (np.arange(self.nx) + ANCHOR[0]) * self.cell_w
+        labels = np.full((self.ny, self.nx), -1, dtype=np.intp)
+        for row in range(self.ny):
+            y = south + (row + ANCHOR[1]) * self.cell_h
+            e = np.unique(self.cell_edges[self.cell_start[row * self.nx]:self.cell_start[(row + 1) * self.nx]])
+            x1, y1, x2, y2 = self.edges[e].T
+            hit = (y1 <= y) != (y2 <= y)
+            if not hit.any():
+                continue
+            x1, y1, x2, y2, e = x1[hit], y1[hit], x2[hit], y2[hit], e[hit]
+            xi = x1 + (y - y1) * (x2 - x1) / (y2 - y1)
+            owners, local = np.unique(self.edge_region[e], return_inverse=True)
+            # 교점 xi가 기준점 cx[j]보다 왼쪽 ⇔ j >= searchsorted(cx, xi, 'right')
+            first = np.searchsorted(cx, xi, side='right')
+            hist = np.bincount(local * (self.nx + 1) + first, minlength=len(owners) * (self.nx + 1))
+            inside = np.cumsum(hist.reshape(len(owners), self.nx + 1), axis=1)[:, :self.nx] % 2 == 1
+            labels[row] = np.where(inside.any(axis=0), owners[inside.argmax(axis=0)], -1)
+        self.anchor_labels = labels.ravel()
+
+    def centroids(self):
+        """지역별 대표점 (lat (R,), lon (R,)): 지역에 든 격자 기준점의 평균 (기준점이 없는 작은 지역은 꼭짓점 평균)"""
+        west, south = self.bounds[:2]
+        row, col = np.divmod(np.arange(self.nx * self.ny), self.nx)
+        inside = self.anchor_labels >= 0
+        n_regions = len(self.regions)
+        label = self.anchor_labels[inside]
+        count = np.bincount(label, minlength=n_regions)
+        lon = np.bincount(label, weights=west + (col[inside] + ANCHOR[0]) * self.cell_w, minlength=n_regions)
+        lat = np.bincount(label, weights=south + (row[inside] + ANCHOR[1]) * self.cell_h, minlength=n_regions)
+        vertices = np.bincount(self.edge_region, minlength=n_regions)
+        vx = np.bincount(self.edge_region, weights=self.edges[:, 0], minlength=n_regions)
+        vy = np.bincount(self.edge_region, weights=self.edges[:, 1], minlength=n_regions)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return (np.where(count > 0, lat / count, vy / vertices),
+                    np.where(count > 0, lon / count, vx / vertices))
+
+    def locate(self, lon, lat):
+        """경도/위도 배열 → 지역 번호 배열 (경계 밖, NaN은 -1)"""
+        px = np.asarray(lon, dtype=float)
+        py = np.asarray(lat, dtype=float)
+        out = np.full(px.shape, -1, dtype=np.intp)
+        col = self._col(np.nan_to_num(px, nan=-np.inf).clip(-1e9, 1e9))
+        row = self._row(np.nan_to_num(py, nan=-np.inf).clip(-1e9, 1e9))
+        ok = np.flatnonzero((col >= 0) & (col < self.nx) & (row >= 0) & (row < self.ny)
+                            & np.isfinite(px) & np.isfinite(py))
+        cell = row[ok] * self.nx + col[ok]
+        out[ok] = self.anchor_labels[cell]
+
+        count = self.cell_start[cell + 1] - self.cell_start[cell]
+        busy = count > 0
+        ok, cell, count = ok[busy], cell[busy], count[busy]
+        # (점, 변) 쌍이 CHUNK_PAIRS 정도씩 되도록 점을 나눠 처리
+        total = np.cumsum(count)
+        splits = np.searchsorted(total, np.arange(CHUNK_PAIRS, total[-1] if len(total) else 0, CHUNK_PAIRS))
+        for part in np.split(np.arange(len(ok)), splits):
+            if len(part):
+                self._resolve(px, py, ok[part], cell[part], count[part], out)
+        return out
+
+    def _resolve(self, px, py, points, cell, count, out):
+        """칸 기준점 → 점 선분이 넘는 변의 지역별 횟수로 기준점 지역을 고침"""
+        pair = np.repeat(np.arange(len(points)), count)
+        k = np.arange(count.sum()) - np.repeat(np.cumsum(count) - count, count)
+        e = self.cell_edges[self.cell_start[cell][pair] + k]
+        row, col = np.divmod(cell, self.nx)
+        ax = (self.bounds[0] + (col + ANCHOR[0]) * self.cell_w)[pair]
+        ay = (self.bounds[1] + (row + ANCHOR[1]) * self.cell_h)[pair]
+        bx, by = px[points][pair], py[points][pair]
+        x1, y1, x2, y2 = self.edges[e].T
+
+        def side(ox, oy, dx, dy, qx, qy):
+            # 0은 '양수 아님' 쪽으로 고정 → 선분이 꼭짓점을 지나도 두 변 중 한 번만 셈
+            return (dx * (qy - oy) - dy * (qx - ox)) > 0
+
+        crosses = (
+            (side(ax, ay, bx - ax, by - ay, x1, y1) != side(ax, ay, bx - ax, by - ay, x2, y2))
+            & (side(x1, y1, x2 - x1, y2 - y1, ax, ay) != side(x1, y1, x2 - x1, y2 - y1, bx, by))
+        )
+        n_regions = len(self.regions)
+        key, times = np.unique(pair[crosses] * n_regions + self.edge_region[e[crosses]], return_counts=True)
+        key = key[times % 2 == 1]
+        who, region = np.divmod(key, n_regions)
+        base = out[points]
+        left = np.zeros(len(points), dtype=bool)
+        left[who[region == base[who]]] = True
+        entered = np.full(len(points), n_regions, dtype=np.intp)
+        np.minimum.at(entered, who[region != base[who]], region[region != base[who]])
+        out[points] = np.where(entered < n_regions, entered, np.where(left, -1, base))
+
+
+@traced('spatial', 'cpu')
+def assign_regions(df, index, lon='lon', lat='lat'):
+    """좌표 컬럼이 있는 df → 경계 기준 행정구역코드/통계시도명/통계시군구명 컬럼 추가 (경계 밖/좌표 없음은 '')"""
+    codes = index.locate(pd.to_numeric(df[lon], errors='coerce').to_numpy(dtype=float),
+                         pd.to_numeric(df[lat], errors='coerce').to_numpy(dtype=float))
+    names = pd.concat([index.regions, pd.DataFrame([[''] * 3], columns=index.regions.columns)],
+                      ignore_index=True)
+    out = df.copy()
+    matched = names.iloc[np.where(codes >= 0, codes, len(names) - 1)].reset_index(drop=True)
+    for col in names.columns:
+        out[col] = matched[col].to_numpy()
+    return out
+
+
+def capacity_by_region(points, index, value='정원'):
+    """assign_regions 결과 → 경계 지역별 value 합 (경계의 모든 지역 포함, 없는 곳은 0)"""
+    keys = list(index.regions.columns)
+    summary = points[points['통계시군구명'] != ''].groupby(keys)[value].sum()
+    full = pd.MultiIndex.from_frame(index.regions)
+    return summary.reindex(full, fill_value=0).rename(value).reset_index()
+
+
+def text_mismatches(points, sido_col='시도', sigungu_col='구'):
+    """글자 시도/구와 경계 결과가 다른 행 (경계 밖/좌표 없음 제외)"""
+    located = points['통계시군구명'] != ''
+    sido = points[sido_col].fillna('').astype(str).str.strip().map(normalize_sido)
+    sigungu = points[sigungu_col].fillna('').astype(str).str.strip()
+    differ = (sido != points['통계시도명']) | (sigungu != points['통계시군구명'])
+    return points[located & differ]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='carestats spatial-join',
+                                     description="시설 좌표 → 시군구 경계 공간 결합")
+    parser.add_argument('--points', required=True, help="lat/lon 컬럼이 있는 CSV (welfare_facilities.py 결과 등)")
+    parser.add_argument('--boundaries', default=config.BOUNDARY_PATH, help="시군구 경계 GeoJSON")
+    parser.add_argument('--lon', default='lon')
+    parser.add_argument('--lat', default='lat')
+    parser.add_argument('--value', default='정원', help="지역별로 합칠 컬럼")
+    parser.add_argument('--out', help="지역별 합계 CSV 저장 경로")
+    args = parser.parse_args(argv)
+
+    if not os.path.exists(args.boundaries):
+        raise SystemExit(f"❌ 경계 파일이 없습니다: {args.boundaries} (CARESTATS_BOUNDARY_PATH로 지정)")
+    start = time.perf_counter()
+    index = RegionIndex.from_geojson(args.boundaries)
+    built = time.perf_counter() - start
+    points = pd.read_csv(args.points, encoding='utf-8-sig')
+    start = time.perf_counter()
+    points = assign_regions(points, index, args.lon, args.lat)
+    elapsed = time.perf_counter() - start
+
+    located = int((points['통계시군구명'] != '').sum())
+    print(f"✅ 지역 {len(index.regions)}개 (변 {len(index.edges):,}개, 격자 {index.nx}×{index.ny}, {built:.2f}s)")
+    print(f"✅ 점 {len(points):,}개 중 {located:,}개 배정 ({elapsed * 1e3:.0f}ms)")
+    if len(points) > located:
+        print(f"⚠️ 경계 밖이거나 좌표 없음: {len(points) - located:,}개")
+    if {'시도', '구'} <= set(points.columns):
+        mismatched = text_mismatches(points)
+        if len(mismatched):
+            print(f"⚠️ 글자 시도/구와 경계 결과가 다른 시설: {len(mismatched):,}개")
+            cols = [c for c in ['시설명', '시도', '구', '통계시도명', '통계시군구명'] if c in points.columns]
+            print(mismatched[cols].head(20).to_string(index=False))
+    if args.value in points.columns:
+        points[args.value] = pd.to_numeric(points[args.value], errors='coerce').fillna(0)
+        summary = capacity_by_region(points, index, args.value)
+        if args.out:
+            summary.to_csv(args.out, index=False, encoding='utf-8-sig')
+            print(f"💾 저장: {args.out}")
+    return 0
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,252 @@
+/* carestats 지도 런타임 (Leaflet 위에서 carestats.maps의 레이어 데이터를 그림)
+ *
+ * 레이어 데이터(spec)는 파이썬 쪽 carestats.maps.*_layer가 만든 JSON이다.
+ *   bubble:     points [[lat, lon, 값, 이름, 반지름px]], color, fill, label, unit, title, sizes [[값, 반지름]]
+ *   marker:     points [[lat, lon, 문구]], color
+ *   choropleth: levels [{from: 줌, rings: [[encoded polyline, ...], ...]}], regions [[이름, 값, 색 번호]],
+ *               colors, edges, unit, title, bounds [서, 남, 동, 북]
+ *
+ * 데이터 파일은 carestats.load(이름, spec); 한 줄짜리 스크립트라 file://로 열어도 읽힌다.
+ */
+var carestats = (function () {
+  var registry = {}, waiting = {};
+
+  function decode(s) {
+    var pts = [], i = 0, lat = 0, lng = 0, v = [0, 0];
+    while (i < s.length) {
+      for (var k = 0; k < 2; k++) {
+        var r = 0, sh = 0, b;
+        do { b = s.charCodeAt(i++) - 63; r |= (b & 31) << sh; sh += 5; } while (b >= 32);
+        v[k] = (r & 1) ? ~(r >> 1) : (r >> 1);
+      }
+      lat += v[0]; lng += v[1];
+      pts.push([lat / 1e5, lng / 1e5]);
+    }
+    return pts;
+  }
+
+  function fmt(v, unit) {
+    if (v === null || v === undefined) return '자료 없음';
+    return v.toLocaleString(undefined, {maximumFractionDigits: 3}) + (unit || '');
+  }
+
+  function swatch(style) { return '<i style="' + style + '"></i>'; }
+
+  function legend(spec) {
+    var html = '<b>' + spec.title + '</b><br>';
+    if (spec.type === 'choropleth') {
+      spec.colors.forEach(function (c, i) {
+        html += swatch('background:' + c) + fmt(spec.edges[i], spec.unit) + ' ~ ' + fmt(spec.edges[i + 1], spec.unit) + '<br>';
+      });
+      return html + swatch('background:#cccccc') + '자료 없음';
+    }
+    if (spec.type === 'bubble') {
+      (spec.sizes || []).forEach(function (s) {
+        var d = 2 * s[1];
+        html += swatch('width:' + d + 'px;height:' + d + 'px;border-radius:50%;background:' + spec.fill) + fmt(s[0], spec.unit) + '<br>';
+      });
+      html += '<div class="rows">';
+      spec.points.forEach(function (p) { html += p[3] + ': ' + fmt(p[2], spec.unit) + '<br>'; });
+      return html + '</div>';
+    }
+    return html + spec.points.length.toLocaleString() + '곳';
+  }
+
+  function pointBounds(points) {
+    return points.length ? L.latLngBounds(points.map(function (p) { return [p[0], p[1]]; })) : null;
+  }
+
+  function bubbleLayer(spec) {
+    var g = L.featureGroup();
+    spec.points.forEach(function (p) {
+      L.circleMarker([p[0], p[1]], {radius: p[4], color: spec.color, weight: 1, fillColor: spec.fill, fillOpacity: 0.6})
+        .bindPopup('<b>' + p[3] + '</b><br>' + spec.label + ': ' + fmt(p[2], spec.unit)).addTo(g);
+    });
+    g.bounds = pointBounds(spec.points);
+    return g;
+  }
+
+  function markerLayer(spec) {
+    var g = L.featureGroup();
+    spec.points.forEach(function (p) {
+      L.circleMarker([p[0], p[1]], {radius: 5, color: spec.color, weight: 1, fillOpacity: 0.8}).bindPopup(p[2]).addTo(g);
+    });
+    g.bounds = pointBounds(spec.points);
+    return g;
+  }
+
+  // 줌이 levels[i].from 이상이면 그 단계 경계로 교체 (단계별 다각형은 처음 쓸 때 한 번 만듦)
+  // opts.click(i): 지역 클릭, opts.dissolve: 테두리를 채움색으로 (같은 값의 시군구가 시도 하나로 보임)
+  function choroplethLayer(spec, opts) {
+    opts = opts || {};
+    var g = L.layerGroup(), built = [], shown = -1, map = null;
+    function level(k) {
+      if (built[k]) return built[k];
+      var group = L.layerGroup();
+      spec.regions.forEach(function (r, i) {
+        var rings = spec.levels[k].rings[i];
+        if (!rings.length) return;
+        var fill = r[2] < 0 ? '#cccccc' : spec.colors[r[2]];
+        var poly = L.polygon(rings.map(decode), {
+          color: opts.dissolve ? fill : '#555', weight: opts.dissolve ? 0.5 : 1, fillOpacity: 0.75, fillColor: fill
+        }).bindTooltip('<b>' + r[0] + '</b><br>' + fmt(r[1], spec.unit)).addTo(group);
+        if (opts.click) poly.on('click', function () { opts.click(i); });
+      });
+      return built[k] = group;
+    }
+    function update() {
+      var k = 0;
+      spec.levels.forEach(function (lv, i) { if (map.getZoom() >= lv.from) k = i; });
+      if (k === shown) return;
+      if (shown >= 0) g.removeLayer(built[shown]);
+      g.addLayer(level(k));
+      shown = k;
+    }
+    g.on('add', function (e) { map = e.target._map; map.on('zoomend', update); update(); });
+    g.on('remove', function () { if (map) map.off('zoomend', update); });
+    var b = spec.bounds;
+    g.bounds = L.latLngBounds([b[1], b[0]], [b[3], b[2]]);
+    return g;
+  }
+
+  function layer(spec, opts) {
+    var make = {bubble: bubbleLayer, marker: markerLayer, choropleth: choroplethLayer}[spec.type];
+    if (!make) throw new Error('알 수 없는 레이어: ' + spec.type);
+    return make(spec, opts);
+  }
+
+  function baseMap(el, options) {
+    options = options || {};
+    var map = L.map(el, {preferCanvas: true}).setView(options.center || [36, 128], options.zoom || 7);
+    if (options.tiles) {
+      L.tileLayer(options.tiles, {attribution: '&copy; OpenStreetMap contributors', maxZoom: 18}).addTo(map);
+    }
+    return map;
+  }
+
+  function legendControl(map, position) {
+    var control = L.control({position: position || 'bottomright'});
+    control.onAdd = function () { return L.DomUtil.create('div', 'carestats-box'); };
+    control.addTo(map);
+    control.set = function (html) { control.getContainer().innerHTML = html; };
+    return control;
+  }
+
+  // 지도 하나에 레이어 하나 (사이트의 지도별 페이지)
+  function show(spec, el, options) {
+    var map = baseMap(el, options), l = layer(spec).addTo(map);
+    if (l.bounds && l.bounds.isValid()) map.fitBounds(l.bounds);
+    legendControl(map).set(legend(spec));
+    return map;
+  }
+
+  function load(name, spec) {
+    registry[name] = spec;
+    (waiting[name] || []).forEach(function (cb) { cb(spec); });
+    delete waiting[name];
+  }
+
+  // 데이터 스크립트를 필요할 때 한 번만 붙임 (같은 이름을 여러 번 요청해도 한 번만 받음)
+  function fetch(name, src, cb) {
+    if (registry[name]) return cb(registry[name]);
+    if (waiting[name]) return waiting[name].push(cb);
+    waiting[name] = [cb];
+    var s = document.createElement('script');
+    s.src = src;
+    document.head.appendChild(s);
+  }
+
+  // 대시보드 (carestats.dashboard): 지표 하나 + 시설 레이어, 전국(시도 색) → 시도 클릭 → 시군구
+  // manifest: {title, palette, geo, sidoGeo: [src], metrics: [{key, title, unit, src}], facilities}
+  // 데이터 파일은 지표/시도를 처음 고를 때 한 번만 받는다.
+  function dashboard(manifest, el, options) {
+    var map = baseMap(el, options), fill = L.layerGroup().addTo(map), legendBox = legendControl(map);
+    var state = {metric: '', sido: -1}, seq = 0, points = null, fitted = false;
+
+    var panel = L.control({position: 'topright'});
+    panel.onAdd = function () {
+      var div = L.DomUtil.create('div', 'carestats-box carestats-panel'), html = '<b>' + manifest.title + '</b>';
+      html += '<div class="crumb"></div>';
+      [{key: '', title: '지표 없음'}].concat(manifest.metrics).forEach(function (m) {
+        html += '<label><input type="radio" name="metric" value="' + m.key + '"' + (m.key ? '' : ' checked') + '> ' + m.title + '</label><br>';
+      });
+      if (manifest.facilities) html += '<label><input type="checkbox" name="facilities"> 시설 위치</label>';
+      div.innerHTML = html;
+      L.DomEvent.disableClickPropagation(div);
+      div.addEventListener('change', function (e) {
+        if (e.target.name === 'metric') { state.metric = e.target.value; render(); }
+        else toggleFacilities(e.target.checked);
+      });
+      div.addEventListener('click', function (e) {
+        if (e.target.className === 'up') { e.preventDefault(); state.sido = -1; render(true); }
+      });
+      return div;
+    };
+    panel.addTo(map);
+
+    function crumb(geo) {
+      var html = state.sido < 0 ? '전국' : '<a href="#" class="up">전국</a> › ' + geo.sidos[state.sido];
+      panel.getContainer().querySelector('.crumb').innerHTML = html;
+    }
+
+    function render(refit) {
+      var token = ++seq;
+      fill.clearLayers();
+      if (!state.metric) { legendBox.set(''); return; }
+      var metric = manifest.metrics.filter(function (m) { return m.key === state.metric; })[0];
+      fetch('dashboard-geo', manifest.geo, function (geo) {
+        fetch('dashboard-' + metric.key, metric.src, function (m) {
+          if (token !== seq) return;
+          crumb(geo);
+          if (state.sido < 0) return nation(geo, m, refit);
+          var s = state.sido;
+          fetch('dashboard-geo-' + s, manifest.sidoGeo[s], function (sg) {
+            if (token === seq) sido(geo, sg, m, s);
+          });
+        });
+      });
+    }
+
+    function nation(geo, m, refit) {
+      var spec = {
+        type: 'choropleth', title: m.title + ' (시도)', unit: m.unit, bounds: geo.bounds,
+        colors: manifest.palette.slice(0, Math.max(m.sido.edges.length - 1, 0)), edges: m.sido.edges,
+        levels: [{from: 0, rings: geo.rings}],
+        regions: geo.regions.map(function (r) {
+          return [geo.sidos[r[1]], m.sido.values[r[1]], m.sido.classes[r[1]]];
+        })
+      };
+      var l = choroplethLayer(spec, {dissolve: true, click: function (i) { state.sido = geo.regions[i][1]; render(); }});
+      fill.addLayer(l);
+      if (refit || !fitted) { map.fitBounds(l.bounds); fitted = true; }
+      legendBox.set(legend(spec));
+    }
+
+    function sido(geo, sg, m, s) {
+      var spec = {
+        type: 'choropleth', title: m.title + ' · ' + geo.sidos[s], unit: m.unit, bounds: geo.boxes[s],
+        colors: manifest.palette.slice(0, Math.max(m.sigungu.edges[s].length - 1, 0)), edges: m.sigungu.edges[s],
+        levels: sg.levels,
+        regions: sg.regions.map(function (i) {
+          return [geo.regions[i][0], m.sigungu.values[i], m.sigungu.classes[i]];
+        })
+      };
+      var l = choroplethLayer(spec);
+      fill.addLayer(l);
+      map.fitBounds(l.bounds);
+      legendBox.set(legend(spec));
+    }
+
+    function toggleFacilities(on) {
+      if (!on) { if (points) map.removeLayer(points); return; }
+      fetch('dashboard-facilities', manifest.facilities, function (spec) {
+        points = points || markerLayer(spec);
+        points.addTo(map);
+      });
+    }
+    return map;
+  }
+
+  return {decode: decode, fmt: fmt, legend: legend, layer: layer, baseMap: baseMap,
+          legendControl: legendControl, show: show, load: load, fetch: fetch, dashboard: dashboard};
+})();
@@ -0,0 +1,342 @@
+# -*- coding: utf-8 -*-
+"""규모 테스트용 가짜 전국 데이터 생성기 (스크립트가 읽는 워크시트와 같은 컬럼/모양)
+
+    python -m carestats synth --out /tmp/synth --sigungu 60 --months 24 --skew 1.2
+    python -m carestats bench --data-dir /tmp/synth
+    python -m carestats.loadtest --data-dir /tmp/synth
+
+생성물 (out 디렉터리):
+- payments.csv / capacity.csv / recipients.csv / households.csv
+    save_snapshot() 형식 → load_snapshot(), api --data-dir, bench, loadtest에서 그대로 사용
+- worksheets/sheet{1,2,3}.csv, worksheets/sheet4_A3_B23.csv, worksheets/sheet7_A3_D.csv
+    ws.get_values() / ws.get(범위)가 돌려주는 2차원 값 그대로 (헤더 행 포함, 숫자도 문자열)
+- 한부모가족 지원구분별 지급건수.csv
+    data_fix.py가 읽는 가로 5블록 CSV ('통합' 블록 + 최근 4개월, 블록 사이 빈 열)
+- boundaries.geojson
+    시군구 경계 대역 (흔든 격자 칸, 이웃과 경계선 공유) → carestats.spatial 공간 결합용
+
+지역 규모는 Zipf 분포(skew)로 정한다. skew=0이면 모든 시군구가 같은 규모이고,
+클수록 소수 시군구에 시설/지급건수/수급자가 몰린다.
+noise > 0이면 그 비율만큼 숫자 칸을 '1,234' / '' / '#REF!'로 바꿔 워크시트 오류 값을 흉내 낸다.
+"""
+import argparse
+import csv
+import json
+import math
+import os
+
+import numpy as np
+import pandas as pd
+
+from carestats.datasets import save_snapshot
+from carestats.regions import SEOUL_GU, SIDO_ALIASES, SIDO_NAMES
+
+SUPPORT_TYPES = ['아동양육비', '추가아동양육비', '생활보조금', '학용품비']
+SUPPORT_SHARE = [0.42, 0.42, 0.09, 0.07]    # 지원구분별 지급건수 비율 (fixtures 기준)
+FAMILY_TYPES = ['모자가족', '부자가족', '조손가족', '청소년한부모모자가족', '청소년한부모부자가족']
+FAMILY_SHARE = [0.70, 0.22, 0.04, 0.03, 0.01]
+INCOME_BANDS = [
+    '기타', '중위소득 30%이하', '중위소득 30~40%이하', '중위소득 40~50%이하',
+    '중위소득 50~52%이하', '중위소득 52~60%이하', '중위소득 60~72%이하',
+]
+INCOME_SHARE = [0.05, 0.35, 0.15, 0.15, 0.05, 0.15, 0.10]
+PAYMENT_COLS = ['통계연월', '통계시도명', '통계시군구명', '지원구분', '지급건수']
+WIDE_CSV = "한부모가족 지원구분별 지급건수.csv"
+# worksheets/ 파일 이름: sheet{번호}[_{시작 셀}_{끝 셀}].csv (범위가 있으면 그 셀부터 놓인 값)
+SHEET_FILES = {
+    'sheet1': 'sheet1.csv',
+    'sheet2': 'sheet2.csv',
+    'sheet3': 'sheet3.csv',
+    'sheet4': 'sheet4_A3_B23.csv',
+    'sheet7': 'sheet7_A3_D.csv',
+}
+
+KOREA_BOUNDS = (126.0, 33.0, 130.0, 38.6)   # 가짜 경계를 깔 범위 (서, 남, 동, 북 경위도)
+
+# 공식 시도명 → 워크시트 1에서 쓰는 약칭 ('서울특별시' → '서울')
+SIDO_SHORT = {}
+for _short, _name in SIDO_ALIASES.items():
+    SIDO_SHORT.setdefault(_name, _short)
+
+
+def region_names(n_sido=17, n_sigungu=14):
+    """[(시도, 시군구)] (서울은 실제 자치구 이름, 17개를 넘는 시도는 '가상시도N')"""
+    regions = []
+    for i in range(n_sido):
+        sido = SIDO_NAMES[i] if i < len(SIDO_NAMES) else f"가상시도{i + 1}"
+        if sido == '서울특별시':
+            names = SEOUL_GU[:n_sigungu] + [f"가상{k}구" for k in range(len(SEOUL_GU) + 1, n_sigungu + 1)]
+        else:
+            short = SIDO_SHORT.get(sido, sido)
+            names = [f"{short}{k}{'시' if k % 3 else '군'}" for k in range(1, n_sigungu + 1)]
+        regions.extend((sido, gu) for gu in names)
+    return regions
+
+
+def zipf_weights(n, skew, rng):
+    """순위 r의 가중치 ∝ 1 / r^skew (지역 순서는 섞음), 합 = n"""
+    w = 1.0 / np.arange(1, n + 1) ** skew
+    rng.shuffle(w)
+    return w / w.sum() * n
+
+
+def month_list(months, last='202503'):
+    """last부터 거꾸로 months개월 (YYYYMM 문자열, 최신 순)"""
+    end = pd.Period(f"{last[:4]}-{last[4:]}", freq='M')
+    return [str(p).replace('-', '') for p in pd.period_range(end=end, periods=months, freq='M')[::-1]]
+
+
+def _split(total, shares, rng):
+    """total을 shares 비율로 나눈 정수 배열 (다항분포)"""
+    return rng.multinomial(int(total), shares)
+
+
+def _noisy(values, noise, rng):
+    """숫자 배열 → 워크시트 문자열 (noise 비율만큼 '1,234' / '' / '#REF!')"""
+    out = values.astype(str).astype(object)
+    if noise > 0:
+        hit = np.flatnonzero(rng.random(len(out)) < noise)
+        kind = rng.integers(0, 3, len(hit))
+        for i, k in zip(hit, kind):
+            out[i] = (f"{int(values[i]):,}", '', '#REF!')[k]
+    return out
+
+
+def generate(n_sido=17, n_sigungu=14, months=4, facilities=2.0, skew=1.0, noise=0.0, seed=0,
+             last_month='202503'):
+    """가짜 데이터셋 생성
+
+    n_sido: 시도 수 (17 초과분은 가상 시도), n_sigungu: 시도별 시군구 수,
+    months: 지급건수 개월 수, facilities: 시군구당 평균 시설 수, skew: 지역 규모 쏠림(Zipf 지수)
+
+    → {'sheet1': DataFrame, 'sheet2': ..., 'sheet3': ..., 'sheet4': 값 목록, 'sheet7': 값 목록,
+       'households': DataFrame}
+    DataFrame 값은 워크시트처럼 모두 문자열이다.
+    """
+    rng = np.random.default_rng(seed)
+    regions = region_names(n_sido, n_sigungu)
+    n = len(regions)
+    sido = np.array([r[0] for r in regions], dtype=object)
+    gu = np.array([r[1] for r in regions], dtype=object)
+    weight = zipf_weights(n, skew, rng)
+
+    # 지역별 수급자 규모 (평균 1,200명) → 가구/지급건수/시설은 여기에 비례
+    members = rng.poisson(1200 * weight)
+
+    # 워크시트 3: 시군구 × 가족유형 × 중위소득비율구분
+    rows = []
+    for i in range(n):
+        by_family = _split(members[i], FAMILY_SHARE, rng)
+        for f, family in enumerate(FAMILY_TYPES):
+            for b, count in enumerate(_split(by_family[f], INCOME_SHARE, rng)):
+                rows.append((sido[i], gu[i], family, INCOME_BANDS[b], count))
+    recipients = pd.DataFrame(rows, columns=['통계시도명', '통계시군구명', '가족유형', '중위소득비율구분', '수급자수'])
+    counts = recipients['수급자수'].to_numpy()
+    households = np.minimum(counts, np.round(counts * rng.uniform(0.4, 0.5, len(counts))).astype(int))
+    recipients['수급자수'] = _noisy(counts, noise, rng)
+    recipients['수급가구수'] = _noisy(households, noise, rng)
+
+    # 워크시트 2: 월 × 시군구 × 지원구분 (지급건수 0인 행은 빠짐)
+    rows = []
+    for month in month_list(months, last_month):
+        monthly = rng.poisson(members * 0.55 * rng.uniform(0.9, 1.1))
+        for i in range(n):
+            for s, count in enumerate(_split(monthly[i], SUPPORT_SHARE, rng)):
+                if count:
+                    rows.append((month, sido[i], gu[i], SUPPORT_TYPES[s], count))
+    payments = pd.DataFrame(rows, columns=PAYMENT_COLS)
+    payments['지급건수'] = _noisy(payments['지급건수'].to_numpy(), noise, rng)
+
+    # 워크시트 1: 시설 단위 (시도는 약칭)
+    per_region = rng.poisson(facilities * weight)
+    idx = np.repeat(np.arange(n), per_region)
+    seq = np.concatenate([np.arange(1, k + 1) for k in per_region]) if len(idx) else np.array([], dtype=int)
+    capacity = rng.integers(10, 60, len(idx))
+    facility = pd.DataFrame({
+        '시도': [SIDO_SHORT.get(s, s) for s in sido[idx]],
+        '구': gu[idx],
+        '정원': _noisy(capacity, noise, rng),
+        '시설명': [f"{g} 한부모가족복지시설 {k}" for g, k in zip(gu[idx], seq)],
+        '소재지': [f"{s} {g} 복지로 {a}" for s, g, a in zip(sido[idx], gu[idx], rng.integers(1, 300, len(idx)))],
+    })
+
+    # 시도별 합계: 워크시트 4 (한부모 가구 수), 워크시트 7 (수급자수)
+    by_sido = pd.DataFrame({'시도': sido, '수급자수': members})
+    by_sido = by_sido.groupby('시도', sort=False)['수급자수'].sum()
+    household_totals = (by_sido * rng.uniform(2.5, 3.5, len(by_sido))).round().astype(int)
+
+    by_family = pd.DataFrame([_split(t, FAMILY_SHARE, rng) for t in by_sido],
+                             index=by_sido.index, columns=FAMILY_TYPES)
+
+    return {
+        'sheet1': facility,
+        'sheet2': payments,
+        'sheet3': recipients,
+        'sheet4': households_grid(household_totals),
+        'sheet7': members_grid(by_family),
+        'households': pd.DataFrame({'통계시도명': household_totals.index,
+                                    '가구수': household_totals.astype(str).to_numpy()}),
+    }
+
+
+def _wiggle(p, q, detail, rng):
+    """p → q 선분을 점 detail + 1개의 구불구불한 선으로 (양 끝점은 그대로, 끝으로 갈수록 덜 흔들어 이웃 변과 안 겹침)"""
+    t = np.linspace(0.0, 1.0, detail + 1)[:, None]
+    d = q - p
+    offset = rng.normal(0.0, 0.03, detail + 1) * np.sin(np.pi * t[:, 0]) ** 2 * np.hypot(*d)
+    return p + t * d + offset[:, None] * np.array([-d[1], d[0]]) / max(np.hypot(*d), 1e-12)
+
+
+def boundary_collection(regions, detail=16, bounds=KOREA_BOUNDS, seed=0):
+    """[(시도, 시군구)] → 가짜 시군구 경계 GeoJSON FeatureCollection (dict)
+
+    bounds를 지역 수만큼의 격자로 나누고 격자점을 흔든 뒤, 칸 변마다 구불구불한 선(점 detail개)을
+    한 번만 만들어 이웃한 두 칸이 같은 경계선을 공유하게 한다. 남는 칸은 경계 밖(바다)이다.
+    """
+    rng = np.random.default_rng(seed)
+    west, south, east, north = bounds
+    n = len(regions)
+    nx = max(1, math.ceil(math.sqrt(n * (east - west) / (north - south))))
+    ny = max(1, math.ceil(n / nx))
+    xs, ys = np.meshgrid(np.linspace(west, east, nx + 1), np.linspace(south, north, ny + 1))
+    pts = np.stack([xs, ys], axis=-1)
+    cell = np.array([(east - west) / nx, (north - south) / ny])
+    pts[1:-1, 1:-1] += rng.uniform(-0.3, 0.3, (ny - 1, nx - 1, 2)) * cell if nx > 1 and ny > 1 else 0.0
+    horizontal = [[_wiggle(pts[j, i], pts[j, i + 1], detail, rng) for i in range(nx)] for j in range(ny + 1)]
+    vertical = [[_wiggle(pts[j, i], pts[j + 1, i], detail, rng) for i in range(nx + 1)] for j in range(ny)]
+
+    features = []
+    for k, (sido, gu) in enumerate(regions):
+        j, i = divmod(k, nx)
+        ring = np.concatenate([
+            horizontal[j][i][:-1], vertical[j][i + 1][:-1],
+            horizontal[j + 1][i][::-1][:-1], vertical[j][i][::-1],
+        ])
+        features.append({
+            'type': 'Feature',
+            'properties': {'통계시도명': sido, '통계시군구명': gu},
+            'geometry': {'type': 'Polygon', 'coordinates': [np.round(ring, 6).tolist()]},
+        })
+    return {'type': 'FeatureCollection', 'features': features}
+
+
+def wide_rows(payments, months=4):
+    """지급건수(세로) → data_fix.py 원본의 가로 블록 행 목록
+
+    블록 = ['통합' 블록(지급건수 빈칸)] + 최근 months개월, 블록 사이 빈 열.
+    모든 블록은 (시도, 시군구, 지원구분) 같은 순서로 행을 맞춘다.
+    """
+    keys = payments[PAYMENT_COLS[1:4]].drop_duplicates().reset_index(drop=True)
+    recent = sorted(payments['통계연월'].unique(), reverse=True)[:months]
+    by_month = {m: payments[payments['통계연월'] == m].set_index(PAYMENT_COLS[1:4])['지급건수'] for m in recent}
+
+    header = []
+    for b in range(len(recent) + 1):
+        header += ([''] if b else []) + PAYMENT_COLS
+    rows = [header]
+    for key in keys.itertuples(index=False, name=None):
+        row = ['통합', *key, '']
+        for m in recent:
+            row += ['', m, *key, by_month[m].get(key, '')]
+        rows.append(row)
+    return rows
+
+
+def households_grid(totals):
+    """시도별 가구 수 Series → 워크시트 4의 A3:B23 값 (제목, 단위, 헤더, 전국, 시도별)"""
+    rows = [['시도별 한부모 가구 수', ''], ['', '(단위: 가구)'], ['지역', '한부모 가구 수'],
+            ['전국', str(int(totals.sum()))]]
+    return rows + [[s, str(int(v))] for s, v in totals.items()]
+
+
+def members_grid(by_family):
+    """시도 × 가족유형 수급자수 DataFrame → 워크시트 7의 A3:D 값 (헤더, 전체 계, 시도별 계/가족유형별)"""
+    totals = by_family.sum(axis=1)
+    rows = [['시도', '특성1', '특성2', '수급자수'], ['계', '계', '소계', str(int(totals.sum()))]]
+    for s, counts in by_family.iterrows():
+        rows.append([s, '계', '소계', str(int(totals[s]))])
+        rows += [[s, '가족유형별', family, str(int(c))] for family, c in counts.items()]
+    return rows
+
+
+def snapshot_sheets(data_dir):
+    """save_snapshot() 디렉터리 → {'sheet1': 값 목록, ...} (워크시트 모양으로 되돌림, 숫자도 문자열)
+
+    worksheets/ 디렉터리가 없는 스냅샷(fixtures/sample 등)을 로컬 Sheets 서버에 올릴 때 쓴다.
+    """
+    def read(name):
+        return pd.read_csv(os.path.join(data_dir, f"{name}.csv"), dtype=str,
+                           keep_default_na=False, encoding='utf-8-sig')
+
+    def grid(df):
+        return [list(df.columns)] + df.values.tolist()
+
+    capacity = read('capacity').rename(columns={'통계시도명': '시도', '통계시군구명': '구'})
+    capacity['시도'] = capacity['시도'].map(lambda s: SIDO_SHORT.get(s, s))
+    recipients = read('recipients')
+    households = read('households')
+
+    counts = pd.to_numeric(recipients['수급자수'].str.replace(',', ''), errors='coerce').fillna(0)
+    by_family = (counts.groupby([recipients['통계시도명'], recipients['가족유형']], sort=False).sum()
+                 .unstack(fill_value=0).astype(int))
+    totals = pd.to_numeric(households['가구수'].str.replace(',', ''), errors='coerce').fillna(0)
+    return {
+        'sheet1': grid(capacity),
+        'sheet2': grid(read('payments')),
+        'sheet3': grid(recipients),
+        'sheet4': households_grid(pd.Series(totals.to_numpy(), index=households['통계시도명'])),
+        'sheet7': members_grid(by_family),
+    }
+
+
+def _write_grid(rows, path):
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        csv.writer(f).writerows(rows)
+
+
+def write(data, out_dir):
+    """generate() 결과 → 스냅샷 CSV + 워크시트 값 + data_fix.py 입력 CSV"""
+    sheets_dir = os.path.join(out_dir, 'worksheets')
+    os.makedirs(sheets_dir, exist_ok=True)
+    for name, filename in SHEET_FILES.items():
+        rows = data[name]
+        if isinstance(rows, pd.DataFrame):
+            rows = [list(rows.columns)] + rows.values.tolist()
+        _write_grid(rows, os.path.join(sheets_dir, filename))
+
+    save_snapshot({
+        'payments': data['sheet2'],
+        'capacity': data['sheet1'].rename(columns={'시도': '통계시도명', '구': '통계시군구명'}),
+        'recipients': data['sheet3'],
+        'households': data['households'],
+    }, out_dir)
+
+    _write_grid(wide_rows(data['sheet2']), os.path.join(out_dir, WIDE_CSV))
+    if 'boundaries' in data:
+        with open(os.path.join(out_dir, 'boundaries.geojson'), 'w', encoding='utf-8') as f:
+            json.dump(data['boundaries'], f, ensure_ascii=False)
+    return out_dir
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='carestats synth', description="규모 테스트용 가짜 데이터 생성")
+    parser.add_argument('--out', required=True, help="저장 디렉터리")
+    parser.add_argument('--sido', type=int, default=17, help="시도 수 (17 초과분은 가상 시도)")
+    parser.add_argument('--sigungu', type=int, default=14, help="시도별 시군구 수")
+    parser.add_argument('--months', type=int, default=4, help="지급건수 개월 수")
+    parser.add_argument('--facilities', type=float, default=2.0, help="시군구당 평균 시설 수")
+    parser.add_argument('--skew', type=float, default=1.0, help="지역 규모 쏠림 (Zipf 지수, 0이면 균등)")
+    parser.add_argument('--noise', type=float, default=0.0, help="숫자 칸 중 오류/서식 값 비율")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    data = generate(args.sido, args.sigungu, args.months, args.facilities, args.skew, args.noise, args.seed)
+    data['boundaries'] = boundary_collection(region_names(args.sido, args.sigungu), seed=args.seed)
+    write(data, args.out)
+    print(f"✅ {args.out}: 시설 {len(data['sheet1']):,}행, 지급건수 {len(data['sheet2']):,}행, "
+          f"수급자 {len(data['sheet3']):,}행")
+    return 0
+
+
+if __name__ == '__main__':
+    main()
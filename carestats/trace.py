@@ -0,0 +1,199 @@
+# -*- coding: utf-8 -*-
+"""단계별 시간 측정 (span) + 실행 요약표 + Chrome trace JSON
+
+    from carestats.trace import span, traced
+
+    @traced()                       # 함수 전체를 하나의 span으로
+    def load_worksheet(...): ...
+
+    with span('m.save', 'render'):  # 코드 블록 하나
+        m.save(out)
+
+켜는 방법:
+    python -m carestats --trace map capacity            # 종료 시 요약표 출력
+    python -m carestats --trace-json run.json refresh   # + Chrome trace JSON 저장
+    CARESTATS_TRACE=1 / CARESTATS_TRACE=run.json python woohyun/복지시설.py
+
+JSON은 chrome://tracing 또는 https://ui.perfetto.dev 에서 열 수 있다.
+꺼져 있으면 span()은 미리 만들어 둔 빈 컨텍스트를 돌려주고 traced()는 플래그 하나만 확인한다.
+요약표의 self 시간은 같은 스레드에서 안쪽 span 시간을 뺀 값이다.
+"""
+import atexit
+import contextlib
+import functools
+import json
+import os
+import sys
+import threading
+import time
+
+_ENABLED = False
+_PATH = None
+_EVENTS = []        # (이름, 분류, 시작 perf_counter, 길이 초, 스레드 id, args)
+_THREADS = {}
+_HOOKS = []         # span 시작/끝에 호출할 객체 (enter(span), exit(span)) — carestats.memory 등
+_LOCK = threading.Lock()
+_NULL = contextlib.nullcontext()
+_T0 = time.perf_counter()
+
+
+class _Span:
+    __slots__ = ('name', 'cat', 'args', 'start', 'data')
+
+    def __init__(self, name, cat, args):
+        self.name = name
+        self.cat = cat
+        self.args = args
+        self.data = None
+
+    def __enter__(self):
+        for hook in _HOOKS:
+            hook.enter(self)
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        dur = time.perf_counter() - self.start
+        for hook in reversed(_HOOKS):
+            hook.exit(self)
+        if exc_type is not None:
+            self.args = dict(self.args, error=exc_type.__name__)
+        thread = threading.current_thread()
+        with _LOCK:
+            _THREADS.setdefault(thread.ident, thread.name)
+            _EVENTS.append((self.name, self.cat, self.start, dur, thread.ident, self.args))
+        return False
+
+
+def span(name, cat='stage', **args):
+    """with span('sheets.download', 'io'): ... (꺼져 있으면 아무것도 하지 않음)"""
+    if not _ENABLED:
+        return _NULL
+    return _Span(name, cat, args)
+
+
+def traced(name=None, cat='stage'):
+    """함수 호출 전체를 span으로 감싸는 데코레이터 (이름 기본값: 함수 이름)"""
+    def wrap(fn):
+        label = name or fn.__name__
+
+        @functools.wraps(fn)
+        def inner(*args, **kwargs):
+            if not _ENABLED:
+                return fn(*args, **kwargs)
+            with _Span(label, cat, {}):
+                return fn(*args, **kwargs)
+        return inner
+    return wrap
+
+
+def enabled():
+    return _ENABLED
+
+
+def add_hook(hook):
+    """span 경계마다 hook.enter(span) / hook.exit(span) 호출 (span.data에 결과를 남길 수 있음)"""
+    if hook not in _HOOKS:
+        _HOOKS.append(hook)
+
+
+def enable(path=None, report_at_exit=True):
+    """측정 시작 (path를 주면 종료 시 Chrome trace JSON 저장)"""
+    global _ENABLED, _PATH, _T0
+    if not _ENABLED:
+        _T0 = time.perf_counter()
+        if report_at_exit:
+            atexit.register(report)
+    _ENABLED = True
+    _PATH = path or _PATH
+
+
+def disable():
+    global _ENABLED
+    _ENABLED = False
+
+
+def events():
+    with _LOCK:
+        return list(_EVENTS)
+
+
+def _self_times(evts):
+    """같은 스레드에서 바로 안쪽 span 시간을 뺀 self 시간 목록 (evts 순서와 같음)"""
+    self_time = [e[3] for e in evts]
+    by_thread = {}
+    for i, e in enumerate(evts):
+        by_thread.setdefault(e[4], []).append(i)
+    for idx in by_thread.values():
+        idx.sort(key=lambda i: (evts[i][2], -evts[i][3]))
+        stack = []
+        for i in idx:
+            start = evts[i][2]
+            while stack and evts[stack[-1]][2] + evts[stack[-1]][3] <= start:
+                stack.pop()
+            if stack:
+                self_time[stack[-1]] -= evts[i][3]
+            stack.append(i)
+    return self_time
+
+
+def summary(evts=None):
+    """[(분류, 이름, 횟수, 합계 초, self 초, 최대 초)] (합계 내림차순)"""
+    evts = events() if evts is None else evts
+    rows = {}
+    for e, self_s in zip(evts, _self_times(evts)):
+        row = rows.setdefault((e[1], e[0]), [0, 0.0, 0.0, 0.0])
+        row[0] += 1
+        row[1] += e[3]
+        row[2] += self_s
+        row[3] = max(row[3], e[3])
+    return sorted(((cat, name, *vals) for (cat, name), vals in rows.items()), key=lambda r: -r[3])
+
+
+def print_summary(evts=None, top=30):
+    rows = summary(evts)
+    if not rows:
+        return
+    wall = time.perf_counter() - _T0
+    print(f"\n=== 단계별 시간 (전체 {wall:.2f}s) ===")
+    print(f"  {'분류':<8} {'단계':<34} {'횟수':>5} {'합계':>9} {'self':>9} {'최대':>9}")
+    for cat, name, count, total, self_s, longest in rows[:top]:
+        print(f"  {cat:<8} {name[:34]:<34} {count:>5} {total:>8.2f}s {self_s:>8.2f}s {longest:>8.2f}s")
+
+
+def chrome_trace(evts=None):
+    """Chrome trace-event 형식 dict (완료 이벤트 'X' + 스레드 이름)"""
+    evts = events() if evts is None else evts
+    pid = os.getpid()
+    trace = [
+        {'name': 'thread_name', 'ph': 'M', 'pid': pid, 'tid': tid, 'args': {'name': tname}}
+        for tid, tname in _THREADS.items()
+    ]
+    for name, cat, start, dur, tid, args in evts:
+        trace.append({
+            'name': name, 'cat': cat, 'ph': 'X', 'pid': pid, 'tid': tid,
+            'ts': round((start - _T0) * 1e6, 3), 'dur': round(dur * 1e6, 3),
+            'args': {k: str(v) for k, v in args.items()},
+        })
+    return {'traceEvents': trace, 'displayTimeUnit': 'ms'}
+
+
+def write_chrome_trace(path, evts=None):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(chrome_trace(evts), f, ensure_ascii=False)
+    return path
+
+
+def report():
+    """요약표 출력 (+ enable(path)였으면 JSON 저장)"""
+    print_summary()
+    if _PATH and _EVENTS:
+        print(f"🧭 trace 저장: {write_chrome_trace(_PATH)}")
+
+
+# 환경 변수로 켜기 (CARESTATS_TRACE=1 → 요약표만, 그 밖의 값 → JSON 경로)
+_env = os.getenv('CARESTATS_TRACE', '')
+if _env and _env != '0':
+    enable(None if _env == '1' else _env)
+if os.getenv('CARESTATS_PROFILE_MEMORY', '') not in ('', '0') and 'carestats.memory' not in sys.modules:
+    from carestats import memory  # noqa: F401 (import 시 CARESTATS_PROFILE_MEMORY를 보고 켜짐)
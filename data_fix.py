@@ -1,43 +1,78 @@
+import sys
 import pandas as pd
 
-# CSV 불러오기
-df = pd.read_csv("./한부모가족 지원구분별 지급건수.csv", encoding="utf-8")
+from carestats.freshness import RunCheck
+from carestats.trace import span, traced
 
-# 열 분리 처리
-blocks = []
-for i in range(0, 5):  # 5개월치
-    suffix = "" if i == 0 else f".{i}"
-    cols = [f"통계연월{suffix}", f"통계시도명{suffix}", f"통계시군구명{suffix}", f"지원구분{suffix}", f"지급건수{suffix}"]
-    if all(c in df.columns for c in cols):
-        temp = df[cols].copy()
-        temp.columns = ["통계연월", "통계시도명", "통계시군구명", "지원구분", "지급건수"]
+SRC = "./한부모가족 지원구분별 지급건수.csv"
+OUT = "output.csv"
+COLUMNS = ["통계연월", "통계시도명", "통계시군구명", "지원구분", "지급건수"]
+MONTHS_TO_SUM = ["202503", "202502", "202501", "202412"]
 
-        # 지급건수를 숫자로 강제 변환
-        temp["지급건수"] = pd.to_numeric(temp["지급건수"], errors="coerce")
-        blocks.append(temp)
 
-# 하나로 합치기
-merged = pd.concat(blocks, ignore_index=True)
+@traced()
+def split_blocks(df, n_blocks=5):
+    """가로로 이어 붙은 월별 블록(통계연월, 통계연월.1, ...) → 세로로 합친 DataFrame"""
+    blocks = []
+    for i in range(0, n_blocks):  # 5개월치
+        suffix = "" if i == 0 else f".{i}"
+        cols = [f"{c}{suffix}" for c in COLUMNS]
+        if all(c in df.columns for c in cols):
+            temp = df[cols].copy()
+            temp.columns = COLUMNS
 
-# 통합 월만 필터
-months_to_sum = ["202503", "202502", "202501", "202412"]
-filtered = merged[merged["통계연월"].isin(months_to_sum)]
+            # 지급건수를 숫자로 강제 변환
+            temp["지급건수"] = pd.to_numeric(temp["지급건수"], errors="coerce")
+            blocks.append(temp)
 
-# 지급건수 그룹별 합산
-summed = (
-    filtered.groupby(["통계시도명", "통계시군구명", "지원구분"], as_index=False)
-    .agg({"지급건수": "sum"})
-)
-summed["통계연월"] = "통합"
+    # 하나로 합치기
+    return pd.concat(blocks, ignore_index=True)
 
-# 열 순서 맞추기
-summed = summed[["통계연월", "통계시도명", "통계시군구명", "지원구분", "지급건수"]]
 
-# 기존 데이터에 통합 행 추가
-final_df = pd.concat([merged, summed], ignore_index=True)
+@traced()
+def add_total_rows(merged, months_to_sum=MONTHS_TO_SUM):
+    """months_to_sum 월의 지급건수 합계를 통계연월='통합' 행으로 추가"""
+    # 통합 월만 필터
+    filtered = merged[merged["통계연월"].isin(months_to_sum)]
 
-# 저장
-final_df.to_csv("output.csv", index=False, encoding="utf-8-sig")
+    # 지급건수 그룹별 합산
+    summed = (
+        filtered.groupby(["통계시도명", "통계시군구명", "지원구분"], as_index=False)
+        .agg({"지급건수": "sum"})
+    )
+    summed["통계연월"] = "통합"
 
-# 확인
-print(final_df[final_df["통계연월"] == "통합"])
+    # 열 순서 맞추기
+    summed = summed[COLUMNS]
+
+    # 기존 데이터에 통합 행 추가
+    return pd.concat([merged, summed], ignore_index=True)
+
+
+def reshape(df, months_to_sum=MONTHS_TO_SUM):
+    return add_total_rows(split_blocks(df), months_to_sum)
+
+
+def main():
+    # 원본 CSV와 이 스크립트가 그대로면 다시 만들 필요 없음
+    check = RunCheck("data_fix", files=[SRC, __file__], outputs=[OUT], spreadsheet_id=None)
+    if not check.changed():
+        print(f"⏭️ 원본 변경 없음, 건너뜀: {OUT}")
+        sys.exit(0)
+
+    # CSV 불러오기
+    with span('read_csv', 'io'):
+        df = pd.read_csv(SRC, encoding="utf-8")
+    final_df = reshape(df)
+
+    # 저장
+    with span('to_csv', 'io'):
+        final_df.to_csv(OUT, index=False, encoding="utf-8-sig")
+    check.record()
+
+    # 확인
+    print(final_df[final_df["통계연월"] == "통합"])
+
+
+if __name__ == "__main__":
+    main()
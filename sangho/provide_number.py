@@ -1,4 +1,5 @@
 import os
+import sys
 import gspread
 from oauth2client.service_account import ServiceAccountCredentials
 import pandas as pd
@@ -7,6 +8,9 @@ import plotly.express as px
 from geopy.geocoders import Nominatim
 import plotly.graph_objects as go
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from carestats.parsing import parse_values
+
 # 지오코딩 위치 찾는 함수
 geolocator = Nominatim(user_agent="geoapi")
 
@@ -44,10 +48,10 @@ worksheet = spreadsheet.get_worksheet(2)
 print("\n✅ 선택된 시트:", worksheet.title)
 
 try:
-    records = worksheet.get_all_records()
-    df = pd.DataFrame(records)
-    # 오류 제거
-    df = df[~df['통계시도명'].astype(str).str.contains('#REF!')]
+    # 원본 값 → 타입 지정 컬럼 (#REF! 등 오류 셀 행은 파싱하면서 제거)
+    df = parse_values(worksheet.get_values(), {
+        '통계시도명': 'str', '통계시군구명': 'str', '지원구분': 'str', '지급건수': 'int',
+    })
     # 주소 결합
     df["full_address"] = df["통계시도명"] + " " + df["통계시군구명"]
     # 주소 열 생성
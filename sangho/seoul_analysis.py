@@ -2,20 +2,18 @@
 # -*- coding: utf-8 -*-
 
 import os
-import json
+import sys
 import time
-import pandas as pd
-from sklearn.preprocessing import MinMaxScaler
-from sklearn.decomposition import PCA
-import gspread
-from google.oauth2 import service_account
-from google.oauth2.service_account import Credentials
-from googleapiclient.discovery import build
 import matplotlib.pyplot as plt
 import matplotlib.font_manager as fm
 from matplotlib import rc
-from pandas.plotting import parallel_coordinates
-import seaborn as sns
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from carestats.sheets import get_client, read_columns
+from carestats.parsing import parse_numeric
+from carestats.numeric import minmax_scale, pca
+from carestats.regions import SEOUL, SIDO
+from carestats.trace import span, traced
 
 # 한글 폰트 설정
 font_path = 'woohyun/Pretendard.ttf'  # 시스템 경로에 맞게 수정
@@ -25,148 +23,60 @@ plt.rcParams['axes.unicode_minus'] = False
 
 # 구글 스프레드시트 정보
 SPREADSHEET_ID = "1_m5GzATyDfHQ6GH_AIDt96dG-fUkLt-I4a93XlSkA58"
-KEY_REL_PATH = "../key/datascience-457408-eb15d8611be3.json"
 
-# --- 데이터 로딩 함수 ---
+# --- 데이터 로딩 함수 (구 코드 인덱스 Series, 시트에 없는 구는 main에서 0으로 채움) ---
+def _worksheet(index):
+    return get_client().open_by_key(SPREADSHEET_ID).get_worksheet(index)
+
+
+def _seoul_sum(df, sido_col, gu_col, column, out_col, context):
+    """필요한 열만 받은 워크시트 → 서울 구별 column 합계 ('서울'/'서울특별시'는 시도 코드로 비교)"""
+    df = df[SIDO.codes(df[sido_col]) == SIDO.code('서울')]
+    values = parse_numeric(df[column].to_numpy(dtype=object))
+    return SEOUL.sum_by(df[gu_col], values, f"{context} {column}").rename(out_col)
+
+
+@traced()
 def load_capacity():
-    script_dir = os.path.dirname(os.path.abspath(__file__))
-    key_path = os.path.join(script_dir, KEY_REL_PATH)
-    info = json.load(open(key_path, encoding='utf-8'))
-    info['private_key'] = info['private_key'].replace('\\n', '\n')
-    creds = service_account.Credentials.from_service_account_info(
-        info,
-        scopes=["https://www.googleapis.com/auth/spreadsheets.readonly"]
-    )
-    client = gspread.authorize(creds)
-    ws = client.open_by_key(SPREADSHEET_ID).get_worksheet(1)
-    df = pd.DataFrame(ws.get_all_records())
-    df.columns = df.columns.str.strip()
-    df = df[df['시도'] == '서울']
-    # 서울의 모든 구 리스트
-    seoul_gu_list = [
-        '강남구', '강동구', '강북구', '강서구', '관악구', '광진구', '구로구', '금천구', 
-        '노원구', '도봉구', '동대문구', '동작구', '마포구', '서대문구', '서초구', '성동구', 
-        '성북구', '송파구', '양천구', '영등포구', '용산구', '은평구', '종로구', '중구', '중랑구'
-    ]  
-    df = df[['구', '정원']].dropna(subset=['구'])
-    df = df[df['구'].str.strip() != '']
-    # 서울의 구 목록에 있는 모든 구를 데이터프레임에 추가
-    missing_gu = [gu for gu in seoul_gu_list if gu not in df['구'].values]
-
-    # 누락된 구들을 빈 값으로 추가 (정원은 0으로 설정)
-    missing_df = pd.DataFrame({
-        '구': missing_gu,
-        '정원': [0] * len(missing_gu)
-    })
-
-    # 기존 df와 누락된 구 데이터프레임 합치기
-    df = pd.concat([df, missing_df], ignore_index=True)
-    df['정원'] = pd.to_numeric(df['정원'], errors='coerce').fillna(0).astype(int)
-    return (
-        df.groupby('구', as_index=False)['정원']
-        .sum()
-        .rename(columns={'정원': 'capacity'})
-    )
-    
+    df = read_columns(_worksheet(1), ['시도', '구', '정원'])
+    return _seoul_sum(df, '시도', '구', '정원', 'capacity', '워크시트 1')
 
 
+@traced()
 def load_supports():
-    script_dir = os.path.dirname(os.path.abspath(__file__))
-    key_path = os.path.join(script_dir, KEY_REL_PATH)
-    info = json.load(open(key_path, encoding='utf-8'))
-    info['private_key'] = info['private_key'].replace('\\n', '\n')
-    creds = service_account.Credentials.from_service_account_info(
-        info,
-        scopes=["https://www.googleapis.com/auth/spreadsheets.readonly"]
-    )
-    client = gspread.authorize(creds)
-    ws = client.open_by_key(SPREADSHEET_ID).get_worksheet(2)
-    df = pd.DataFrame(ws.get_all_records())
-    df.columns = df.columns.str.strip()
-    df = df[df['통계시도명'] == '서울특별시'] # 서울만
-    df = df[['통계시군구명','지급건수']].dropna(subset=['통계시군구명'])
-    df['지급건수'] = pd.to_numeric(df['지급건수'], errors='coerce').fillna(0).astype(int)
-    return (
-        df.groupby('통계시군구명', as_index=False)['지급건수']
-        .sum()
-        .rename(columns={'통계시군구명': '구', '지급건수': 'support_count'})
-    )
+    df = read_columns(_worksheet(2), ['통계시도명', '통계시군구명', '지급건수'])
+    return _seoul_sum(df, '통계시도명', '통계시군구명', '지급건수', 'support_count', '워크시트 2')
 
 
-def load_households():
-    script_dir = os.path.dirname(os.path.abspath(__file__))
-    key_path = os.path.join(script_dir, KEY_REL_PATH)
-    creds = Credentials.from_service_account_file(
-        key_path,
-        scopes=[
-            "https://www.googleapis.com/auth/spreadsheets.readonly",
-            "https://www.googleapis.com/auth/drive.readonly"
-        ]
-    )
-    client = gspread.authorize(creds)
-    ws = client.open_by_key(SPREADSHEET_ID).get_worksheet(3)
-    df = pd.DataFrame(ws.get_all_records())
-    df.columns = df.columns.str.strip()
-    # 데이터 정리
-    df = df[df['통계시도명'] == '서울특별시']
-    df = (
-        df
-        .groupby('통계시군구명', as_index=False)['수급가구수']
-        .sum()
-        .rename(columns={'통계시군구명':'구', '수급가구수':'household_count'})
-    )
-    df['구'] = df['구'].astype(str).str.strip()
-    df['household_count'] = pd.to_numeric(df['household_count'], errors='coerce').fillna(0).astype(int)
-    return df
-
-
-def load_members():
-    script_dir = os.path.dirname(os.path.abspath(__file__))
-    key_path = os.path.join(script_dir, KEY_REL_PATH)
-    creds = Credentials.from_service_account_file(
-        key_path,
-        scopes=[
-            "https://www.googleapis.com/auth/spreadsheets.readonly",
-            "https://www.googleapis.com/auth/drive.readonly"
-        ]
-    )
-    client = gspread.authorize(creds)
-    ws = client.open_by_key(SPREADSHEET_ID).get_worksheet(3)
-    df = pd.DataFrame(ws.get_all_records())
-    df.columns = df.columns.str.strip()
-    # 데이터 정리
-    df = df[df['통계시도명'] == '서울특별시']
-    df = (
-        df
-        .groupby('통계시군구명', as_index=False)['수급자수']
-        .sum()
-        .rename(columns={'통계시군구명':'구', '수급자수':'member_count'})
+@traced()
+def load_recipients():
+    """워크시트 3을 한 번만 받아 → (household_count, member_count)"""
+    df = read_columns(_worksheet(3), ['통계시도명', '통계시군구명', '수급가구수', '수급자수'])
+    return (
+        _seoul_sum(df, '통계시도명', '통계시군구명', '수급가구수', 'household_count', '워크시트 3'),
+        _seoul_sum(df, '통계시도명', '통계시군구명', '수급자수', 'member_count', '워크시트 3'),
     )
-    df['구'] = df['구'].astype(str).str.strip()
-    df['member_count'] = pd.to_numeric(df['member_count'], errors='coerce').fillna(0).astype(int)
-    return df
 
 
 def main():
+    # 무거운 분석/시각화 라이브러리는 실제로 분석할 때만 로드
+    import seaborn as sns
+    from pandas.plotting import parallel_coordinates
+
     # 데이터 로드
     cap_df = load_capacity()
     sup_df = load_supports()
-    hh_df = load_households()
-    mem_df = load_members()
-
-    # 병합 및 결측 처리
-    df = (
-        cap_df.merge(sup_df, on='구', how='outer')
-        .merge(hh_df, on='구', how='outer')
-        .merge(mem_df, on='구', how='outer')
-        .fillna(0)
-    )
+    hh_df, mem_df = load_recipients()
+
+    # 구 코드 인덱스로 맞춤 (25개 구 전체, 자료 없는 구는 0)
+    with span('merge'):
+        df = SEOUL.table({'capacity': cap_df, 'support_count': sup_df,
+                          'household_count': hh_df, 'member_count': mem_df})
 
     # 정규화
-    scaler = MinMaxScaler()
     raw_cols = ['capacity', 'support_count', 'household_count', 'member_count']
     norm_cols = [f"{c}_norm" for c in raw_cols]
-    df[norm_cols] = scaler.fit_transform(df[raw_cols])
+    df[norm_cols] = minmax_scale(df[raw_cols].to_numpy(dtype=float))
 
     # 상위 10개 선 그래프
     for col in norm_cols:
@@ -217,8 +127,7 @@ def main():
     plt.show()
 
     # 9) PCA 2D 투영  ← 이 주석과 동일한 들여쓰기 레벨로 아래 코드도 맞춥니다.
-    pca = PCA(n_components=2)
-    df[['PC1', 'PC2']] = pca.fit_transform(df[norm_cols])
+    df[['PC1', 'PC2']] = pca(df[norm_cols].to_numpy(), n_components=2)[0]
     plt.figure(figsize=(6, 5))
     plt.scatter(df['PC1'], df['PC2'], alpha=0.6)
     for _, row in df.nlargest(5, 'gap_diff').iterrows():
@@ -1,5 +1,6 @@
 # -*- coding: utf-8 -*-
 import os
+import sys
 import time
 import json
 import pandas as pd
@@ -8,6 +9,9 @@ import gspread
 from google.oauth2.service_account import Credentials
 from geopy.geocoders import Nominatim
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from carestats.sheets import QuotaHTTPClient
+
 def get_coords(address):
     """주소 → (위도, 경도) 반환 (Nominatim 지오코딩)"""
     geolocator = Nominatim(user_agent="geoapi", timeout=10)
@@ -35,7 +39,7 @@ def load_sheet_data():
             "https://www.googleapis.com/auth/drive.readonly"
         ]
     )
-    client = gspread.authorize(creds)
+    client = gspread.authorize(creds, http_client=QuotaHTTPClient)
 
     # 워크시트 로드 (인덱스 4)
     SPREADSHEET_ID = "1_m5GzATyDfHQ6GH_AIDt96dG-fUkLt-I4a93XlSkA58"
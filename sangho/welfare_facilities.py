@@ -1,67 +1,29 @@
 import os
+import sys
 import gspread
 from oauth2client.service_account import ServiceAccountCredentials
 import pandas as pd
 import matplotlib
-from geopy.geocoders import Nominatim
-import time
 import folium
 import numpy as np
-import re
-
-# 지오코더 설정
-geolocator = Nominatim(user_agent="welfare-map", timeout=10)
-
-# 주소 형식 정리
-def clean_address(address):
-    if pd.isna(address):
-        return ""
-
-    # 문자열로 캐스팅 후 기본 정리
-    address = str(address).strip()
-
-    # 완전히 주소가 아닌 경우 삭제
-    if any(keyword in address for keyword in ["비공개", "작성자", "미혼모자", "안내"]):
-        return ""
-
-    # 괄호/인용 부호/이상한 문자 제거
-    address = re.sub(r'[\(\)\[\]「」|※★·●◎▶▷◆◇□■○]', '', address)
-    
-    # 콤마 뒤 지우기
-    address = re.sub(r',.*$', '', address)
-    
-    # "A동 B호", "202호", "한남하우스" 등 건물/호실 제거 (가능한 한 뒤쪽만 제거)
-    address = re.sub(r'\s+\d{1,3}동\b', '', address)
-    address = re.sub(r'\s+\d{1,3}호\b', '', address)
-    address = re.sub(r'\s+\d{1,3}(호|층|호실)\b', '', address)
-    address = re.sub(r'\s+\d{1,3}(호|층)?\s+[가-힣]{2,}\b', '', address)  # 예: "501 한남하우스"
-
-    # "숫자-숫자"가 나오면 그 뒤는 제거
-    address = re.sub(r'(\d+-\d+).*', r'\1', address)
-    # 공백 정리
-    address = re.sub(r'\s+', ' ', address).strip()
-
-    return address
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from carestats.geocode import address_query, get_geocoder  # 표준 주소 키 + 공용 캐시
 
+# 지오코더 설정 (같은 건물로 보이는 주소는 캐시 좌표 재사용)
+geocoder = get_geocoder()
 
 # 주소 → 위도/경도  
 def geocode_address(address):
-    address = clean_address(address) # 주소 전처리
-    if not address or pd.isna(address):
-        return pd.Series([None, None])
-    try:
-        time.sleep(0.5)
-        location = geolocator.geocode(address)
-        if location:
-            print(f"주소 찾음: {address}")
-            return pd.Series([location.latitude, location.longitude])
-        else:
-            print(f"⚠️ 주소를 찾을 수 없음: {address}")
-            return pd.Series([None, None])
-    except Exception as e:
-        print(f"❌ 오류 발생 - 주소: {address} → {e}")
+    address = address_query(address) # 주소 전처리 (시도 시군구 도로명 건물번호)
+    if not address:
         return pd.Series([None, None])
+    lat, lon = geocoder.address(address)
+    if lat is not None:
+        print(f"주소 찾음: {address}")
+    else:
+        print(f"⚠️ 주소를 찾을 수 없음: {address}")
+    return pd.Series([lat, lon])
 
 
 scope = [
@@ -89,6 +51,11 @@ try:
     df = pd.DataFrame(records)
     df.replace('', np.nan, inplace=True)
     df[['lat', 'lon']] = df['소재지'].apply(geocode_address)
+    geocoder.save()
+    if geocoder.reused:
+        print(f"♻️ 비슷한 주소의 좌표 재사용 {geocoder.reused}건")
+    # 좌표 포함 시설 목록 (python -m carestats spatial-join --points welfare_facilities_points.csv)
+    df.to_csv("welfare_facilities_points.csv", index=False, encoding='utf-8-sig')
     # 지도 기본 위치 (서울시청 기준)
     map_center = [37.5665, 126.9780]
     welfare_map = folium.Map(location=map_center, zoom_start=11)
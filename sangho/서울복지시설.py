@@ -1,33 +1,33 @@
 # -*- coding: utf-8 -*-
+import argparse
 import os
 import sys
-import json
 import time
 import math
 import pandas as pd
 import folium
 from geopy.geocoders import Nominatim
-import gspread
-from google.oauth2 import service_account
 
-def load_worksheet(index=1):
-    """구글 스프레드시트 워크시트(index) → DataFrame"""
-    script_dir = os.path.dirname(os.path.abspath(__file__))
-    key_path = os.path.normpath(os.path.join(
-        script_dir, "../key/datascience-457408-eb15d8611be3.json"
-    ))
-    info = json.load(open(key_path, encoding='utf-8'))
-    info['private_key'] = info['private_key'].replace('\\n','\n')
-    creds = service_account.Credentials.from_service_account_info(
-        info, scopes=["https://www.googleapis.com/auth/spreadsheets.readonly"]
-    )
-    client = gspread.authorize(creds)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from carestats import config
+from carestats.freshness import RENDER_CODE, SHEET_CODE, RunCheck
+from carestats.regions import SEOUL, SIDO
+from carestats.sheets import get_client, read_columns
+from carestats.trace import span, traced
+
+@traced()
+def load_worksheet(index=1, columns=None, where=None):
+    """구글 스프레드시트 워크시트(index) → DataFrame (columns를 주면 해당 열만 읽음)"""
+    client = get_client()
     SPREADSHEET_ID = "1_m5GzATyDfHQ6GH_AIDt96dG-fUkLt-I4a93XlSkA58"
     ws = client.open_by_key(SPREADSHEET_ID).get_worksheet(index)
+    if columns:
+        return read_columns(ws, columns, where)
     df = pd.DataFrame(ws.get_all_records())
     df.columns = df.columns.str.strip()
     return df
 
+@traced()
 def geocode_districts(districts):
     """시군구명 리스트 → {구명: (lat, lon)}"""
     geolocator = Nominatim(user_agent="bubble_map", timeout=10)
@@ -38,51 +38,51 @@ def geocode_districts(districts):
             coords[d] = (loc.latitude, loc.longitude) if loc else (None, None)
         except:
             coords[d] = (None, None)
-        time.sleep(1)
+        with span('geocode.sleep', 'sleep'):
+            time.sleep(1)
     return coords
 
-def main():
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="서울 구별 복지시설 총정원 지도")
+    parser.add_argument('--choropleth', action='store_true',
+                        help="지오코딩 없이 경계 다각형(config.BOUNDARY_PATH)을 칠한 단계구분도로 저장")
+    args = parser.parse_args(argv)
+
+    here = os.path.dirname(os.path.abspath(__file__))
+    if args.choropleth:
+        if not os.path.exists(config.BOUNDARY_PATH):
+            raise SystemExit(f"❌ 경계 파일이 없습니다: {config.BOUNDARY_PATH}")
+        out = os.path.join(here, "capacity_choropleth.html")
+        check = RunCheck('sangho/서울복지시설:choropleth', files=[__file__, config.BOUNDARY_PATH], outputs=[out],
+                         code=RENDER_CODE)
+    else:
+        out = os.path.join(here, "capacity_bubble_map.html")
+        check = RunCheck('sangho/서울복지시설', files=[__file__], outputs=[out], code=SHEET_CODE)
+    if not check.changed():
+        print(f"⏭️ 원본 변경 없음, 건너뜀: {out}")
+        return
+    print(f"🔄 다시 생성 ({', '.join(check.reasons)})")
+
     # 1) 워크시트 로드 & 집계
-    df = load_worksheet(index=1)
+    df = load_worksheet(index=1, columns=['시도', '정원', '구'])
     # 반드시 컬럼명이 정확히 일치해야 합니다.
     if '시도' not in df.columns or '정원' not in df.columns:
         raise KeyError("워크시트에 '시도' 또는 '정원' 컬럼이 없습니다.")
-    # 서울의 모든 구 리스트
-    seoul_gu_list = [
-        '강남구', '강동구', '강북구', '강서구', '관악구', '광진구', '구로구', '금천구', 
-        '노원구', '도봉구', '동대문구', '동작구', '마포구', '서대문구', '서초구', '성동구', 
-        '성북구', '송파구', '양천구', '영등포구', '용산구', '은평구', '종로구', '중구', '중랑구'
-    ]
-    # '시도'와 '구'가 NaN인 행 제거
-    df = df[['시도','정원', '구']].dropna(subset=['시도', '구'])
-    df = df[(df['시도'].str.strip() != '') & (df['구'].str.strip() != '')]
-    # 서울의 구 목록에 있는 모든 구를 데이터프레임에 추가
-    missing_gu = [gu for gu in seoul_gu_list if gu not in df['구'].values]
-
-    # 누락된 구들을 빈 값으로 추가 (정원은 0으로 설정)
-    missing_df = pd.DataFrame({
-        '시도': ['서울'] * len(missing_gu),
-        '구': missing_gu,
-        '정원': [0] * len(missing_gu)
-    })
-
-    # 기존 df와 누락된 구 데이터프레임 합치기
-    df = pd.concat([df, missing_df], ignore_index=True)
-
-    # 정원 컬럼 숫자 형식으로 변환
-    df['정원'] = pd.to_numeric(df['정원'], errors='coerce').fillna(0).astype(int)
-    # 서울만
-    df = df[df['시도'] == '서울']
-    # 정리
-    summary = (
-        df
-        .groupby('구', as_index=False)['정원']
-        .sum()
-        .rename(columns={'정원':'총정원'})
-    )
+    df = df[SIDO.codes(df['시도']) == SIDO.code('서울')]   # '서울', '서울특별시' 모두
+    # 구 코드별 합계 → 서울 25개 구 전체 (데이터에 없는 구는 0, 목록에 없는 구 이름은 ⚠️로 알림)
+    capacity = pd.to_numeric(df['정원'], errors='coerce').fillna(0).astype(int)
+    summary = SEOUL.table({'총정원': SEOUL.sum_by(df['구'], capacity, '워크시트 1')}).reset_index(drop=True)
     print("=== 구별 총정원 ===")
     print(summary.to_string(), "\n")
 
+    if args.choropleth:
+        from carestats.maps import choropleth_map
+        choropleth_map(summary, out, name_col='구', value_col='총정원', sido='서울특별시',
+                       title="서울특별시 구별 복지시설 총정원", unit='명')
+        print(f"✅ 단계구분도 저장: {out}")
+        check.record()
+        return
+
     # 2) 지오코딩
     coords = geocode_districts(summary['구'])
 
@@ -136,9 +136,14 @@ def main():
         m.fit_bounds(bounds)
 
     # 7) 저장
-    out = os.path.join(os.path.dirname(os.path.abspath(__file__)), "capacity_bubble_map.html")
-    m.save(out)
+    with span('m.save', 'render'):
+        m.save(out)
     print(f"✅ 버블맵 저장: {out}")
+    if bounds:
+        check.record()
+    else:
+        # 지오코딩이 모두 실패해 버블 없는 지도: 기록하면 다음 실행부터 계속 건너뜀
+        print("⚠️ 좌표를 얻은 지역이 없어 실행 기록을 남기지 않음 (다음 실행 때 다시 생성)")
 
 if __name__ == "__main__":
     main()
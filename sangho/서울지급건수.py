@@ -1,33 +1,33 @@
 # -*- coding: utf-8 -*-
+import argparse
 import os
 import sys
-import json
 import time
 import math
 import pandas as pd
 import folium
 from geopy.geocoders import Nominatim
-import gspread
-from google.oauth2 import service_account
-
-def load_worksheet(index=2):
-    """구글 스프레드시트 워크시트(index) → DataFrame"""
-    script_dir = os.path.dirname(os.path.abspath(__file__))
-    key_path = os.path.normpath(os.path.join(
-        script_dir, "../key/datascience-457408-eb15d8611be3.json"
-    ))
-    info = json.load(open(key_path, encoding='utf-8'))
-    info['private_key'] = info['private_key'].replace('\\n','\n')
-    creds = service_account.Credentials.from_service_account_info(
-        info, scopes=["https://www.googleapis.com/auth/spreadsheets.readonly"]
-    )
-    client = gspread.authorize(creds)
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from carestats import config
+from carestats.freshness import RENDER_CODE, SHEET_CODE, RunCheck
+from carestats.regions import SEOUL, SIDO
+from carestats.sheets import get_client, read_columns
+from carestats.trace import span, traced
+
+@traced()
+def load_worksheet(index=2, columns=None, where=None):
+    """구글 스프레드시트 워크시트(index) → DataFrame (columns를 주면 해당 열만 읽음)"""
+    client = get_client()
     SPREADSHEET_ID = "1_m5GzATyDfHQ6GH_AIDt96dG-fUkLt-I4a93XlSkA58"
     ws = client.open_by_key(SPREADSHEET_ID).get_worksheet(index)
+    if columns:
+        return read_columns(ws, columns, where)
     df = pd.DataFrame(ws.get_all_records())
     df.columns = df.columns.str.strip()
     return df
 
+@traced()
 def geocode_regions(regions):
     """시도명 리스트 → {시도명: (lat, lon)}"""
     geolocator = Nominatim(user_agent="bubble_map", timeout=10)
@@ -38,28 +38,53 @@ def geocode_regions(regions):
             coords[r] = (loc.latitude, loc.longitude)
         else:
             coords[r] = (None, None)
-        time.sleep(1)
+        with span('geocode.sleep', 'sleep'):
+            time.sleep(1)
     return coords
 
-def main():
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="서울 구별 총지급건수 지도")
+    parser.add_argument('--choropleth', action='store_true',
+                        help="지오코딩 없이 경계 다각형(config.BOUNDARY_PATH)을 칠한 단계구분도로 저장")
+    args = parser.parse_args(argv)
+
+    here = os.path.dirname(os.path.abspath(__file__))
+    if args.choropleth:
+        if not os.path.exists(config.BOUNDARY_PATH):
+            raise SystemExit(f"❌ 경계 파일이 없습니다: {config.BOUNDARY_PATH}")
+        out = os.path.join(here, "payments_choropleth.html")
+        check = RunCheck('sangho/서울지급건수:choropleth', files=[__file__, config.BOUNDARY_PATH], outputs=[out],
+                         code=RENDER_CODE)
+    else:
+        out = os.path.join(here, "bubble_map_by_region.html")
+        check = RunCheck('sangho/서울지급건수', files=[__file__], outputs=[out], code=SHEET_CODE)
+    if not check.changed():
+        print(f"⏭️ 원본 변경 없음, 건너뜀: {out}")
+        return
+    print(f"🔄 다시 생성 ({', '.join(check.reasons)})")
+
     # 1) 워크시트 로드 & 집계
-    df = load_worksheet(index=2)
-    df = df[df['통계시도명'] == '서울특별시'] # 서울만
+    df = load_worksheet(index=2, columns=['통계시도명', '통계시군구명', '지급건수'])
     if '통계시군구명' not in df.columns or '지급건수' not in df.columns:
         raise KeyError("워크시트에 '통계시군구명' 또는 '지급건수' 컬럼이 없습니다.")
-    df = df[['통계시군구명','지급건수']].dropna(subset=['통계시군구명'])
-    df['지급건수'] = pd.to_numeric(df['지급건수'], errors='coerce').fillna(0).astype(int)
+    df = df[SIDO.codes(df['통계시도명']) == SIDO.code('서울')]  # 서울만 ('서울', '서울특별시' 모두)
+    counts = pd.to_numeric(df['지급건수'], errors='coerce').fillna(0).astype(int)
 
-    summary = (
-        df
-        .groupby('통계시군구명', as_index=False)['지급건수']
-        .sum()
-        .rename(columns={'지급건수':'총지급건수'})
-    )
+    # 구 코드별 합계 (별칭은 한 구로, 목록에 없는 구 이름은 ⚠️로 알림)
+    summary = SEOUL.named(SEOUL.sum_by(df['통계시군구명'], counts, '워크시트 2').rename('총지급건수'),
+                          '통계시군구명').reset_index(drop=True)
 
     print("=== 시군구별 총 지급건수 ===")
     print(summary.to_string(), "\n")
 
+    if args.choropleth:
+        from carestats.maps import choropleth_map
+        choropleth_map(summary, out, name_col='통계시군구명', value_col='총지급건수', sido='서울특별시',
+                       title="서울특별시 구별 총지급건수", unit='건')
+        print(f"✅ 단계구분도 저장: {out}")
+        check.record()
+        return
+
     # 2) 지오코딩 (시도 단위)
     coords = geocode_regions(summary['통계시군구명'])
 
@@ -114,9 +139,14 @@ def main():
         m.fit_bounds(bounds)
 
     # 7) 저장
-    out = os.path.join(os.path.dirname(os.path.abspath(__file__)), "bubble_map_by_region.html")
-    m.save(out)
+    with span('m.save', 'render'):
+        m.save(out)
     print(f"✅ 시군구별 버블맵 저장: {out}")
+    if bounds:
+        check.record()
+    else:
+        # 지오코딩이 모두 실패해 버블 없는 지도: 기록하면 다음 실행부터 계속 건너뜀
+        print("⚠️ 좌표를 얻은 지역이 없어 실행 기록을 남기지 않음 (다음 실행 때 다시 생성)")
 
 if __name__ == "__main__":
     main()
@@ -1,45 +1,38 @@
 # -*- coding: utf-8 -*-
+import argparse
 import os
-import json
+import sys
 import time
 import math
 import pandas as pd
 import folium
-import gspread
 from geopy.geocoders import Nominatim
-from google.oauth2.service_account import Credentials
-from google.oauth2 import service_account
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from carestats.sheets import get_client
+from carestats import config
+from carestats.freshness import RENDER_CODE, SHEET_CODE, RunCheck
+from carestats.regions import SEOUL, SIDO
+from carestats.trace import span, traced
 
 SPREADSHEET_ID = "1_m5GzATyDfHQ6GH_AIDt96dG-fUkLt-I4a93XlSkA58"
 
+@traced()
 def load_data(index = 3):
     """구글 스프레드시트 워크시트(index) → DataFrame"""
-    script_dir = os.path.dirname(os.path.abspath(__file__))
-    key_path = os.path.normpath(os.path.join(
-        script_dir, "../key/datascience-457408-eb15d8611be3.json"
-    ))
-    info = json.load(open(key_path, encoding='utf-8'))
-    info['private_key'] = info['private_key'].replace('\\n','\n')
-    creds = service_account.Credentials.from_service_account_info(
-        info, scopes=["https://www.googleapis.com/auth/spreadsheets.readonly"]
-    )
-    client = gspread.authorize(creds)
+    client = get_client()
     SPREADSHEET_ID = "1_m5GzATyDfHQ6GH_AIDt96dG-fUkLt-I4a93XlSkA58"
     ws = client.open_by_key(SPREADSHEET_ID).get_worksheet(index)
     df = pd.DataFrame(ws.get_all_records())
     df.columns = df.columns.str.strip()
     
-    # 데이터 정리
-    df = df[df['통계시도명'] == '서울특별시']
-    df = (
-        df
-        .groupby('통계시군구명', as_index=False)['수급자수']
-        .sum()
-        .rename(columns={'수급자수':'총수급자수'})
-    )
-    
-    return df
+    # 데이터 정리: 서울('서울', '서울특별시' 모두)만, 구 코드별 합계
+    df = df[SIDO.codes(df['통계시도명']) == SIDO.code('서울')]
+    counts = pd.to_numeric(df['수급자수'], errors='coerce').fillna(0).astype(int)
+    total = SEOUL.sum_by(df['통계시군구명'], counts, f"워크시트 {index}").rename('총수급자수')
+    return SEOUL.named(total, '통계시군구명').reset_index(drop=True)
 
+@traced()
 def geocode(regions):
     geo = Nominatim(user_agent="sheet3_map", timeout=10)
     coords = {}
@@ -49,10 +42,13 @@ def geocode(regions):
             coords[r] = (loc.latitude, loc.longitude) if loc else (None, None)
         except:
             coords[r] = (None, None)
-        time.sleep(1)
+        with span('geocode.sleep', 'sleep'):
+            time.sleep(1)
     return coords
 
-def make_map(df):
+@traced()
+def make_map(df, out):
+    """지오코딩 + 버블맵 저장 → 좌표를 얻은 지역 수"""
     coords = geocode(df['통계시군구명'])
     m = folium.Map(location=[36,128], zoom_start=6, width='100%', height='100%')
     factor = 0.6
@@ -99,13 +95,46 @@ def make_map(df):
     if bounds:
         m.fit_bounds(bounds)
 
-    out = os.path.join(os.path.dirname(__file__), "sheet3_bubble_map.html")
-    m.save(out)
+    with span('m.save', 'render'):
+        m.save(out)
     print(f"✅ 맵 저장됨: {out}")
+    return len(bounds)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="서울 구별 한부모 수급자수 지도")
+    parser.add_argument('--choropleth', action='store_true',
+                        help="지오코딩 없이 경계 다각형(config.BOUNDARY_PATH)을 칠한 단계구분도로 저장")
+    args = parser.parse_args(argv)
+
+    here = os.path.dirname(os.path.abspath(__file__))
+    if args.choropleth:
+        if not os.path.exists(config.BOUNDARY_PATH):
+            raise SystemExit(f"❌ 경계 파일이 없습니다: {config.BOUNDARY_PATH}")
+        out = os.path.join(here, "sheet3_choropleth.html")
+        check = RunCheck('sangho/서울한부모가정명수:choropleth', files=[__file__, config.BOUNDARY_PATH],
+                         outputs=[out], code=RENDER_CODE)
+    else:
+        out = os.path.join(here, "sheet3_bubble_map.html")
+        check = RunCheck('sangho/서울한부모가정명수', files=[__file__], outputs=[out], code=SHEET_CODE)
+    if not check.changed():
+        print(f"⏭️ 원본 변경 없음, 건너뜀: {out}")
+        return
+    print(f"🔄 다시 생성 ({', '.join(check.reasons)})")
 
-def main():
     df = load_data()
-    make_map(df)
+    if args.choropleth:
+        from carestats.maps import choropleth_map
+        choropleth_map(df, out, name_col='통계시군구명', value_col='총수급자수', sido='서울특별시',
+                       title="서울특별시 구별 수급자수", unit='명')
+        print(f"✅ 단계구분도 저장: {out}")
+        check.record()
+        return
+
+    if make_map(df, out):
+        check.record()
+    else:
+        # 지오코딩이 모두 실패해 버블 없는 지도: 기록하면 다음 실행부터 계속 건너뜀
+        print("⚠️ 좌표를 얻은 지역이 없어 실행 기록을 남기지 않음 (다음 실행 때 다시 생성)")
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+"""carestats.access 격자 버킷: 최근접 k / 반경 안 합계가 전체 거리 행렬 계산과 같은지, 좌표 없는 시설/지점"""
+import numpy as np
+import pytest
+
+from carestats.access import NeighborIndex, accessibility, haversine_km
+
+
+@pytest.fixture(scope='module')
+def points():
+    rng = np.random.default_rng(0)
+    # 시설은 몇 군데 도시에 몰리고 일부는 좌표가 없음, 지점은 한반도 범위 전체
+    centers = rng.uniform([34.5, 126.5], [38.0, 129.0], (6, 2))
+    fac = centers[rng.integers(0, 6, 800)] + rng.normal(0, 0.15, (800, 2))
+    fac[::97] = np.nan
+    capacity = rng.integers(1, 50, 800).astype(float)
+    demand = rng.uniform([33.5, 125.5], [38.5, 130.0], (500, 2))
+    return fac, capacity, demand
+
+
+def brute(fac, demand):
+    return haversine_km(demand[:, :1], demand[:, 1:], fac[None, :, 0], fac[None, :, 1])
+
+
+@pytest.mark.parametrize('cell_km', [1.0, 5.0, 40.0])
+@pytest.mark.parametrize('k', [1, 3, 10])
+def test_nearest_matches_brute_force(points, cell_km, k):
+    fac, _, demand = points
+    full = np.where(np.isfinite(fac[:, 0]), brute(fac, demand), np.inf)
+    expected = np.sort(full, axis=1)[:, :k]
+    dist, idx = NeighborIndex(fac[:, 0], fac[:, 1], cell_km).nearest(demand[:, 0], demand[:, 1], k)
+    assert np.allclose(dist, expected)
+    assert np.allclose(np.take_along_axis(full, idx, axis=1), dist)    # 시설 번호는 입력 순서 기준
+
+
+@pytest.mark.parametrize('cell_km', [1.0, 5.0, 40.0])
+def test_within_matches_brute_force(points, cell_km):
+    fac, capacity, demand = points
+    near = np.nan_to_num(brute(fac, demand), nan=np.inf) <= 25.0
+    count, total = NeighborIndex(fac[:, 0], fac[:, 1], cell_km).within(demand[:, 0], demand[:, 1], 25.0, capacity)
+    assert count.tolist() == near.sum(axis=1).tolist()
+    assert np.allclose(total, near @ capacity)
+
+
+def test_fewer_facilities_than_k_and_missing_points():
+    index = NeighborIndex([37.5, np.nan], [127.0, np.nan])
+    dist, idx = index.nearest([37.5, np.nan], [127.1, 127.0], k=2)
+    assert idx.tolist() == [[0, -1], [-1, -1]]
+    assert np.isfinite(dist[0, 0]) and np.isinf(dist[0, 1]) and np.isinf(dist[1]).all()
+
+    table = accessibility([37.5], [127.0], [37.5, 37.6], [127.0, 127.0], [10, 20], k=3, radius_km=5.0)
+    assert table['nearest_km'].tolist() == [0.0]
+    assert np.isnan(table['mean3_km'][0])
+    assert table['facilities_within'].tolist() == [1] and table['capacity_within'].tolist() == [10.0]
@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+"""carestats.api 쿼리 검증(시도 약칭 해석, 모르는 시도/음수 top은 400)과 응답 캐시 키/ETag"""
+import asyncio
+import os
+
+import pytest
+
+from carestats.api import create_app, load_store
+
+SAMPLE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'fixtures', 'sample')
+
+
+@pytest.fixture(scope='module')
+def store():
+    return load_store(SAMPLE)
+
+
+def _get(store, path):
+    from aiohttp.test_utils import TestClient, TestServer
+
+    async def go():
+        async with TestClient(TestServer(create_app(store))) as client:
+            resp = await client.get(path)
+            return resp.status, await resp.json()
+    return asyncio.run(go())
+
+
+def test_sido_alias_matches_official_name(store):
+    status, short = _get(store, '/stats/payments?sido=서울')
+    assert status == 200
+    assert short['total'] > 0
+    assert short['total'] == _get(store, '/stats/payments?sido=서울특별시')[1]['total']
+
+
+def test_unknown_sido_is_rejected(store):
+    status, body = _get(store, '/stats/payments?sido=서울시청')
+    assert status == 400 and '서울시청' in body['error']
+    assert _get(store, '/gap?level=sigungu&sido=없는도')[0] == 400
+
+
+def test_negative_top_is_rejected(store):
+    assert _get(store, '/gap?top=-1')[0] == 400
+    status, body = _get(store, '/gap?top=0')
+    assert status == 200 and len(body['rows']) > 0
+
+
+def _get_all(store, requests):
+    """같은 서버(같은 캐시)에 차례로 요청 → [(status, headers)]"""
+    from aiohttp.test_utils import TestClient, TestServer
+
+    async def go():
+        out = []
+        async with TestClient(TestServer(create_app(store))) as client:
+            for path, headers in requests:
+                resp = await client.get(path, headers=headers)
+                await resp.read()
+                out.append((resp.status, resp.headers))
+        return out
+    return asyncio.run(go())
+
+
+def test_sido_alias_shares_cache_entry(store):
+    (_, first), (_, second), (_, other) = _get_all(store, [
+        ('/stats/payments?sido=서울', {}),
+        ('/stats/payments?sido=서울특별시', {}),
+        ('/stats/payments?sido=부산', {}),
+    ])
+    assert (first['X-Cache'], second['X-Cache'], other['X-Cache']) == ('MISS', 'HIT', 'MISS')
+    assert first['ETag'] == second['ETag'] != other['ETag']
+
+
+def test_if_none_match_returns_304(store):
+    (status, first), = _get_all(store, [('/gap?level=sigungu&sido=서울', {})])
+    etag = first['ETag']
+    results = _get_all(store, [
+        ('/gap?level=sigungu&sido=서울특별시', {'If-None-Match': etag}),          # 캐시 MISS여도 304
+        ('/gap?sido=서울특별시&level=sigungu', {'If-None-Match': f'"x", W/{etag}'}),
+        ('/gap?level=sigungu&sido=서울', {'If-None-Match': '"other"'}),
+    ])
+    assert status == 200
+    assert [(s, h['X-Cache']) for s, h in results] == [(304, 'MISS'), (304, 'HIT'), (200, 'HIT')]
+    assert all(h['ETag'] == etag for _, h in results)
@@ -0,0 +1,60 @@
+# -*- coding: utf-8 -*-
+"""carestats.bench: 등록된 벤치마크가 fixtures로 실행되는지, 규모 상한/Skip, 커밋별 결과 저장과 비교"""
+import pytest
+
+from carestats import bench
+
+
+@pytest.fixture(scope='module')
+def fx():
+    return bench.Fixture()
+
+
+@pytest.mark.parametrize('name', sorted(bench.BENCHMARKS))
+def test_benchmark_runs_at_scale_1(fx, name):
+    setup, _ = bench.BENCHMARKS[name]
+    try:
+        fn = setup(fx, 1)
+    except bench.Skip as e:
+        pytest.skip(str(e))
+    fn()
+
+
+def test_scale_frame_grows_rows_and_groups(fx):
+    df = fx.raw('payments')
+    scaled = bench.scale_frame(df, 3, '통계시군구명')
+    assert len(scaled) == 3 * len(df)
+    assert scaled['통계시군구명'].nunique() == 3 * df['통계시군구명'].nunique()
+
+
+def test_run_respects_max_scale_and_skip(monkeypatch):
+    calls = []
+
+    def fast(fx, scale):
+        calls.append(scale)
+        return lambda: None
+
+    def missing(fx, scale):
+        raise bench.Skip('없는 모듈')
+
+    monkeypatch.setattr(bench, 'BENCHMARKS', {'fast': (fast, 10), 'missing': (missing, None)})
+    monkeypatch.setattr(bench, 'measure', lambda fn, repeat: {'median': 1.0, 'min': 1.0, 'number': 1, 'repeat': 1})
+    results = bench.run(['fast', 'missing'], [1, 10, 100], verbose=False)
+    assert calls == [1, 10]
+    assert sorted(results) == ['fast@1', 'fast@10', 'missing@1']
+    assert results['missing@1'] == {'skipped': '없는 모듈'}
+
+
+def test_results_saved_per_commit_and_compared(tmp_path, monkeypatch, capsys):
+    commit = 'a' * 40
+    monkeypatch.setattr(bench, 'commit_info', lambda: (commit, False))
+    monkeypatch.setattr(bench, '_git', lambda *args: commit if args[0] == 'rev-parse' else None)
+    bench.save_results({'x@1': {'median': 1.0}, 'y@1': {'median': 1.0}}, str(tmp_path))
+    path = bench.save_results({'y@1': {'median': 2.0}}, str(tmp_path))   # 일부만 다시 재도 나머지 유지
+    assert path == bench.result_path(str(tmp_path), commit)
+
+    base = bench.load_results(str(tmp_path), 'HEAD')
+    assert base['commit'] == commit and base['results'] == {'x@1': {'median': 1.0}, 'y@1': {'median': 2.0}}
+    slower = bench.compare(base, {'x@1': {'median': 1.5}, 'y@1': {'median': 2.0}, 'z@1': {'skipped': '-'}})
+    assert slower == 1
+    assert '⚠️ x@1' in capsys.readouterr().out
@@ -0,0 +1,60 @@
+# -*- coding: utf-8 -*-
+"""carestats.bootstrap 구간: 재표본 없는 입력은 점 추정 그대로, 프로세스 수와 무관한 결과, --sido 약칭 해석"""
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from carestats import bootstrap, datasets
+from carestats.gap import RAW_COLS, gap_table
+
+SAMPLE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'fixtures', 'sample')
+
+
+@pytest.fixture(scope='module')
+def frames():
+    return datasets.load_snapshot(SAMPLE)
+
+
+def test_fixed_inputs_reproduce_point_estimate(frames):
+    df = gap_table(frames, 'sido')
+    diff, ratio, _ = bootstrap.bootstrap_gap(df[RAW_COLS].to_numpy(dtype=float), n_boot=20)
+    assert np.allclose(diff, df['gap_diff'].to_numpy()[None, :])
+    assert np.allclose(ratio, df['gap_ratio'].to_numpy()[None, :])
+
+
+def test_result_independent_of_workers(frames):
+    df = bootstrap.gap_intervals(frames, 'sido', n_boot=60)
+    base = df[RAW_COLS].to_numpy(dtype=float)
+    facilities = (np.arange(len(df)).repeat(3), np.ones(3 * len(df)))
+    one = bootstrap.bootstrap_gap(base, facilities, n_boot=60, seed=3, workers=1, chunk_size=16)
+    two = bootstrap.bootstrap_gap(base, facilities, n_boot=60, seed=3, workers=2, chunk_size=16)
+    for a, b in zip(one, two):
+        assert np.array_equal(a, b)
+
+
+def test_resample_inputs_sum_by_month():
+    regions = pd.Index(['a', 'b'])
+    _, monthly = bootstrap.resample_inputs(
+        regions, payment_keys=pd.Index(['a', 'b', 'a', 'c']), months=['1', '1', '2', '2'], counts=[1, 2, 3, 4])
+    assert monthly.tolist() == [[1.0, 2.0], [3.0, 0.0]]
+
+
+def test_empty_scope_raises(frames):
+    with pytest.raises(ValueError, match='지역이 없습니다'):
+        bootstrap.gap_intervals(frames, 'sigungu', '없는도', n_boot=10)
+
+
+def test_cli_resolves_sido_alias(tmp_path):
+    short, full = tmp_path / 'short.csv', tmp_path / 'full.csv'
+    bootstrap.main(['--data-dir', SAMPLE, '--sido', '서울', '--samples', '100', '--csv', str(short)])
+    bootstrap.main(['--data-dir', SAMPLE, '--sido', '서울특별시', '--samples', '100', '--csv', str(full)])
+    result = pd.read_csv(short, encoding='utf-8-sig')
+    assert len(result) == 25 and set(result['통계시도명']) == {'서울특별시'}
+    assert result.equals(pd.read_csv(full, encoding='utf-8-sig'))
+
+
+def test_cli_rejects_unknown_sido():
+    with pytest.raises(SystemExit, match='없는도'):
+        bootstrap.main(['--data-dir', SAMPLE, '--sido', '없는도', '--samples', '10'])
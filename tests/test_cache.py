@@ -0,0 +1,35 @@
+# -*- coding: utf-8 -*-
+"""carestats.cache: 쿼리 정규화, 바이트 상한 LRU 제거, ETag 비교"""
+from multidict import MultiDict
+
+from carestats.cache import ResultCache, etag_matches, make_etag, normalize_query
+
+
+def test_normalize_query_ignores_order_and_duplicates():
+    a = normalize_query('/stats/x', MultiDict([('sido', '부산,서울'), ('value', 'n')]), ('sido',))
+    b = normalize_query('/stats/x', MultiDict([('value', 'n'), ('sido', '서울'), ('sido', '부산,서울')]), ('sido',))
+    assert a == b
+
+
+def test_lru_evicts_least_recently_used_by_bytes():
+    cache = ResultCache(max_bytes=10)
+    cache.put('a', b'1234')
+    cache.put('b', b'5678')
+    assert cache.get('a') is not None           # a가 최근 사용 → b가 먼저 제거됨
+    cache.put('c', b'90ab')
+    assert cache.get('b') is None and cache.get('a') and cache.get('c')
+    assert cache.size == 8 and cache.evictions == 1
+
+    cache.put('a', b'123456')                    # 같은 키 덮어쓰기는 크기만 바꿈
+    assert cache.size == 10 and len(cache) == 2
+    assert cache.put('big', b'x' * 11) == make_etag(b'x' * 11)   # 상한보다 큰 본문은 저장 안 함
+    assert cache.get('big') is None and len(cache) == 2
+
+
+def test_etag_matches():
+    etag = make_etag(b'body')
+    assert etag_matches(etag, etag)
+    assert etag_matches(f'"other", W/{etag}', etag)
+    assert etag_matches('*', etag)
+    assert not etag_matches('"other"', etag)
+    assert not etag_matches(None, etag)
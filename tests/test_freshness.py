@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+"""carestats.freshness RunCheck: 스크립트가 쓰는 carestats 코드가 바뀌어도 다시 실행하는지, CARESTATS_FORCE"""
+import os
+
+import pytest
+
+from carestats.freshness import RENDER_CODE, SHEET_CODE, RunCheck
+
+
+def _write(path, text, mtime_ns):
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(text)
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+def test_render_code_only_when_passed(tmp_path):
+    def names(**kwargs):
+        check = RunCheck('job', spreadsheet_id=None, path=str(tmp_path / 'runs.json'), **kwargs)
+        return {os.path.basename(p) for p in check.files}
+
+    assert names() == set()                                   # data_fix.py 같은 CSV 작업
+    assert names(code=SHEET_CODE) == {'sheets.py', 'parsing.py', 'regions.py'}
+    assert {'maps.py', 'shapes.py', 'map.js', 'map.css'} <= names(code=RENDER_CODE)
+
+
+def test_code_change_triggers_rerun(tmp_path):
+    script, renderer, out = tmp_path / 'script.py', tmp_path / 'renderer.py', tmp_path / 'out.html'
+    _write(script, "print('hi')\n", 1_000_000_000)
+    _write(renderer, "COLOR = 'red'\n", 1_000_000_000)
+    out.write_text('page')
+
+    def check():
+        return RunCheck('job', files=[script], outputs=[out], spreadsheet_id=None,
+                        path=str(tmp_path / 'runs.json'), code=[str(renderer)])
+
+    first = check()
+    assert first.changed()
+    first.record()
+    assert not check().changed()
+
+    _write(renderer, "COLOR = 'blue'\n", 2_000_000_000)
+    again = check()
+    assert again.changed()
+    assert again.reasons == ['파일 변경: renderer.py']
+
+
+@pytest.mark.parametrize('value, forced', [('', False), ('0', False), ('1', True)])
+def test_force_env(tmp_path, monkeypatch, value, forced):
+    out = tmp_path / 'out.csv'
+    out.write_text('x')
+    first = RunCheck('job', outputs=[out], spreadsheet_id=None, path=str(tmp_path / 'runs.json'))
+    first.changed()
+    first.record()
+    monkeypatch.setenv('CARESTATS_FORCE', value)
+    check = RunCheck('job', outputs=[out], spreadsheet_id=None, path=str(tmp_path / 'runs.json'))
+    assert check.changed() == forced
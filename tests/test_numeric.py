@@ -0,0 +1,27 @@
+# -*- coding: utf-8 -*-
+"""carestats.numeric 정규화 커널: 빈 입력, 값이 모두 같은 열, 묶음별 정규화"""
+import numpy as np
+import pytest
+
+from carestats.numeric import SCALERS, minmax_scale, pad_groups
+
+
+@pytest.mark.parametrize('method', sorted(SCALERS))
+def test_empty_input_gives_empty_result(method):
+    out = SCALERS[method](np.empty((0, 4)))
+    assert out.shape == (0, 4)
+    assert SCALERS[method](np.empty((3, 0, 2))).shape == (3, 0, 2)
+
+
+def test_minmax_constant_column_is_zero():
+    x = np.array([[1.0, 5.0], [3.0, 5.0], [2.0, 5.0]])
+    assert minmax_scale(x).tolist() == [[0.0, 0.0], [1.0, 0.0], [0.5, 0.0]]
+
+
+def test_grouped_matches_per_group():
+    x = np.array([[1.0], [10.0], [3.0], [20.0], [2.0]])
+    codes = np.array([0, 1, 0, 1, 0])
+    padded, mask, index = pad_groups(x, codes)
+    grouped = minmax_scale(padded, mask)[index]
+    for code in (0, 1):
+        assert np.allclose(grouped[codes == code], minmax_scale(x[codes == code]))
@@ -0,0 +1,42 @@
+# -*- coding: utf-8 -*-
+"""carestats.parsing 숫자 열: 콤마/빈칸/오류 셀, 벡터 경로 자릿수 한도를 넘는 긴 정수"""
+import numpy as np
+import pytest
+
+from carestats.parsing import parse_numeric, parse_values
+
+ROWS = [
+    ['지역', '값'],
+    ['a', '1,234'],
+    ['b', ''],
+    ['c', '#REF!'],
+    ['d', '-999,999,999,999,999,999'],        # 18자리: 벡터 경로
+    ['e', '9,223,372,036,854,775,807'],       # 19자리: int64 최대값
+    ['f', '99999999999999999999'],            # 20자리: int64를 넘음
+    ['g', '1.5'],
+]
+
+
+def test_int_schema():
+    df = parse_values(ROWS, {'지역': 'str', '값': 'int'}, drop_errors=False)
+    assert df['값'].tolist() == [1234, 0, 0, -999_999_999_999_999_999, 9_223_372_036_854_775_807, 0, 1]
+
+
+def test_int_schema_drops_error_rows():
+    df = parse_values(ROWS, {'지역': 'str', '값': 'int'})
+    assert df['지역'].tolist() == ['a', 'b', 'd', 'e', 'f', 'g']
+
+
+def test_float_schema_keeps_wide_values():
+    df = parse_values(ROWS, {'값': 'float'}, drop_errors=False)
+    values = df['값'].to_numpy()
+    assert values[0] == 1234.0
+    assert np.isnan(values[1]) and np.isnan(values[2])
+    assert values[3] == pytest.approx(-1e18)
+    assert values[5] == pytest.approx(1e20)
+    assert values[6] == 1.5
+
+
+def test_wide_integer_does_not_wrap():
+    out = parse_numeric(['99999999999999999999', '123456789012345678901234'])
+    assert out.tolist() == [0, 0]
@@ -0,0 +1,53 @@
+# -*- coding: utf-8 -*-
+"""carestats.pipeline 단계 키: 단계 함수가 부르는 모듈(code=)이 바뀌면 캐시가 무효화되는지"""
+import os
+
+from carestats.pipeline import Pipeline
+
+
+def render(out):
+    with open(out, 'w', encoding='utf-8') as f:
+        f.write('page')
+    return out
+
+
+def _touch(path, text, mtime_ns):
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(text)
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+def test_editing_callee_changes_stage_key(tmp_path):
+    callee = tmp_path / 'callee.py'
+    _touch(callee, "COLOR = 'red'\n", 1_000_000_000)
+    p = Pipeline(cache_dir=str(tmp_path / 'cache'))
+    p.add('map', render, params={'out': str(tmp_path / 'map.html')}, writes=True, code=[str(callee)])
+    stage = p.stages['map']
+
+    before = p.stage_key(stage, [])
+    assert p.stage_key(stage, []) == before
+    _touch(callee, "COLOR = 'blue'\n", 2_000_000_000)
+    assert p.stage_key(stage, []) != before
+
+
+def test_editing_callee_reruns_writes_stage(tmp_path):
+    callee = tmp_path / 'callee.py'
+    _touch(callee, "COLOR = 'red'\n", 1_000_000_000)
+    cache = str(tmp_path / 'cache')
+
+    def run():
+        p = Pipeline(cache_dir=cache, workers=1)
+        p.add('map', render, params={'out': str(tmp_path / 'map.html')}, writes=True, code=[str(callee)])
+        return p.run(verbose=False)['map'].status
+
+    assert run() == 'run'
+    assert run() == 'hit'   # 결과 파일이 있고 코드도 그대로
+    _touch(callee, "COLOR = 'blue'\n", 2_000_000_000)
+    assert run() == 'run'
+
+
+def test_module_names_resolve_to_package_files():
+    from carestats.freshness import code_paths
+    maps, js = code_paths(['carestats.maps', 'static/map.js'])
+    assert maps.endswith(os.path.join('carestats', 'maps.py'))
+    assert os.path.exists(js)
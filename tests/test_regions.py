@@ -0,0 +1,47 @@
+# -*- coding: utf-8 -*-
+"""carestats.regions 지역 차원: 별칭 → 코드, 기대 구성원 reindex, 버리는 이름 알림"""
+from carestats.regions import SEOUL, SIDO
+
+
+def test_aliases_share_code():
+    assert SIDO.codes(['서울', '서울특별시', '서울시', '강원도', '강원특별자치도']).tolist() == [11, 11, 11, 51, 51]
+    assert SEOUL.code('서울특별시 강남구') == SEOUL.code('강남구') == 11680
+
+
+def test_table_fills_missing_members():
+    df = SIDO.table({'capacity': SIDO.sum_by(['서울', '서울특별시', '부산'], [1, 2, 3])})
+    assert len(df) == len(SIDO) == 17
+    assert df.loc[11, 'capacity'] == 3 and df.loc[26, 'capacity'] == 3 and df.loc[27, 'capacity'] == 0
+    assert df.loc[11, '시도'] == '서울특별시'
+
+
+def test_sum_by_reports_dropped_names(capsys):
+    total = SIDO.sum_by(['서울', '충청북', '서울 강남구', '계', None, ''], [1, 2, 3, 4, 5, 6], '워크시트 1')
+    assert total.to_dict() == {11: 1}
+    out = capsys.readouterr().out
+    assert '충청북' in out and '서울 강남구' in out and '워크시트 1' in out
+    assert '계,' not in out and not out.rstrip().endswith('계')
+
+
+def test_sum_by_silent_when_all_resolve(capsys):
+    SEOUL.sum_by(['강남구', '중구', '전국'], [1, 2, 3])
+    assert capsys.readouterr().out == ''
+
+
+def test_named_uses_official_names():
+    df = SIDO.named(SIDO.sum_by(['서울', '부산광역시', '서울특별시'], [1, 2, 3]).rename('총정원'))
+    assert df.columns.tolist() == ['시도', '총정원']
+    assert df.loc[11].tolist() == ['서울특별시', 4] and df.loc[26].tolist() == ['부산광역시', 2]
+
+
+def test_refresh_sum_by_merges_aliases():
+    import pandas as pd
+
+    from carestats.refresh import sum_by
+    sheet1 = pd.DataFrame({'시도': ['서울', '서울특별시', '부산', '서울'], '구': ['중구', '중구', '중구', '강남구'],
+                           '정원': ['10', '5', '7', '1,000']})
+    by_sido = sum_by(sheet1, '시도', '정원', '총정원', dim='sido')
+    assert by_sido.values.tolist() == [[11, '서울특별시', 1015], [26, '부산광역시', 7]]
+    seoul = sum_by(sheet1, '구', '정원', '총정원', dim='seoul', sido_col='시도', sido='서울특별시', fill=True)
+    assert len(seoul) == 25
+    assert seoul.set_index('구')['총정원'][['중구', '강남구', '종로구']].tolist() == [15, 1000, 0]
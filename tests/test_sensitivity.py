@@ -0,0 +1,49 @@
+# -*- coding: utf-8 -*-
+"""carestats.sensitivity 가중치 민감도: 기본 가중치 = 지금 순위, --sido 약칭 해석, 모르는 시도"""
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from carestats import datasets, sensitivity
+from carestats.gap import NORM_COLS, gap_table
+
+SAMPLE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'fixtures', 'sample')
+
+
+@pytest.fixture(scope='module')
+def frames():
+    return datasets.load_snapshot(SAMPLE)
+
+
+def test_base_weights_reproduce_gap_index(frames):
+    df = gap_table(frames, 'sigungu')
+    norm = df[NORM_COLS].to_numpy(dtype=float)
+    weights = sensitivity.sample_weights(50, seed=1)
+    assert np.allclose(sensitivity.gap_scores(norm, weights, 'gap_diff')[0], df['gap_diff'])
+    assert np.allclose(sensitivity.gap_scores(norm, weights, 'gap_ratio')[0], df['gap_ratio'])
+
+
+def test_rank_summary_matches_sorting():
+    rng = np.random.default_rng(0)
+    scores = rng.normal(size=(400, 7))
+    ranks = sensitivity.rank_matrix(scores)
+    assert (ranks == np.argsort(np.argsort(-scores, axis=1, kind='stable'), axis=1)).all()
+    summary = sensitivity.rank_summary(ranks, top=3)
+    assert np.allclose(summary['top3_prob'], (ranks < 3).mean(axis=0))
+    assert (summary['median'] == np.percentile(ranks + 1, 50, axis=0, method='inverted_cdf')).all()
+
+
+def test_cli_resolves_sido_alias(tmp_path):
+    short, full = tmp_path / 'short.csv', tmp_path / 'full.csv'
+    sensitivity.main(['--data-dir', SAMPLE, '--sido', '서울', '--samples', '200', '--csv', str(short)])
+    sensitivity.main(['--data-dir', SAMPLE, '--sido', '서울특별시', '--samples', '200', '--csv', str(full)])
+    result = pd.read_csv(short, encoding='utf-8-sig')
+    assert len(result) == 25 and set(result['통계시도명']) == {'서울특별시'}
+    assert result.equals(pd.read_csv(full, encoding='utf-8-sig'))
+
+
+def test_cli_rejects_unknown_sido():
+    with pytest.raises(SystemExit, match='없는도'):
+        sensitivity.main(['--data-dir', SAMPLE, '--sido', '없는도', '--samples', '10'])
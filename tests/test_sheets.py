@@ -0,0 +1,43 @@
+# -*- coding: utf-8 -*-
+"""carestats.sheets QuotaHTTPClient: 드라이브 요청은 'drive' 버킷, 시트 요청은 'sheets' 버킷"""
+import pytest
+from gspread.http_client import HTTPClient
+from google.auth.credentials import AnonymousCredentials
+
+from carestats import quota, sheets
+
+
+@pytest.fixture
+def charged(monkeypatch):
+    calls = []
+
+    class Bucket:
+        def __init__(self, api):
+            self.api = api
+
+        def acquire(self):
+            calls.append(self.api)
+
+    monkeypatch.setattr(quota, 'get_bucket', Bucket)
+    monkeypatch.setattr(HTTPClient, 'request', lambda self, method, endpoint, *a, **k: endpoint)
+    return calls
+
+
+@pytest.mark.parametrize('url, api', [
+    ('https://sheets.googleapis.com/v4/spreadsheets/abc/values:batchGet', 'sheets'),
+    ('https://www.googleapis.com/drive/v3/files/abc', 'drive'),
+    ('https://www.googleapis.com/drive/v3/files', 'drive'),
+])
+def test_request_charges_bucket_by_url(charged, url, api):
+    client = sheets.QuotaHTTPClient(AnonymousCredentials())
+    client.request('get', url)
+    assert charged == [api]
+
+
+def test_api_bucket_follows_configured_urls(monkeypatch):
+    monkeypatch.setattr(sheets, '_BASE_URLS', (
+        ('sheets', 'https://sheets.googleapis.com/v4', 'http://127.0.0.1:8091/v4'),
+        ('drive', 'https://www.googleapis.com/drive/v3', 'http://127.0.0.1:8091/drive/v3'),
+    ))
+    assert sheets.api_bucket(sheets.api_url('https://www.googleapis.com/drive/v3/files')) == 'drive'
+    assert sheets.api_bucket(sheets.api_url('https://sheets.googleapis.com/v4/spreadsheets/abc')) == 'sheets'
@@ -0,0 +1,55 @@
+# -*- coding: utf-8 -*-
+"""carestats.site 번들: 일부 페이지만 다시 써도 이전 판이 남고, prune_bundles 뒤에는 현재 판만 / 단독 페이지는 CDN 없이"""
+import os
+import re
+
+import pytest
+
+from carestats import config, site
+
+SPEC = {'title': '테스트', 'layers': []}
+
+
+@pytest.fixture
+def assets(tmp_path, monkeypatch):
+    vendor = tmp_path / 'vendor'
+    vendor.mkdir()
+    (vendor / 'leaflet.js').write_text('/* leaflet */ var L = {}; var t = "</script>";\n', encoding='utf-8')
+    (vendor / 'leaflet.css').write_text('.leaflet-container { }\n', encoding='utf-8')
+    monkeypatch.setattr(config, 'ASSET_DIR', str(vendor))
+    return vendor
+
+
+def _runtime(monkeypatch, version):
+    js, css = f"/* map.js {version} */", f"/* map.css {version} */"
+    monkeypatch.setattr(site, 'runtime', lambda: (js.encode(), css.encode()))
+
+
+def _bundle(page):
+    with open(page, encoding='utf-8') as f:
+        return re.search(r'src="([^"]*carestats\.[0-9a-f]{10}\.js)"', f.read()).group(1)
+
+
+def test_partial_rewrite_keeps_old_bundle_until_pruned(tmp_path, assets, monkeypatch):
+    out = tmp_path / 'site'
+    _runtime(monkeypatch, 1)
+    a = site.write_map(str(out), 'a.html', SPEC)
+    b = site.write_map(str(out), 'b.html', SPEC)
+    _runtime(monkeypatch, 2)
+    site.write_map(str(out), 'a.html', SPEC)   # refresh --only map:a.html
+
+    assert _bundle(a) != _bundle(b)
+    assert os.path.exists(out / _bundle(a)) and os.path.exists(out / _bundle(b))
+
+    site.write_map(str(out), 'b.html', SPEC)
+    assert site.prune_bundles(str(out)) == 2   # 이전 판 js + css
+    assert sorted(os.listdir(out / 'assets')) == sorted(os.path.basename(p) for p in site.write_bundle(str(out)).values())
+    assert os.path.exists(out / _bundle(b))
+
+
+def test_standalone_html_inlines_leaflet(assets, monkeypatch):
+    _runtime(monkeypatch, 1)
+    html = site.standalone_html(SPEC, '테스트')
+    assert 'unpkg.com' not in html and site.LEAFLET_CDN not in html
+    assert '/* leaflet */' in html and '.leaflet-container' in html and '/* map.js 1 */' in html
+    assert html.count('</script>') == html.count('<script>') + html.count('<script src')
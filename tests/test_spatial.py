@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+"""carestats.spatial 격자 색인: 모든 고리를 광선 교차로 세는 전수 계산과 같은 지역, 구멍/섬/경계 밖/NaN"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from carestats.spatial import RegionIndex, assign_regions, read_rings
+from carestats.synthetic import boundary_collection, region_names
+
+
+def brute_locate(source, lon, lat):
+    """지역마다 모든 고리와의 광선 교차 횟수 (짝홀 규칙) → 홀수인 지역 (없으면 -1)"""
+    regions, rings = read_rings(source)
+    crossings = np.zeros((len(regions), len(lon)), dtype=int)
+    for owner, xy in rings:
+        x1, y1, x2, y2 = xy[:-1, 0:1], xy[:-1, 1:2], xy[1:, 0:1], xy[1:, 1:2]
+        hit = (y1 <= lat) != (y2 <= lat)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            xi = x1 + (lat - y1) * (x2 - x1) / (y2 - y1)
+        crossings[owner] += (hit & (xi > lon)).sum(axis=0)
+    inside = crossings % 2 == 1
+    return np.where(inside.any(axis=0), inside.argmax(axis=0), -1)
+
+
+def _feature(name, *polygons):
+    geometry = {'type': 'MultiPolygon', 'coordinates': [list(p) for p in polygons]}
+    return {'type': 'Feature', 'properties': {'통계시도명': '서울', '통계시군구명': name}, 'geometry': geometry}
+
+
+HOLES = {'type': 'FeatureCollection', 'features': [
+    # 가운데 구멍이 뚫린 사각형
+    _feature('도넛구', [[[0, 0], [4, 0], [4, 4], [0, 4], [0, 0]], [[1, 1], [3, 1], [3, 3], [1, 3], [1, 1]]]),
+    # 구멍 안의 섬 + 떨어진 오목한 조각 (한 지역)
+    _feature('섬구', [[[1.5, 1.5], [2.5, 1.5], [2.5, 2.5], [1.5, 2.5]]],
+             [[[5, 0], [8, 0], [8, 3], [7, 3], [7, 1], [6, 1], [6, 3], [5, 3], [5, 0]]]),
+]}
+
+
+@pytest.mark.parametrize('source, cells', [
+    (boundary_collection(region_names(3, 8), detail=12, seed=1), None),
+    (boundary_collection(region_names(3, 8), detail=12, seed=1), 7),
+    (HOLES, None),
+    (HOLES, 3),
+])
+def test_locate_matches_brute_force(source, cells):
+    index = RegionIndex.from_geojson(source, cells=cells)
+    west, south, east, north = index.bounds
+    rng = np.random.default_rng(0)
+    lon = rng.uniform(west - 0.5, east + 0.5, 20000)
+    lat = rng.uniform(south - 0.5, north + 0.5, 20000)
+    expected = brute_locate(source, lon, lat)
+    assert (expected >= 0).any() and (expected < 0).any()
+    assert np.array_equal(index.locate(lon, lat), expected)
+
+
+def test_holes_islands_and_missing_coordinates():
+    index = RegionIndex.from_geojson(HOLES)
+    names = index.regions['통계시군구명']
+    lon = np.array([0.5, 1.2, 2.0, 6.5, 6.5, 7.5, np.nan, 20.0])
+    lat = np.array([0.5, 1.2, 2.0, 0.5, 2.0, 2.0, 1.0, 1.0])
+    got = [names[c] if c >= 0 else '' for c in index.locate(lon, lat)]
+    assert got == ['도넛구', '', '섬구', '섬구', '', '섬구', '', '']
+    assert set(index.regions['통계시도명']) == {'서울특별시'}
+
+    points = pd.DataFrame({'lon': ['2.0', '0.5', ''], 'lat': [2.0, 0.5, None], '정원': [1, 2, 3]})
+    out = assign_regions(points, index)
+    assert out['통계시군구명'].tolist() == ['섬구', '도넛구', '']
+    assert out['정원'].tolist() == [1, 2, 3]
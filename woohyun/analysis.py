@@ -1,21 +1,24 @@
 # welfare_gap_analysis.py
 # -*- coding: utf-8 -*-
 
+import argparse
 import os
-import json
+import sys
 import time
 import pandas as pd
-from sklearn.preprocessing import MinMaxScaler
-from sklearn.decomposition import PCA
-import gspread
-from google.oauth2 import service_account
-from google.oauth2.service_account import Credentials
-from googleapiclient.discovery import build
 import matplotlib.pyplot as plt
 import matplotlib.font_manager as fm
 from matplotlib import rc
-from pandas.plotting import parallel_coordinates
-import seaborn as sns
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from carestats.sheets import get_client, get_credentials, read_columns, sheets_service
+from carestats.quota import execute
+from carestats.async_sheets import fetch_values
+from carestats.parsing import parse_values
+from carestats.numeric import minmax_scale, pca
+from carestats.bootstrap import bootstrap_gap, interval_table, resample_inputs
+from carestats.regions import SIDO
+from carestats.trace import span, traced
 
 # 한글 폰트 설정
 font_path = 'woohyun/Pretendard.ttf'  # 시스템 경로에 맞게 수정
@@ -25,118 +28,145 @@ plt.rcParams['axes.unicode_minus'] = False
 
 # 구글 스프레드시트 정보
 SPREADSHEET_ID = "1_m5GzATyDfHQ6GH_AIDt96dG-fUkLt-I4a93XlSkA58"
-KEY_REL_PATH = "../key/datascience-457408-eb15d8611be3.json"
+
+# --- 데이터 정리 함수 (원본 → 시도코드 인덱스 Series, '서울'/'서울특별시'는 같은 코드) ---
+def prepare_capacity(df):
+    df.columns = df.columns.str.strip()
+    capacity = pd.to_numeric(df['정원'], errors='coerce').fillna(0).astype(int)
+    return SIDO.sum_by(df['시도'], capacity, '워크시트 1').rename('capacity')
+
+
+def prepare_supports(df):
+    df.columns = df.columns.str.strip()
+    counts = pd.to_numeric(df['지급건수'], errors='coerce').fillna(0).astype(int)
+    return SIDO.sum_by(df['통계시도명'], counts, '워크시트 2').rename('support_count')
+
+
+def prepare_households(raw):
+    """A3:B23 값 → 시도별 가구 수 ('계' 등 시도가 아닌 행은 버림)"""
+    header = [c.strip() for c in raw[2]]
+    rows = raw[4:]
+    df = pd.DataFrame(rows, columns=header)
+    df.columns = ['시도', 'household_count']
+    counts = pd.to_numeric(df['household_count'], errors='coerce').fillna(0).astype(int)
+    return SIDO.sum_by(df['시도'], counts, '워크시트 4').rename('household_count')
+
+
+def prepare_members(vals):
+    """A3:D 값 → 시도별 수급자수 ('계→소계' 행만)"""
+    df = parse_values(
+        vals,
+        {'시도': 'str', '특성1': 'str', '특성2': 'str', 'member_count': 'int'},
+        names=['시도', '특성1', '특성2', 'member_count'],
+    )
+    df = df[(df['특성1'] == '계') & (df['특성2'] == '소계') & (df['시도'] != '계')]
+    return SIDO.sum_by(df['시도'], df['member_count'], '워크시트 7').rename('member_count')
+
 
 # --- 데이터 로딩 함수 ---
+@traced()
 def load_capacity():
-    script_dir = os.path.dirname(os.path.abspath(__file__))
-    key_path = os.path.join(script_dir, KEY_REL_PATH)
-    info = json.load(open(key_path, encoding='utf-8'))
-    info['private_key'] = info['private_key'].replace('\\n', '\n')
-    creds = service_account.Credentials.from_service_account_info(
-        info,
-        scopes=["https://www.googleapis.com/auth/spreadsheets.readonly"]
-    )
-    client = gspread.authorize(creds)
+    client = get_client()
     ws = client.open_by_key(SPREADSHEET_ID).get_worksheet(1)
-    df = pd.DataFrame(ws.get_all_records())
-    df.columns = df.columns.str.strip()
-    df = df[['시도', '정원']].dropna(subset=['시도'])
-    df['정원'] = pd.to_numeric(df['정원'], errors='coerce').fillna(0).astype(int)
-    return (
-        df.groupby('시도', as_index=False)['정원']
-        .sum()
-        .rename(columns={'정원': 'capacity'})
-    )
+    return prepare_capacity(read_columns(ws, ['시도', '정원']))
 
 
+@traced()
 def load_supports():
-    script_dir = os.path.dirname(os.path.abspath(__file__))
-    key_path = os.path.join(script_dir, KEY_REL_PATH)
-    info = json.load(open(key_path, encoding='utf-8'))
-    info['private_key'] = info['private_key'].replace('\\n', '\n')
-    creds = service_account.Credentials.from_service_account_info(
-        info,
-        scopes=["https://www.googleapis.com/auth/spreadsheets.readonly"]
-    )
-    client = gspread.authorize(creds)
+    client = get_client()
     ws = client.open_by_key(SPREADSHEET_ID).get_worksheet(2)
-    df = pd.DataFrame(ws.get_all_records())
-    df.columns = df.columns.str.strip()
-    df = df[['통계시도명', '지급건수']].dropna(subset=['통계시도명'])
-    df['지급건수'] = pd.to_numeric(df['지급건수'], errors='coerce').fillna(0).astype(int)
-    return (
-        df.groupby('통계시도명', as_index=False)['지급건수']
-        .sum()
-        .rename(columns={'통계시도명': '시도', '지급건수': 'support_count'})
-    )
+    return prepare_supports(read_columns(ws, ['통계시도명', '지급건수']))
 
 
+@traced()
 def load_households():
-    script_dir = os.path.dirname(os.path.abspath(__file__))
-    key_path = os.path.join(script_dir, KEY_REL_PATH)
-    creds = Credentials.from_service_account_file(
-        key_path,
-        scopes=[
-            "https://www.googleapis.com/auth/spreadsheets.readonly",
-            "https://www.googleapis.com/auth/drive.readonly"
-        ]
-    )
-    client = gspread.authorize(creds)
+    client = get_client()
     ws = client.open_by_key(SPREADSHEET_ID).get_worksheet(4)
-    raw = ws.get('A3:B23')
-    header = [c.strip() for c in raw[2]]
-    rows = raw[4:]
-    df = pd.DataFrame(rows, columns=header)
-    df.columns = ['시도', 'household_count']
-    df['시도'] = df['시도'].astype(str).str.strip()
-    df['household_count'] = pd.to_numeric(df['household_count'], errors='coerce').fillna(0).astype(int)
-    return df
+    return prepare_households(ws.get('A3:B23'))
 
 
+@traced()
 def load_members():
-    script_dir = os.path.dirname(os.path.abspath(__file__))
-    key_path = os.path.join(script_dir, KEY_REL_PATH)
-    creds = Credentials.from_service_account_file(
-        key_path,
-        scopes=["https://www.googleapis.com/auth/spreadsheets.readonly"]
-    )
-    service = build('sheets', 'v4', credentials=creds)
-    meta = service.spreadsheets().get(spreadsheetId=SPREADSHEET_ID).execute()
+    service = sheets_service()
+    meta = execute(service.spreadsheets().get(spreadsheetId=SPREADSHEET_ID))
     sheet_title = meta['sheets'][7]['properties']['title']
-    resp = service.spreadsheets().values().get(
+    resp = execute(service.spreadsheets().values().get(
         spreadsheetId=SPREADSHEET_ID,
         range=f"{sheet_title}!A3:D"
-    ).execute()
-    vals = resp.get('values', [])
-    header = [c.strip() for c in vals[0]]
-    df = pd.DataFrame(vals[1:], columns=header)
-    df.columns = ['시도', '특성1', '특성2', 'member_count']
-    df = df[(df['특성1'] == '계') & (df['특성2'] == '소계') & (df['시도'] != '계')]
-    df['member_count'] = df['member_count'].str.replace(',', '').astype(int)
-    return df[['시도', 'member_count']]
-
-
-def main():
-    # 데이터 로드
-    cap_df = load_capacity()
-    sup_df = load_supports()
-    hh_df = load_households()
-    mem_df = load_members()
-
-    # 병합 및 결측 처리
-    df = (
-        cap_df.merge(sup_df, on='시도', how='outer')
-        .merge(hh_df, on='시도', how='outer')
-        .merge(mem_df, on='시도', how='outer')
-        .fillna(0)
+    ))
+    return prepare_members(resp.get('values', []))
+
+
+@traced()
+def fetch_all(concurrency=4):
+    """네 워크시트를 한 세션에서 동시에 받아옴 (가장 느린 시트 하나 만큼만 걸림)"""
+    creds = get_credentials()
+    return fetch_values({
+        'capacity': (1, ['시도', '정원']),
+        'supports': (2, ['통계시도명', '통계연월', '지급건수']),
+        'households': (4, 'A3:B23'),
+        'members': (7, 'A3:D'),
+    }, concurrency=concurrency, credentials=creds)
+
+
+def prepare_all(vals):
+    return (
+        prepare_capacity(vals['capacity']),
+        prepare_supports(vals['supports']),
+        prepare_households(vals['households']),
+        prepare_members(vals['members']),
+    )
+
+
+@traced()
+def load_all(concurrency=4):
+    return prepare_all(fetch_all(concurrency))
+
+
+@traced()
+def bootstrap_intervals(df, raw_cols, vals, n_boot=1000, seed=0, workers=1):
+    """시설(정원)·월(지급건수) 재표본으로 gap_diff/gap_ratio 구간 (df와 같은 행 순서)"""
+    cap = vals['capacity']
+    sup = vals['supports']
+    # 월 재표본: '통합'(월 합계) 행과 빈 연월은 달이 아니므로 제외 (datasets.normalize_payments와 같은 기준)
+    months = sup['통계연월'].astype(str).str.strip().str.replace(r'\.0$', '', regex=True)
+    keep = ~months.isin(['', '통합'])
+    sup = sup[keep].assign(통계연월=months[keep])
+    facilities, monthly = resample_inputs(
+        df.index,
+        pd.Index(SIDO.codes(cap['시도'])), pd.to_numeric(cap['정원'], errors='coerce').fillna(0),
+        pd.Index(SIDO.codes(sup['통계시도명'])), sup['통계연월'],
+        pd.to_numeric(sup['지급건수'], errors='coerce').fillna(0),
     )
+    reps = bootstrap_gap(df[raw_cols].to_numpy(dtype=float), facilities, monthly, n_boot, seed, workers)
+    return interval_table(*reps).set_index(df.index)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="시도별 복지 공백 분석")
+    parser.add_argument('--bootstrap', type=int, default=0, metavar='N',
+                        help="재표본 N개로 최종 순위표에 gap_diff/gap_ratio 95%% 구간 추가 (0이면 점 추정만)")
+    parser.add_argument('--workers', type=int, default=1, help="부트스트랩 프로세스 수")
+    parser.add_argument('--seed', type=int, default=0, help="부트스트랩 시드")
+    args = parser.parse_args(argv)
+
+    # 무거운 분석/시각화 라이브러리는 실제로 분석할 때만 로드
+    import seaborn as sns
+    from pandas.plotting import parallel_coordinates
+
+    # 데이터 로드 (워크시트 동시 요청)
+    vals = fetch_all()
+    cap_df, sup_df, hh_df, mem_df = prepare_all(vals)
+
+    # 시도코드 인덱스로 맞춤 (17개 시도 전체, 자료 없는 시도는 0)
+    with span('merge'):
+        df = SIDO.table({'capacity': cap_df, 'support_count': sup_df,
+                         'household_count': hh_df, 'member_count': mem_df})
 
     # 정규화
-    scaler = MinMaxScaler()
     raw_cols = ['capacity', 'support_count', 'household_count', 'member_count']
     norm_cols = [f"{c}_norm" for c in raw_cols]
-    df[norm_cols] = scaler.fit_transform(df[raw_cols])
+    df[norm_cols] = minmax_scale(df[raw_cols].to_numpy(dtype=float))
 
     # 상위 10개 선 그래프
     for col in norm_cols:
@@ -187,8 +217,7 @@ def main():
     plt.show()
 
     # 9) PCA 2D 투영  ← 이 주석과 동일한 들여쓰기 레벨로 아래 코드도 맞춥니다.
-    pca = PCA(n_components=2)
-    df[['PC1', 'PC2']] = pca.fit_transform(df[norm_cols])
+    df[['PC1', 'PC2']] = pca(df[norm_cols].to_numpy(), n_components=2)[0]
     plt.figure(figsize=(6, 5))
     plt.scatter(df['PC1'], df['PC2'], alpha=0.6)
     for _, row in df.nlargest(5, 'gap_diff').iterrows():
@@ -202,11 +231,15 @@ def main():
     plt.show()
 
     # 10) 최종 결과 출력
+    cols = ['시도'] + raw_cols + ['supply_index', 'demand_index', 'gap_diff', 'gap_ratio']
+    if args.bootstrap:
+        df = df.join(bootstrap_intervals(df, raw_cols, vals, args.bootstrap, args.seed, args.workers))
+        cols += ['gap_diff_lo', 'gap_diff_hi', 'gap_ratio_lo', 'gap_ratio_hi', 'rank_lo', 'rank_hi', 'zero_supply']
     result = df.nlargest(10, 'gap_diff')
     print("\n=== 복지 공백 상위 10개 지역 ===")
-    print(
-        result.loc[:, ['시도'] + raw_cols + ['supply_index', 'demand_index', 'gap_diff', 'gap_ratio']].to_string(index=False)
-    )
+    if args.bootstrap:
+        print(f"(95% 부트스트랩 구간: 재표본 {args.bootstrap:,}개, 시설·월 단위 복원 추출, zero_supply = 공급 지수 0 비율)")
+    print(result.loc[:, cols].to_string(index=False))
 
 if __name__ == '__main__':
     main()
\ No newline at end of file
@@ -1,33 +1,31 @@
 # -*- coding: utf-8 -*-
 import os
 import sys
-import json
 import time
 import math
 import pandas as pd
 import folium
 from geopy.geocoders import Nominatim
-import gspread
-from google.oauth2 import service_account
 
-def load_worksheet(index=1):
-    """구글 스프레드시트 워크시트(index) → DataFrame"""
-    script_dir = os.path.dirname(os.path.abspath(__file__))
-    key_path = os.path.normpath(os.path.join(
-        script_dir, "../key/datascience-457408-eb15d8611be3.json"
-    ))
-    info = json.load(open(key_path, encoding='utf-8'))
-    info['private_key'] = info['private_key'].replace('\\n','\n')
-    creds = service_account.Credentials.from_service_account_info(
-        info, scopes=["https://www.googleapis.com/auth/spreadsheets.readonly"]
-    )
-    client = gspread.authorize(creds)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from carestats.freshness import SHEET_CODE, RunCheck
+from carestats.regions import SIDO
+from carestats.sheets import get_client, read_columns
+from carestats.trace import span, traced
+
+@traced()
+def load_worksheet(index=1, columns=None, where=None):
+    """구글 스프레드시트 워크시트(index) → DataFrame (columns를 주면 해당 열만 읽음)"""
+    client = get_client()
     SPREADSHEET_ID = "1_m5GzATyDfHQ6GH_AIDt96dG-fUkLt-I4a93XlSkA58"
     ws = client.open_by_key(SPREADSHEET_ID).get_worksheet(index)
+    if columns:
+        return read_columns(ws, columns, where)
     df = pd.DataFrame(ws.get_all_records())
     df.columns = df.columns.str.strip()
     return df
 
+@traced()
 def geocode_districts(districts):
     """시군구명 리스트 → {구명: (lat, lon)}"""
     geolocator = Nominatim(user_agent="bubble_map", timeout=10)
@@ -38,24 +36,27 @@ def geocode_districts(districts):
             coords[d] = (loc.latitude, loc.longitude) if loc else (None, None)
         except:
             coords[d] = (None, None)
-        time.sleep(1)
+        with span('geocode.sleep', 'sleep'):
+            time.sleep(1)
     return coords
 
 def main():
+    out = os.path.join(os.path.dirname(os.path.abspath(__file__)), "capacity_bubble_map.html")
+    check = RunCheck('woohyun/복지시설', files=[__file__], outputs=[out], code=SHEET_CODE)
+    if not check.changed():
+        print(f"⏭️ 원본 변경 없음, 건너뜀: {out}")
+        return
+    print(f"🔄 다시 생성 ({', '.join(check.reasons)})")
+
     # 1) 워크시트 로드 & 집계
-    df = load_worksheet(index=1)
+    df = load_worksheet(index=1, columns=['시도', '정원'])
     # 반드시 컬럼명이 정확히 일치해야 합니다.
     if '시도' not in df.columns or '정원' not in df.columns:
         raise KeyError("워크시트에 '시도' 또는 '정원' 컬럼이 없습니다.")
-    df = df[['시도','정원']].dropna(subset=['시도'])
-    df['정원'] = pd.to_numeric(df['정원'], errors='coerce').fillna(0).astype(int)
+    capacity = pd.to_numeric(df['정원'], errors='coerce').fillna(0).astype(int)
 
-    summary = (
-        df
-        .groupby('시도', as_index=False)['정원']
-        .sum()
-        .rename(columns={'정원':'총정원'})
-    )
+    # 시도 코드별 합계 ('서울'/'서울특별시'는 한 시도, 목록에 없는 이름은 ⚠️로 알림)
+    summary = SIDO.named(SIDO.sum_by(df['시도'], capacity, '워크시트 1').rename('총정원')).reset_index(drop=True)
     print("=== 시군구별 총정원 ===")
     print(summary.to_string(), "\n")
 
@@ -112,9 +113,14 @@ def main():
         m.fit_bounds(bounds)
 
     # 7) 저장
-    out = os.path.join(os.path.dirname(os.path.abspath(__file__)), "capacity_bubble_map.html")
-    m.save(out)
+    with span('m.save', 'render'):
+        m.save(out)
     print(f"✅ 버블맵 저장: {out}")
+    if bounds:
+        check.record()
+    else:
+        # 지오코딩이 모두 실패해 버블 없는 지도: 기록하면 다음 실행부터 계속 건너뜀
+        print("⚠️ 좌표를 얻은 지역이 없어 실행 기록을 남기지 않음 (다음 실행 때 다시 생성)")
 
 if __name__ == "__main__":
     main()
@@ -1,12 +1,13 @@
 # -*- coding: utf-8 -*-
 import os
 import sys
-import json
 import pandas as pd
 import matplotlib.pyplot as plt
 from matplotlib import font_manager
-import gspread
-from google.oauth2 import service_account
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from carestats.sheets import get_client
+from carestats.trace import span, traced
 
 def setup_encoding_and_font():
     # 터미널 UTF-8 출력, 한글 폰트 설정
@@ -19,6 +20,7 @@ def setup_encoding_and_font():
     plt.rc('font', family=prop.get_name())
     plt.rcParams['axes.unicode_minus'] = False
 
+@traced()
 def calculate_city_income_sums(df):
     """
     '통계시도명', '중위소득비율구분', '수급자수' 컬럼을 이용해
@@ -52,19 +54,49 @@ def calculate_city_income_sums(df):
     pivot = pivot.reindex(columns=category_order, fill_value=0)
     return pivot
 
+@traced()
+def plot_income_donut(city, counts, out_path):
+    """시도 하나의 중위소득구간별 수급자수 → 도넛 차트 PNG"""
+    total    = counts.sum()
+    percents = counts / total * 100
+
+    fig, ax = plt.subplots(figsize=(10, 6))
+    wedges, _ = ax.pie(
+        counts,
+        startangle=90,
+        wedgeprops=dict(width=0.4, edgecolor='w')
+    )
+
+    # 범례 라벨에 수치와 퍼센트 함께 표시
+    legend_labels = [
+        f"{cat}: {counts[cat]}명 ({percents[cat]:.1f}%)"
+        for cat in counts.index
+    ]
+    ax.legend(
+        wedges,
+        legend_labels,
+        title="중위소득구간",
+        loc='center left',
+        bbox_to_anchor=(1, 0.5),
+        fontsize=10,
+        title_fontsize=12
+    )
+
+    ax.set_title(f"{city} 중위소득비율구간별 수급자 분포", pad=20)
+    fig.subplots_adjust(right=0.75)  # 오른쪽 여백 확보
+    plt.tight_layout()
+
+    with span('savefig', 'render'):
+        plt.savefig(out_path, dpi=150)
+    plt.close(fig)
+    return out_path
+
 def main():
     setup_encoding_and_font()
     script_dir = os.path.dirname(os.path.abspath(__file__))
 
     # 인증 및 시트 로드
-    key_path = os.path.normpath(os.path.join(script_dir, "../key/datascience-457408-eb15d8611be3.json"))
-    info     = json.load(open(key_path, encoding='utf-8'))
-    info["private_key"] = info["private_key"].replace("\\n","\n")
-    creds = service_account.Credentials.from_service_account_info(
-        info,
-        scopes=["https://www.googleapis.com/auth/spreadsheets.readonly"],
-    )
-    client = gspread.authorize(creds)
+    client = get_client()
     SPREADSHEET_ID = "1_m5GzATyDfHQ6GH_AIDt96dG-fUkLt-I4a93XlSkA58"
     ws = client.open_by_key(SPREADSHEET_ID).get_worksheet(3)
 
@@ -88,39 +120,9 @@ def main():
             print(f"{city}: 데이터 없음 (합계 0)\n")
             continue
 
-        counts   = row
-        percents = counts / total * 100
-
-        fig, ax = plt.subplots(figsize=(10, 6))
-        wedges, _ = ax.pie(
-            counts,
-            startangle=90,
-            wedgeprops=dict(width=0.4, edgecolor='w')
-        )
-
-        # 범례 라벨에 수치와 퍼센트 함께 표시
-        legend_labels = [
-            f"{cat}: {counts[cat]}명 ({percents[cat]:.1f}%)"
-            for cat in counts.index
-        ]
-        ax.legend(
-            wedges,
-            legend_labels,
-            title="중위소득구간",
-            loc='center left',
-            bbox_to_anchor=(1, 0.5),
-            fontsize=10,
-            title_fontsize=12
-        )
-
-        ax.set_title(f"{city} 중위소득비율구간별 수급자 분포", pad=20)
-        fig.subplots_adjust(right=0.75)  # 오른쪽 여백 확보
-        plt.tight_layout()
-
         safe = city.replace(" ", "_").replace("/", "_")
         out_path = os.path.join(script_dir, f"{safe}_income_donut.png")
-        plt.savefig(out_path, dpi=150)
-        plt.close()
+        plot_income_donut(city, row, out_path)
         print(f"{city} 도넛 차트 저장: {out_path}\n")
 
 if __name__ == "__main__":
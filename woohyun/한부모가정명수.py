@@ -1,38 +1,40 @@
 # -*- coding: utf-8 -*-
 import os
+import sys
 import time
 import math
-import pandas as pd
 import folium
 from geopy.geocoders import Nominatim
-from google.oauth2.service_account import Credentials
-from googleapiclient.discovery import build
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from carestats.quota import execute
+from carestats.sheets import sheets_service
+from carestats.parsing import parse_values
+from carestats.freshness import SHEET_CODE, RunCheck
+from carestats.trace import span, traced
 
 SPREADSHEET_ID = "1_m5GzATyDfHQ6GH_AIDt96dG-fUkLt-I4a93XlSkA58"
 
+@traced()
 def load_data():
     """Worksheet index=7, A3:D 끝까지 읽어서 '계→소계' 시도별 데이터만 반환"""
-    base = os.path.dirname(__file__)
-    creds = Credentials.from_service_account_file(
-        os.path.join(base, "../key/datascience-457408-eb15d8611be3.json"),
-        scopes=["https://www.googleapis.com/auth/spreadsheets.readonly"]
-    )
-    service = build('sheets', 'v4', credentials=creds)
-    meta = service.spreadsheets().get(spreadsheetId=SPREADSHEET_ID).execute()
+    service = sheets_service()
+    meta = execute(service.spreadsheets().get(spreadsheetId=SPREADSHEET_ID))
     sheet = meta['sheets'][7]['properties']['title']
-    resp = service.spreadsheets().values().get(
+    resp = execute(service.spreadsheets().values().get(
         spreadsheetId=SPREADSHEET_ID,
         range=f"{sheet}!A3:D"
-    ).execute()
+    ))
     vals = resp.get('values', [])
-    header = [c.strip() for c in vals[0]]
-    rows = vals[1:]
-    df = pd.DataFrame(rows, columns=header)
-    df.columns = ['시도','특성1','특성2','수급자수']
+    df = parse_values(
+        vals,
+        {'시도': 'str', '특성1': 'str', '특성2': 'str', '수급자수': 'int'},
+        names=['시도','특성1','특성2','수급자수'],
+    )
     df = df[(df['특성1']=='계') & (df['특성2']=='소계') & (df['시도']!='계')]
-    df['수급자수'] = df['수급자수'].str.replace(',', '').astype(int)
     return df[['시도','수급자수']]
 
+@traced()
 def geocode(regions):
     geo = Nominatim(user_agent="sheet7_map", timeout=10)
     coords = {}
@@ -42,10 +44,13 @@ def geocode(regions):
             coords[r] = (loc.latitude, loc.longitude) if loc else (None, None)
         except:
             coords[r] = (None, None)
-        time.sleep(1)
+        with span('geocode.sleep', 'sleep'):
+            time.sleep(1)
     return coords
 
-def make_map(df):
+@traced()
+def make_map(df, out):
+    """지오코딩 + 버블맵 저장 → 좌표를 얻은 지역 수"""
     coords = geocode(df['시도'])
     m = folium.Map(location=[36,128], zoom_start=6, width='100%', height='100%')
     factor = 0.3
@@ -92,13 +97,25 @@ def make_map(df):
     if bounds:
         m.fit_bounds(bounds)
 
-    out = os.path.join(os.path.dirname(__file__), "sheet7_bubble_map.html")
-    m.save(out)
+    with span('m.save', 'render'):
+        m.save(out)
     print(f"✅ 맵 저장됨: {out}")
+    return len(bounds)
 
 def main():
+    out = os.path.join(os.path.dirname(os.path.abspath(__file__)), "sheet7_bubble_map.html")
+    check = RunCheck('woohyun/한부모가정명수', files=[__file__], outputs=[out], code=SHEET_CODE)
+    if not check.changed():
+        print(f"⏭️ 원본 변경 없음, 건너뜀: {out}")
+        return
+    print(f"🔄 다시 생성 ({', '.join(check.reasons)})")
+
     df = load_data()
-    make_map(df)
+    if make_map(df, out):
+        check.record()
+    else:
+        # 지오코딩이 모두 실패해 버블 없는 지도: 기록하면 다음 실행부터 계속 건너뜀
+        print("⚠️ 좌표를 얻은 지역이 없어 실행 기록을 남기지 않음 (다음 실행 때 다시 생성)")
 
 if __name__ == "__main__":
     main()